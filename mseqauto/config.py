@@ -22,6 +22,39 @@ class MseqConfig:
     MSEQ_PATH = Path("C:/DNA/Mseq4/bin")
     MSEQ_EXECUTABLE = "j.exe -jprofile mseq.ijl"
 
+    # Number of isolated mSeq worker processes used by MseqWorkerPool. Above 1,
+    # ind_auto_mseq and ind_process_all mSeq the ready orders in parallel, each
+    # worker on its own mSeq instance (run under the 32-bit interpreter)
+    MSEQ_WORKER_COUNT = 1
+
+    # Threads sorting BioI folders at once (FolderProcessor.sort_ind_folders);
+    # 1 sorts them one after another
+    SORT_WORKER_COUNT = 4
+
+    # Build zips in a local temp folder: the member files are prefetched from the
+    # share by ZIP_STAGING_WORKERS threads, zipped locally and the finished zip is
+    # uploaded in one sequential write. ZIP_STAGING_DIR None uses the system temp
+    ZIP_LOCAL_STAGING = False
+    ZIP_STAGING_WORKERS = 8
+    ZIP_STAGING_DIR = None
+
+    # Deep-verify zips while validating: every member is decompressed and its CRC
+    # checked, on ZIP_VERIFY_WORKERS threads, and with ZIP_VERIFY_SOURCES also
+    # compared with the source files. Results go in the summary's Integrity column
+    ZIP_DEEP_VERIFY = False
+    ZIP_VERIFY_SOURCES = False
+    ZIP_VERIFY_WORKERS = 4
+
+    # 64-bit scripts and the GUI drive mSeq through one long-lived 32-bit
+    # automation server (core/automation_server.py) instead of relaunching
+    # themselves in 32-bit Python. The server exits after the idle timeout.
+    # A script the server does not answer within the busy timeout (it is
+    # serving another script) drives mSeq from its own process instead
+    USE_AUTOMATION_SERVER = True
+    AUTOMATION_SERVER_FILE = Path.home() / ".mseqauto" / "automation_server.json"
+    AUTOMATION_SERVER_IDLE_TIMEOUT = 4 * 3600
+    AUTOMATION_SERVER_BUSY_TIMEOUT = 5
+
 
     # File Extensions
     ABI_EXTENSION = '.ab1'
@@ -113,6 +146,28 @@ class MseqConfig:
     KEY_FILE_PATH = Path("P:/order_key.txt")
     BATCH_FILE_PATH = Path("P:/generate-data-sorting-key-file.bat")
     REINJECT_FOLDER = Path("P:/Data/Reinjects")
+    INDIVIDUALS_DATA_PATH = Path("P:/Data/Individuals")
+    SPREADSHEETS_PATH = Path("G:/Lab/Spreadsheets")
+    ABI_UPLOAD_PATH = SPREADSHEETS_PATH / "Individual Uploaded to ABI"
+
+    # Local SQLite record of order lifecycle state (None disables it). Kept off
+    # the network share so re-runs can skip unchanged orders without rescanning
+    ORDER_STATE_DB = Path.home() / ".mseqauto" / "order_state.db"
+
+    # How zips reach the zip dump folder. 'auto' hardlinks the dump entry when the
+    # order folder and the dump folder are on the same volume, and otherwise writes
+    # the dump copy alongside the order copy in the one zip pass, so no zip is
+    # written twice. 'copy' copies every finished zip into the dump folder
+    ZIP_DUMP_DELIVERY = 'auto'
+
+    # Validation summary layout. False inserts each session above the older ones
+    # (newest first). True appends sessions below them so existing rows are never
+    # shifted; scripts/summary_newest_first.py renders a newest-first copy
+    SUMMARY_APPEND_MODE = False
+
+    # Also append each session's summary rows to a tab-separated file next to the
+    # workbook, for tools that should not have to parse xlsx
+    SUMMARY_TSV_EXPORT = False
 
     # Convenience methods for path operations
     @classmethod
@@ -3,14 +3,67 @@ Core functionality for the MseqAuto package.
 
 This module contains the core classes and functions that handle
 file system operations, folder processing, and UI automation.
+
+Classes are imported on first use (PEP 562), so a script that only sorts
+or zips files never loads numpy, pywinauto or the COM bindings.
 """
+import importlib
+from typing import TYPE_CHECKING
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    'OSCompatibilityManager': '.os_compatibility',
+    'FileSystemDAO': '.file_system_dao',
+    'FolderProcessor': '.folder_processor',
+    'MseqAutomation': '.ui_automation',
+    'FilenameClassifier': '.filename_classifier',
+    'MseqSimulator': '.mseq_simulator',
+    'OrderStateStore': '.order_state_store',
+    'open_order_state_store': '.order_state_store',
+    'MseqWorkerPool': '.mseq_worker_pool',
+    'PlateSortEngine': '.plate_sort_engine',
+    'AutomationServer': '.automation_server',
+    'AutomationClient': '.automation_server',
+    'PipelineContext': '.pipeline_context',
+    'SharedOrderKey': '.shared_order_key',
+}
+
+__all__ = ['AutomationClient', 'AutomationServer', 'FileSystemDAO', 'FilenameClassifier', 'FolderProcessor',
+           'MseqAutomation', 'MseqSimulator', 'MseqWorkerPool',
+           'OSCompatibilityManager', 'OrderStateStore', 'PipelineContext', 'PlateSortEngine', 'SharedOrderKey',
+           'open_order_state_store']
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except ImportError:
+        # pywinauto and pywin32 only exist on Windows; keep the rest of core importable
+        # elsewhere so headless workers and tests can run
+        if name != 'MseqAutomation':
+            raise
+        value = None
+    globals()[name] = value
+    return value
+
 
-# First, import the OSCompatibilityManager to make it available
-from .os_compatibility import OSCompatibilityManager
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
 
-# Then import other classes that might depend on it
-from .file_system_dao import FileSystemDAO
-from .folder_processor import FolderProcessor
-from .ui_automation import MseqAutomation
 
-__all__ = ['FileSystemDAO', 'FolderProcessor', 'MseqAutomation', 'OSCompatibilityManager']
+if TYPE_CHECKING:
+    from .os_compatibility import OSCompatibilityManager
+    from .file_system_dao import FileSystemDAO
+    from .folder_processor import FolderProcessor
+    from .ui_automation import MseqAutomation
+    from .filename_classifier import FilenameClassifier
+    from .mseq_simulator import MseqSimulator
+    from .order_state_store import OrderStateStore, open_order_state_store
+    from .mseq_worker_pool import MseqWorkerPool
+    from .plate_sort_engine import PlateSortEngine
+    from .automation_server import AutomationClient, AutomationServer
+    from .pipeline_context import PipelineContext
+    from .shared_order_key import SharedOrderKey
@@ -0,0 +1,406 @@
+# automation_server.py
+"""
+Long-lived mSeq automation server
+
+mSeq is a 32-bit application, so it has to be driven from 32-bit Python. The
+server runs once per session in that interpreter and keeps pywinauto, COM and
+the mSeq window loaded; scripts and the GUI run in any interpreter and talk to
+it through AutomationClient, which has the MseqAutomation interface
+(connect_or_start_mseq, process_folder, close).
+
+Protocol: one JSON object per line over a localhost TCP connection.
+Requests are {"token": ..., "op": ..., "args": {...}} and replies are
+{"ok": true, "result": ...} or {"ok": false, "error": ...}. Ops are ping,
+status, connect, process_folder, close (closes mSeq, the server keeps
+running) and shutdown. Clients are served one at a time, the same way mSeq
+can only process one folder at a time; a client that is not answered within
+its busy timeout gets AutomationServerBusy and can drive mSeq itself.
+
+The address and token are published in config.AUTOMATION_SERVER_FILE.
+
+Example (headless stub worker, runs anywhere):
+    python -m mseqauto.core.automation_server --simulator --latency 0.5
+"""
+import argparse
+import json
+import logging
+import os
+import secrets
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+
+class AutomationServerError(Exception):
+    """The server could not be reached or rejected a request"""
+
+
+class AutomationServerBusy(AutomationServerError):
+    """The server is serving another client and did not answer in time"""
+
+
+def _send(sock_file, message):
+    sock_file.write(json.dumps(message).encode('utf-8') + b'\n')
+    sock_file.flush()
+
+
+def _receive(sock_file):
+    line = sock_file.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def read_session_file(path):
+    """Return the published server details, or None if there is no usable file"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            session = json.load(f)
+        return session if {'host', 'port', 'token', 'pid'} <= set(session) else None
+    except (OSError, ValueError):
+        return None
+
+
+class AutomationServer:
+    """Serve one automation object (MseqAutomation or MseqSimulator) to local clients"""
+
+    def __init__(self, automation, session_file, host='127.0.0.1', port=0, idle_timeout=4 * 3600,
+                 logger=None):
+        self.automation = automation
+        self.session_file = Path(session_file)
+        self.idle_timeout = idle_timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.token = secrets.token_hex(16)
+        self.started = time.time()
+        self.stats = {'clients': 0, 'requests': 0, 'folders_processed': 0, 'folders_failed': 0}
+        self.current_folder = None
+        self._running = False
+
+        self._socket = socket.create_server((host, port))
+        self.host, self.port = self._socket.getsockname()[:2]
+
+    def publish(self):
+        """Write the session file other processes use to find the server"""
+        self.session_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.session_file.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'host': self.host, 'port': self.port, 'token': self.token, 'pid': os.getpid(),
+                       'python': sys.executable, 'started': self.started}, f)
+        os.replace(tmp_path, self.session_file)
+
+    def unpublish(self):
+        session = read_session_file(self.session_file)
+        if session and session['pid'] == os.getpid():
+            try:
+                self.session_file.unlink()
+            except OSError:
+                pass
+
+    def status(self):
+        return {
+            'pid': os.getpid(),
+            'python': sys.executable,
+            'bits': 64 if sys.maxsize > 2 ** 32 else 32,
+            'automation': type(self.automation).__name__,
+            'uptime': time.time() - self.started,
+            'folder': self.current_folder,
+            **self.stats
+        }
+
+    def handle(self, request):
+        """Run one request and return the reply"""
+        if not isinstance(request, dict) or request.get('token') != self.token:
+            return {'ok': False, 'error': 'invalid token'}
+        op = request.get('op')
+        args = request.get('args') or {}
+        self.stats['requests'] += 1
+
+        try:
+            if op == 'ping':
+                result = True
+            elif op == 'status':
+                result = self.status()
+            elif op == 'connect':
+                self.automation.connect_or_start_mseq()
+                result = True
+            elif op == 'process_folder':
+                self.current_folder = args['folder']
+                try:
+                    result = bool(self.automation.process_folder(args['folder']))
+                finally:
+                    self.current_folder = None
+                self.stats['folders_processed' if result else 'folders_failed'] += 1
+            elif op == 'close':
+                self.automation.close()
+                result = True
+            elif op == 'shutdown':
+                self._running = False
+                result = True
+            else:
+                return {'ok': False, 'error': f"unknown op {op!r}"}
+        except Exception as e:
+            self.logger.error(f"Automation server {op} failed: {e}")
+            return {'ok': False, 'error': str(e)}
+        return {'ok': True, 'result': result}
+
+    def _serve_client(self, conn):
+        self.stats['clients'] += 1
+        with conn, conn.makefile('rwb') as sock_file:
+            while self._running:
+                try:
+                    request = _receive(sock_file)
+                except ValueError:
+                    _send(sock_file, {'ok': False, 'error': 'malformed request'})
+                    continue
+                if request is None:
+                    return
+                reply = self.handle(request)
+                _send(sock_file, reply)
+                if reply.get('error') == 'invalid token':
+                    return
+
+    def serve_forever(self):
+        """Serve clients until shutdown or idle_timeout seconds without a client"""
+        self._running = True
+        self.publish()
+        self.logger.info(f"Automation server listening on {self.host}:{self.port} (pid {os.getpid()})")
+        if self.idle_timeout:
+            self._socket.settimeout(self.idle_timeout)
+        try:
+            while self._running:
+                try:
+                    conn, _ = self._socket.accept()
+                except socket.timeout:
+                    self.logger.info("Automation server idle, shutting down")
+                    break
+                conn.settimeout(None)
+                try:
+                    self._serve_client(conn)
+                except OSError as e:
+                    self.logger.warning(f"Automation client connection lost: {e}")
+        finally:
+            self._socket.close()
+            self.unpublish()
+            try:
+                self.automation.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing automation: {e}")
+
+
+class AutomationClient:
+    """
+    Talks to an AutomationServer; usable wherever an MseqAutomation is expected
+
+    close() closes mSeq in the server and disconnects, so the server is free
+    for other scripts; the next call reconnects, as the next process_folder
+    after MseqAutomation.close() starts mSeq again.
+
+    timeout bounds every reply (None waits as long as mSeq takes). ping()
+    waits at most busy_timeout seconds, since the server only answers once
+    it is done with its current client.
+    """
+
+    def __init__(self, host, port, token, timeout=None, busy_timeout=5):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+        self.busy_timeout = busy_timeout
+        self._socket = None
+        self._file = None
+        self._connect()
+
+    def _connect(self):
+        self._socket = socket.create_connection((self.host, self.port), timeout=10)
+        self._socket.settimeout(self.timeout)
+        self._file = self._socket.makefile('rwb')
+
+    @classmethod
+    def from_session_file(cls, path, timeout=None, busy_timeout=5):
+        session = read_session_file(path)
+        if session is None:
+            raise AutomationServerError(f"No automation server session in {path}")
+        try:
+            return cls(session['host'], session['port'], session['token'], timeout=timeout,
+                       busy_timeout=busy_timeout)
+        except OSError as e:
+            raise AutomationServerError(f"Automation server not reachable: {e}") from e
+
+    def call(self, op, **args):
+        return self._call(op, args, self.timeout)
+
+    def _call(self, op, args, timeout):
+        try:
+            if self._file is None:
+                self._connect()
+            self._socket.settimeout(timeout)
+            _send(self._file, {'token': self.token, 'op': op, 'args': args})
+            reply = _receive(self._file)
+        except socket.timeout as e:
+            # The reply may still come, so this connection is no longer in step
+            self.disconnect()
+            if op == 'ping':
+                raise AutomationServerBusy(f"Automation server busy: no reply within {timeout} seconds") from e
+            raise AutomationServerError(f"Automation server {op} timed out: {e}") from e
+        except (OSError, ValueError) as e:
+            raise AutomationServerError(f"Automation server {op} failed: {e}") from e
+        if reply is None:
+            raise AutomationServerError(f"Automation server closed the connection during {op}")
+        if not reply.get('ok'):
+            raise AutomationServerError(reply.get('error', 'unknown error'))
+        return reply['result']
+
+    def ping(self):
+        """True once the server answers; AutomationServerBusy if it is serving someone else"""
+        return self._call('ping', {}, self.busy_timeout)
+
+    def status(self):
+        return self.call('status')
+
+    def connect_or_start_mseq(self):
+        return self.call('connect')
+
+    def process_folder(self, folder_path):
+        return self.call('process_folder', folder=str(folder_path))
+
+    def close(self):
+        """Close mSeq in the server and disconnect"""
+        try:
+            self.call('close')
+        finally:
+            self.disconnect()
+
+    def shutdown(self):
+        """Stop the server process"""
+        try:
+            self.call('shutdown')
+        finally:
+            self.disconnect()
+
+    def disconnect(self):
+        for closeable in (self._file, self._socket):
+            if closeable is None:
+                continue
+            try:
+                closeable.close()
+            except OSError:
+                pass
+        self._file = self._socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.disconnect()
+
+
+def automation_python(config):
+    """Interpreter for the server: the 32-bit venv's python if present, else PYTHON32_PATH"""
+    venv_python = Path(config.VENV32_PATH) / "Scripts" / "python.exe"
+    return str(venv_python if venv_python.exists() else config.PYTHON32_PATH)
+
+
+def connect_automation_server(config, logger=None, start=True, simulator=False, start_timeout=30):
+    """
+    Connect to the session's automation server, starting it if needed
+
+    Returns:
+        AutomationClient: Connected client
+    Raises:
+        AutomationServerBusy: If the running server is serving another script
+        AutomationServerError: If no server could be reached or started
+    """
+    logger = logger or logging.getLogger(__name__)
+    session_file = Path(config.AUTOMATION_SERVER_FILE)
+    busy_timeout = getattr(config, 'AUTOMATION_SERVER_BUSY_TIMEOUT', 5)
+
+    try:
+        client = AutomationClient.from_session_file(session_file, busy_timeout=busy_timeout)
+        client.ping()
+        return client
+    except AutomationServerBusy:
+        raise
+    except AutomationServerError:
+        if not start:
+            raise
+
+    python = sys.executable if simulator else automation_python(config)
+    cmd = [python, '-m', 'mseqauto.core.automation_server', '--session-file', str(session_file),
+           '--idle-timeout', str(config.AUTOMATION_SERVER_IDLE_TIMEOUT)]
+    if simulator:
+        cmd.append('--simulator')
+    logger.info(f"Starting automation server: {python}")
+
+    kwargs = {}
+    if os.name == 'nt':
+        kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+    else:
+        kwargs['start_new_session'] = True
+    previous = read_session_file(session_file)
+    process = subprocess.Popen(cmd, cwd=str(Path(__file__).parents[2]), stdin=subprocess.DEVNULL,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **kwargs)
+
+    deadline = time.time() + start_timeout
+    while time.time() < deadline:
+        session = read_session_file(session_file)
+        if session and session != previous and session['pid'] == process.pid:
+            client = AutomationClient(session['host'], session['port'], session['token'],
+                                      busy_timeout=busy_timeout)
+            client.ping()
+            return client
+        if process.poll() is not None:
+            raise AutomationServerError(f"Automation server exited with code {process.returncode}")
+        time.sleep(0.05)
+    process.kill()
+    raise AutomationServerError(f"Automation server did not start within {start_timeout} seconds")
+
+
+def create_ui_automation(config, logger=None):
+    """
+    MseqAutomation in 32-bit Python, otherwise a client of the session's automation server
+
+    With USE_AUTOMATION_SERVER off, or while the server is busy with another
+    script, a 64-bit interpreter gets a local MseqAutomation, as before.
+    """
+    if sys.maxsize > 2 ** 32 and getattr(config, 'USE_AUTOMATION_SERVER', False):
+        try:
+            return connect_automation_server(config, logger)
+        except AutomationServerBusy as e:
+            (logger or logging.getLogger(__name__)).warning(f"{e}; driving mSeq from this process")
+    from mseqauto.core.ui_automation import MseqAutomation  # type: ignore
+    return MseqAutomation(config, logger)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve mSeq automation to MseqAuto scripts")
+    parser.add_argument('--session-file', help="Where to publish the address (default: config)")
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--idle-timeout', type=float, help="Seconds without a client before exiting")
+    parser.add_argument('--simulator', action='store_true', help="Serve MseqSimulator instead of mSeq")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated seconds per folder")
+    args = parser.parse_args(argv)
+
+    from mseqauto.config import MseqConfig  # type: ignore
+    from mseqauto.utils.logger import setup_logger  # type: ignore
+    config = MseqConfig()
+    logger = setup_logger("automation_server", log_dir=Path(__file__).resolve().parents[1] / "scripts" / "logs")
+
+    if args.simulator:
+        from mseqauto.core.mseq_simulator import MseqSimulator  # type: ignore
+        automation = MseqSimulator(config, logger=logger, latency=args.latency)
+    else:
+        from mseqauto.core.ui_automation import MseqAutomation  # type: ignore
+        automation = MseqAutomation(config, logger)
+
+    idle_timeout = config.AUTOMATION_SERVER_IDLE_TIMEOUT if args.idle_timeout is None else args.idle_timeout
+    server = AutomationServer(automation, args.session_file or config.AUTOMATION_SERVER_FILE,
+                              port=args.port, idle_timeout=idle_timeout, logger=logger)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# destination_resolver.py
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+from mseqauto.utils.logger import LevelLogger  # type: ignore
+
+
+class DestinationResolver:
+    """
+    Memoized PCR, BioI and order destination folders for one sorting run
+
+    Each base folder is listed once and PCR folders are looked up in that
+    listing; every resolved path is remembered and created at most once, so
+    sorting a file no longer lists the day folder or stats the share. The
+    run is assumed to own the destinations: folders the run itself removes,
+    moves or renames are dropped with forget(), and a folder created or
+    removed by someone else while it sorts is only noticed after invalidate().
+    """
+
+    def __init__(self, file_dao, logger=None):
+        self.file_dao = file_dao
+        levels = LevelLogger(logger, name=__name__)
+        self.log = levels.info
+        self.debug = levels.debug
+        self._lock = threading.RLock()
+        self._listings = {}   # base folder -> [subfolder names] in directory order
+        self._pcr = {}        # (base folder, PCR number) -> path
+        self._folders = {}    # normalized path -> path, folders known to exist
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(str(path)))
+
+    def invalidate(self):
+        """Forget every listing and resolved folder"""
+        with self._lock:
+            self._listings.clear()
+            self._pcr.clear()
+            self._folders.clear()
+
+    def forget(self, *folder_paths):
+        """
+        Forget folders that were removed, moved or renamed
+
+        Drops each folder, everything resolved inside it, and the listing of
+        its parent, so the next lookup looks at the disk again.
+        """
+        if not folder_paths:
+            return
+        keys = {self._key(path) for path in folder_paths}
+        inside = tuple(key + os.sep for key in keys)
+        parents = {os.path.dirname(key) for key in keys}
+
+        def gone(key):
+            return key in keys or key.startswith(inside)
+
+        with self._lock:
+            for key in [key for key in self._folders if gone(key)]:
+                del self._folders[key]
+            for key in [key for key in self._listings if key in parents or gone(key)]:
+                del self._listings[key]
+            for memo_key, folder in list(self._pcr.items()):
+                if memo_key[0] in parents or gone(memo_key[0]) or gone(self._key(folder)):
+                    del self._pcr[memo_key]
+
+    def _subfolders(self, base_path):
+        key = self._key(base_path)
+        names = self._listings.get(key)
+        if names is None:
+            try:
+                with os.scandir(base_path) as entries:
+                    names = [entry.name for entry in entries if entry.is_dir()]
+            except OSError:
+                names = []
+            self._listings[key] = names
+            self.debug("Indexed %d folders in %s", len(names), base_path)
+        return names
+
+    def ensure_folder(self, folder_path, parents=False):
+        """Create a folder unless this run already created or saw it; returns the path as str"""
+        key = self._key(folder_path)
+        if key in self._folders:
+            return self._folders[key]
+        with self._lock:
+            if key not in self._folders:
+                path = Path(folder_path)
+                if not path.exists():
+                    path.mkdir(parents=parents, exist_ok=True)
+                    self.log(f"Created folder: {path}")
+                    parent_names = self._listings.get(self._key(path.parent))
+                    if parent_names is not None:
+                        parent_names.append(path.name)
+                self._folders[key] = str(path)
+            return self._folders[key]
+
+    def pcr_folder(self, pcr_number, base_path):
+        """
+        PCR folder for a PCR number in base_path, created as FB-PCR<n> if none exists
+
+        Any folder whose name contains PCR<n> matches; one with an order
+        number (PCR<n>_<order>) is preferred over the first match.
+        """
+        memo_key = (self._key(base_path), str(pcr_number))
+        folder = self._pcr.get(memo_key)
+        if folder is not None:
+            return folder
+
+        with self._lock:
+            folder = self._pcr.get(memo_key)
+            if folder is not None:
+                return folder
+
+            pcr_pattern = re.compile(f'pcr{pcr_number}', re.IGNORECASE)
+            order_pattern = re.compile(f'pcr{pcr_number}_\\d+', re.IGNORECASE)
+            found = [name for name in self._subfolders(base_path) if pcr_pattern.search(name.lower())]
+            with_order = [name for name in found if order_pattern.search(name.lower())]
+
+            if with_order:
+                folder = str(Path(base_path) / with_order[0])
+                self.log(f"Found PCR folder with order number: {folder}")
+            elif found:
+                folder = str(Path(base_path) / found[0])
+                self.log(f"Found PCR folder: {folder}")
+            else:
+                folder = str(Path(base_path) / f"FB-PCR{pcr_number}")
+                self.log(f"Creating new PCR folder: {folder}")
+                self.file_dao.create_folder_if_not_exists(folder)
+                self._subfolders(base_path).append(Path(folder).name)
+
+            self._folders[self._key(folder)] = folder
+            self._pcr[memo_key] = folder
+            return folder
+
+    def bioi_folder(self, i_num, data_folder):
+        """Clean BioI-<n> folder in the data folder, created if needed"""
+        return self.ensure_folder(Path(data_folder) / f"BioI-{i_num}", parents=True)
+
+    def order_folder(self, i_num, acct_name, order_num, bioi_folder):
+        """BioI-<n>_<account>_<order> folder inside its BioI folder, created if needed"""
+        return self.ensure_folder(Path(bioi_folder) / f"BioI-{i_num}_{acct_name}_{order_num}", parents=True)
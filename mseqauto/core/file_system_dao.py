@@ -5,41 +5,172 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parents[2]))
 
 import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from shutil import move, copyfile
+from shutil import move, copyfile, copy2, copyfileobj
 from zipfile import ZipFile, ZIP_DEFLATED
 from mseqauto.config import MseqConfig  # type: ignore
+from mseqauto.core.filename_classifier import ABI_TRANSLATION  # type: ignore
+from mseqauto.core.folder_status import scan_folder_status  # type: ignore
+from mseqauto.core.zip_manifest import ManifestUnavailable, diff_manifest, manifest_comment, read_manifest, source_entries  # type: ignore
+from mseqauto.utils.instrumentation import count, timed  # type: ignore
+from mseqauto.utils.logger import LevelLogger  # type: ignore
 
 config = MseqConfig()
 
+
+def same_volume(path_a, path_b):
+    """True if two existing paths are on the same volume, so one can be hardlinked next to the other"""
+    try:
+        return os.stat(path_a).st_dev == os.stat(path_b).st_dev
+    except OSError:
+        return False
+
+
+class _TeeWriter:
+    """
+    Seekable binary writer that writes every byte to two files
+
+    ZipFile seeks back to patch local headers, so both files get the same
+    seeks and writes and end up identical. An error on the second file only
+    stops the tee (recorded in secondary_error); the first is always written.
+    """
+
+    def __init__(self, primary, secondary):
+        self.primary = primary
+        self.secondary = secondary
+        self.secondary_error = None
+
+    def _secondary(self, method, *args):
+        if self.secondary_error is None:
+            try:
+                getattr(self.secondary, method)(*args)
+            except OSError as e:
+                self.secondary_error = e
+
+    def write(self, data):
+        self._secondary('write', data)
+        return self.primary.write(data)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self._secondary('seek', offset, whence)
+        return self.primary.seek(offset, whence)
+
+    def tell(self):
+        return self.primary.tell()
+
+    def seekable(self):
+        return True
+
+    def flush(self):
+        self._secondary('flush')
+        self.primary.flush()
+
+
+class _ZipOutput:
+    """
+    Context manager behind FileSystemDAO.open_zip_output
+
+    The zip (and a teed dump copy) is written to a temp file next to its
+    target and replaces it only once the write has finished, so a failed
+    write leaves the previous zip, and any dump entry hardlinked to it, whole.
+    """
+
+    def __init__(self, file_dao, zip_path, dump_folder):
+        self.file_dao = file_dao
+        self.zip_path = str(zip_path)
+        self.dump_folder = dump_folder
+        self.dump_path = None
+        self._temp_path = None
+        self._dump_temp_path = None
+        self._tee = None
+        self._files = []
+
+    @staticmethod
+    def _open_temp(target):
+        fd, temp_path = tempfile.mkstemp(prefix=".write_", suffix=".zip", dir=Path(target).parent)
+        return os.fdopen(fd, 'wb'), temp_path
+
+    def __enter__(self):
+        primary, self._temp_path = self._open_temp(self.zip_path)
+        self._files.append(primary)
+        if self.dump_folder is None or getattr(self.file_dao.config, 'ZIP_DUMP_DELIVERY', 'copy') != 'auto':
+            return primary
+        try:
+            dump_path = self.file_dao._dump_path(self.zip_path, self.dump_folder)
+            if same_volume(Path(self.zip_path).parent, dump_path.parent):
+                return primary   # hardlinked on exit
+            secondary, self._dump_temp_path = self._open_temp(dump_path)
+        except OSError as e:
+            self.file_dao.debug("Cannot write the zip dump copy directly, will copy: %s", e)
+            return primary
+        self._files.append(secondary)
+        self.dump_path = dump_path
+        self._tee = _TeeWriter(primary, secondary)
+        return self._tee
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def __exit__(self, exc_type, exc, tb):
+        failed = exc_type is not None
+        try:
+            for f in self._files:
+                try:
+                    f.close()
+                except OSError as e:
+                    if f is self._files[0] or self._tee is None:
+                        raise
+                    self._tee.secondary_error = self._tee.secondary_error or e
+            if not failed:
+                os.replace(self._temp_path, self.zip_path)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            if failed:
+                # Never leave a partial zip beside the old one or in the dump folder
+                self._remove(self._temp_path)
+                if self._dump_temp_path is not None:
+                    self._remove(self._dump_temp_path)
+        if failed:
+            return False
+        count("fs.zip_bytes_written", os.path.getsize(self.zip_path))
+        if self._tee is not None and self._tee.secondary_error is None:
+            os.replace(self._dump_temp_path, self.dump_path)
+            count("fs.dump_bytes_written", os.path.getsize(self.dump_path))
+        elif self.dump_folder is not None:
+            if self._tee is not None:
+                self.file_dao.warning(f"Writing the zip dump copy failed, copying instead: {self._tee.secondary_error}")
+                self._remove(self._dump_temp_path)
+            self.file_dao.deliver_zip(self.zip_path, self.dump_folder)
+        return False
+
+
 class FileSystemDAO:
+    # Network shares can report directory mtimes with ~2s resolution
+    STATUS_MTIME_GRANULARITY_NS = 2_000_000_000
+
     def __init__(self, config, logger=None):
         self.config = config
         self.directory_cache = {}
-
-        # Create a unified logging interface with support for different levels
-        import logging
-        if logger is None:
-            # No logger provided, use default
-            self._logger = logging.getLogger(__name__)
-            self.log = self._logger.info
-            self.debug = self._logger.debug
-            self.warning = self._logger.warning
-            self.error = self._logger.error
-        elif isinstance(logger, logging.Logger):
-            # It's a Logger object
-            self._logger = logger
-            self.log = logger.info
-            self.debug = logger.debug
-            self.warning = logger.warning
-            self.error = logger.error
-        else:
-            # Assume it's a callable function - in this case, we don't have level differentiation
-            self._logger = None
-            self.log = logger
-            self.debug = logger
-            self.warning = logger
-            self.error = logger
+        self.folder_status_cache = {}
+        # Folders may be sorted on several threads (FolderProcessor.sort_ind_folders)
+        self._cache_lock = threading.Lock()
+
+        # Level-aware logging for a Logger, a bound method such as logger.info, or a plain callable
+        levels = LevelLogger(logger, name=__name__)
+        self._logger = levels.logger
+        self.log = levels.info
+        self.debug = levels.debug
+        self.warning = levels.warning
+        self.error = levels.error
 
         # Precompiled regex patterns
         self.regex_patterns = {
@@ -56,21 +187,51 @@ class FileSystemDAO:
         }
 
     # Directory Operations
+    @timed()
     def get_directory_contents(self, path, refresh=False):
         """Get directory contents with caching"""
         path = Path(path)  # Convert to Path object
 
-        if path not in self.directory_cache or refresh:
-            if not path.exists():  # Remove duplicate parameter
-                self.directory_cache[path] = []
-                return []
+        with self._cache_lock:
+            contents = self.directory_cache.get(path)
+        if contents is not None and not refresh:
+            return contents
+
+        contents = []
+        if path.exists():
             try:
                 contents = list(path.iterdir())
-                self.directory_cache[path] = contents
             except Exception as e:
                 print(f"Error reading directory {path}: {e}")
-                self.directory_cache[path] = []
-        return self.directory_cache[path]
+        with self._cache_lock:
+            self.directory_cache[path] = contents
+        return contents
+
+    def get_folder_status(self, folder_path, refresh=False):
+        """
+        Get a FolderStatus snapshot for a folder, cached until the folder changes
+
+        A cached snapshot is reused while the folder's mtime is unchanged, so
+        repeated status checks cost one stat instead of a full listing. Snapshots
+        taken within STATUS_MTIME_GRANULARITY_NS of the last change are rescanned,
+        since a coarse timestamp could hide a file added in the same tick.
+        """
+        key = str(folder_path)
+        with self._cache_lock:
+            cached = self.folder_status_cache.get(key)
+        if cached is not None and cached.exists and not refresh:
+            try:
+                mtime_ns = os.stat(key).st_mtime_ns
+                if (mtime_ns == cached.mtime_ns and
+                        cached.scanned_ns - mtime_ns > self.STATUS_MTIME_GRANULARITY_NS):
+                    return cached
+            except OSError:
+                pass
+
+        status = scan_folder_status(key, self.config)
+        with self._cache_lock:
+            self.folder_status_cache[key] = status
+        return status
 
     def get_folders(self, path, pattern=None): #KEEP
         """
@@ -119,6 +280,7 @@ class FileSystemDAO:
         self.log(f"Returning {len(folder_list)} matching folders: {[f.name for f in folder_list]}")  # Changed from print to self.log
         return folder_list
 
+    @timed()
     def get_files_by_extension(self, folder_path_str, extension, recursive=False):
         """
         Get all files with a specific extension in a folder
@@ -163,6 +325,7 @@ class FileSystemDAO:
             path.mkdir()
         return str(path)
 
+    @timed()
     def move_folder(self, source, destination, max_retries=3, delay=0.1):
         """
         Move folder with proper error handling and retries
@@ -191,6 +354,7 @@ class FileSystemDAO:
             try:
                 # Use shutil.move for the actual move operation
                 shutil.move(str(source_path), str(destination_path))
+                count("fs.folders_moved")
                 self.log(f"Successfully moved {source_path.name} to {destination_path}")
                 return True
 
@@ -270,25 +434,7 @@ class FileSystemDAO:
     def adjust_abi_chars(self, file_name):
         #move to path_utilities.py
         """Adjust characters in file name to match ABI naming conventions"""
-        # Create translation table
-        translation_table = str.maketrans({
-            ' ': '',
-            '+': '&',
-            '*': '-',
-            '|': '-',
-            '/': '-',
-            '\\': '-',
-            ':': '-',
-            '"': '',
-            "'": '',
-            '<': '-',
-            '>': '-',
-            '?': '',
-            ',': ''
-        })
-
-        # Apply translation
-        return file_name.translate(translation_table)
+        return file_name.translate(ABI_TRANSLATION)
 
     def extract_order_number_from_filename(self, filename):
         """Extract order number from filename braces if present"""
@@ -351,38 +497,207 @@ class FileSystemDAO:
     #################### Zip operations ####################
     def check_for_zip(self, folder_path):
         #Keep
-        """Check if folder contains any zip files"""
-        folder_path_obj = Path(folder_path)
-        for item in self.get_directory_contents(folder_path):
-            file_path = folder_path_obj / item
-            if file_path.is_file() and item.name.endswith(self.config.ZIP_EXTENSION):
-                return True
-        return False
+        """Check if folder contains any zip files (FolderProcessor.check_for_zip also checks they are current)"""
+        return bool(self.get_folder_status(folder_path).zip_files)
 
-    def zip_files(self, source_folder: str, zip_path: str, file_extensions=None, exclude_extensions=None):
+    @timed()
+    def zip_files(self, source_folder: str, zip_path: str, file_extensions=None, exclude_extensions=None,
+                  dump_folder=None):
         #Keep
         """Create a zip file from files in source_folder matching extensions
         
         Only includes files from the root directory of source_folder.
         Files in subdirectories (like 'Alternate Injections') are automatically excluded.
+
+        With a dump_folder the zip is also delivered there (see deliver_zip), so
+        callers must not copy it again. With ZIP_LOCAL_STAGING the zip is built
+        locally first (see _zip_files_staged).
+
+        The zip carries a member manifest (see zip_manifest). If zip_path already
+        has one, an unchanged folder is left alone, new files are appended, and
+        only replaced or removed files make it rebuild the zip.
         """
+        # mSeq or sorting may have changed the folder since it was last listed
+        self.get_directory_contents(source_folder, refresh=True)
+        members = [file_path for file_path in self.zip_members(source_folder, file_extensions, exclude_extensions)
+                   if file_path.name != Path(zip_path).name]
+        sources = source_entries(members)
+
+        if os.path.exists(zip_path):
+            try:
+                manifest = read_manifest(zip_path)
+            except ManifestUnavailable as e:
+                self.log(f"Rebuilding {Path(zip_path).name}: {e}")
+                manifest = None
+            if manifest is not None:
+                diff = diff_manifest(manifest, sources)
+                if diff.current:
+                    self.debug("Zip is up to date: %s", Path(zip_path).name)
+                    if dump_folder is not None and not (Path(dump_folder) / Path(zip_path).name).exists():
+                        self.deliver_zip(zip_path, dump_folder)
+                    return True
+                if diff.append_only:
+                    return self._append_to_zip(zip_path, members, diff.added, sources, dump_folder)
+                self.log(f"Rebuilding {Path(zip_path).name}: {len(diff.changed)} replaced, "
+                         f"{len(diff.removed)} removed, {len(diff.added)} new files")
+
+        if getattr(self.config, 'ZIP_LOCAL_STAGING', False):
+            return self._zip_files_staged(members, zip_path, dump_folder, sources)
+
+        with self.open_zip_output(zip_path, dump_folder) as output:
+            with ZipFile(output, 'w') as zip_file:
+                for file_path in members:
+                    zip_file.write(file_path, arcname=file_path.name, compress_type=ZIP_DEFLATED)
+                    count("fs.files_zipped")
+                zip_file.comment = manifest_comment(zip_file, sources)
+
+        return True
+
+    def zip_members(self, source_folder, file_extensions=None, exclude_extensions=None):
+        """Files zip_files would put in a zip of source_folder (root files only)"""
         source_folder_path = Path(source_folder)
-        with ZipFile(zip_path, 'w') as zip_file:
-            for item in self.get_directory_contents(source_folder):
-                file_path = source_folder_path / item
-                # Skip directories - only process files in the root directory
-                if not file_path.is_file():
-                    continue
-                if file_extensions and not any(item.name.endswith(ext) for ext in file_extensions):
-                    continue
+        members = []
+        for item in self.get_directory_contents(source_folder):
+            file_path = source_folder_path / item
+            # Skip directories - only process files in the root directory
+            if not file_path.is_file():
+                continue
+            if file_extensions and not any(item.name.endswith(ext) for ext in file_extensions):
+                continue
 
-                if exclude_extensions and any(item.name.endswith(ext) for ext in exclude_extensions):
-                    continue
+            if exclude_extensions and any(item.name.endswith(ext) for ext in exclude_extensions):
+                continue
+            members.append(file_path)
+        return members
+
+    def zip_is_current(self, source_folder, zip_path, file_extensions=None, exclude_extensions=None):
+        """
+        True if zip_path exists and still matches the folder
+
+        Zips without a manifest count as current, so older zips are never
+        rebuilt just for lacking one; unreadable zips and zips that no longer
+        match their manifest do not.
+        """
+        if not os.path.exists(zip_path):
+            return False
+        try:
+            manifest = read_manifest(zip_path)
+        except ManifestUnavailable as e:
+            self.debug("Zip %s is stale: %s", Path(zip_path).name, e)
+            return False
+        if manifest is None:
+            return True
+        self.get_directory_contents(source_folder, refresh=True)
+        members = [file_path for file_path in self.zip_members(source_folder, file_extensions, exclude_extensions)
+                   if file_path.name != Path(zip_path).name]
+        return diff_manifest(manifest, source_entries(members)).current
+
+    def _append_to_zip(self, zip_path, members, added, sources, dump_folder=None):
+        """
+        Add new files to a zip and refresh its manifest
+
+        The append goes to a copy next to the zip, which then replaces it, so
+        the zip (and a dump entry hardlinked to it) is never seen half-appended
+        and a failed append leaves both as they were.
+        """
+        added = set(added)
+        fd, temp_path = tempfile.mkstemp(prefix=".append_", suffix=".zip", dir=Path(zip_path).parent)
+        os.close(fd)
+        try:
+            copyfile(zip_path, temp_path)
+            with ZipFile(temp_path, 'a') as zip_file:
+                for file_path in members:
+                    if file_path.name in added:
+                        zip_file.write(file_path, arcname=file_path.name, compress_type=ZIP_DEFLATED)
+                        count("fs.files_appended")
+                zip_file.comment = manifest_comment(zip_file, sources)
+            os.replace(temp_path, zip_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        self.log(f"Added {len(added)} new files to {Path(zip_path).name}")
+        if dump_folder is not None:
+            self.deliver_zip(zip_path, dump_folder)
+        return True
+
+    @timed()
+    def _zip_files_staged(self, members, zip_path, dump_folder=None, sources=None):
+        """
+        Build a zip in a local temp folder and upload it in one sequential write
 
-                zip_file.write(file_path, arcname=item.name, compress_type=ZIP_DEFLATED)
+        The members are copied from the share concurrently (ZIP_STAGING_WORKERS
+        threads, copy2 keeps the mtimes the zip entries are dated with), zipped
+        from local disk, and the finished zip is streamed to zip_path (and the
+        dump folder) in large blocks. The temp folder is always removed, and a
+        failed upload leaves whatever zip was already at zip_path.
+        """
+        workers = max(1, int(getattr(self.config, 'ZIP_STAGING_WORKERS', 8)))
+        with tempfile.TemporaryDirectory(prefix="mseqauto_zip_", dir=getattr(self.config, 'ZIP_STAGING_DIR', None)) as staging:
+            staging_path = Path(staging)
+            (staging_path / "members").mkdir()
+            local_members = [staging_path / "members" / file_path.name for file_path in members]
+            with ThreadPoolExecutor(max_workers=min(workers, len(members) or 1)) as executor:
+                # list() re-raises the first failed copy
+                list(executor.map(copy2, members, local_members))
+            count("fs.files_staged", len(members))
+
+            local_zip = staging_path / Path(zip_path).name
+            with ZipFile(local_zip, 'w') as zip_file:
+                for local_path in local_members:
+                    zip_file.write(local_path, arcname=local_path.name, compress_type=ZIP_DEFLATED)
+                    count("fs.files_zipped")
+                zip_file.comment = manifest_comment(zip_file, sources if sources is not None else source_entries(members))
+
+            with self.open_zip_output(zip_path, dump_folder) as output, open(local_zip, 'rb') as source:
+                copyfileobj(source, output, 1024 * 1024)
 
         return True
 
+    def open_zip_output(self, zip_path, dump_folder=None):
+        """
+        Context manager giving the binary file a new zip is written to
+
+        Without a dump folder it is just zip_path. With one, the zip reaches the
+        dump folder as part of the write: ZIP_DUMP_DELIVERY 'auto' tees the
+        stream into the dump copy when the dump folder is on another volume,
+        and otherwise hardlinks (or, failing that, copies) the finished zip.
+        """
+        return _ZipOutput(self, zip_path, dump_folder)
+
+    def _dump_path(self, zip_path, dump_folder):
+        dump_folder_path = Path(dump_folder)
+        if not dump_folder_path.exists():
+            dump_folder_path.mkdir(parents=True)
+        return dump_folder_path / Path(zip_path).name
+
+    def deliver_zip(self, zip_path, dump_folder):
+        """
+        Put a finished zip into the dump folder without writing it twice where possible
+
+        Hardlinks the dump entry when the dump folder is on the same volume and
+        ZIP_DUMP_DELIVERY is 'auto'; copies it otherwise or if linking fails.
+        An existing dump entry of the same name is replaced.
+        """
+        dest_path = self._dump_path(zip_path, dump_folder)
+        if getattr(self.config, 'ZIP_DUMP_DELIVERY', 'copy') == 'auto' and same_volume(zip_path, dest_path.parent):
+            try:
+                if dest_path.exists():
+                    dest_path.unlink()
+                os.link(zip_path, dest_path)
+                count("fs.dump_hardlinks")
+                self.debug("Hardlinked %s into the zip dump", dest_path.name)
+                return str(dest_path)
+            except OSError as e:
+                self.debug("Hardlink into the zip dump failed, copying %s: %s", dest_path.name, e)
+
+        copyfile(zip_path, dest_path)
+        count("fs.dump_bytes_written", os.path.getsize(dest_path))
+        return str(dest_path)
+
+    @timed()
     def get_zip_contents(self, zip_path):
         #Keep
         """Get list of files in a zip archive"""
@@ -393,16 +708,11 @@ class FileSystemDAO:
             print(f"Error reading zip file {zip_path}: {e}")
             return []
 
+    @timed()
     def copy_zip_to_dump(self, zip_path, dump_folder):
         #Keep
-        """Copy zip file to dump folder"""
-        dump_folder_path = Path(dump_folder)
-        if not dump_folder_path.exists():
-            dump_folder_path.mkdir(parents=True)
-
-        dest_path = dump_folder_path / Path(zip_path).name
-        copyfile(zip_path, dest_path)
-        return str(dest_path)
+        """Copy zip file to dump folder (hardlinked instead when possible, see deliver_zip)"""
+        return self.deliver_zip(zip_path, dump_folder)
 
     def find_recent_zips(self, folder_path, max_age_minutes=15):
         """
@@ -884,11 +1194,13 @@ class FileSystemDAO:
         return i_numbers, matching_folders
 
     #################### File Operations ####################
+    @timed()
     def move_file(self, source, destination):
         #Keep
         """Move a file with error handling"""
         try:
             move(source, destination)
+            count("fs.files_moved")
             return True
         except Exception as e:
             print(f"Error moving file {source}: {e}")
@@ -0,0 +1,205 @@
+# filename_classifier.py
+import os
+import re
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+# Result codes, one byte per name
+KIND_OTHER = 0
+KIND_PCR = 1
+KIND_BLANK = 2
+KIND_CONTROL = 3
+KIND_CROSS_PLATE = 4
+KIND_BRACES = 5
+
+KIND_NAMES = ('other', 'pcr', 'blank', 'control', 'cross', 'braces')
+
+# Plate run controls, matched anywhere in the lowercased file name
+PLATE_SORT_CONTROLS = (
+    'pgem_m13f-20',
+    'pgem_m13r-27',
+    'pgem_t7promoter',
+    'pgem_sp6promoter',
+    'water_m13f-20',
+    'water_m13r-27',
+    'water_t7promoter',
+    'water_sp6promoter'
+)
+
+# Characters ABI replaces or drops when it writes sample names
+ABI_TRANSLATION = str.maketrans({
+    ' ': '',
+    '+': '&',
+    '*': '-',
+    '|': '-',
+    '/': '-',
+    '\\': '-',
+    ':': '-',
+    '"': '',
+    "'": '',
+    '<': '-',
+    '>': '-',
+    '?': '',
+    ',': ''
+})
+
+BRACES_RE = re.compile(r'{.*?}')
+CROSS_PLATE_BRACES_RE = re.compile(r'{[^{}]+}')
+PLATE_WELL_PREFIX_RE = re.compile(r'^\d{2}[a-z]_(.+)$', re.IGNORECASE)
+LEADING_DIGITS_RE = re.compile(r'\d+')
+
+# Individual run rules in one pattern. Blanks are anchored at the start
+# ({07H}.ab1, 01A__.ab1); a PCR tag ({PCR1234exp1}) can appear anywhere.
+IND_RULES_RE = re.compile(
+    r'(?P<ind_blank>^\{\d+[A-H]\}.ab1$)'
+    r'|(?P<plate_blank>^\d{2}[A-H]__.ab1$)'
+    r'|(?P<pcr>\{pcr\d+.+\})',
+    re.IGNORECASE
+)
+
+
+def _strip_suffixes(name):
+    return name.replace('_Premixed', '').replace('_RTI', '')
+
+
+def normalize_name(file_name):
+    """Same result as FileSystemDAO.normalize_filename for a single file name"""
+    adjusted = file_name.translate(ABI_TRANSLATION)
+    if adjusted.endswith('.ab1'):
+        adjusted = adjusted[:-4]
+    elif '.' in adjusted:
+        adjusted = adjusted[:adjusted.rfind('.')]
+    return BRACES_RE.sub('', _strip_suffixes(adjusted))
+
+
+class ClassifiedNames:
+    """
+    Result of classifying a batch of file names
+
+    kinds holds one KIND_* code per name. details holds the PCR number for
+    PCR files, the destination plate for cross-plate files, the normalized
+    name for unclassified individual files and the cleaned name for plate
+    files, otherwise None.
+    """
+
+    __slots__ = ('names', 'kinds', 'details')
+
+    def __init__(self, names):
+        self.names = names
+        self.kinds = array('B')
+        self.details = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __iter__(self):
+        return zip(self.names, self.kinds, self.details)
+
+    def count(self, kind):
+        return self.kinds.count(kind)
+
+
+class FilenameClassifier:
+    """
+    Shared file name rules for the individual and plate sorters
+
+    Individual controls are exact names (after braces, suffixes, the
+    extension and an optional plate well prefix are stripped), so they are
+    a set lookup. Plate controls can appear anywhere in a name, so they are
+    compiled into one alternation together with the blank and cross-plate
+    rules; each name is then matched once instead of once per rule.
+    """
+
+    def __init__(self, controls=(), plate_controls=PLATE_SORT_CONTROLS):
+        self.controls = frozenset(control.lower() for control in controls)
+        self.plate_controls = tuple(control.lower() for control in plate_controls)
+        alternation = '|'.join(re.escape(control) for control in self.plate_controls) or r'(?!)'
+        # Every rule is an optional lookahead at the start of the name, so one
+        # match reports all of them and precedence is applied afterwards
+        self._plate_re = re.compile(
+            r'(?=(?:.*?(?P<control>(?i:' + alternation + r')))?)'
+            r'(?=(?P<blank>(?i:.*__.ab1$))?)'
+            r'(?=(?:.*\{(?P<cross>[Pp]\d+[a-zA-Z]?)\}\.ab1$)?)'
+            r'(?=(?P<braces>.*[{}])?)'
+        )
+
+    def is_control_name(self, file_name):
+        """Exact control match, as FileSystemDAO.is_control_file"""
+        clean = os.path.splitext(BRACES_RE.sub('', _strip_suffixes(file_name)))[0].lower()
+        if clean in self.controls:
+            return True
+        well_match = PLATE_WELL_PREFIX_RE.match(clean)
+        return bool(well_match) and well_match.group(1) in self.controls
+
+    def classify(self, names, detect_pcr=True):
+        """
+        Classify names with the individual sorting rules
+
+        Order of precedence: PCR tag, blank, control, anything else.
+        """
+        result = ClassifiedNames(names)
+        kinds, details = result.kinds, result.details
+        match_rules = IND_RULES_RE.search
+        is_control = self.is_control_name
+
+        for name in names:
+            match = match_rules(name)
+            if match is not None:
+                pcr_tag = match.group('pcr')
+                if pcr_tag is None:
+                    kinds.append(KIND_BLANK)
+                    details.append(None)
+                    continue
+                if detect_pcr:
+                    digits = LEADING_DIGITS_RE.match(pcr_tag, 4)  # after '{pcr'
+                    kinds.append(KIND_PCR)
+                    details.append(digits.group())
+                    continue
+            if is_control(name):
+                kinds.append(KIND_CONTROL)
+                details.append(None)
+            else:
+                kinds.append(KIND_OTHER)
+                details.append(normalize_name(name))
+        return result
+
+    def classify_plate(self, names):
+        """
+        Classify names with the plate sorting rules
+
+        Order of precedence: control, blank, cross-plate, braces, plain.
+        details is the destination plate for cross-plate files and the final
+        file name for everything else.
+        """
+        result = ClassifiedNames(names)
+        kinds, details = result.kinds, result.details
+        match_rules = self._plate_re.match
+
+        for name in names:
+            match = match_rules(name)
+            if match.group('control') is not None:
+                kinds.append(KIND_CONTROL)
+                details.append(name)
+            elif match.group('blank') is not None:
+                kinds.append(KIND_BLANK)
+                details.append(name)
+            elif match.group('cross') is not None:
+                kinds.append(KIND_CROSS_PLATE)
+                details.append(match.group('cross'))
+            elif match.group('braces') is not None:
+                kinds.append(KIND_BRACES)
+                details.append(BRACES_RE.sub('', name))
+            else:
+                kinds.append(KIND_OTHER)
+                details.append(name)
+        return result
+
+
+@lru_cache(maxsize=8)
+def get_filename_classifier(controls=(), plate_controls=PLATE_SORT_CONTROLS):
+    """Shared FilenameClassifier for a tuple of controls"""
+    return FilenameClassifier(controls, plate_controls)
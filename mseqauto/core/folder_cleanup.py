@@ -0,0 +1,142 @@
+# folder_cleanup.py
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+from mseqauto.utils.logger import LevelLogger  # type: ignore
+
+# Not Needed folders inside a raw BioI folder: NN, NN-Preemptives, NN_2, ...
+NN_FOLDER_RE = re.compile(r'^(nn|nn-preemptives)(_.*)?$', re.IGNORECASE)
+
+# Final cleanup never descends into (or removes) these
+PROTECTED_PREFIXES = ('ind', 'fb-pcr')
+
+
+def is_nn_folder(name):
+    return NN_FOLDER_RE.match(name) is not None
+
+
+def is_protected_folder(name):
+    return name.lower().startswith(PROTECTED_PREFIXES)
+
+
+class FolderTree:
+    """
+    Folders under a root from one scandir walk, with their files and
+    subfolders tracked in memory
+
+    Callers update the tree as they move files out (discard_file), so
+    emptiness is known without listing a folder again. Folders for which
+    skip(name) is true are not entered and never count as empty.
+    """
+
+    def __init__(self, root, skip=None):
+        self.root = str(root)
+        self.files = {}     # folder -> set of file names
+        self.subdirs = {}   # folder -> set of subfolder paths (skipped ones included)
+        self.skipped = set()
+        self._order = []    # pre-order; reversed it lists children before parents
+
+        stack = [self.root]
+        while stack:
+            folder = stack.pop()
+            self._order.append(folder)
+            files, subdirs = set(), set()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.add(entry.path)
+                            if skip is not None and skip(entry.name):
+                                self.skipped.add(entry.path)
+                            else:
+                                stack.append(entry.path)
+                        else:
+                            files.add(entry.name)
+            except OSError:
+                # Unreadable: keep it out of every removal
+                self.skipped.add(folder)
+            self.files[folder] = files
+            self.subdirs[folder] = subdirs
+
+    def bottom_up(self):
+        """Walked folders, every folder after all of its subfolders"""
+        return [folder for folder in reversed(self._order) if folder in self.files]
+
+    def is_empty(self, folder):
+        return folder not in self.skipped and not self.files[folder] and not self.subdirs[folder]
+
+    def entry_count(self, folder):
+        return len(self.files.get(folder, ())) + len(self.subdirs.get(folder, ()))
+
+    def files_under(self, folder, extension=None):
+        """Paths of the files in a folder and its walked subfolders"""
+        paths = []
+        prefix = folder + os.sep
+        for walked in self._order:
+            if (walked == folder or walked.startswith(prefix)) and walked in self.files:
+                paths.extend(os.path.join(walked, name) for name in sorted(self.files[walked])
+                             if extension is None or name.endswith(extension))
+        return paths
+
+    def discard_file(self, file_path):
+        """Record that a file was moved out of the tree"""
+        folder, name = os.path.split(str(file_path))
+        self.files.get(folder, set()).discard(name)
+
+    def discard_folder(self, folder):
+        """Record that a folder was removed"""
+        self.subdirs.get(os.path.dirname(folder), set()).discard(folder)
+        self.files.pop(folder, None)
+        self.subdirs.pop(folder, None)
+
+
+class FolderCleanup:
+    """
+    Remove emptied folders in one bottom-up pass over a FolderTree
+
+    Every folder is listed once, when the tree is walked; a folder is
+    removed when its in-memory count drops to zero, which also empties its
+    parent's count. removed and failed record exactly what happened.
+    """
+
+    def __init__(self, logger=None):
+        levels = LevelLogger(logger, name=__name__)
+        self.log = levels.info
+        self.removed = []   # folders deleted, in deletion order
+        self.failed = []    # (folder, error) for folders that could not be deleted
+
+    def remove_empty(self, tree, include_root=False, removable=None):
+        """
+        Delete every empty folder of the tree, children first
+
+        Args:
+            tree: FolderTree to clean (updated in place)
+            include_root: Also delete the root if it ends up empty
+            removable: Optional predicate on a folder name; other folders are kept
+
+        Returns:
+            list: Folders deleted by this call
+        """
+        removed = []
+        for folder in tree.bottom_up():
+            if folder == tree.root and not include_root:
+                continue
+            if not tree.is_empty(folder):
+                continue
+            if removable is not None and folder != tree.root and not removable(os.path.basename(folder)):
+                continue
+            try:
+                os.rmdir(folder)
+            except OSError as e:
+                self.failed.append((folder, str(e)))
+                self.log(f"Failed to delete empty folder {folder}: {e}")
+                continue
+            tree.discard_folder(folder)
+            removed.append(folder)
+            self.log(f"Deleted empty folder: {folder}")
+        self.removed.extend(removed)
+        return removed
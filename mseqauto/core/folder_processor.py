@@ -3,75 +3,179 @@ import re
 # Add parent directory to PYTHONPATH for imports
 import os
 import sys
-import numpy as np
 from pathlib import Path
 sys.path.append(str(Path(__file__).parents[2]))
 
 #print(sys.path)
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import NamedTuple
 
 from mseqauto.config import MseqConfig # type: ignore
+from mseqauto.core.destination_resolver import DestinationResolver # type: ignore
+from mseqauto.core.filename_classifier import KIND_BLANK, KIND_CONTROL, KIND_PCR, get_filename_classifier # type: ignore
+from mseqauto.core.folder_cleanup import FolderCleanup, FolderTree, is_nn_folder, is_protected_folder # type: ignore
+from mseqauto.core.shared_order_key import SharedOrderKey # type: ignore
+from mseqauto.core.zip_manifest import manifest_comment, source_entries # type: ignore
+from mseqauto.utils.instrumentation import timed # type: ignore
+from mseqauto.utils.logger import LevelLogger # type: ignore
 import warnings
 warnings.filterwarnings("ignore", message="Revert to STA COM threading mode", module="pywinauto")
 
 config = MseqConfig()
 
+
+class OrderKeyTables(NamedTuple):
+     """Per-order views of an order key, built in one pass by FolderProcessor.tabulate_order_key"""
+     expected_counts: Counter   # order number -> number of samples (expected .ab1 files)
+     samples: dict              # (I number, order number) -> [raw sample names] in order key order
+
+
 class FolderProcessor:
-     def __init__(self, file_dao, ui_automation, config, logger=None):
+     # Files zipped for a full plasmid sequencing order
+     PLASMID_EXTENSIONS = [
+          '.annotations.bed',
+          '.annotations.gbk',
+          '.assembly_stats.tsv',
+          '.final.fasta',
+          '.final.fastq',
+          '.html'  # Include the validation report HTML
+     ]
+
+     def __init__(self, file_dao, ui_automation, config, logger=None, state_store=None, context=None):
           self.file_dao = file_dao
           self.ui_automation = ui_automation
           self.config = config
-
-          # Create a unified logging interface with support for different levels
-          import logging
-          if logger is None:
-               # No logger provided, use default
-               self._logger = logging.getLogger(__name__)
-               self.log = self._logger.info
-               self.debug = self._logger.debug
-               self.warning = self._logger.warning
-               self.error = self._logger.error
-          elif isinstance(logger, logging.Logger):
-               # It's a Logger object
-               self._logger = logger
-               self.log = logger.info
-               self.debug = logger.debug
-               self.warning = logger.warning
-               self.error = logger.error
-          else:
-               # Assume it's a callable function - in this case, we don't have level differentiation
-               self._logger = None
-               self.log = logger
-               self.debug = logger
-               self.warning = logger
-               self.error = logger
+          # Optional OrderStateStore consulted before re-inferring order state from the filesystem
+          self.state_store = state_store
+          # Optional PipelineContext holding the order key and other caches shared across stages
+          self.context = context
+
+          # Level-aware logging for a Logger, a bound method such as logger.info, or a plain callable
+          levels = LevelLogger(logger, name=__name__)
+          self._logger = levels.logger
+          self._levels = levels
+          self.log = levels.info
+          self.debug = levels.debug
+          self.warning = levels.warning
+          self.error = levels.error
 
           # Keep original reference for backward compatibility
           self.logger = logger
 
           # Initialize other attributes
           self.order_key_index = None
+          self._order_key_tables = None   # (order key, OrderKeyTables)
+          self._loaded_order_key = None   # (key file signature, order key) without a pipeline context
           self.reinject_list = []
           self.raw_reinject_list = []
 
-     def build_order_key_index(self, order_key):
-          """Build lookup index for faster order key searches"""
-          if self.order_key_index is not None:
-               return  # Already built
+          # PCR, BioI and order folders resolved (and created) once per processor
+          self.destinations = DestinationResolver(file_dao, logger=logger)
+
+          # Concurrent sorting: one lock per destination folder, order folders
+          # touched by the current thread's sort_ind_folder call
+          self._destination_locks = {}
+          self._destination_locks_guard = threading.Lock()
+          self._thread_state = threading.local()
+
+     def _state(self, method, *args, **kwargs):
+          """Call an OrderStateStore method; the store is only an optimization, so errors return None"""
+          if self.state_store is None:
+               return None
+          try:
+               return getattr(self.state_store, method)(*args, **kwargs)
+          except Exception as e:
+               self.warning(f"Order state store error in {method}: {e}")
+               return None
+
+     def record_order_stage(self, folder_path, stage, **kwargs):
+          """Record an order lifecycle stage (sorted/mseqed/zipped/validated) if a state store is set"""
+          self._state('record_stage', folder_path, stage, **kwargs)
 
-          self.order_key_index = {}
+     def is_order_validated(self, folder_path, zip_path, summary_path):
+          """True if the state store shows this zip was already validated into the summary"""
+          return bool(self._state('is_validated', folder_path, zip_path, summary_path))
+
+     @staticmethod
+     @timed()
+     def index_order_key(order_key, file_dao):
+          """Map normalized sample name -> [(I number, account, order number)] for an order key"""
+          index = {}
 
           # Process each entry in the order key
           for entry in order_key:
                i_num, acct_name, order_num, sample_name = entry[0:4]
                # Use customer-specific normalization for order key
-               normalized_name = self.file_dao.standardize_for_customer_files(sample_name, remove_extension=False)
+               normalized_name = file_dao.standardize_for_customer_files(sample_name, remove_extension=False)
 
                # Create entry in index (handle multiple entries with same normalized name)
-               if normalized_name not in self.order_key_index:
-                    self.order_key_index[normalized_name] = []
-               self.order_key_index[normalized_name].append((i_num, acct_name, order_num))
+               if normalized_name not in index:
+                    index[normalized_name] = []
+               index[normalized_name].append((i_num, acct_name, order_num))
+          return index
+
+     @staticmethod
+     @timed()
+     def tabulate_order_key(order_key):
+          """Expected .ab1 count per order and sample names per (I number, order) in one pass"""
+          expected_counts = Counter()
+          samples = {}
+          for entry in order_key:
+               i_num, order_num = str(entry[0]), str(entry[2])
+               expected_counts[order_num] += 1
+               samples.setdefault((i_num, order_num), []).append(entry[3])
+          return OrderKeyTables(expected_counts, samples)
+
+     def order_key_tables(self, order_key=None):
+          """
+          OrderKeyTables for an order key, built once per order key
+
+          Without an order key the run's key is used: the pipeline context's, or
+          KEY_FILE_PATH loaded once and reloaded only when the file changes.
+          Returns None if no order key could be loaded.
+          """
+          if order_key is None:
+               order_key = self._current_order_key()
+               if order_key is None:
+                    return None
+          if self.context is not None and self.context.owns_order_key(order_key):
+               # Shared by every processor of the pipeline
+               return self.context.order_key_tables()
+          cached = self._order_key_tables
+          if cached is None or cached[0] is not order_key:
+               cached = self._order_key_tables = (order_key, self.tabulate_order_key(order_key))
+          return cached[1]
+
+     def _current_order_key(self):
+          if self.context is not None:
+               return self.context.order_key()
+          try:
+               stat = os.stat(self.config.KEY_FILE_PATH)
+               signature = (stat.st_size, stat.st_mtime_ns)
+          except (OSError, TypeError, ValueError):
+               signature = None
+          if self._loaded_order_key is None or self._loaded_order_key[0] != signature:
+               self._loaded_order_key = (signature, self.file_dao.load_order_key(self.config.KEY_FILE_PATH))
+          return self._loaded_order_key[1]
+
+     @timed()
+     def build_order_key_index(self, order_key):
+          """Build lookup index for faster order key searches"""
+          if self.order_key_index is not None:
+               return  # Already built
+
+          if isinstance(order_key, SharedOrderKey):
+               # Packed key (e.g. attached from shared memory) carries its own index
+               self.order_key_index = order_key.index
+          elif self.context is not None and self.context.owns_order_key(order_key):
+               # Built once per run and shared by every processor of the pipeline
+               self.order_key_index = self.context.order_key_index()
+          else:
+               self.order_key_index = self.index_order_key(order_key, self.file_dao)
 
           self.log(f"Built order key index with {len(self.order_key_index)} unique entries")
 
@@ -82,7 +186,7 @@ class FolderProcessor:
                self.build_order_key_index(order_key)
 
           file_name = Path(file_path).name
-          self.log(f"Processing customer file: {file_name}")
+          self.debug("Processing customer file: %s", file_name)
 
           # Extract order number from filename if present
           embedded_order_number = self.file_dao.extract_order_number_from_filename(file_name)
@@ -97,7 +201,7 @@ class FolderProcessor:
                if embedded_order_number:
                     for i_num, acct_name, order_num in matches:
                          if order_num == embedded_order_number:
-                              self.log(f"Found exact match with embedded order number: {embedded_order_number}")
+                              self.debug("Found exact match with embedded order number: %s", embedded_order_number)
                               destination_folder = self.create_order_folder(i_num, acct_name, order_num)
                               return self._place_customer_file(file_path, destination_folder, base_normalized_name)
 
@@ -132,24 +236,13 @@ class FolderProcessor:
           Returns:
                Path to the created order folder
           """
-          # Create order folder name
-          order_folder_name = f"BioI-{i_num}_{acct_name}_{order_num}"
-          self.log(f"Target order folder: {order_folder_name}")
-
           # Get parent folder path with consistent naming scheme
-          parent_folder = Path(self._get_bioi_folder_path(i_num, base_path))
-          self.log(f"Parent folder: {parent_folder}")
+          parent_folder = self._get_bioi_folder_path(i_num, base_path)
 
-          # Create full order folder path inside BioI folder
-          order_folder_path = parent_folder / order_folder_name
-          self.log(f"Order folder path: {order_folder_path}")
-
-          # Create order folder if it doesn't exist
-          if not order_folder_path.exists():
-               order_folder_path.mkdir(parents=True, exist_ok=True)
-               self.log(f"Created order folder: {order_folder_path}")
-
-          return str(order_folder_path)
+          # Order folder inside the BioI folder, created the first time it is needed
+          order_folder_path = self.destinations.order_folder(i_num, acct_name, order_num, parent_folder)
+          self.debug("Target order folder: %s", order_folder_path)
+          return order_folder_path
 
      def _get_bioi_folder_path(self, i_num, base_path=None):
           """
@@ -180,20 +273,114 @@ class FolderProcessor:
                     # Fallback to current directory
                     data_folder = str(Path.cwd().parent)
 
-          # Create path to the standardized BioI folder
-          bioi_folder_name = f"BioI-{i_num}"
-          bioi_folder_path = Path(data_folder) / bioi_folder_name
+          # Standardized BioI folder, created the first time it is needed
+          try:
+               return self.destinations.bioi_folder(i_num, data_folder)
+          except Exception as e:
+               self.log(f"Error creating BioI folder: {e}")
+               return str(Path(data_folder) / f"BioI-{i_num}")
+
+     def _destination_lock(self, destination):
+          """
+          Lock serializing placement decisions and moves into one destination
 
-          # Create the folder if it doesn't exist
-          if not bioi_folder_path.exists():
-               try:
-                    bioi_folder_path.mkdir(parents=True, exist_ok=True)
-                    self.log(f"Created clean BioI folder: {bioi_folder_path}")
-               except Exception as e:
-                    self.log(f"Error creating BioI folder: {e}")
+          destination is a folder path, or a tuple key for a destination whose
+          path is only resolved under the lock (('PCR', number) for PCR folders)
+          """
+          if isinstance(destination, tuple):
+               key = destination
+          else:
+               key = os.path.normcase(os.path.abspath(str(destination)))
+          lock = self._destination_locks.get(key)
+          if lock is None:
+               with self._destination_locks_guard:
+                    lock = self._destination_locks.setdefault(key, threading.RLock())
+          return lock
+
+     @property
+     def _sorted_folders(self):
+          """Order folders that received files in this thread's current sort_ind_folder call"""
+          folders = getattr(self._thread_state, 'sorted_folders', None)
+          if folders is None:
+               folders = self._thread_state.sorted_folders = set()
+          return folders
+
+     @timed()
+     def sort_ind_folders(self, folder_paths, reinject_list, order_key, max_workers=None):
+          """
+          Sort several BioI folders, concurrently when SORT_WORKER_COUNT > 1
+
+          Which copy of a sample lands in the main folder depends on which
+          arrives first, so folders that can sort into the same destination
+          (see _sort_destinations: their own I number, any I number their
+          customer files match in the order key, their PCR numbers) stay one
+          group sorted in the given order. Groups share no destination and
+          run in parallel. Every placement decision and move also happens
+          under its destination's lock.
+
+          Returns:
+               list: sort_ind_folder() result for each folder, in order
+          """
+          folder_paths = list(folder_paths)
+          if max_workers is None:
+               max_workers = getattr(self.config, 'SORT_WORKER_COUNT', 1)
+
+          # Build the shared index once instead of racing to build it in every thread
+          if self.order_key_index is None and order_key is not None:
+               self.build_order_key_index(order_key)
 
-          return str(bioi_folder_path)
+          if max_workers <= 1 or len(folder_paths) <= 1:
+               results = []
+               for i, folder in enumerate(folder_paths):
+                    self.log(f"Processing folder {i+1}/{len(folder_paths)}: {Path(folder).name}")
+                    results.append(self.sort_ind_folder(folder, reinject_list, order_key))
+               return results
+
+          # Merge folders sharing any destination into one group
+          groups = {}         # group id -> folder indexes
+          group_of_key = {}   # destination -> group id
+          for index, folder in enumerate(folder_paths):
+               keys = self._sort_destinations(folder)
+               members = [index]
+               for group_id in {group_of_key[key] for key in keys if key in group_of_key}:
+                    members.extend(groups.pop(group_id))
+                    group_of_key.update((key, index) for key, owner in list(group_of_key.items())
+                                        if owner == group_id)
+               groups[index] = sorted(members)
+               group_of_key.update((key, index) for key in keys)
+
+          def sort_group(indexes):
+               return [(index, self.sort_ind_folder(folder_paths[index], reinject_list, order_key))
+                       for index in indexes]
+
+          self.log(f"Sorting {len(folder_paths)} folders in {len(groups)} groups with {max_workers} threads")
+          results = [None] * len(folder_paths)
+          with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sort") as pool:
+               for future in [pool.submit(sort_group, indexes) for indexes in groups.values()]:
+                    for index, result in future.result():
+                         results[index] = result
+          return results
+
+     def _sort_destinations(self, folder_path):
+          """
+          Keys of every destination sort_ind_folder could move a folder's files to
 
+          The folder's own I number, every I number a customer file's name
+          matches in the order key (embedded order numbers and the first-match
+          fallback can route a file to another I number) and ('PCR', number)
+          for its PCR files. Needs the order key index.
+          """
+          keys = {self.file_dao.get_inumber_from_name(folder_path) or str(folder_path)}
+          names = [ab1_file.name for ab1_file in Path(folder_path).rglob("*.ab1")]
+          classified = get_filename_classifier(tuple(self.config.CONTROLS)).classify(names)
+          for _, kind, detail in classified:
+               if kind == KIND_PCR:
+                    keys.add(('PCR', detail))
+               elif kind not in (KIND_BLANK, KIND_CONTROL) and self.order_key_index and detail in self.order_key_index:
+                    keys.update(str(i_num) for i_num, _, _ in self.order_key_index[detail])
+          return keys
+
+     @timed()
      def sort_ind_folder(self, folder_path, reinject_list, order_key):
           """Sort all files in a BioI folder using batch processing with recursive folder scanning"""
           self.log(f"Processing folder: {folder_path}")
@@ -237,40 +424,30 @@ class FolderProcessor:
           customer_files = []
           unmatched_files = []
 
-          # Classify files first
-          for file_path in ab1_files:
-               file_name = Path(file_path).name
+          # Classify all names in one batch
+          classified = get_filename_classifier(tuple(self.config.CONTROLS)).classify(
+               [Path(file_path).name for file_path in ab1_files])
 
-               # Check for PCR files
-               pcr_number = self.file_dao.get_pcr_number(file_name)
-               if pcr_number:
-                    if pcr_number not in pcr_files:
-                         pcr_files[pcr_number] = []
-                    pcr_files[pcr_number].append(file_path)
-                    continue
+          # Build order key index if needed
+          if self.order_key_index is None and order_key is not None:
+               self.build_order_key_index(order_key)
+
+          for file_path, (file_name, kind, detail) in zip(ab1_files, classified):
+               # PCR files, grouped by PCR number
+               if kind == KIND_PCR:
+                    pcr_files.setdefault(detail, []).append(file_path)
 
-               # Check for blank files (check this before control files)
-               if self.file_dao.is_blank_file(file_name):
-                    self.log(f"Identified blank file: {file_name}")
+               # Blank files (checked before control files)
+               elif kind == KIND_BLANK:
+                    self.debug("Identified blank file: %s", file_name)
                     blank_files.append(file_path)
-                    continue
 
-               # Check for control files
-               if self.file_dao.is_control_file(file_name, self.config.CONTROLS):
-                    self.log(f"Identified control file: {file_name}")
+               elif kind == KIND_CONTROL:
+                    self.debug("Identified control file: %s", file_name)
                     control_files.append(file_path)
-                    continue
 
-               # Check if it's a customer file (has a match in order key)
-               # Pre-normalize for matching
-               normalized_name = self.file_dao.normalize_filename(file_name)
-
-               # Build order key index if needed
-               if self.order_key_index is None and order_key is not None:
-                    self.build_order_key_index(order_key)
-
-               # Check if in order key
-               if self.order_key_index and normalized_name in self.order_key_index:
+               # Customer file if its normalized name is in the order key
+               elif self.order_key_index and detail in self.order_key_index:
                     customer_files.append(file_path)
                else:
                     # No match found - unmatched file
@@ -287,36 +464,40 @@ class FolderProcessor:
           # Process PCR files by PCR number
           for pcr_number, files in pcr_files.items():
                self.log(f"Processing {len(files)} files for PCR number {pcr_number}")
-               for file_path in files:
-                    self._sort_pcr_file(file_path, pcr_number)
-
-          # Process controls
-          if control_files:
-               self.log(f"Processing {len(control_files)} control files")
-               controls_folder = Path(new_folder_path) / "Controls"
-               controls_folder.mkdir(exist_ok=True)
-
-               for file_path in control_files:
-                    target_path = controls_folder / Path(file_path).name
-                    moved = self.file_dao.move_file(file_path, str(target_path))
-                    if moved:
-                         self.log(f"Moved control file {Path(file_path).name} to {controls_folder}")
-                    else:
-                         self.log(f"Failed to move control file {Path(file_path).name}")
+               with self._destination_lock(('PCR', pcr_number)):
+                    for file_path in files:
+                         self._sort_pcr_file(file_path, pcr_number)
+
+          # Controls, blanks and unmatched files land in the BioI folder, which another
+          # source folder of the same I number may be sorting into at the same time
+          with self._destination_lock(new_folder_path):
+               # Process controls
+               if control_files:
+                    self.log(f"Processing {len(control_files)} control files")
+                    controls_folder = Path(new_folder_path) / "Controls"
+                    controls_folder.mkdir(exist_ok=True)
+
+                    for file_path in control_files:
+                         target_path = controls_folder / Path(file_path).name
+                         moved = self.file_dao.move_file(file_path, str(target_path))
+                         if moved:
+                              self.debug("Moved control file %s to %s", Path(file_path).name, controls_folder)
+                         else:
+                              self.log(f"Failed to move control file {Path(file_path).name}")
 
-          # Process blanks
-          if blank_files:
-               self.log(f"Processing {len(blank_files)} blank files")
-               blank_folder = Path(new_folder_path) / "Blank"
-               blank_folder.mkdir(exist_ok=True)
+               # Process blanks
+               if blank_files:
+                    self.log(f"Processing {len(blank_files)} blank files")
+                    blank_folder = Path(new_folder_path) / "Blank"
+                    blank_folder.mkdir(exist_ok=True)
 
-               for file_path in blank_files:
-                    target_path = blank_folder / Path(file_path).name
-                    moved = self.file_dao.move_file(file_path, str(target_path))
-                    if moved:
-                         self.log(f"Moved blank file {Path(file_path).name} to {blank_folder}")
-                    else:
-                         self.log(f"Failed to move blank file {Path(file_path).name}")
+                    for file_path in blank_files:
+                         target_path = blank_folder / Path(file_path).name
+                         moved = self.file_dao.move_file(file_path, str(target_path))
+                         if moved:
+                              self.debug("Moved blank file %s to %s", Path(file_path).name, blank_folder)
+                         else:
+                              self.log(f"Failed to move blank file {Path(file_path).name}")
 
           # Process customer files
           if customer_files:
@@ -324,50 +505,56 @@ class FolderProcessor:
                for file_path in customer_files:
                     self.sort_customer_file(file_path, order_key)
 
-          # Process unmatched files - move to BioI folder root
-          if unmatched_files and i_num:
-               self.log(f"Processing {len(unmatched_files)} unmatched files")
-               # Create an 'Unsorted' folder for files with ambiguous names
-               unsorted_folder = None
-
-               for file_path in unmatched_files:
-                    file_name = Path(file_path).name
-
-                    # Check if this is a preemptive but has no match in order key
-                    is_preempt = self.is_preemptive(file_name)
-
-                    if is_preempt:
-                         # For preemptive files with no match, put in Unsorted folder
-                         if unsorted_folder is None:
-                              unsorted_folder = Path(new_folder_path) / "Unsorted"
-                              unsorted_folder.mkdir(exist_ok=True)
-
-                         # Keep original name for Unsorted folder
-                         target_path = unsorted_folder / file_name
-                         moved = self.file_dao.move_file(file_path, str(target_path))
-                         if moved:
-                              self.log(f"Moved preemptive unmatched file {file_name} to Unsorted folder")
+          with self._destination_lock(new_folder_path):
+               # Process unmatched files - move to BioI folder root
+               if unmatched_files and i_num:
+                    self.log(f"Processing {len(unmatched_files)} unmatched files")
+                    # Create an 'Unsorted' folder for files with ambiguous names
+                    unsorted_folder = None
+
+                    for file_path in unmatched_files:
+                         file_name = Path(file_path).name
+
+                         # Check if this is a preemptive but has no match in order key
+                         is_preempt = self.is_preemptive(file_name)
+
+                         if is_preempt:
+                              # For preemptive files with no match, put in Unsorted folder
+                              if unsorted_folder is None:
+                                   unsorted_folder = Path(new_folder_path) / "Unsorted"
+                                   unsorted_folder.mkdir(exist_ok=True)
+
+                              # Keep original name for Unsorted folder
+                              target_path = unsorted_folder / file_name
+                              moved = self.file_dao.move_file(file_path, str(target_path))
+                              if moved:
+                                   self.log(f"Moved preemptive unmatched file {file_name} to Unsorted folder")
+                              else:
+                                   self.log(f"Failed to move unmatched file {file_name}")
                          else:
-                              self.log(f"Failed to move unmatched file {file_name}")
-                    else:
-                         # Clean filename for destination (remove braces)
-                         clean_brace_file_name = re.sub(r'{.*?}', '', file_name)
-                         target_path = Path(new_folder_path) / clean_brace_file_name
+                              # Clean filename for destination (remove braces)
+                              clean_brace_file_name = re.sub(r'{.*?}', '', file_name)
+                              target_path = Path(new_folder_path) / clean_brace_file_name
 
-                         moved = self.file_dao.move_file(file_path, str(target_path))
-                         if moved:
-                              self.log(f"Moved unmatched file {file_name} to BioI folder root")
-                         else:
-                              self.log(f"Failed to move unmatched file {file_name}")
+                              moved = self.file_dao.move_file(file_path, str(target_path))
+                              if moved:
+                                   self.log(f"Moved unmatched file {file_name} to BioI folder root")
+                              else:
+                                   self.log(f"Failed to move unmatched file {file_name}")
 
-          # Enhanced cleanup: Check if the original folder is empty or can be safely deleted
-          try:
-               self._cleanup_original_folder(folder_path, new_folder_path)
-          except Exception as e:
-               self.log(f"Error during folder cleanup: {e}")
+               # Enhanced cleanup: Check if the original folder is empty or can be safely deleted
+               try:
+                    self._cleanup_original_folder(folder_path, new_folder_path)
+               except Exception as e:
+                    self.log(f"Error during folder cleanup: {e}")
+
+          for order_folder in self._sorted_folders:
+               self._state('record_stage', order_folder, 'sorted')
+          self._sorted_folders.clear()
 
           return new_folder_path
 
+     @timed()
      def sort_plate_folder(self, folder_path):
           """Sort all files in a plate folder - much simpler than ind folder processing"""
           self.log(f"Processing plate folder: {folder_path}")
@@ -385,24 +572,19 @@ class FolderProcessor:
           blank_files = []
           brace_files = []
 
-          # Classify files
-          for file_path in ab1_files:
-               file_name = Path(file_path).name
+          # Classify files (plate controls, no PCR tags)
+          classified = get_filename_classifier(tuple(self.config.PLATE_CONTROLS)).classify(
+               [Path(file_path).name for file_path in ab1_files], detect_pcr=False)
 
-               # Check for control files (use PLATE_CONTROLS)
-               if self.file_dao.is_control_file(file_name, self.config.PLATE_CONTROLS):
-                    self.log(f"Identified control file: {file_name}")
+          for file_path, (file_name, kind, _) in zip(ab1_files, classified):
+               if kind == KIND_CONTROL:
+                    self.debug("Identified control file: %s", file_name)
                     control_files.append(file_path)
-                    continue
-
-               # Check for blank files
-               if self.file_dao.is_blank_file(file_name):
-                    self.log(f"Identified blank file: {file_name}")
+               elif kind == KIND_BLANK:
+                    self.debug("Identified blank file: %s", file_name)
                     blank_files.append(file_path)
-                    continue
-
                # Check for files with braces (need cleaning)
-               if '{' in file_name or '}' in file_name:
+               elif '{' in file_name or '}' in file_name:
                     brace_files.append(file_path)
 
           # Detailed logging
@@ -419,7 +601,7 @@ class FolderProcessor:
                     target_path = controls_folder / Path(file_path).name
                     moved = self.file_dao.move_file(file_path, str(target_path))
                     if moved:
-                         self.log(f"Moved control file {Path(file_path).name} to Controls")
+                         self.debug("Moved control file %s to Controls", Path(file_path).name)
                     else:
                          self.log(f"Failed to move control file {Path(file_path).name}")
 
@@ -433,7 +615,7 @@ class FolderProcessor:
                     target_path = blank_folder / Path(file_path).name
                     moved = self.file_dao.move_file(file_path, str(target_path))
                     if moved:
-                         self.log(f"Moved blank file {Path(file_path).name} to Blank")
+                         self.debug("Moved blank file %s to Blank", Path(file_path).name)
                     else:
                          self.log(f"Failed to move blank file {Path(file_path).name}")
 
@@ -508,10 +690,14 @@ class FolderProcessor:
      def _place_customer_file(self, file_path, destination_folder, normalized_name):
           """Place customer file in main folder or Alternate Injections based on file characteristics"""
 
-          if self._should_use_alternate_injections(file_path, destination_folder, normalized_name):
-               return self._move_to_alternate_injections(file_path, destination_folder)
-          else:
-               return self._move_to_main_folder(file_path, destination_folder)
+          self._sorted_folders.add(str(destination_folder))
+          # The overwrite and preemptive checks look at the destination, so they and
+          # the move must not interleave with another thread placing into it
+          with self._destination_lock(destination_folder):
+               if self._should_use_alternate_injections(file_path, destination_folder, normalized_name):
+                    return self._move_to_alternate_injections(file_path, destination_folder)
+               else:
+                    return self._move_to_main_folder(file_path, destination_folder)
 
      def _should_use_alternate_injections(self, file_path, destination_folder, normalized_name):
           """Check if customer file should be placed in Alternate Injections folder"""
@@ -588,7 +774,7 @@ class FolderProcessor:
           alt_path = alt_folder / file_name  # Keep original name with braces
           success = self.file_dao.move_file(file_path, str(alt_path))
           if success:
-               self.log(f"Moved to Alternate Injections: {file_name}")
+               self.debug("Moved to Alternate Injections: %s", file_name)
           return success
 
      def _move_to_main_folder(self, file_path, destination_folder):
@@ -600,24 +786,16 @@ class FolderProcessor:
           target_path = Path(destination_folder) / clean_name
           success = self.file_dao.move_file(file_path, str(target_path))
           if success:
-               self.log(f"Moved to main folder: {file_name}")
+               self.debug("Moved to main folder: %s", file_name)
           return success
 
      def _get_expected_file_count(self, order_number):
           """Get expected number of files for an order based on the order key"""
-          # Load the order key file
-          order_key = self.file_dao.load_order_key(self.config.KEY_FILE_PATH)
-          if order_key is None:
+          tables = self.order_key_tables()
+          if tables is None:
                self.log(f"Warning: Could not load order key file, unable to verify count for order {order_number}")
                return 0
-
-          # Count matching entries for this order number
-          count = 0
-          for row in order_key:
-               if str(row[2]) == str(order_number):
-                    count += 1
-
-          return count
+          return tables.expected_counts[str(order_number)]
 
      def process_bio_folder(self, bio_folder):
           """Process an individual I number plate folder - BioI folder containing multiple order folders"""
@@ -633,6 +811,62 @@ class FolderProcessor:
 
           return
 
+     def _order_completeness(self, order_folder):
+          """(files_complete, is_andreev_order) for an order folder"""
+          folder_name = Path(order_folder).name
+          order_number = self.get_order_number_from_folder_name(order_folder)
+          ab1_files = self.file_dao.get_folder_status(order_folder).ab1_files
+          is_andreev_order = self.config.ANDREEV_NAME in folder_name.lower()
+
+          if re.search(r'_\d$', folder_name):
+               # For re-sequenced requests, bypass normal file count checking
+               # These are often partial uploads with only a few reactions
+               files_complete = len(ab1_files) > 0  # Just need to have some files
+          else:
+               # Normal file count validation
+               expected_count = self._get_expected_file_count(order_number)
+               files_complete = expected_count > 0 and len(ab1_files) == expected_count
+          return files_complete, is_andreev_order
+
+     def order_ready_for_mseq(self, order_folder):
+          """True if process_order_folder would run mSeq on this order folder"""
+          files_complete, is_andreev_order = self._order_completeness(order_folder)
+          was_mseqed, has_braces, has_ab1_files = self.check_order_status(order_folder)
+          return not was_mseqed and not has_braces and files_complete and has_ab1_files and not is_andreev_order
+
+     def mseq_orders_in_pool(self, order_folders, worker_count=None):
+          """
+          Run mSeq on the ready order folders in an MseqWorkerPool, one mSeq per worker
+
+          Folders mSeq completes are recorded as mSeqed, so the usual
+          process_bio_folder/process_order_folder pass that follows only
+          moves them; folders that failed are left to that pass to retry.
+
+          Returns:
+               dict: folder -> pool result, for the folders that were ready
+          """
+          from mseqauto.core.mseq_worker_pool import MseqWorkerPool  # type: ignore
+
+          ready = [str(folder) for folder in order_folders if self.order_ready_for_mseq(folder)]
+          if not ready:
+               return {}
+          executable = None
+          if sys.maxsize > 2 ** 32:
+               # Workers drive mSeq through pywinauto, which needs the 32-bit interpreter
+               from mseqauto.core.automation_server import automation_python  # type: ignore
+               executable = automation_python(self.config)
+
+          self.log(f"Running mSeq on {len(ready)} order folders in parallel")
+          with MseqWorkerPool(self.config, worker_count=worker_count, logger=self._logger,
+                              executable=executable) as pool:
+               results = pool.process_folders(ready)
+          for folder, result in results.items():
+               if result['success'] and result['outputs_complete']:
+                    self.record_order_stage(folder, 'mseqed')
+               self.file_dao.get_folder_status(folder, refresh=True)
+          return results
+
+     @timed()
      def process_order_folder(self, order_folder, parent_folder=None):
           """Process an individual order folder"""
           folder_name = Path(order_folder).name
@@ -646,21 +880,10 @@ class FolderProcessor:
           # Determine if we're in IND Not Ready context
           in_not_ready = Path(order_folder).parent.name == self.config.IND_NOT_READY_FOLDER
 
-          # Get order information
-          order_number = self.get_order_number_from_folder_name(order_folder)
-          ab1_files = self.file_dao.get_files_by_extension(order_folder, self.config.ABI_EXTENSION)
-          is_andreev_order = self.config.ANDREEV_NAME in folder_name.lower()
-
-          # Check order completeness
           if is_resequenced:
-               # For re-sequenced requests, bypass normal file count checking
-               # These are often partial uploads with only a few reactions
-               files_complete = len(ab1_files) > 0  # Just need to have some files
                self.log(f"Re-sequenced request detected: {folder_name}, bypassing file count validation")
-          else:
-               # Normal file count validation
-               expected_count = self._get_expected_file_count(order_number)
-               files_complete = expected_count > 0 and len(ab1_files) == expected_count
+
+          files_complete, is_andreev_order = self._order_completeness(order_folder)
 
           # Check order status
           was_mseqed, has_braces, has_ab1_files = self.check_order_status(order_folder)
@@ -672,6 +895,7 @@ class FolderProcessor:
                     if not is_andreev_order:
                          self.ui_automation.process_folder(order_folder)
                          self.log(f"mSeq completed: {folder_name}")
+                         self._state('record_stage', order_folder, 'mseqed')
 
                          # IMPORTANT: Close mSeq to release file handles before moving
                          if self.ui_automation:
@@ -695,6 +919,7 @@ class FolderProcessor:
                                    try:
                                         import shutil
                                         shutil.move(order_folder, str(destination))
+                                        self.destinations.forget(order_folder, destination)
                                         self.log(f"Order moved back: {folder_name}")
                                    except Exception as e:
                                         self.warning(f"Error moving folder: {e}")
@@ -714,6 +939,7 @@ class FolderProcessor:
                               try:
                                    import shutil
                                    shutil.move(order_folder, str(target_path))
+                                   self.destinations.forget(order_folder, target_path)
                                    self.log(f"Incomplete order moved to Not Ready: {folder_name}")
                               except Exception as e:
                                    self.warning(f"Error moving to IND Not Ready: {e}")
@@ -741,6 +967,7 @@ class FolderProcessor:
                          try:
                               import shutil
                               shutil.move(order_folder, str(destination))
+                              self.destinations.forget(order_folder, destination)
                               self.log(f"Processed order moved back: {folder_name}")
                          except Exception as e:
                               self.warning(f"Error moving folder: {e}")
@@ -759,35 +986,10 @@ class FolderProcessor:
           Returns:
                str: Path to the PCR folder
           """
-          self.log(f"Looking for PCR folder with PCR{pcr_number} in {base_path}")
-
-          # Search for any folder containing the PCR number
-          pcr_pattern = re.compile(f'pcr{pcr_number}', re.IGNORECASE)
-          found_folders = []
-
-          for item in Path(base_path).iterdir():
-               if item.is_dir() and pcr_pattern.search(item.name.lower()):
-                    found_folders.append(str(item))
-
-          if found_folders:
-               # If multiple matches found, prioritize ones with order numbers
-               order_pattern = re.compile(f'pcr{pcr_number}_\\d+', re.IGNORECASE)
-               for folder in found_folders:
-                    if order_pattern.search(Path(folder).name.lower()):
-                         self.log(f"Found PCR folder with order number: {folder}")
-                         return folder
-
-               # If no folder with order number, use the first match
-               self.log(f"Found PCR folder: {found_folders[0]}")
-               return found_folders[0]
-
-          # No matching folder found, create a new one
-          pcr_folder_name = f"FB-PCR{pcr_number}"
-          new_folder_path = Path(base_path) / pcr_folder_name
-          self.log(f"Creating new PCR folder: {new_folder_path}")
-          self.file_dao.create_folder_if_not_exists(str(new_folder_path))
-          return str(new_folder_path)
+          # The day folder is listed once; folders with an order number are preferred
+          return self.destinations.pcr_folder(pcr_number, base_path)
 
+     @timed()
      def process_pcr_folder(self, pcr_folder):
           """Process all files in a PCR folder - updated matching logic"""
           self.log(f"Processing PCR folder: {Path(pcr_folder).name}")
@@ -841,198 +1043,90 @@ class FolderProcessor:
           if not was_mseqed and not has_braces and has_ab1_files:
                self.ui_automation.process_folder(pcr_folder)
                self.log(f"mSeq completed: {Path(pcr_folder).name}")
+               self._state('record_stage', pcr_folder, 'mseqed')
           else:
                self.log(f"mSeq NOT completed: {Path(pcr_folder).name}")
 
      def _cleanup_original_folder(self, original_folder: str, new_folder: str):
           """
-          Enhanced cleanup to remove the original folder if all files have been processed,
-          handle nested NN folders, and clean up empty folders
+          Remove the original folder once all of its files have been sorted
+
+          The folder is walked once (FolderTree). Files left in nested NN folders
+          are sorted, leftover Controls/Blank/Alternate Injections files are moved
+          to the new folder, then empty NN and special folders and the original
+          folder itself are removed bottom-up by FolderCleanup.
+
+          Returns:
+               list: Folders that were deleted
           """
           if original_folder == new_folder:
                self.log("Original folder is the same as new folder, no cleanup needed")
-               return
-
-          # Process nested NN folders first
-          # Walk the directory tree from bottom-up to process subdirectories first
-          for dir_path in reversed(list(Path(original_folder).rglob("*"))):
-               if dir_path.is_dir():
-                    dir_lower = dir_path.name.lower()
-
-                    # Check if this is an NN folder
-                    if dir_lower == "nn" or dir_lower == "nn-preemptives" or dir_lower.startswith("nn_") or dir_lower.startswith("nn-preemptives_"):
-                         self.log(f"Processing nested NN folder: {dir_path.name}")
-
-                         # Get all AB1 files in this NN folder
-                         nn_ab1_files = self.file_dao.get_files_by_extension(str(dir_path), ".ab1", recursive=True)
-
-                         if nn_ab1_files:
-                              self.log(f"Found {len(nn_ab1_files)} AB1 files in nested NN folder")
+               return []
 
-                              # Process each file
-                              for file_path in nn_ab1_files:
-                                   file_name = Path(file_path).name
-                                   normalized_name = self.file_dao.normalize_filename(file_name)
+          tree = FolderTree(original_folder)
+          cleanup = FolderCleanup(logger=self.log)
 
-                                   # Find matching entry in order key (if available)
-                                   if self.order_key_index and normalized_name in self.order_key_index:
-                                        matches = self.order_key_index[normalized_name]
-                                        i_num, acct_name, order_num = matches[0]  # Use first match
+          # Sort what is left in nested NN folders, deepest first
+          for dir_path in tree.bottom_up():
+               if dir_path == tree.root or not is_nn_folder(os.path.basename(dir_path)):
+                    continue
+               self.log(f"Processing nested NN folder: {os.path.basename(dir_path)}")
 
-                                        # Create destination folder and move file
-                                        destination_folder = self.create_order_folder(i_num, acct_name, order_num)
-                                        self._place_customer_file(file_path, destination_folder, normalized_name)
-                                   else:
-                                        self.log(f"No order key match for nested NN file: {file_name}")
+               nn_ab1_files = tree.files_under(dir_path, ".ab1")
+               if nn_ab1_files:
+                    self.log(f"Found {len(nn_ab1_files)} AB1 files in nested NN folder")
 
-                         # After processing files, check if NN folder is now empty
-                         if not any(dir_path.iterdir()):
-                              try:
-                                   dir_path.rmdir()
-                                   self.log(f"Deleted empty NN folder: {dir_path.name}")
-                              except Exception as e:
-                                   self.log(f"Failed to delete empty NN folder {dir_path.name}: {e}")
+               for file_path in nn_ab1_files:
+                    file_name = Path(file_path).name
+                    normalized_name = self.file_dao.normalize_filename(file_name)
 
-          # Force refresh directory cache after processing NN folders
-          self.file_dao.get_directory_contents(original_folder, refresh=True)
+                    # Find matching entry in order key (if available)
+                    if self.order_key_index and normalized_name in self.order_key_index:
+                         i_num, acct_name, order_num = self.order_key_index[normalized_name][0]  # Use first match
+                         destination_folder = self.create_order_folder(i_num, acct_name, order_num)
+                         if self._place_customer_file(file_path, destination_folder, normalized_name):
+                              tree.discard_file(file_path)
+                    else:
+                         self.log(f"No order key match for nested NN file: {file_name}")
 
-          # Check if any .ab1 files remain in the original folder
-          ab1_files = self.file_dao.get_files_by_extension(original_folder, ".ab1")
+          # Any .ab1 file left at the top means the folder was not fully sorted
+          ab1_files = sorted(name for name in tree.files[tree.root] if name.endswith(".ab1"))
           if ab1_files:
                self.log(f"Found {len(ab1_files)} remaining .ab1 files in original folder, cannot delete")
-
-               # Log the names of remaining files for debugging
-               for file_path in ab1_files:
-                    self.log(f"Remaining file: {Path(file_path).name}")
-
-               return
-
-          # Refresh directory contents
-          remaining_items = self.file_dao.get_directory_contents(original_folder, refresh=True)
-
-          # If completely empty, delete the folder
-          if not remaining_items:
-               try:
-                    Path(original_folder).rmdir()
-                    self.log(f"Deleted empty original folder: {original_folder}")
-                    return
-               except Exception as e:
-                    self.log(f"Failed to delete original folder: {e}")
-                    return
-
-          # Try to move any remaining Control/Blank folders to the new location
-          moved_all = True
-          item: str
-          for item in list(remaining_items):  # Create a copy of the list to avoid iteration issues
-               item_path = Path(original_folder) / str(item)
-
-               if item in ["Controls", "Blank", "Alternate Injections"]:
-                    # Try to move this folder to the new location if it's not empty
-                    if item_path.is_dir() and any(item_path.iterdir()):
-                         try:
-                              # Create target folder in new location if needed
-                              target_path = Path(new_folder) / item
-                              target_path.mkdir(exist_ok=True)
-
-                              # Move all files from old to new location
-                              for subitem in item_path.iterdir():
-                                   if subitem.is_file():
-                                        new_file = target_path / subitem.name
-                                        self.file_dao.move_file(str(subitem), str(new_file))
-                                        self.log(f"Moved remaining file {subitem.name} to {target_path}")
-
-                              # Check if folder is now empty and can be deleted
-                              if not any(item_path.iterdir()):
-                                   item_path.rmdir()
-                                   self.log(f"Deleted now-empty folder: {item}")
-                         except Exception as e:
-                              self.log(f"Failed to move remaining files from {item}: {e}")
-                              moved_all = False
-                              continue
-
-                    elif item_path.is_dir() and not any(item_path.iterdir()):
-                         # Empty folder - delete it
-                         try:
-                              item_path.rmdir()
-                              self.log(f"Deleted empty folder: {item}")
-                         except Exception as e:
-                              self.log(f"Failed to delete empty folder {item}: {e}")
-                              moved_all = False
-               elif item_path.is_dir():
-                    # Check if this is a non-standard folder (like NN) and if it's empty
-                    dir_lower = item.lower()
-                    if (dir_lower == "nn" or dir_lower == "nn-preemptives" or
-                         dir_lower.startswith("nn_") or dir_lower.startswith("nn-preemptives_")) and not any(item_path.iterdir()):
-                         try:
-                              item_path.rmdir()
-                              self.log(f"Deleted empty NN folder: {item}")
-                              # Remove from remaining items list
-                              remaining_items = [i for i in remaining_items if i != item]
-                              continue
-                         except Exception as e:
-                              self.log(f"Failed to delete empty NN folder {item}: {e}")
-                              moved_all = False
-                    else:
-                         # Non-standard folder
-                         self.log(f"Found non-standard folder in folder: {item}")
-                         moved_all = False
-               else:
-                    # Non-standard item
-                    self.log(f"Found non-standard item in folder: {item}")
-                    moved_all = False
-
-          if moved_all:
-               self.log("Successfully moved all special folders to new location")
-          else:
-               self.log("Some items could not be moved to the new location")
-
-          # Refresh contents one more time after all operations
-          remaining_items = self.file_dao.get_directory_contents(original_folder, refresh=True)
-
-          # If we've successfully cleaned everything up, try to delete the original folder
-          if not remaining_items:
+               for file_name in ab1_files:
+                    self.log(f"Remaining file: {file_name}")
+               cleanup.remove_empty(tree, removable=is_nn_folder)
+               self.destinations.forget(*cleanup.removed)
+               return cleanup.removed
+
+          # Move files left in the special folders to the new location
+          for special_name in ("Controls", "Blank", "Alternate Injections"):
+               special_path = os.path.join(tree.root, special_name)
+               remaining_files = sorted(tree.files.get(special_path, ()))
+               if not remaining_files:
+                    continue
+               target_path = Path(new_folder) / special_name
                try:
-                    Path(original_folder).rmdir()
-                    self.log(f"Deleted original folder after cleaning: {original_folder}")
-               except Exception as e:
-                    self.log(f"Failed to delete original folder: {e}")
+                    target_path.mkdir(exist_ok=True)
+               except OSError as e:
+                    self.log(f"Failed to move remaining files from {special_name}: {e}")
+                    continue
+               for file_name in remaining_files:
+                    if self.file_dao.move_file(os.path.join(special_path, file_name), str(target_path / file_name)):
+                         tree.discard_file(os.path.join(special_path, file_name))
+                         self.log(f"Moved remaining file {file_name} to {target_path}")
+
+          special_names = {"Controls", "Blank", "Alternate Injections"}
+          cleanup.remove_empty(tree, include_root=True,
+                               removable=lambda name: name in special_names or is_nn_folder(name))
+          self.file_dao.directory_cache.pop(Path(original_folder), None)
+          self.destinations.forget(*cleanup.removed)
+
+          if tree.root in cleanup.removed:
+               self.log(f"Deleted original folder after cleaning: {original_folder}")
           else:
-               # Check if all remaining items are empty NN folders
-               all_empty_nn = True
-               for item in remaining_items:
-                    item_path = Path(original_folder) / str(item)
-                    if not item_path.is_dir():
-                         all_empty_nn = False
-                         break
-
-                    dir_lower = item.lower()
-                    if not (dir_lower == "nn" or dir_lower == "nn-preemptives" or
-                         dir_lower.startswith("nn_") or dir_lower.startswith("nn-preemptives_")):
-                         all_empty_nn = False
-                         break
-
-                    if any(item_path.iterdir()):
-                         all_empty_nn = False
-                         break
-
-               if all_empty_nn:
-                    # Delete all empty NN folders
-                    for item in list(remaining_items):
-                         item_path = Path(original_folder) / str(item)
-                         try:
-                              item_path.rmdir()
-                              self.log(f"Deleted empty NN folder: {item}")
-                         except Exception as e:
-                              self.log(f"Failed to delete empty NN folder {item}: {e}")
-
-                    # Try to delete the original folder again
-                    try:
-                         Path(original_folder).rmdir()
-                         self.log(f"Deleted original folder after cleaning all empty NN folders: {original_folder}")
-                    except Exception as e:
-                         self.log(f"Failed to delete original folder: {e}")
-               else:
-                    self.log(f"Unable to clean up original folder. {len(remaining_items)} items remain.")
+               self.log(f"Unable to clean up original folder. {tree.entry_count(tree.root)} items remain.")
+          return cleanup.removed
 
      def _sort_pcr_file(self, file_path, pcr_number):
           """Sort a PCR file to the appropriate folder"""
@@ -1166,6 +1260,7 @@ class FolderProcessor:
                if not new_folder_path.exists() and folder_pathobj.name != new_folder_name:
                     try:
                          folder_pathobj.rename(new_folder_path)
+                         self.destinations.forget(folder_path, new_folder_path)
                          self.log(f"Renamed folder to: {new_folder_name}")
                          return True
                     except Exception as e:
@@ -1255,9 +1350,11 @@ class FolderProcessor:
                          matching_files.append(item.name)
           return matching_files
 
+     @timed()
      def get_reinject_list(self, i_numbers, reinject_path=None):
           """Get list of reactions that are reinjects - optimized version"""
           from pathlib import Path
+          import numpy as np
 
           # Helper function to check if entry is just a well location
           def is_valid_entry(raw_name):
@@ -1276,8 +1373,8 @@ class FolderProcessor:
           processed_files = set()
 
           # Process text files only once
-          spreadsheets_path = Path(r'G:\Lab\Spreadsheets')
-          abi_path = spreadsheets_path / 'Individual Uploaded to ABI'
+          spreadsheets_path = Path(self.config.SPREADSHEETS_PATH)
+          abi_path = Path(self.config.ABI_UPLOAD_PATH)
           reinject_files = []
 
           # Build list of reinject files
@@ -1412,53 +1509,73 @@ class FolderProcessor:
                     - has_ab1_files: True if folder contains .ab1 files
           """
 
-          was_mseqed = False
-          has_braces = False
-          has_ab1_files = False
-
-          folder_path = Path(folder_path)
-          folder_contents = list(self.file_dao.get_directory_contents(folder_path))
-
-          # Check for mSeq directory structure
-          mseq_set = {'chromat_dir', 'edit_dir', 'phd_dir', 'mseq4.ini'}
-          current_proj = [item.name if hasattr(item, "name") else str(item) for item in folder_contents if (item.name if hasattr(item, "name") else str(item)) in mseq_set]
-
-          if set(current_proj) == mseq_set:
-               was_mseqed = True
-
-          # Check for the 5 txt files as an additional verification
-          txt_file_count = 0
-          for item in folder_contents:
-               item_name = item.name if hasattr(item, "name") else str(item)
-               item_path = folder_path / item_name
-               if item_path.is_file():
-                    if (item_name.endswith('.raw.qual.txt') or
-                              item_name.endswith('.raw.seq.txt') or
-                              item_name.endswith('.seq.info.txt') or
-                              item_name.endswith('.seq.qual.txt') or
-                              item_name.endswith('.seq.txt')):
-                         txt_file_count += 1
-
-          if txt_file_count == 5:
-               was_mseqed = True
-
-          # Check for .ab1 files and braces
-          for item in folder_contents:
-               item_name = item.name if hasattr(item, "name") else str(item)
-               if item_name.endswith(self.config.ABI_EXTENSION):
-                    has_ab1_files = True
-                    if '{' in item_name or '}' in item_name:
-                         has_braces = True
-
-          return was_mseqed, has_braces, has_ab1_files
-
-     def zip_order_folder(self, folder_path, include_txt=True):
+          # An unchanged folder keeps the status recorded on a previous run
+          cached = self._state('get_order_status', folder_path)
+          if cached is not None:
+               return cached
+
+          # mSeq project structure or all 5 txt outputs means it was processed
+          status = self.file_dao.get_folder_status(folder_path)
+          order_status = status.order_status(len(self.config.TEXT_FILES))
+          if status.exists:
+               self._state('record_status', folder_path, status, order_status)
+          return order_status
+
+     def check_for_zip(self, folder_path, include_txt=True):
+          """
+          Check if an order folder has a current zip, trusting the state store while the folder is unchanged
+
+          A zip whose member manifest no longer matches the folder (e.g. a reinject
+          landed after zipping) does not count, so zip_order_folder updates it.
+          """
+          zip_path = self._state('get_zip_path', folder_path)
+          if zip_path is not None:
+               return bool(zip_path)
+
+          status = self.file_dao.get_folder_status(folder_path)
+          if status.zip_files:
+               expected_zip, file_extensions = self._zip_plan(folder_path, include_txt, status)
+               if expected_zip is not None and expected_zip.name in status.zip_files and \
+                    not self.file_dao.zip_is_current(folder_path, str(expected_zip), file_extensions):
+                    self.log(f"Zip is out of date with its folder: {expected_zip.name}")
+                    return False
+          if status.exists:
+               self._state('record_status', folder_path, status, status.order_status(len(self.config.TEXT_FILES)))
+          return bool(status.zip_files)
+
+     def _zip_plan(self, folder_path, include_txt, status):
+          """(zip path, file extensions) zip_order_folder uses for a folder, (None, None) if it cannot be named"""
+          folder_name = Path(folder_path).name
+          if self.config.ANDREEV_NAME.lower() in folder_name.lower():
+               # Andreev's naming format "123456_I-20000.zip", never with txt files
+               order_number = self.get_order_number_from_folder_name(folder_path)
+               i_number = self.file_dao.get_inumber_from_name(folder_name)
+               if not order_number or not i_number:
+                    return None, None
+               zip_filename = f"{order_number}_I-{i_number}.zip"
+               include_txt = False
+          else:
+               # Standard naming format "BioI-20000_Customer_123456.zip"
+               zip_filename = f"{folder_name}.zip"
+
+          if status.fsa_count > 0:
+               # FSA folders: only .fsa files
+               file_extensions = [self.config.FSA_EXTENSION]
+          else:
+               file_extensions = [self.config.ABI_EXTENSION]
+               if include_txt:
+                    file_extensions.extend(self.config.TEXT_FILES)
+          return Path(folder_path) / zip_filename, file_extensions
+
+     @timed()
+     def zip_order_folder(self, folder_path, include_txt=True, dump_folder=None):
           """
           Zip the contents of an order folder with special handling for Andreev orders
 
           Args:
                folder_path (str): Path to the order folder
                include_txt (bool): Whether to include text files in zip
+               dump_folder (str, optional): Zip dump folder to deliver the zip to as it is written
 
           Returns:
                str: Path to created zip file, or None if failed
@@ -1468,69 +1585,45 @@ class FolderProcessor:
                folder_name = folder_path_obj.name
                
                # Check if folder is empty
-               folder_contents = list(folder_path_obj.iterdir())
-               if not folder_contents:
+               status = self.file_dao.get_folder_status(folder_path)
+               if not status.item_count:
                     self.log(f"Skipping zip creation for empty folder: {folder_name}")
                     return None
                
                # Check for files with braces in their names (only in root directory, not subdirectories)
-               files_with_braces = []
-               for item in folder_contents:
-                    if item.is_file() and ('{' in item.name or '}' in item.name):
-                         files_with_braces.append(item.name)
+               files_with_braces = status.brace_files
                
                if files_with_braces:
                     self.log(f"Skipping zip creation for folder with braces in filenames: {folder_name}")
                     self.log(f"Files with braces: {', '.join(files_with_braces)}")
                     return None
                
-               is_andreev_order = self.config.ANDREEV_NAME.lower() in folder_name.lower()
-
-               # For Andreev orders, use different naming and never include txt files
-               if is_andreev_order:
-                    # Extract order number and I-number from folder name
-                    order_number = self.get_order_number_from_folder_name(folder_path)
-                    i_number = self.file_dao.get_inumber_from_name(folder_name)
-
-                    if not order_number or not i_number:
-                         self.log(f"Could not extract order number or I-number for Andreev order: {folder_name}")
-                         return None
-
-                    # Use Andreev's preferred naming format: "123456_I-20000.zip"
-                    zip_filename = f"{order_number}_I-{i_number}.zip"
-                    include_txt = False  # Never include txt files for Andreev
-               else:
-                    # Use standard naming format: "BioI-20000_Customer_123456.zip"
-                    zip_filename = f"{folder_name}.zip"
-
-               zip_path = folder_path_obj / zip_filename
-
-               # Check if this folder contains FSA files
-               has_fsa_files = self.file_dao.contains_file_type(folder_path, self.config.FSA_EXTENSION)
+               # Andreev orders use a different name and never include txt files
+               zip_path, file_extensions = self._zip_plan(folder_path, include_txt, status)
+               if zip_path is None:
+                    self.log(f"Could not extract order number or I-number for Andreev order: {folder_name}")
+                    return None
+               zip_filename = zip_path.name
 
-               # Determine which files to include based on file types present
-               if has_fsa_files:
-                    # FSA folders: include only .fsa files
-                    file_extensions = [self.config.FSA_EXTENSION]
+               if status.fsa_count > 0:
                     self.log(f"FSA folder detected, including only .fsa files: {zip_filename}")
                else:
-                    # Regular folders: include .ab1 files and optionally .txt files
-                    file_extensions = [self.config.ABI_EXTENSION]
-                    if include_txt:
-                         file_extensions.extend(self.config.TEXT_FILES)
-                    self.log(f"Regular folder, including .ab1 files{' and .txt files' if include_txt else ''}: {zip_filename}")
+                    with_txt = self.config.TEXT_FILES[0] in file_extensions
+                    self.log(f"Regular folder, including .ab1 files{' and .txt files' if with_txt else ''}: {zip_filename}")
 
-               # Create zip file
+               # Create zip file (an existing zip is brought up to date instead)
                self.log(f"Creating zip file: {zip_filename}")
                success = self.file_dao.zip_files(
                     source_folder=str(folder_path_obj),  # Convert Path object to string
                     zip_path=str(zip_path), # Convert Path object back to string
                     file_extensions=file_extensions,
-                    exclude_extensions=None
+                    exclude_extensions=None,
+                    dump_folder=dump_folder
                )
 
                if success:
                     self.log(f"Successfully created zip file: {zip_path}")
+                    self._state('record_stage', folder_path, 'zipped', zip_path=str(zip_path))
                     return str(zip_path) # Convert Path object back to string
                else:
                     self.log(f"Failed to create zip file: {zip_path}")
@@ -1539,7 +1632,8 @@ class FolderProcessor:
                self.log(f"Error creating zip file for {folder_path}: {e}")
                return None
 
-     def zip_full_plasmid_order_folder(self, folder_path, order_key=None, order_number=None, use_7zip=False, compression_level=6):
+     def zip_full_plasmid_order_folder(self, folder_path, order_key=None, order_number=None, use_7zip=False, compression_level=6,
+                                       dump_folder=None):
           """
           Zip the contents of a full plasmid sequencing order folder.
 
@@ -1549,6 +1643,7 @@ class FolderProcessor:
                order_number (str, optional): Order number to filter order key entries
                use_7zip (bool, optional): Whether to try using 7-Zip for compression (default: False)
                compression_level (int, optional): Compression level 0-9, where 9 is maximum (default: 6)
+               dump_folder (str, optional): Zip dump folder to deliver the zip to
 
           Returns:
                str: Path to created zip file, or None if failed
@@ -1563,14 +1658,7 @@ class FolderProcessor:
                zip_path = Path(folder_path) / zip_filename
 
                # Define file extensions to include
-               plasmid_extensions = [
-                    '.annotations.bed',
-                    '.annotations.gbk',
-                    '.assembly_stats.tsv',
-                    '.final.fasta',
-                    '.final.fastq',
-                    '.html'  # Include the validation report HTML
-               ]
+               plasmid_extensions = self.PLASMID_EXTENSIONS
 
                # Collect all files to zip
                all_files = []
@@ -1642,6 +1730,8 @@ class FolderProcessor:
                                         except Exception as e:
                                              self.log(f"Warning: Failed to remove list file: {e}")
 
+                                        if dump_folder is not None:
+                                             self.file_dao.deliver_zip(str(zip_path), dump_folder)
                                         return str(zip_path)
                                    else:
                                         self.log(f"7-Zip reported success but zip file not found at: {zip_path}")
@@ -1664,7 +1754,9 @@ class FolderProcessor:
                # Ensure compression level is within valid range
                python_compression = max(0, min(9, compression_level))
 
-               with zipfile.ZipFile(str(zip_path), 'w', zipfile.ZIP_DEFLATED, compresslevel=python_compression) as zipf:
+               # The dump copy, if any, is written or linked along with the zip
+               with self.file_dao.open_zip_output(str(zip_path), dump_folder) as output, \
+                    zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED, compresslevel=python_compression) as zipf:
                     for item in all_files:
                          file_path = folder_pathobj / item
 
@@ -1682,6 +1774,9 @@ class FolderProcessor:
                               file_data = f.read()
                               zipf.writestr(zipinfo, file_data, zipfile.ZIP_DEFLATED)
 
+                    # Member manifest, so a changed folder is noticed and re-zipped
+                    zipf.comment = manifest_comment(zipf, source_entries(folder_pathobj / item for item in all_files))
+
                self.log(f"Successfully created zip file using Python zipfile: {zip_path}")
                return str(zip_path)
 
@@ -1693,6 +1788,10 @@ class FolderProcessor:
 
      def find_zip_file(self, folder_path):
           """Find zip file in a folder"""
+          zip_path = self._state('get_zip_path', folder_path)
+          if zip_path is not None:
+               return zip_path or None
+
           folder_pathobj = Path(folder_path)
           for item in folder_pathobj.iterdir():
                if item.suffix == '.zip' and item.is_file():
@@ -1751,6 +1850,7 @@ class FolderProcessor:
           return order_folders
 
 
+     @timed()
      def validate_zip_contents(self, zip_path, i_number, order_number, order_key):
           """
           Validate zip file contents against order key
@@ -1765,7 +1865,6 @@ class FolderProcessor:
                dict: Validation results with match/mismatch details
           """
           import zipfile
-          import numpy as np
 
           # Results to return
           validation_result = {
@@ -1781,29 +1880,13 @@ class FolderProcessor:
           }
 
           try:
-               # Get expected files from order key for this order
+               # Get expected files from order key for this order (table built once per order key)
                order_items = []
-
-               # Handle NumPy array properly
-               if isinstance(order_key, np.ndarray):
-                    # Use NumPy's boolean indexing for efficient filtering
-                    mask = (order_key[:, 0] == i_number) & (order_key[:, 2] == order_number)
-                    matching_rows = order_key[mask]
-
-                    for row in matching_rows:
-                         raw_name = row[3]
-                         # Use customer-specific normalization (same as order key)
-                         adjusted_name = self.file_dao.standardize_for_customer_files(raw_name, remove_extension=True)
-                         order_items.append({'raw_name': raw_name, 'adjusted_name': adjusted_name})
-                         self.log(f"DEBUG: Order key entry - Raw: '{raw_name}' -> Adjusted: '{adjusted_name}'")
-               else:
-                    # Fallback for non-NumPy arrays
-                    for entry in order_key:
-                         if entry[0] == i_number and entry[2] == order_number:
-                              raw_name = entry[3]
-                              adjusted_name = self.file_dao.standardize_for_customer_files(raw_name, remove_extension=True)
-                              order_items.append({'raw_name': raw_name, 'adjusted_name': adjusted_name})
-                              self.log(f"DEBUG: Order key entry - Raw: '{raw_name}' -> Adjusted: '{adjusted_name}'")
+               for raw_name in self.order_key_tables(order_key).samples.get((str(i_number), str(order_number)), []):
+                    # Use customer-specific normalization (same as order key)
+                    adjusted_name = self.file_dao.standardize_for_customer_files(raw_name, remove_extension=True)
+                    order_items.append({'raw_name': raw_name, 'adjusted_name': adjusted_name})
+                    self.debug("Order key entry - Raw: '%s' -> Adjusted: '%s'", raw_name, adjusted_name)
 
                validation_result['expected_count'] = len(order_items)
 
@@ -1814,9 +1897,13 @@ class FolderProcessor:
                # Get only AB1 files from zip for matching
                zip_ab1_files = [f for f in zip_contents if f.endswith('.ab1')]
 
-               self.log(f"DEBUG: Starting match process for {len(order_items)} expected items vs {len(zip_ab1_files)} AB1 files in zip")
-               self.log(f"DEBUG: Expected items: {[item['adjusted_name'] for item in order_items]}")
-               self.log(f"DEBUG: Zip AB1 files: {zip_ab1_files}")
+               debug_enabled = self._levels.debug_enabled
+               trace_enabled = self._levels.trace_enabled
+               self.debug("Starting match process for %d expected items vs %d AB1 files in zip",
+                          len(order_items), len(zip_ab1_files))
+               if debug_enabled:
+                    self.debug("Expected items: %s", [item['adjusted_name'] for item in order_items])
+                    self.debug("Zip AB1 files: %s", zip_ab1_files)
 
                # Track which items have been matched
                matched_order_indices = set()
@@ -1829,7 +1916,7 @@ class FolderProcessor:
 
                     adjusted_name = order_item['adjusted_name']
                     raw_name = order_item['raw_name']
-                    self.log(f"DEBUG: Looking for match for '{adjusted_name}'...")
+                    self.debug("Looking for match for '%s'...", adjusted_name)
 
                     for zip_idx, zip_item in enumerate(zip_ab1_files):
                          if zip_idx in matched_zip_indices:
@@ -1838,10 +1925,11 @@ class FolderProcessor:
                          # Use customer-specific normalization consistently
                          clean_zip_item = self.file_dao.standardize_for_customer_files(zip_item, remove_extension=True)
 
-                         self.log(f"DEBUG:   Checking against: '{zip_item}' -> '{clean_zip_item}'")
+                         if trace_enabled:
+                              self._levels.trace("  Checking against: '%s' -> '%s'", zip_item, clean_zip_item)
 
                          if clean_zip_item == adjusted_name:  # Match found
-                              self.log(f"DEBUG:   ! MATCH FOUND! '{raw_name}' matches '{zip_item}'")
+                              self.debug("  ! MATCH FOUND! '%s' matches '%s'", raw_name, zip_item)
                               validation_result['matches'].append({
                                    'raw_name': raw_name,
                                    'file_name': zip_item
@@ -1856,7 +1944,7 @@ class FolderProcessor:
                # Record unmatched order items as mismatches
                for order_idx, order_item in enumerate(order_items):
                     if order_idx not in matched_order_indices:
-                         self.log(f"DEBUG: X NO MATCH found for '{order_item['raw_name']}' (adjusted: '{order_item['adjusted_name']}')")
+                         self.debug("X NO MATCH found for '%s' (adjusted: '%s')", order_item['raw_name'], order_item['adjusted_name'])
                          validation_result['mismatches_in_order'].append({
                               'raw_name': order_item['raw_name']
                          })
@@ -1865,17 +1953,16 @@ class FolderProcessor:
                # Record unmatched zip files as extra files
                for zip_idx, zip_item in enumerate(zip_ab1_files):
                     if zip_idx not in matched_zip_indices:
-                         self.log(f"DEBUG: Found extra AB1 file in zip: {zip_item}")
+                         self.debug("Found extra AB1 file in zip: %s", zip_item)
                          validation_result['mismatches_in_zip'].append(zip_item)
                          validation_result['extra_ab1_count'] += 1
                          validation_result['mismatch_count'] += 1
 
-               self.log(f"DEBUG: Final match summary:")
-               self.log(f"DEBUG: - Expected files: {len(order_items)}")
-               self.log(f"DEBUG: - Zip AB1 files: {len(zip_ab1_files)}")
-               self.log(f"DEBUG: - Successful matches: {len(matched_order_indices)}")
-               self.log(f"DEBUG: - Unmatched order items: {len(order_items) - len(matched_order_indices)}")
-               self.log(f"DEBUG: - Extra zip files: {len(zip_ab1_files) - len(matched_zip_indices)}")
+               self.debug("Final match summary: %d expected files, %d zip AB1 files, %d matches, "
+                          "%d unmatched order items, %d extra zip files",
+                          len(order_items), len(zip_ab1_files), len(matched_order_indices),
+                          len(order_items) - len(matched_order_indices),
+                          len(zip_ab1_files) - len(matched_zip_indices))
 
                # Check for text files
                txt_extensions = self.config.TEXT_FILES
@@ -2013,89 +2100,34 @@ class FolderProcessor:
                self.log(f"Error processing plate zip file {zip_path}: {e}")
                return None
 
-     def _try_delete_if_empty(self, folder_path, depth=0):
-          """
-          Recursively check if a folder is empty or contains only empty folders,
-          and delete it if so.
-
-          Args:
-               folder_path (pathlib.Path): Path to the folder to check
-               depth (int): Current recursion depth (for logging)
-
-          Returns:
-               bool: True if the folder was empty or successfully deleted, False otherwise
-          """
-          if not folder_path.exists():
-               return True
-
-          # Check if this folder should be preserved
-          folder_name_lower = folder_path.name.lower()
-          if folder_name_lower.startswith('ind') or folder_name_lower.startswith('fb-pcr'):
-               self.log(f"Preserving protected folder: {folder_path.name}")
-               return False
-
-          # Get list of items in the folder
-          try:
-               items = list(folder_path.iterdir())
-          except Exception as e:
-               self.log(f"Error listing directory {folder_path}: {e}")
-               return False
-
-          # If folder is already empty, try to delete it
-          if not items:
-               try:
-                    folder_path.rmdir()
-                    self.log(f"Deleted empty folder in final cleanup: {folder_path}")
-                    return True
-               except Exception as e:
-                    self.log(f"Failed to delete empty folder {folder_path}: {e}")
-                    return False
-
-          # Check if all items are directories that can be deleted
-          all_removable = True
-          for item in items:
-               if item.is_dir():
-                    # Recursively check if this subdirectory can be deleted
-                    if not self._try_delete_if_empty(item, depth + 1):
-                         all_removable = False
-               else:
-                    # It's a file, so this directory cannot be removed
-                    all_removable = False
-
-          # If all subdirectories were removed, try to delete this directory too
-          if all_removable:
-               # Check again if the folder is now empty
-               if not list(folder_path.iterdir()):
-                    try:
-                         folder_path.rmdir()
-                         self.log(f"Deleted empty folder in final cleanup: {folder_path}")
-                         return True
-                    except Exception as e:
-                         self.log(f"Failed to delete empty folder {folder_path}: {e}")
-                         return False
-
-          return False
-
+     @timed()
      def final_cleanup(self, root_folder):
           """
           Final cleanup pass to delete any empty folders that might have been missed.
 
+          One bottom-up walk of the root folder; folders that are empty or hold
+          only empty folders are deleted. ind* and FB-PCR* folders are neither
+          entered nor deleted, and the root folder itself is kept.
+
           Args:
                root_folder (pathlib.Path): Root folder to start cleanup from
+
+          Returns:
+               list: Folders that were deleted
           """
           self.log(f"Running final cleanup on: {root_folder}")
 
-          # Get all folders in the root directory
-          folders_to_check = []
-          for item in root_folder.iterdir():
-               if item.is_dir():
-                    folders_to_check.append(item)
+          tree = FolderTree(root_folder, skip=is_protected_folder)
+          for folder in sorted(tree.skipped):
+               self.debug("Preserving protected folder: %s", os.path.basename(folder))
 
-          # Process each folder to see if it's empty or contains only empty folders
-          for folder in folders_to_check:
-               self._try_delete_if_empty(folder)
+          cleanup = FolderCleanup(logger=self.log)
+          removed = cleanup.remove_empty(tree)
+          self.file_dao.directory_cache.clear()
+          self.destinations.forget(*removed)
 
-          self.log("Final cleanup complete")
+          self.log(f"Final cleanup complete: {len(removed)} empty folders deleted, {len(cleanup.failed)} failed")
+          return removed
 
 
 
@@ -0,0 +1,149 @@
+# folder_status.py
+import os
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+MSEQ_PROJECT_ITEMS = frozenset({'chromat_dir', 'edit_dir', 'phd_dir', 'mseq4.ini'})
+
+
+class OutputSuffixTable:
+    """
+    Longest-suffix lookup for mSeq output names
+
+    Several outputs share endings ('.seq.txt' is also the tail of
+    '.raw.seq.txt'), so a name is matched against its longest dotted tail first
+    and each file maps to exactly one output type. Lookups are a handful of
+    dict probes instead of one endswith per suffix.
+    """
+
+    def __init__(self, suffixes):
+        self.suffixes = tuple(suffixes)
+        self._lookup = {suffix.lower(): suffix for suffix in self.suffixes}
+        self._max_parts = max((suffix.count('.') for suffix in self.suffixes), default=0)
+
+    def match(self, name):
+        """Return the output suffix a file name ends with, or None"""
+        lower = name.lower()
+        end = len(lower)
+        dots = []
+        pos = end
+        # Collect up to _max_parts dot positions from the right
+        while len(dots) < self._max_parts:
+            pos = lower.rfind('.', 0, pos)
+            if pos <= 0:
+                break
+            dots.append(pos)
+        for pos in reversed(dots):
+            suffix = self._lookup.get(lower[pos:])
+            if suffix is not None:
+                return suffix
+        return None
+
+
+@lru_cache(maxsize=8)
+def get_suffix_table(suffixes):
+    """Shared OutputSuffixTable for a tuple of suffixes"""
+    return OutputSuffixTable(suffixes)
+
+
+class FolderStatus:
+    """Snapshot of what mSeq-relevant files a folder contains"""
+
+    __slots__ = ('path', 'exists', 'mtime_ns', 'scanned_ns', 'item_count', 'project_items', 'outputs',
+                 'output_count', 'ab1_files', 'brace_files', 'zip_files', 'fsa_count',
+                 'has_braces')
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.exists = False
+        self.mtime_ns = None
+        self.scanned_ns = None
+        self.item_count = 0
+        self.project_items = set()   # chromat_dir, edit_dir, phd_dir, mseq4.ini present
+        self.outputs = {}            # output suffix -> number of files
+        self.output_count = 0        # files matching any output suffix
+        self.ab1_files = []          # names of .ab1 files
+        self.brace_files = []        # names of files with braces
+        self.zip_files = []          # names of .zip files
+        self.fsa_count = 0
+        self.has_braces = False      # any .ab1 file still has brace tags
+
+    @property
+    def has_mseq_project(self):
+        """True if all the mSeq project directories and ini file are present"""
+        return self.project_items == MSEQ_PROJECT_ITEMS
+
+    def outputs_complete(self, expected):
+        """True if at least expected output files have been written"""
+        return self.output_count >= expected
+
+    @property
+    def has_ab1_files(self):
+        return bool(self.ab1_files)
+
+    @property
+    def ab1_count(self):
+        return len(self.ab1_files)
+
+    def order_status(self, expected_outputs):
+        """(was_mseqed, has_braces, has_ab1_files) as returned by check_order_status"""
+        was_mseqed = self.has_mseq_project or self.output_count == expected_outputs
+        return was_mseqed, self.has_braces, self.has_ab1_files
+
+
+def scan_folder_status(folder_path, config):
+    """
+    Scan a folder once and classify every entry
+
+    Uses a single scandir pass; entry types come from the directory listing so
+    no extra stat is needed per file. A missing or unreadable folder gives an
+    empty status with exists=False.
+    """
+    status = FolderStatus(folder_path)
+    table = get_suffix_table(tuple(config.TEXT_FILES))
+    abi_ext = config.ABI_EXTENSION.lower()
+    zip_ext = config.ZIP_EXTENSION.lower()
+    fsa_ext = config.FSA_EXTENSION.lower()
+
+    try:
+        status.scanned_ns = time.time_ns()
+        status.mtime_ns = os.stat(folder_path).st_mtime_ns
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                name = entry.name
+                status.item_count += 1
+
+                if name in MSEQ_PROJECT_ITEMS:
+                    status.project_items.add(name)
+                    continue
+
+                if not entry.is_file():
+                    continue
+
+                has_brace = '{' in name or '}' in name
+                if has_brace:
+                    status.brace_files.append(name)
+
+                lower = name.lower()
+                if lower.endswith(abi_ext):
+                    status.ab1_files.append(name)
+                    if has_brace and name.endswith(config.ABI_EXTENSION):
+                        status.has_braces = True
+                elif lower.endswith(zip_ext):
+                    status.zip_files.append(name)
+                elif lower.endswith(fsa_ext):
+                    status.fsa_count += 1
+                else:
+                    suffix = table.match(name)
+                    if suffix is not None:
+                        status.outputs[suffix] = status.outputs.get(suffix, 0) + 1
+                        status.output_count += 1
+        status.exists = True
+    except OSError:
+        return FolderStatus(folder_path)
+
+    return status
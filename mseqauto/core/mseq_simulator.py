@@ -0,0 +1,133 @@
+# mseq_simulator.py
+import logging
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+
+class MseqSimulator:
+    """
+    Headless stand-in for MseqAutomation
+
+    Honors the same interface (connect_or_start_mseq, process_folder, close) but
+    instead of driving the mSeq GUI it writes the project artifacts mSeq leaves
+    behind (chromat_dir, edit_dir, phd_dir, mseq4.ini) and the five TEXT_FILES
+    outputs. Latency and failure rate are configurable so the rest of the
+    pipeline can be benchmarked and tested without Windows.
+    """
+
+    def __init__(self, config, logger=None, latency=0.0, per_file_latency=0.0,
+                 startup_latency=0.0, failure_rate=0.0, seed=None):
+        """
+        Args:
+            config: MseqConfig (or compatible) instance
+            logger: Logger object, defaults to the module logger
+            latency (float): Fixed seconds spent per folder
+            per_file_latency (float): Additional seconds per .ab1 file
+            startup_latency (float): Seconds to "launch" mSeq after a close
+            failure_rate (float): Probability (0-1) that a folder fails part way
+            seed (int): Seed for the failure RNG so runs are reproducible
+        """
+        self.config = config
+        self.logger = logger or logging.getLogger(__name__)
+        self.latency = latency
+        self.per_file_latency = per_file_latency
+        self.startup_latency = startup_latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.app = None
+        self.main_window = None
+
+        # Counters for benchmark reporting
+        self.stats = {
+            'starts': 0,
+            'closes': 0,
+            'folders_processed': 0,
+            'folders_failed': 0,
+            'files_processed': 0,
+            'busy_time': 0.0
+        }
+
+    def connect_or_start_mseq(self):
+        """Pretend to connect to (or start) mSeq"""
+        if self.app is None:
+            if self.startup_latency:
+                time.sleep(self.startup_latency)
+            self.app = self
+            self.main_window = self
+            self.stats['starts'] += 1
+            self.logger.info("Started simulated mSeq instance")
+        return self.app, self.main_window
+
+    def process_folder(self, folder_path):
+        """Simulate an mSeq run over a folder, returning True on success"""
+        folder = Path(folder_path)
+        if not folder.exists():
+            self.logger.warning(f"Folder does not exist: {folder_path}")
+            return False
+
+        ab1_files = [f.name for f in folder.iterdir() if f.suffix == self.config.ABI_EXTENSION]
+        if not ab1_files:
+            self.logger.warning(f"No AB1 files found in {folder_path}")
+            return False
+
+        self.logger.info(f"Processing folder with {len(ab1_files)} AB1 files: {folder_path}")
+        self.connect_or_start_mseq()
+
+        start_time = time.time()
+        delay = self.latency + self.per_file_latency * len(ab1_files)
+        if delay:
+            time.sleep(delay)
+
+        with self._lock:
+            failed = self.failure_rate > 0 and self._random.random() < self.failure_rate
+
+        self._write_project(folder, ab1_files)
+
+        # A failed run looks like mSeq stalling on the Low quality dialog: only
+        # four of the five text files get written
+        outputs = self.config.TEXT_FILES[:-1] if failed else self.config.TEXT_FILES
+        for ext in outputs:
+            (folder / f"{folder.name}{ext}").write_text(f"simulated mSeq output for {len(ab1_files)} files\n")
+
+        with self._lock:
+            self.stats['busy_time'] += time.time() - start_time
+            if failed:
+                self.stats['folders_failed'] += 1
+            else:
+                self.stats['folders_processed'] += 1
+                self.stats['files_processed'] += len(ab1_files)
+
+        if failed:
+            self.logger.warning(f"Processing may not have completed properly for {folder_path}")
+            return False
+
+        self.logger.info(f"Successfully processed {folder_path}")
+        return True
+
+    def _write_project(self, folder, ab1_files):
+        """Write the mSeq project directories and ini file"""
+        for dir_name in ('chromat_dir', 'edit_dir', 'phd_dir'):
+            (folder / dir_name).mkdir(exist_ok=True)
+
+        # mSeq keeps its own copies of the chromatograms and phd outputs
+        for name in ab1_files:
+            stem = Path(name).stem
+            (folder / 'chromat_dir' / name).touch()
+            (folder / 'phd_dir' / f"{stem}.phd.1").touch()
+
+        (folder / 'mseq4.ini').write_text(f"[mSeq]\nproject={folder.name}\nfiles={len(ab1_files)}\n")
+
+    def close(self):
+        """Close the simulated mSeq application"""
+        if self.app:
+            self.app = None
+            self.main_window = None
+            self.stats['closes'] += 1
+            self.logger.info("mSeq application closed")
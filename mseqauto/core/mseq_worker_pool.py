@@ -0,0 +1,407 @@
+# mseq_worker_pool.py
+import logging
+import multiprocessing as mp
+import pickle
+import queue
+import sys
+import time
+import traceback
+from collections import deque
+from multiprocessing import connection
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+from mseqauto.core.folder_status import scan_folder_status  # type: ignore
+
+
+def create_mseq_automation(config, worker_id, input_lock=None):
+    """
+    Default automation factory - one MseqAutomation per worker process
+
+    Each drives its own mSeq process, bound by process id, and takes
+    input_lock while sending keystrokes and clicks.
+    """
+    # Imported here so only the worker processes pay for pywinauto
+    from mseqauto.core.ui_automation import MseqAutomation  # type: ignore
+    return MseqAutomation(config, logger=logging.getLogger(f"mseq_worker_{worker_id}"),
+                          dedicated=True, input_lock=input_lock)
+
+
+def count_text_outputs(folder_path, config):
+    """Count the mSeq text outputs (TEXT_FILES) present in a folder"""
+    return scan_folder_status(folder_path, config).output_count
+
+
+class _InputLock:
+    """
+    Cross-process lock held while a worker sends input to the desktop
+
+    Records which worker holds it, so the parent can free it when it has to
+    kill that worker mid-dialog instead of leaving every other worker stuck.
+    """
+
+    def __init__(self, ctx):
+        self._lock = ctx.Lock()
+        self._owner = ctx.Value('i', -1, lock=False)
+        self.worker_id = -1     # set in each worker process
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._owner.value = self.worker_id
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._owner.value = -1
+        self._lock.release()
+
+    def release_for(self, worker_id):
+        """Free the lock if a (dead) worker still holds it"""
+        if worker_id >= 0 and self._owner.value == worker_id:
+            self._owner.value = -1
+            self._lock.release()
+
+
+def _worker_main(worker_id, config, automation_factory, task_queue, result_conn, heartbeat,
+                 input_lock, poll_interval):
+    """
+    Worker process loop
+
+    Each worker owns its own automation instance (and therefore its own mSeq
+    application and window handles) and takes (task_id, folder) pairs from its
+    own queue until it receives the None sentinel. It reports 'ready' once
+    mSeq is set up and 'done' after every folder; the parent only hands it the
+    next folder then, so the parent always knows which folder a worker holds,
+    even if the process is killed before it starts on it. Messages go through
+    the worker's own pipe: a worker killed mid-message cannot leave a shared
+    queue locked for the others.
+    """
+    input_lock.worker_id = worker_id
+    try:
+        automation = automation_factory(config, worker_id, input_lock)
+    except Exception as e:
+        result_conn.send(('failed_start', worker_id, None, f"{e}\n{traceback.format_exc()}"))
+        return
+
+    result_conn.send(('ready', worker_id, None, None))
+
+    try:
+        while True:
+            heartbeat.value = time.time()
+            try:
+                task = task_queue.get(timeout=poll_interval)
+            except queue.Empty:
+                continue
+
+            if task is None:
+                break
+
+            task_id, folder = task
+            start_time = time.time()
+            error = None
+            try:
+                success = bool(automation.process_folder(folder))
+            except Exception as e:
+                success = False
+                error = f"{e}\n{traceback.format_exc()}"
+
+            result_conn.send(('done', worker_id, task_id, {
+                'success': success,
+                'error': error,
+                'elapsed': time.time() - start_time
+            }))
+    finally:
+        try:
+            automation.close()
+        except Exception:
+            pass
+
+
+class MseqWorkerPool:
+    """
+    Orchestrates K isolated mSeq worker processes.
+
+    Folders are handed out one at a time to idle workers, each through its
+    own queue. automation_factory(config, worker_id, input_lock) builds a
+    worker's automation; input_lock is shared by all workers so only one
+    sends input to the desktop at a time. The parent watches every worker: a worker that dies or exceeds
+    the task timeout is replaced and the folder it was given is queued again
+    (up to max_attempts).
+    """
+
+    def __init__(self, config, worker_count=None, automation_factory=None, logger=None,
+                 task_timeout=600, idle_timeout=60, max_attempts=2, max_restarts=3,
+                 poll_interval=0.5, start_method='spawn', executable=None):
+        self.config = config
+        self.worker_count = max(1, worker_count or getattr(config, 'MSEQ_WORKER_COUNT', 1))
+        self.automation_factory = automation_factory or create_mseq_automation
+        self.logger = logger or logging.getLogger(__name__)
+        self.task_timeout = task_timeout
+        self.idle_timeout = idle_timeout
+        self.max_attempts = max_attempts
+        self.max_restarts = max_restarts
+        self.poll_interval = poll_interval
+
+        self._ctx = mp.get_context(start_method)
+        self.executable = executable    # interpreter for spawned workers, e.g. the 32-bit one
+        self._saved_executable = None
+        self._input_lock = None
+        self._workers = {}       # worker_id -> (process, heartbeat, task_queue)
+        self._readers = {}       # worker_id -> receiving end of the worker's result pipe
+        self._tasks = {}         # task_id -> folder, for tasks not yet finished
+        self._pending = deque()  # task ids waiting for an idle worker
+        self._assigned = {}      # worker_id -> (task_id, dispatch time) of the folder it holds
+        self._idle = set()       # ready workers without a folder
+        self._next_task_id = 0
+        self._restarts = 0
+        self._next_worker_id = 0
+
+    # Worker lifecycle
+    def _start_worker(self):
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+
+        # Unlocked: a worker killed while holding the value's lock would block the parent
+        heartbeat = self._ctx.Value('d', time.time(), lock=False)
+        task_queue = self._ctx.Queue()
+        reader, result_conn = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.config, self.automation_factory, task_queue,
+                  result_conn, heartbeat, self._input_lock, self.poll_interval),
+            name=f"mseq-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        # Only the worker writes to the pipe, so the reader sees EOF once it exits
+        result_conn.close()
+        self._workers[worker_id] = (process, heartbeat, task_queue)
+        self._readers[worker_id] = reader
+        self.logger.info(f"Started mSeq worker {worker_id} (pid {process.pid})")
+        return worker_id
+
+    def _stop_worker(self, worker_id, terminate=False):
+        self._idle.discard(worker_id)
+        self._assigned.pop(worker_id, None)
+        reader = self._readers.pop(worker_id, None)
+        if reader is not None:
+            reader.close()
+        process, _, task_queue = self._workers.pop(worker_id, (None, None, None))
+        if process is None:
+            return
+        if terminate and process.is_alive():
+            process.terminate()
+        process.join(timeout=5)
+        if not process.is_alive():
+            self._input_lock.release_for(worker_id)
+        # Nothing reads this queue any more; don't block exit flushing it
+        task_queue.cancel_join_thread()
+        task_queue.close()
+
+    def _replace_worker(self, worker_id, reason):
+        """Tear down an unhealthy worker and start a new one if the restart budget allows"""
+        self.logger.warning(f"mSeq worker {worker_id} unhealthy ({reason}), replacing it")
+        self._stop_worker(worker_id, terminate=True)
+        if self._restarts >= self.max_restarts:
+            self.logger.error(f"Restart limit reached ({self.max_restarts}), not replacing worker {worker_id}")
+            return None
+        self._restarts += 1
+        return self._start_worker()
+
+    def start(self):
+        """Start the worker processes"""
+        if self._workers:
+            return
+        self._input_lock = _InputLock(self._ctx)
+        if self.executable:
+            # Process-wide setting, restored by shutdown()
+            from multiprocessing import spawn
+            self._saved_executable = spawn.get_executable()
+            self._ctx.set_executable(str(self.executable))
+        for _ in range(self.worker_count):
+            self._start_worker()
+
+    def shutdown(self):
+        """Stop all workers, letting each close its own mSeq instance"""
+        if self._input_lock is None:
+            return
+        for _, _, task_queue in self._workers.values():
+            task_queue.put(None)
+        for worker_id in list(self._workers):
+            self._workers[worker_id][0].join(timeout=10)
+            self._stop_worker(worker_id, terminate=True)
+        self._input_lock = None
+        if self._saved_executable is not None:
+            self._ctx.set_executable(self._saved_executable)
+            self._saved_executable = None
+        self._tasks = {}
+        self._pending.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+
+    # Health checks
+    def _in_flight(self, worker_id):
+        """Return (folder, dispatch_time) for the task a worker holds, or None if idle"""
+        task_id, dispatched = self._assigned.get(worker_id, (None, 0.0))
+        if task_id not in self._tasks:
+            return None
+        return self._tasks[task_id], dispatched
+
+    def _receive(self, timeout):
+        """Next (kind, worker_id, task_id, payload) message from any worker, or None"""
+        readers = {reader: worker_id for worker_id, reader in self._readers.items()}
+        for reader in connection.wait(list(readers), timeout=timeout):
+            try:
+                return reader.recv()
+            except (EOFError, OSError, pickle.UnpicklingError):
+                # The worker exited, maybe mid-message; check_health replaces it
+                self._readers.pop(readers[reader], None)
+                reader.close()
+        if not readers:
+            time.sleep(timeout)
+        return None
+
+    def _dispatch(self):
+        """Hand pending folders to idle workers, one each"""
+        while self._pending and self._idle:
+            task_id = self._pending.popleft()
+            if task_id not in self._tasks:
+                continue
+            worker_id = self._idle.pop()
+            self._assigned[worker_id] = (task_id, time.time())
+            self._workers[worker_id][2].put((task_id, self._tasks[task_id]))
+
+    def check_health(self, now=None):
+        """
+        Check every worker and return a list of folders that need to be retried
+
+        A worker is unhealthy if its process died, it has been on one folder for
+        longer than task_timeout, or it stopped polling the queue while idle.
+        """
+        now = now or time.time()
+        to_retry = []
+
+        for worker_id in list(self._workers):
+            process, heartbeat, _ = self._workers[worker_id]
+            in_flight = self._in_flight(worker_id)
+
+            reason = None
+            if not process.is_alive():
+                reason = f"exited with code {process.exitcode}"
+            elif in_flight and self.task_timeout and now - in_flight[1] > self.task_timeout:
+                reason = f"timed out on {Path(in_flight[0]).name}"
+            elif not in_flight and self.idle_timeout and now - heartbeat.value > self.idle_timeout:
+                reason = "stopped responding"
+
+            if reason:
+                if in_flight:
+                    to_retry.append(in_flight[0])
+                    del self._tasks[self._assigned[worker_id][0]]
+                self._replace_worker(worker_id, reason)
+
+        return to_retry
+
+    def worker_status(self):
+        """Snapshot of worker state for logging or GUI display"""
+        status = {}
+        for worker_id, (process, heartbeat, _) in self._workers.items():
+            in_flight = self._in_flight(worker_id)
+            status[worker_id] = {
+                'pid': process.pid,
+                'alive': process.is_alive(),
+                'last_heartbeat': heartbeat.value,
+                'folder': in_flight[0] if in_flight else None
+            }
+        return status
+
+    # Processing
+    def process_folders(self, folders):
+        """
+        Process folders across the pool
+
+        Args:
+            folders (list): Order/PCR folder paths ready for mSeq
+
+        Returns:
+            dict: folder -> result dict with success, outputs_complete, worker_id,
+                  attempts, elapsed and error
+        """
+        folders = [str(folder) for folder in folders]
+        if not folders:
+            return {}
+
+        self.start()
+
+        attempts = {folder: 0 for folder in folders}
+        results = {}
+
+        def submit(folder):
+            attempts[folder] += 1
+            task_id = self._next_task_id
+            self._next_task_id += 1
+            self._tasks[task_id] = folder
+            self._pending.append(task_id)
+
+        for folder in folders:
+            submit(folder)
+
+        while len(results) < len(folders):
+            if not self._workers:
+                for folder in folders:
+                    results.setdefault(folder, {
+                        'success': False, 'outputs_complete': False, 'worker_id': None,
+                        'attempts': attempts[folder], 'elapsed': 0.0, 'error': 'No healthy mSeq workers left'
+                    })
+                break
+
+            self._dispatch()
+            message = self._receive(self.poll_interval)
+            kind, worker_id, task_id, payload = message if message else (None, None, None, None)
+
+            if kind in ('ready', 'done') and worker_id in self._workers:
+                if kind == 'ready' or self._assigned.get(worker_id, (None,))[0] == task_id:
+                    self._assigned.pop(worker_id, None)
+                    self._idle.add(worker_id)
+
+            if kind == 'done':
+                # A task already given up on (e.g. after a timeout) may still report back
+                folder = self._tasks.pop(task_id, None)
+                if folder is None or folder in results:
+                    continue
+                outputs = count_text_outputs(folder, self.config)
+                result = dict(payload)
+                result['outputs_complete'] = outputs >= len(self.config.TEXT_FILES)
+                result['worker_id'] = worker_id
+                result['attempts'] = attempts[folder]
+
+                if not (result['success'] and result['outputs_complete']) and attempts[folder] < self.max_attempts:
+                    self.logger.warning(f"mSeq did not complete {Path(folder).name} on worker {worker_id}, retrying")
+                    submit(folder)
+                    continue
+
+                results[folder] = result
+                self.logger.info(f"mSeq {'completed' if result['success'] else 'failed'}: "
+                                 f"{Path(folder).name} (worker {worker_id}, {result['elapsed']:.1f}s)")
+            elif kind == 'failed_start':
+                self.logger.error(f"mSeq worker {worker_id} failed to start: {payload}")
+                self._stop_worker(worker_id)
+                continue
+
+            for folder in self.check_health():
+                if folder in results:
+                    continue
+                if attempts[folder] < self.max_attempts:
+                    submit(folder)
+                else:
+                    results[folder] = {
+                        'success': False, 'outputs_complete': False, 'worker_id': None,
+                        'attempts': attempts[folder], 'elapsed': 0.0,
+                        'error': 'Worker died while processing folder'
+                    }
+
+        return results
@@ -0,0 +1,201 @@
+# order_state_store.py
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+# Directory mtimes on network shares can be this coarse; a snapshot taken
+# within this window of the last change is not trusted
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    folder_path TEXT PRIMARY KEY,
+    folder_name TEXT,
+    folder_mtime_ns INTEGER,
+    checked_ns INTEGER,
+    ab1_count INTEGER,
+    output_count INTEGER,
+    was_mseqed INTEGER,
+    has_braces INTEGER,
+    zip_path TEXT,
+    zip_mtime REAL,
+    sorted_at REAL,
+    mseqed_at REAL,
+    zipped_at REAL,
+    validated_at REAL,
+    validation_summary TEXT
+)
+"""
+
+
+class OrderStateStore:
+    """
+    SQLite record of each order folder's lifecycle (sorted, mSeq'd, zipped, validated)
+
+    Every record carries the folder mtime it was taken at. A record is only
+    trusted while the folder's mtime still matches, so checking an order costs
+    one stat instead of listing the folder on the network share; anything that
+    changed is re-inferred from the filesystem as before.
+    """
+
+    STAGES = ('sorted', 'mseqed', 'zipped', 'validated')
+
+    def __init__(self, db_path, logger=None):
+        self.db_path = Path(db_path)
+        self.logger = logger or logging.getLogger(__name__)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the threads of a concurrent sort, serialized by the lock
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=10, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def _key(folder_path):
+        return os.path.normcase(os.path.abspath(str(folder_path)))
+
+    @staticmethod
+    def _mtime_ns(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def get(self, folder_path):
+        """Return the stored record for a folder as a dict, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM orders WHERE folder_path = ?",
+                                     (self._key(folder_path),)).fetchone()
+        return dict(row) if row else None
+
+    def get_current(self, folder_path):
+        """Return the stored record only if the folder has not changed since it was taken"""
+        record = self.get(folder_path)
+        if record is None or record['folder_mtime_ns'] is None:
+            return None
+        if self._mtime_ns(folder_path) != record['folder_mtime_ns']:
+            return None
+        if (record['checked_ns'] or 0) - record['folder_mtime_ns'] <= MTIME_GRANULARITY_NS:
+            return None
+        return record
+
+    def _upsert(self, folder_path, values):
+        key = self._key(folder_path)
+        values = dict(values, folder_name=Path(key).name)
+        columns = ', '.join(values)
+        placeholders = ', '.join('?' for _ in values)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in values)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO orders (folder_path, {columns}) VALUES (?, {placeholders}) "
+                f"ON CONFLICT(folder_path) DO UPDATE SET {updates}",
+                (key, *values.values())
+            )
+            self._conn.commit()
+
+    # Order status
+    def get_order_status(self, folder_path):
+        """(was_mseqed, has_braces, has_ab1_files) if a current record exists, else None"""
+        record = self.get_current(folder_path)
+        if record is None or record['was_mseqed'] is None:
+            return None
+        return bool(record['was_mseqed']), bool(record['has_braces']), bool(record['ab1_count'])
+
+    def record_status(self, folder_path, status, order_status):
+        """Store a FolderStatus snapshot and the order status derived from it"""
+        was_mseqed, has_braces, _ = order_status
+        values = {
+            'folder_mtime_ns': status.mtime_ns,
+            'checked_ns': status.scanned_ns,
+            'ab1_count': status.ab1_count,
+            'output_count': status.output_count,
+            'was_mseqed': int(was_mseqed),
+            'has_braces': int(has_braces),
+            'zip_path': None
+        }
+        if status.zip_files:
+            values['zip_path'] = os.path.join(str(folder_path), status.zip_files[0])
+        self._upsert(folder_path, values)
+
+    # Lifecycle stages
+    def record_stage(self, folder_path, stage, zip_path=None, validation_summary=None):
+        """
+        Mark an order folder as having completed a stage
+
+        Sorting, mSeq and zipping change the folder, so for those stages the
+        folder mtime is re-read and the cached status is dropped until the
+        next scan confirms it.
+        """
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown order stage: {stage}")
+
+        values = {f"{stage}_at": time.time()}
+        if stage != 'validated':
+            values['checked_ns'] = time.time_ns()
+            values['folder_mtime_ns'] = self._mtime_ns(folder_path)
+            values['was_mseqed'] = None
+        if zip_path is not None:
+            values['zip_path'] = str(zip_path)
+            values['zip_mtime'] = os.path.getmtime(zip_path) if os.path.exists(zip_path) else None
+        if validation_summary is not None:
+            values['validation_summary'] = str(validation_summary)
+        self._upsert(folder_path, values)
+
+    def get_zip_path(self, folder_path):
+        """
+        Recorded zip path (or '' if the folder had none) while the folder is
+        unchanged, None if the record cannot be trusted
+        """
+        record = self.get_current(folder_path)
+        if record is None or (record['was_mseqed'] is None and not record['zipped_at']):
+            return None
+        return record['zip_path'] or ''
+
+    def is_validated(self, folder_path, zip_path, summary_path):
+        """True if this exact zip was already validated into the given summary"""
+        record = self.get(folder_path)
+        if not record or not record['validated_at'] or record['zip_path'] != str(zip_path):
+            return False
+        if record['validation_summary'] != str(summary_path):
+            return False
+        try:
+            return record['zip_mtime'] is not None and os.path.getmtime(zip_path) <= record['zip_mtime']
+        except OSError:
+            return False
+
+
+def open_order_state_store(config, logger=None):
+    """
+    Open the store configured by ORDER_STATE_DB
+
+    Returns None when the store is disabled or cannot be opened; callers fall
+    back to inspecting the filesystem.
+    """
+    db_path = getattr(config, 'ORDER_STATE_DB', None)
+    if not db_path:
+        return None
+    try:
+        return OrderStateStore(db_path, logger=logger)
+    except (sqlite3.Error, OSError) as e:
+        (logger or logging.getLogger(__name__)).warning(f"Order state store unavailable ({db_path}): {e}")
+        return None
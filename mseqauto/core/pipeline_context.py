@@ -0,0 +1,170 @@
+# pipeline_context.py
+import logging
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+from mseqauto.core.file_system_dao import FileSystemDAO  # type: ignore
+from mseqauto.core.folder_processor import FolderProcessor  # type: ignore
+from mseqauto.core.order_state_store import open_order_state_store  # type: ignore
+from mseqauto.core.shared_order_key import SharedOrderKey  # type: ignore
+
+
+def _file_signature(path):
+    """(size, mtime) of a file or folder, None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class PipelineContext:
+    """
+    Components and caches shared by the stages of one process run
+
+    ind_process_all runs sort, mSeq and zip in one process; with a context
+    they share one FileSystemDAO, one order state store, the order key and its
+    index, the active I numbers and the reinject list instead of each stage
+    rebuilding them. Invalidation rules:
+
+    - order key, its index and its per-order tables: reloaded when KEY_FILE_PATH changes size or mtime;
+      the shared memory copy for worker processes is replaced with them
+    - reinject list: per (I numbers, workbook), reloaded when the workbook or
+      the spreadsheet/ABI upload folders change
+    - active I numbers: computed once per run
+    - directory listings: dropped by begin_stage(), since every stage moves or
+      writes files; folder status snapshots check the folder mtime themselves
+    """
+
+    def __init__(self, config=None, data_folder=None, logger=None, state_store=None):
+        if config is None:
+            from mseqauto.config import MseqConfig  # type: ignore
+            config = MseqConfig()
+        self.config = config
+        self.data_folder = data_folder
+        self.logger = logger or logging.getLogger(__name__)
+        self.file_dao = FileSystemDAO(config, logger=self.logger)
+        self._state_store = state_store
+        self._state_store_opened = state_store is not None
+        self.stage = None
+
+        self._order_key = None
+        self._order_key_loaded = False
+        self._order_key_signature = None
+        self._order_key_index = None
+        self._order_key_tables = None
+        self._shared_order_key = None
+        self._active_inumbers = None
+        self._reinjects = {}   # (I numbers, workbook) -> (signature, reinject list, raw reinject list)
+
+    @property
+    def state_store(self):
+        """OrderStateStore opened on first use (None when disabled)"""
+        if not self._state_store_opened:
+            self._state_store = open_order_state_store(self.config, self.logger)
+            self._state_store_opened = True
+        return self._state_store
+
+    def begin_stage(self, name):
+        """Start a stage; directory listings from the previous stage are stale"""
+        self.stage = name
+        self.file_dao.directory_cache.clear()
+        self.logger.debug("Pipeline stage %s", name)
+
+    def processor(self, ui_automation=None, logger=None):
+        """FolderProcessor wired to the shared DAO, state store and caches"""
+        processor = FolderProcessor(self.file_dao, ui_automation, self.config, logger=logger or self.logger.info,
+                                    state_store=self.state_store, context=self)
+        if self.data_folder is not None:
+            processor.current_data_folder = self.data_folder
+        return processor
+
+    # Order key
+    def order_key(self):
+        """The order key, reloaded only when the key file changes"""
+        signature = _file_signature(self.config.KEY_FILE_PATH)
+        if not self._order_key_loaded or signature != self._order_key_signature:
+            self._order_key = self.file_dao.load_order_key(str(self.config.KEY_FILE_PATH))
+            self._order_key_loaded = True
+            self._order_key_signature = signature
+            self._order_key_index = None
+            self._order_key_tables = None
+            self._release_shared_order_key()
+            self.logger.info(f"Order key loaded ({0 if self._order_key is None else len(self._order_key)} rows)")
+        return self._order_key
+
+    def owns_order_key(self, order_key):
+        return order_key is not None and order_key is self._order_key
+
+    def order_key_index(self):
+        """Normalized sample name -> [(I number, account, order number)] for the current order key"""
+        order_key = self.order_key()
+        if self._order_key_index is None and order_key is not None:
+            self._order_key_index = FolderProcessor.index_order_key(order_key, self.file_dao)
+        return self._order_key_index
+
+    def order_key_tables(self):
+        """Expected count per order and samples per (I number, order) for the current order key"""
+        order_key = self.order_key()
+        if self._order_key_tables is None and order_key is not None:
+            self._order_key_tables = FolderProcessor.tabulate_order_key(order_key)
+        return self._order_key_tables
+
+    def shared_order_key(self):
+        """
+        The current order key packed into shared memory, for worker processes
+
+        Workers attach with SharedOrderKey.attach(context.shared_order_key().name)
+        and pass the result as the order key. Freed by close().
+        """
+        order_key = self.order_key()
+        if self._shared_order_key is None and order_key is not None:
+            self._shared_order_key = SharedOrderKey.create_shared(order_key, self.file_dao)
+        return self._shared_order_key
+
+    def _release_shared_order_key(self):
+        if self._shared_order_key is not None:
+            self._shared_order_key.close()
+            self._shared_order_key.unlink()
+            self._shared_order_key = None
+
+    def close(self):
+        """Free the shared memory order key, if one was made"""
+        self._release_shared_order_key()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # I numbers and reinjects
+    def active_inumbers(self):
+        """I numbers with upload or spreadsheet files, computed once per run"""
+        if self._active_inumbers is None:
+            self._active_inumbers = self.file_dao.collect_active_inumbers(
+                paths=[str(self.config.ABI_UPLOAD_PATH), str(self.config.SPREADSHEETS_PATH)],
+                min_inum=self.file_dao.get_most_recent_inumber(str(self.config.INDIVIDUALS_DATA_PATH))
+            )
+        return self._active_inumbers
+
+    def reinject_list(self, processor, i_numbers, reinject_path=None):
+        """
+        processor.get_reinject_list(), cached while its inputs are unchanged
+
+        Sets processor.raw_reinject_list like get_reinject_list does.
+        """
+        key = (tuple(i_numbers), str(reinject_path))
+        signature = (_file_signature(reinject_path), _file_signature(self.config.SPREADSHEETS_PATH),
+                     _file_signature(self.config.ABI_UPLOAD_PATH))
+        cached = self._reinjects.get(key)
+        if cached is None or cached[0] != signature:
+            reinject_list = processor.get_reinject_list(i_numbers, reinject_path)
+            cached = (signature, reinject_list, processor.raw_reinject_list)
+            self._reinjects[key] = cached
+        else:
+            processor.raw_reinject_list = cached[2]
+        return cached[1]
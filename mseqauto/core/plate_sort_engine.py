@@ -0,0 +1,258 @@
+# plate_sort_engine.py
+import logging
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import NamedTuple
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+from mseqauto.core.filename_classifier import (  # type: ignore
+    CROSS_PLATE_BRACES_RE, KIND_BLANK, KIND_CONTROL, KIND_CROSS_PLATE, KIND_NAMES, PLATE_SORT_CONTROLS,
+    get_filename_classifier
+)
+
+CONTROLS_FOLDER = "Controls"
+BLANK_FOLDER = "Blank"
+
+
+class PlateMove(NamedTuple):
+    source: str
+    dest: str
+    kind: str    # 'other', 'control', 'blank', 'cross' or 'braces'
+    plate: str   # plate folder the file was sorted in
+
+
+class RawFolderPlan:
+    """Moves planned for one raw plate folder"""
+
+    def __init__(self, raw_folder):
+        self.raw_folder = raw_folder
+        self.folder_name = os.path.basename(raw_folder)
+        self.is_single_plate = is_single_plate_folder(self.folder_name)
+        self.plate_folders = {}   # prefix -> plate folder path
+        self.moves = []
+
+
+def is_single_plate_folder(folder_name):
+    """YYYY-MM-DD_P#####_1 holds a single plate; anything else is multi-plate"""
+    parts = folder_name.split('_')
+    return len(parts) == 3 and '-' not in parts[1]
+
+
+class PlateSortEngine:
+    """
+    Sort raw plate folders into plate folders in one planned pass
+
+    Each raw folder is listed once and every .ab1 file is classified up
+    front, so a file is moved straight to its final place (plate folder,
+    Controls, Blank or a cross-plate destination) instead of being moved into
+    the plate folder and sorted again. Destination folders are created before
+    any file moves, raw folders are then moved in parallel, and cross-plate
+    moves run last so they never race a plate that is still being sorted.
+    Two files planned for the same destination are not allowed to overwrite
+    each other: the first wins and the second stays where it is.
+    """
+
+    def __init__(self, data_folder, logger=None, controls=PLATE_SORT_CONTROLS, max_workers=4):
+        self.data_folder = str(data_folder)
+        self.logger = logger or logging.getLogger(__name__)
+        self.classifier = get_filename_classifier(plate_controls=tuple(controls))
+        self.max_workers = max(1, max_workers)
+
+    # Classification
+    def plan_moves(self, entries, plate_folder, prefix):
+        """
+        Classify a batch of (source path, name in plate folder) pairs and plan
+        where each one goes
+        """
+        names = [name for _, name in entries]
+        classified = self.classifier.classify_plate(names)
+        moves = []
+        for (source, name), kind, detail in zip(entries, classified.kinds, classified.details):
+            if kind == KIND_CONTROL:
+                dest = os.path.join(plate_folder, CONTROLS_FOLDER, name)
+            elif kind == KIND_BLANK:
+                dest = os.path.join(plate_folder, BLANK_FOLDER, name)
+            elif kind == KIND_CROSS_PLATE:
+                dest = os.path.join(self.data_folder, detail, CROSS_PLATE_BRACES_RE.sub('', name))
+            else:
+                dest = os.path.join(plate_folder, detail)
+            moves.append(PlateMove(source, dest, KIND_NAMES[kind], prefix))
+        return moves
+
+    # Planning
+    def plan_raw_folder(self, raw_folder):
+        """List a raw folder once and plan a move for each .ab1 file"""
+        plan = RawFolderPlan(raw_folder)
+
+        if plan.is_single_plate:
+            plate_name = plan.folder_name.split('_')[1]
+            dest_folder = os.path.join(self.data_folder, plate_name)
+            if os.path.exists(dest_folder):
+                self.logger.warning(f"Destination folder already exists: {dest_folder}")
+                # Add a timestamp to avoid conflicts
+                timestamp = datetime.now().strftime("%H%M%S")
+                dest_folder = os.path.join(self.data_folder, f"{plate_name}_{timestamp}")
+                self.logger.info(f"Using alternate destination: {dest_folder}")
+            plan.plate_folders[plate_name] = dest_folder
+
+        by_prefix = {}
+        with os.scandir(raw_folder) as entries:
+            for entry in entries:
+                file_name = entry.name
+                if not file_name.endswith('.ab1') or not entry.is_file():
+                    continue
+
+                if plan.is_single_plate:
+                    prefix = plate_name
+                    sorted_name = file_name
+                else:
+                    # Plate prefix is the text before the first underscore
+                    prefix, sep, sorted_name = file_name.partition('_')
+                    if not sep:
+                        self.logger.warning(f"No matching prefix found for file: {file_name}")
+                        continue
+                by_prefix.setdefault(prefix, []).append((entry.path, sorted_name))
+
+        for prefix, plate_entries in by_prefix.items():
+            plate_folder = plan.plate_folders.get(prefix)
+            if plate_folder is None:
+                plate_folder = os.path.join(self.data_folder, prefix)
+                plan.plate_folders[prefix] = plate_folder
+            plan.moves.extend(self.plan_moves(plate_entries, plate_folder, prefix))
+
+        self.logger.info(f"{plan.folder_name}: {len(plan.moves)} files for "
+                         f"{len(plan.plate_folders)} plate folders")
+        return plan
+
+    def plan_existing_files(self, prefix, plate_folder):
+        """Plan moves for files already at the root of a plate folder (e.g. from an earlier run)"""
+        try:
+            with os.scandir(plate_folder) as entries:
+                existing = [(entry.path, entry.name) for entry in entries
+                            if entry.name.endswith('.ab1') and entry.is_file()]
+        except FileNotFoundError:
+            return []
+        return [move for move in self.plan_moves(existing, plate_folder, prefix) if move.dest != move.source]
+
+    def _claim_destinations(self, moves, claimed):
+        """Drop moves whose destination another planned move already claimed"""
+        kept = []
+        for move in moves:
+            key = os.path.normcase(move.dest)
+            if key in claimed:
+                self.logger.warning(f"Skipping {os.path.basename(move.source)}: "
+                                    f"{move.dest} is already the destination of {os.path.basename(claimed[key])}")
+                continue
+            claimed[key] = move.source
+            kept.append(move)
+        return kept
+
+    # Execution
+    def _move(self, move):
+        try:
+            shutil.move(move.source, move.dest)
+            self.logger.debug(f"Moved {os.path.basename(move.source)} to {move.dest}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Error moving file {os.path.basename(move.source)}: {e}")
+            return False
+
+    def _run_moves(self, moves):
+        return [move for move in moves if self._move(move)]
+
+    def sort(self, raw_folders):
+        """
+        Sort all raw plate folders
+
+        Returns:
+            dict: 'plate_folders' (prefix -> path), 'moved', 'skipped' and
+                'failed' move counts, and per-plate 'counts'
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            planned = list(pool.map(self._safe_plan, raw_folders))
+        plans = [plan for plan in planned if plan is not None]
+
+        # Files already sitting in a plate folder are sorted by the first raw
+        # folder that feeds that plate
+        groups = []
+        seen_plate_folders = set()
+        for plan in plans:
+            group = []
+            for prefix, plate_folder in plan.plate_folders.items():
+                key = os.path.normcase(plate_folder)
+                if key not in seen_plate_folders:
+                    seen_plate_folders.add(key)
+                    group.extend(self.plan_existing_files(prefix, plate_folder))
+            group.extend(plan.moves)
+            groups.append(group)
+
+        claimed = {}
+        local_groups = [self._claim_destinations([m for m in group if m.kind != 'cross'], claimed)
+                        for group in groups]
+        cross_moves = self._claim_destinations([m for group in groups for m in group if m.kind == 'cross'],
+                                               claimed)
+        planned_count = sum(len(group) for group in groups)
+
+        # Create every destination folder up front, parents first
+        dest_dirs = {os.path.dirname(move.dest) for group in local_groups for move in group}
+        dest_dirs.update(os.path.dirname(move.dest) for move in cross_moves)
+        dest_dirs.update(folder for plan in plans for folder in plan.plate_folders.values())
+        for folder in sorted(dest_dirs):
+            os.makedirs(folder, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            done = [move for moved in pool.map(self._run_moves, local_groups) for move in moved]
+        # Cross-plate files go last, once every plate folder has been sorted
+        for move in cross_moves:
+            if self._move(move):
+                self.logger.info(f"Moved cross-plate file to destination plate folder: "
+                                 f"{os.path.basename(move.source)} to {move.dest}")
+                done.append(move)
+
+        counts = self._report(plans, done)
+        kept_count = sum(len(group) for group in local_groups) + len(cross_moves)
+        return {
+            'plate_folders': {prefix: folder for plan in plans for prefix, folder in plan.plate_folders.items()},
+            'moved': len(done),
+            'skipped': planned_count - kept_count,
+            'failed': kept_count - len(done),
+            'counts': counts
+        }
+
+    def _safe_plan(self, raw_folder):
+        try:
+            return self.plan_raw_folder(raw_folder)
+        except OSError as e:
+            self.logger.error(f"Error processing folder {os.path.basename(raw_folder)}: {e}")
+            return None
+
+    def _report(self, plans, done):
+        counts = {}
+        for move in done:
+            plate_counts = counts.setdefault(move.plate, dict.fromkeys(
+                ('files',) + KIND_NAMES, 0))
+            plate_counts['files'] += 1
+            plate_counts[move.kind] += 1
+
+        for prefix, c in counts.items():
+            self.logger.info(f"Processed {c['files']} files in {prefix}: "
+                             f"{c['control']} controls, {c['blank']} blanks, "
+                             f"{c['cross']} cross-plate, {c['braces']} with braces")
+
+        for plan in plans:
+            if plan.is_single_plate:
+                continue
+            with os.scandir(plan.raw_folder) as entries:
+                remaining = [entry.name for entry in entries if entry.is_file()]
+            if not remaining:
+                self.logger.info(f"Raw folder {plan.folder_name} is now empty of files")
+            else:
+                self.logger.warning(f"Raw folder {plan.folder_name} still has {len(remaining)} files")
+                for file_name in remaining:
+                    self.logger.debug(f"Remaining file: {file_name}")
+        return counts
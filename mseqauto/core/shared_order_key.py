@@ -0,0 +1,292 @@
+# shared_order_key.py
+"""
+Parsed order key and its name index in one flat, offset-based buffer
+
+Worker processes attach to the buffer (shared memory or a memory-mapped
+file) and look names up in place, instead of each re-parsing order_key.txt
+and rebuilding FolderProcessor.order_key_index.
+
+Layout (little-endian, all offsets from the start of the buffer):
+
+    header   magic, version, row count, name count, bucket count and the
+             offsets of the sections below
+    rows     4 x (offset, length) into the heap per row: I number,
+             account, order number, sample name
+    names    per normalized name: (offset, length, crc32, first match,
+             match count)
+    matches  row numbers, grouped by name in order key order
+    buckets  open-addressing hash table of name numbers (EMPTY if unused),
+             keyed by crc32 so every process agrees on the slots
+    heap     UTF-8 strings
+"""
+import mmap
+import struct
+import sys
+import zlib
+from collections.abc import Mapping, Sequence
+from multiprocessing import shared_memory
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+MAGIC = b'MSEQOKEY'
+VERSION = 1
+EMPTY = 0xFFFFFFFF
+
+HEADER = struct.Struct('<8sIIII5Q')
+ROW = struct.Struct('<8I')
+NAME = struct.Struct('<5I')
+U32 = struct.Struct('<I')
+
+
+class SharedOrderKeyError(Exception):
+    """The buffer is not a packed order key of this version"""
+
+
+def _name_hash(encoded):
+    return zlib.crc32(encoded)
+
+
+def pack_order_key(order_key, file_dao):
+    """
+    Pack an order key (rows of I number, account, order, sample) and its
+    normalized-name index into bytes
+
+    Names are normalized with file_dao.standardize_for_customer_files, the
+    same way FolderProcessor.index_order_key does.
+    """
+    heap = bytearray()
+    strings = {}
+
+    def intern(text):
+        encoded = str(text).encode('utf-8')
+        offset = strings.get(encoded)
+        if offset is None:
+            offset = strings[encoded] = len(heap)
+            heap.extend(encoded)
+        return offset, len(encoded)
+
+    rows = []
+    matches_by_name = {}
+    for row_number, entry in enumerate(order_key):
+        i_num, acct_name, order_num, sample_name = entry[0:4]
+        rows.append([value for text in (i_num, acct_name, order_num, sample_name) for value in intern(text)])
+        normalized_name = file_dao.standardize_for_customer_files(sample_name, remove_extension=False)
+        matches_by_name.setdefault(str(normalized_name), []).append(row_number)
+
+    names = []
+    matches = []
+    for name, row_numbers in matches_by_name.items():
+        encoded = name.encode('utf-8')
+        offset, length = intern(name)
+        names.append((offset, length, _name_hash(encoded), len(matches), len(row_numbers)))
+        matches.extend(row_numbers)
+
+    # At most half full, so probes stay short
+    bucket_count = 1
+    while bucket_count < 2 * len(names):
+        bucket_count *= 2
+    buckets = [EMPTY] * bucket_count
+    mask = bucket_count - 1
+    for name_number, (_, _, name_hash, _, _) in enumerate(names):
+        slot = name_hash & mask
+        while buckets[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        buckets[slot] = name_number
+
+    rows_offset = HEADER.size
+    names_offset = rows_offset + ROW.size * len(rows)
+    matches_offset = names_offset + NAME.size * len(names)
+    buckets_offset = matches_offset + U32.size * len(matches)
+    heap_offset = buckets_offset + U32.size * bucket_count
+
+    buffer = bytearray(heap_offset + len(heap))
+    HEADER.pack_into(buffer, 0, MAGIC, VERSION, len(rows), len(names), bucket_count,
+                     rows_offset, names_offset, matches_offset, buckets_offset, heap_offset)
+    for i, row in enumerate(rows):
+        ROW.pack_into(buffer, rows_offset + i * ROW.size, *row)
+    for i, name in enumerate(names):
+        NAME.pack_into(buffer, names_offset + i * NAME.size, *name)
+    struct.pack_into(f'<{len(matches)}I', buffer, matches_offset, *matches)
+    struct.pack_into(f'<{bucket_count}I', buffer, buckets_offset, *buckets)
+    buffer[heap_offset:] = heap
+    return bytes(buffer)
+
+
+def _attach_shared_memory(name):
+    """Attach to an existing block without letting this process's resource tracker unlink it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    if sys.platform == 'win32':
+        return shared_memory.SharedMemory(name=name)
+    # Before 3.13 attaching registers the block for cleanup at exit. Spawned workers
+    # share their parent's tracker, so unregistering afterwards would drop the
+    # creator's registration too; skip registering instead.
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedOrderKey(Sequence):
+    """
+    Read-only view of a packed order key
+
+    Behaves as the order key (a sequence of (I number, account, order,
+    sample) rows) and its index attribute as FolderProcessor.order_key_index,
+    so it can be passed wherever a loaded order key is expected. Nothing is
+    copied on attach; strings are decoded from the buffer on access.
+    """
+
+    def __init__(self, buffer, owner=None, shared_memory_block=None):
+        self._owner = owner
+        self._shm = shared_memory_block
+        self._buf = memoryview(buffer)
+        try:
+            (magic, version, self._row_count, self._name_count, self._bucket_count, self._rows_offset,
+             self._names_offset, self._matches_offset, self._buckets_offset,
+             self._heap_offset) = HEADER.unpack_from(self._buf, 0)
+        except struct.error as e:
+            self.close()
+            raise SharedOrderKeyError(f"Buffer too small for an order key header: {e}") from e
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SharedOrderKeyError(f"Not a version {VERSION} order key buffer")
+        self._mask = self._bucket_count - 1
+        self.index = OrderKeyIndex(self)
+
+    # Construction
+    @classmethod
+    def from_order_key(cls, order_key, file_dao):
+        """Pack into private memory (no sharing)"""
+        return cls(pack_order_key(order_key, file_dao))
+
+    @classmethod
+    def create_shared(cls, order_key, file_dao, name=None):
+        """
+        Pack into a new shared memory block
+
+        The creating process owns the block: call unlink() once every worker
+        is done with it. Workers attach with SharedOrderKey.attach(key.name).
+        """
+        packed = pack_order_key(order_key, file_dao)
+        block = shared_memory.SharedMemory(name=name, create=True, size=len(packed))
+        block.buf[:len(packed)] = packed
+        return cls(block.buf, shared_memory_block=block)
+
+    @classmethod
+    def attach(cls, name):
+        """Attach to a block made by create_shared()"""
+        block = _attach_shared_memory(name)
+        return cls(block.buf, shared_memory_block=block)
+
+    @staticmethod
+    def write_file(path, order_key, file_dao):
+        """Pack into a file for open_file() (atomic replace)"""
+        path = Path(path)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        tmp_path.write_bytes(pack_order_key(order_key, file_dao))
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def open_file(cls, path):
+        """Memory-map a file made by write_file()"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, owner=mapped)
+
+    @property
+    def name(self):
+        """Shared memory block name, None when not in shared memory"""
+        return self._shm.name if self._shm is not None else None
+
+    def close(self):
+        """Release the buffer; the shared memory block itself stays until unlink()"""
+        self._buf.release()
+        if self._shm is not None:
+            self._shm.close()
+        elif self._owner is not None:
+            self._owner.close()
+
+    def unlink(self):
+        """Free the shared memory block (creator only)"""
+        if self._shm is not None:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Reading
+    def _string(self, offset, length):
+        start = self._heap_offset + offset
+        return str(self._buf[start:start + length], 'utf-8')
+
+    def __len__(self):
+        return self._row_count
+
+    def __getitem__(self, row_number):
+        if isinstance(row_number, slice):
+            return [self[i] for i in range(*row_number.indices(self._row_count))]
+        if row_number < 0:
+            row_number += self._row_count
+        if not 0 <= row_number < self._row_count:
+            raise IndexError(row_number)
+        fields = ROW.unpack_from(self._buf, self._rows_offset + row_number * ROW.size)
+        return tuple(self._string(fields[i], fields[i + 1]) for i in range(0, 8, 2))
+
+    def _find_name(self, name):
+        """Name number for a normalized name, or None"""
+        if not self._name_count:
+            return None
+        encoded = name.encode('utf-8')
+        name_hash = _name_hash(encoded)
+        slot = name_hash & self._mask
+        while True:
+            name_number = U32.unpack_from(self._buf, self._buckets_offset + slot * U32.size)[0]
+            if name_number == EMPTY:
+                return None
+            offset, length, stored_hash, _, _ = NAME.unpack_from(
+                self._buf, self._names_offset + name_number * NAME.size)
+            if stored_hash == name_hash and length == len(encoded):
+                start = self._heap_offset + offset
+                if self._buf[start:start + length] == encoded:
+                    return name_number
+            slot = (slot + 1) & self._mask
+
+    def _matches(self, name_number):
+        _, _, _, first, count = NAME.unpack_from(self._buf, self._names_offset + name_number * NAME.size)
+        row_numbers = struct.unpack_from(f'<{count}I', self._buf, self._matches_offset + first * U32.size)
+        return [self[row_number][:3] for row_number in row_numbers]
+
+    def _name(self, name_number):
+        offset, length = NAME.unpack_from(self._buf, self._names_offset + name_number * NAME.size)[:2]
+        return self._string(offset, length)
+
+
+class OrderKeyIndex(Mapping):
+    """Normalized sample name -> [(I number, account, order number)], read from the buffer"""
+
+    def __init__(self, order_key):
+        self._key = order_key
+
+    def __getitem__(self, name):
+        name_number = self._key._find_name(name) if isinstance(name, str) else None
+        if name_number is None:
+            raise KeyError(name)
+        return self._key._matches(name_number)
+
+    def __contains__(self, name):
+        return isinstance(name, str) and self._key._find_name(name) is not None
+
+    def __len__(self):
+        return self._key._name_count
+
+    def __iter__(self):
+        return (self._key._name(i) for i in range(self._key._name_count))
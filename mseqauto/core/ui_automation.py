@@ -3,6 +3,7 @@ import os
 import time
 import logging
 import re
+from contextlib import nullcontext
 from pathlib import Path
 
 from pywinauto import Application, timings
@@ -13,6 +14,8 @@ import win32api
 import os
 import sys
 sys.path.append(str(Path(__file__).parents[2]))
+from mseqauto.core.folder_status import scan_folder_status  # type: ignore
+from mseqauto.utils.instrumentation import span, timed  # type: ignore
 import warnings
 warnings.filterwarnings("ignore", message="Revert to STA COM threading mode", module="pywinauto")
 
@@ -20,9 +23,19 @@ class MseqAutomation:
     """Streamlined automation class for controlling mSeq software"""
 
 
-    def __init__(self, config, logger=None):
-        """Initialize the automation with configuration settings"""
+    def __init__(self, config, logger=None, dedicated=False, input_lock=None):
+        """
+        Initialize the automation with configuration settings
+
+        dedicated starts this instance's own mSeq process and binds to it by
+        process id instead of attaching to whichever mSeq window exists (one
+        per MseqWorkerPool worker). input_lock, shared between workers, is held
+        while keystrokes and dialog clicks are sent, since those go to the one
+        desktop; mSeq's processing itself runs outside it.
+        """
         self.config = config
+        self.dedicated = dedicated
+        self.input_lock = input_lock
         self.app = None
         self.main_window = None
         self.first_time_browsing = True
@@ -71,25 +84,28 @@ class MseqAutomation:
 
     def connect_or_start_mseq(self):
         """Connect to existing mSeq instance or start a new one"""
-        try:
-            # Try to connect to an existing instance
-            self.app = Application(backend='win32').connect(title_re='[mM]seq.*', timeout=1)
-            self.logger.info("Connected to existing mSeq instance")
-        except (ElementNotFoundError, timings.TimeoutError):
-            # Start a new instance
-            self.logger.info("Starting new mSeq instance")
-            start_cmd = f'cmd /c "cd /d {self.config.MSEQ_PATH} && {self.config.MSEQ_EXECUTABLE}"'
-
+        if self.dedicated:
+            self._start_dedicated_mseq()
+        else:
             try:
-                self.app = Application(backend='win32').start(start_cmd, wait_for_idle=False)
-                self.app.connect(title='mSeq', timeout=self.timeouts["connect"])
-            except Exception as e:
-                self.logger.error(f"Failed to start mSeq: {e}")
-                raise
-        except ElementAmbiguousError:
-            # Handle multiple instances
-            self.app = Application(backend='win32').connect(title_re='[mM]seq.*', found_index=0)
-            self.logger.warning("Multiple mSeq windows found, connecting to first instance")
+                # Try to connect to an existing instance
+                self.app = Application(backend='win32').connect(title_re='[mM]seq.*', timeout=1)
+                self.logger.info("Connected to existing mSeq instance")
+            except (ElementNotFoundError, timings.TimeoutError):
+                # Start a new instance
+                self.logger.info("Starting new mSeq instance")
+                start_cmd = f'cmd /c "cd /d {self.config.MSEQ_PATH} && {self.config.MSEQ_EXECUTABLE}"'
+
+                try:
+                    self.app = Application(backend='win32').start(start_cmd, wait_for_idle=False)
+                    self.app.connect(title='mSeq', timeout=self.timeouts["connect"])
+                except Exception as e:
+                    self.logger.error(f"Failed to start mSeq: {e}")
+                    raise
+            except ElementAmbiguousError:
+                # Handle multiple instances
+                self.app = Application(backend='win32').connect(title_re='[mM]seq.*', found_index=0)
+                self.logger.warning("Multiple mSeq windows found, connecting to first instance")
 
         # Get the main window
         for title_pattern in ['mSeq.*', 'Mseq.*']:
@@ -106,6 +122,26 @@ class MseqAutomation:
 
         return self.app, self.main_window
 
+    def _start_dedicated_mseq(self):
+        """Start this instance's own mSeq unless it is still running, and bind to it by process id"""
+        if self.app is not None and self.app.is_process_running():
+            return
+        executable, _, args = self.config.MSEQ_EXECUTABLE.partition(' ')
+        cmd_line = f'"{Path(self.config.MSEQ_PATH) / executable}" {args}'.strip()
+        self.logger.info("Starting dedicated mSeq instance")
+        try:
+            started = Application(backend='win32').start(cmd_line, work_dir=str(self.config.MSEQ_PATH),
+                                                          wait_for_idle=False)
+            self.app = Application(backend='win32').connect(process=started.process,
+                                                            timeout=self.timeouts["connect"])
+            self.app.window(title_re='[mM]seq.*').wait('exists', timeout=self.timeouts["connect"])
+        except Exception as e:
+            self.logger.error(f"Failed to start mSeq: {e}")
+            raise
+        self.main_window = None
+        self.first_time_browsing = True
+
+    @timed()
     def process_folder(self, folder_path):
         """Process a folder with mSeq - streamlined version based on successful path"""
         folder = Path(folder_path)
@@ -124,6 +160,27 @@ class MseqAutomation:
         # Close any existing Read information windows before starting
         self._close_all_read_info_dialogs()
 
+        # Only one process drives the keyboard and dialogs at a time
+        with self.input_lock or nullcontext():
+            if not self._submit_folder(folder_path):
+                return False
+
+        # Wait for processing to complete
+        completion_success = self._wait_for_completion(folder_path)
+
+        # Always close any Read information windows before returning
+        self._close_all_read_info_dialogs()
+
+        if completion_success:
+            self.logger.info(f"Successfully processed {folder_path}")
+        else:
+            self.logger.warning(f"Processing may not have completed properly for {folder_path}")
+            return False
+
+        return True
+
+    def _submit_folder(self, folder_path):
+        """Start a new mSeq project on a folder and answer its dialogs; False if it could not be started"""
         # Connect to mSeq and get main window
         self.app, self.main_window = self.connect_or_start_mseq() #type: ignore
         self.main_window.set_focus()
@@ -208,18 +265,6 @@ class MseqAutomation:
         else:
             self.logger.debug("No Low quality files dialog found within timeout")
 
-        # Wait for processing to complete
-        completion_success = self._wait_for_completion(folder_path)
-
-        # Always close any Read information windows before returning
-        self._close_all_read_info_dialogs()
-
-        if completion_success:
-            self.logger.info(f"Successfully processed {folder_path}")
-        else:
-            self.logger.warning(f"Processing may not have completed properly for {folder_path}")
-            return False
-
         return True
 
     def _close_all_read_info_dialogs(self):
@@ -254,6 +299,10 @@ class MseqAutomation:
 
     def _wait_for_dialog(self, dialog_type):
         """Wait for a specific dialog to appear and return both status and dialog object"""
+        with span(f"mseq.wait.{dialog_type}"):
+            return self._poll_for_dialog(dialog_type)
+
+    def _poll_for_dialog(self, dialog_type):
         self.logger.debug(f"Waiting for {dialog_type} dialog...")
         timeout = self.timeouts.get(dialog_type, 5)
 
@@ -578,6 +627,14 @@ class MseqAutomation:
         current_item.click_input()
         return True
 
+    def _count_text_files(self, folder_path):
+        """Count mSeq text outputs in a folder (fresh scan, never cached)"""
+        status = scan_folder_status(folder_path, self.config)
+        if not status.exists:
+            self.logger.error(f"Error reading folder contents: {folder_path}")
+        return status.output_count
+
+    @timed()
     def _wait_for_completion(self, folder_path):
         """Wait for mSeq processing to complete"""
         from pathlib import Path
@@ -623,19 +680,7 @@ class MseqAutomation:
                     self._read_info_wait_done = True
 
                 # Dialog exists, check for text files
-                folder = Path(folder_path)
-                txt_count = 0
-
-                try:
-                    for file_path in folder.iterdir():
-                        if file_path.is_file():
-                            # Check if file ends with any of the expected text file extensions
-                            for ext in self.config.TEXT_FILES:
-                                if file_path.name.endswith(ext):
-                                    txt_count += 1
-                                    break
-                except Exception as e:
-                    self.logger.error(f"Error reading folder contents: {e}")
+                txt_count = self._count_text_files(folder_path)
 
                 # Log progress every 10 seconds
                 if elapsed % 10 == 0:
@@ -647,16 +692,7 @@ class MseqAutomation:
 
                     # Quick verification check (0.1s) to ensure files are stable
                     time.sleep(0.1)
-                    final_txt_count = 0
-                    try:
-                        for file_path in folder.iterdir():
-                            if file_path.is_file():
-                                for ext in self.config.TEXT_FILES:
-                                    if file_path.name.endswith(ext):
-                                        final_txt_count += 1
-                                        break
-                    except Exception as e:
-                        self.logger.error(f"Error in final file count: {e}")
+                    final_txt_count = self._count_text_files(folder_path)
 
                     if final_txt_count >= 5:
                         self.logger.info(f"Final confirmation: {final_txt_count} text files found, closing read dialogs")
@@ -673,14 +709,7 @@ class MseqAutomation:
                 else:
                     self.logger.debug(f"Read info dialog not found at {elapsed:.1f}s - checking for completion")
                     # Check if we have any text files even without the dialog
-                    folder = Path(folder_path)
-                    txt_count = 0
-                    for file_path in folder.iterdir():
-                        if file_path.is_file():
-                            for ext in self.config.TEXT_FILES:
-                                if file_path.name.endswith(ext):
-                                    txt_count += 1
-                                    break
+                    txt_count = self._count_text_files(folder_path)
 
                     # Only consider it complete if we have all 5 text files
                     # If we have exactly 4 files, the Low quality dialog is blocking the 5th (seq.info.txt)
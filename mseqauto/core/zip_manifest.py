@@ -0,0 +1,137 @@
+# zip_manifest.py
+"""
+Member manifests stored in a zip's archive comment
+
+Every zip MseqAuto writes carries the name, size, mtime and CRC of each
+member as the source files were when zipped. Comparing that with the folder
+tells whether the zip is stale without opening a single member, and which
+members were added, replaced or removed since.
+
+The comment is JSON: {"mseqauto_manifest": 1, "members": [[name, size,
+mtime_ns, crc32], ...]}. Zips without one (older zips, 7-Zip output) have no
+manifest and are treated as current, as before. A manifest too large for a
+zip comment is replaced by an "oversized" marker, and a zip that cannot be
+read or whose members no longer match its manifest raises ManifestUnavailable,
+so those zips count as stale rather than current.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import NamedTuple
+from zipfile import ZipFile, BadZipFile
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+MANIFEST_KEY = 'mseqauto_manifest'
+MANIFEST_VERSION = 1
+MAX_COMMENT_BYTES = 65535
+
+
+class ManifestUnavailable(Exception):
+    """A zip that should carry a manifest cannot be checked against it; treat the zip as stale"""
+
+
+class ManifestEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    crc: int
+
+
+class ManifestDiff(NamedTuple):
+    added: list      # members in the folder but not in the zip
+    changed: list    # members whose size or mtime differ
+    removed: list    # members in the zip no longer in the folder
+
+    @property
+    def current(self):
+        return not (self.added or self.changed or self.removed)
+
+    @property
+    def append_only(self):
+        """True if appending the added members brings the zip up to date"""
+        return bool(self.added) and not (self.changed or self.removed)
+
+
+def source_entries(file_paths):
+    """name -> (size, mtime_ns) of the files that are about to be zipped"""
+    entries = {}
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+        entries[Path(file_path).name] = (stat.st_size, stat.st_mtime_ns)
+    return entries
+
+
+def manifest_comment(zip_file, sources):
+    """
+    Archive comment for an open ZipFile whose members came from sources
+    (name -> (size, mtime_ns)); CRCs are taken from the zip itself
+
+    A manifest that would not fit in a zip comment is replaced by the
+    oversized marker, which makes the zip stale on the next check.
+    """
+    members = []
+    for info in zip_file.infolist():
+        size, mtime_ns = sources.get(info.filename, (info.file_size, 0))
+        members.append([info.filename, size, mtime_ns, info.CRC])
+    comment = json.dumps({MANIFEST_KEY: MANIFEST_VERSION, 'members': members},
+                         separators=(',', ':')).encode('utf-8')
+    if len(comment) > MAX_COMMENT_BYTES:
+        return json.dumps({MANIFEST_KEY: MANIFEST_VERSION, 'oversized': True}).encode('utf-8')
+    return comment
+
+
+def parse_manifest(comment):
+    """
+    name -> ManifestEntry from an archive comment, None if it is not a manifest
+
+    Raises:
+        ManifestUnavailable: For the oversized marker or a damaged manifest
+    """
+    try:
+        data = json.loads(comment.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get(MANIFEST_KEY) != MANIFEST_VERSION:
+        return None
+    if data.get('oversized'):
+        raise ManifestUnavailable("manifest was too large to store")
+    try:
+        return {name: ManifestEntry(int(size), int(mtime_ns), int(crc))
+                for name, size, mtime_ns, crc in data['members']}
+    except (KeyError, TypeError, ValueError) as e:
+        raise ManifestUnavailable(f"damaged manifest: {e}") from e
+
+
+def read_manifest(zip_path):
+    """
+    Manifest of a zip file, None if the zip simply has none
+
+    The manifest's names and CRCs are checked against the zip's own member
+    list, so a zip rewritten by another tool or left incomplete is caught
+    without reading any member data.
+
+    Raises:
+        ManifestUnavailable: If the zip cannot be read, its manifest cannot be
+        used, or its members do not match the manifest
+    """
+    try:
+        with ZipFile(zip_path, 'r') as zip_file:
+            manifest = parse_manifest(zip_file.comment)
+            if manifest is None:
+                return None
+            members = {info.filename: info.CRC for info in zip_file.infolist()}
+    except (OSError, BadZipFile) as e:
+        raise ManifestUnavailable(f"unreadable zip: {e}") from e
+    if members != {name: entry.crc for name, entry in manifest.items()}:
+        raise ManifestUnavailable("zip members do not match its manifest")
+    return manifest
+
+
+def diff_manifest(manifest, sources):
+    """Compare a manifest with the current source files (name -> (size, mtime_ns))"""
+    added = sorted(name for name in sources if name not in manifest)
+    changed = sorted(name for name, (size, mtime_ns) in sources.items()
+                     if name in manifest and (manifest[name].size, manifest[name].mtime_ns) != (size, mtime_ns))
+    removed = sorted(name for name in manifest if name not in sources)
+    return ManifestDiff(added, changed, removed)
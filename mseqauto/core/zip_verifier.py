@@ -0,0 +1,155 @@
+# zip_verifier.py
+import mmap
+import os
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+from zipfile import ZipFile, BadZipFile
+
+sys.path.append(str(Path(__file__).parents[2]))
+
+from mseqauto.utils.logger import LevelLogger  # type: ignore
+
+READ_SIZE = 1024 * 1024
+
+
+class ZipIntegrity(NamedTuple):
+    """Result of a deep verification; problems is empty when the zip is sound"""
+    members: int           # members whose data decompressed with a matching CRC
+    sources: int           # members also compared with their source file
+    problems: list         # one line per damaged member, copy or source mismatch
+
+    @property
+    def ok(self):
+        return not self.problems
+
+    def summary(self):
+        """Text for the summary's Integrity column"""
+        if self.ok:
+            checked = f"{self.members} CRC"
+            if self.sources:
+                checked += f", {self.sources} source"
+            return f"OK ({checked})"
+        return "; ".join(self.problems)
+
+
+class _MappedFile:
+    """Read-only, seekable file over an mmap, as ZipFile expects"""
+
+    def __init__(self, mapped):
+        self._mapped = mapped
+
+    def read(self, size=-1):
+        return self._mapped.read(size if size is not None and size >= 0 else len(self._mapped))
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self._mapped.seek(offset, whence)
+        return self._mapped.tell()
+
+    def tell(self):
+        return self._mapped.tell()
+
+    def seekable(self):
+        return True
+
+
+def file_crc32(path):
+    """CRC-32 of a file, read through a memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return zlib.crc32(mapped)
+
+
+def verify_zip(zip_path, source_folder=None, compare_sources=False):
+    """
+    Stream every member of a zip and check its CRC
+
+    With compare_sources, each member that still has a file of the same
+    name in source_folder is also compared with that file's CRC.
+
+    Returns:
+        ZipIntegrity: Counts and problems found (an unreadable or truncated
+        zip is a single problem)
+    """
+    members = sources = 0
+    problems = []
+    try:
+        with open(zip_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with ZipFile(_MappedFile(mapped)) as zip_file:
+                for info in zip_file.infolist():
+                    if info.is_dir():
+                        continue
+                    try:
+                        with zip_file.open(info) as member:
+                            while member.read(READ_SIZE):
+                                pass
+                    except (BadZipFile, EOFError, zlib.error, NotImplementedError) as e:
+                        problems.append(f"{info.filename}: {e}")
+                        continue
+                    members += 1
+
+                    if compare_sources and source_folder is not None:
+                        source = Path(source_folder) / info.filename
+                        if source.is_file():
+                            sources += 1
+                            try:
+                                if file_crc32(source) != info.CRC:
+                                    problems.append(f"{info.filename}: differs from source file")
+                            except (OSError, ValueError) as e:
+                                problems.append(f"{info.filename}: source file unreadable: {e}")
+    except (OSError, ValueError, BadZipFile) as e:
+        # ValueError: mmap of an empty file
+        problems.append(f"Unreadable zip {Path(zip_path).name}: {e}")
+    return ZipIntegrity(members, sources, problems)
+
+
+class ZipVerifier:
+    """
+    Deep-verify zips on a thread pool while the caller carries on
+
+    submit() returns a Future of ZipIntegrity. zlib releases the GIL while
+    decompressing and computing CRCs, so zips are checked in parallel and
+    alongside the name validation of the next orders.
+    """
+
+    def __init__(self, max_workers=4, compare_sources=False, logger=None):
+        self.compare_sources = compare_sources
+        levels = LevelLogger(logger, name=__name__)
+        self.log = levels.info
+        self.warning = levels.warning
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="zip-verify")
+
+    def submit(self, zip_path, source_folder=None, copies=()):
+        """Verify a zip, and any delivered copies of it (e.g. in the zip dump)"""
+        return self._executor.submit(self._verify, zip_path, source_folder, tuple(copies))
+
+    def _verify(self, zip_path, source_folder, copies):
+        result = verify_zip(zip_path, source_folder, self.compare_sources)
+        for copy_path in copies:
+            try:
+                if not os.path.exists(copy_path) or os.path.samefile(zip_path, copy_path):
+                    continue
+                copy_result = verify_zip(copy_path)
+                problems = [f"dump copy: {problem}" for problem in copy_result.problems]
+                if not problems and os.path.getsize(copy_path) != os.path.getsize(zip_path):
+                    problems.append("dump copy: size differs from the order zip")
+            except OSError as e:
+                # e.g. the dump entry was replaced or removed mid-check
+                problems = [f"dump copy: {e}"]
+            result.problems.extend(problems)
+        if not result.ok:
+            self.warning(f"Integrity check failed for {Path(zip_path).name}: {result.summary()}")
+        return result
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
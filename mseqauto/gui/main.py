@@ -46,8 +46,10 @@ class WorkerThread(QThread):
             env['MSEQAUTO_GUI_MODE'] = 'True'
             env['MSEQAUTO_DATA_FOLDER'] = self.data_folder
             
-            # Use 32-bit Python
-            cmd = [self.config.PYTHON32_PATH, script_path]
+            # Scripts reach mSeq through the 32-bit automation server, so they can
+            # run in this interpreter; without it they need 32-bit Python
+            python = sys.executable if self.config.USE_AUTOMATION_SERVER else self.config.PYTHON32_PATH
+            cmd = [python, script_path]
             
             # Create process
             self.process = subprocess.Popen(
@@ -100,6 +102,10 @@ class WorkerThread(QThread):
             )
         elif msg_type == 'status':
             self.status_signal.emit(data.get('status', ''))
+        elif msg_type == 'timing':
+            spans = ', '.join(f"{name} {stats['total']:.2f}s" for name, stats in data.get('spans', {}).items())
+            self.log_signal.emit(f"{data.get('run', '')} finished in {data.get('duration', 0):.1f}s ({spans})")
+            self.log_signal.emit(f"Timing report: {data.get('report', '')}")
 
 # Add this to your gui/main.py
 
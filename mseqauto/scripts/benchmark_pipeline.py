@@ -0,0 +1,152 @@
+# benchmark_pipeline.py
+"""
+End-to-end throughput benchmark for the IND pipeline (sort -> mSeq -> zip)
+
+Generates a synthetic day folder, runs the same stage functions as
+ind_process_all.py against it with the headless mSeq simulator, and reports
+time and throughput per stage. Runs anywhere - no Windows, mSeq or lab drives.
+
+Example:
+    python -m mseqauto.scripts.benchmark_pipeline --bioi 4 --orders 8 --samples 12 --latency 0.05
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to PYTHONPATH for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def count_files(folder, suffix):
+    """Count files with a suffix anywhere under folder"""
+    return sum(1 for _ in Path(folder).rglob(f"*{suffix}"))
+
+
+def run_benchmark(work_dir, bioi_count=2, orders_per_bioi=4, samples_per_order=8, pcr_count=1,
+                  reinject_count=2, ab1_size=4096, latency=0.0, per_file_latency=0.0,
+                  startup_latency=0.0, failure_rate=0.0, seed=0):
+    """
+    Generate a day folder in work_dir and time each ind_process_all stage
+
+    Returns:
+        dict: Generation parameters, per-stage results and simulator stats
+    """
+    from mseqauto.config import MseqConfig  # type: ignore
+    from mseqauto.core.mseq_simulator import MseqSimulator  # type: ignore
+    from mseqauto.core.pipeline_context import PipelineContext  # type: ignore
+    from mseqauto.utils.synthetic_data import generate_day_folder, apply_to_config  # type: ignore
+    from mseqauto.scripts.ind_process_all import run_sort_files, run_mseq_processing, run_zip_files  # type: ignore
+
+    gen_start = time.perf_counter()
+    day = generate_day_folder(work_dir, bioi_count=bioi_count, orders_per_bioi=orders_per_bioi,
+                              samples_per_order=samples_per_order, pcr_count=pcr_count,
+                              plate_count=0, reinject_count=reinject_count, ab1_size=ab1_size, seed=seed)
+    gen_elapsed = time.perf_counter() - gen_start
+
+    config = apply_to_config(MseqConfig(), day)
+    simulator = MseqSimulator(config, latency=latency, per_file_latency=per_file_latency,
+                              startup_latency=startup_latency, failure_rate=failure_rate, seed=seed)
+    data_folder = str(day['day_folder'])
+    context = PipelineContext(config, data_folder)
+    zip_dump = Path(data_folder) / config.ZIP_DUMP_FOLDER
+
+    stages = [
+        ('sort', lambda: run_sort_files(data_folder, context=context),
+         lambda: day['total_ab1'], 'files'),
+        ('mseq', lambda: run_mseq_processing(data_folder, ui_automation=simulator, context=context),
+         lambda: simulator.stats['folders_processed'] + simulator.stats['folders_failed'], 'folders'),
+        ('zip', lambda: run_zip_files(data_folder, context=context),
+         lambda: count_files(zip_dump, config.ZIP_EXTENSION) if zip_dump.exists() else 0, 'zips'),
+    ]
+
+    results = []
+    with context:
+        for name, run, count, unit in stages:
+            start = time.perf_counter()
+            success = run()
+            elapsed = time.perf_counter() - start
+            items = count()
+            results.append({
+                'stage': name,
+                'success': bool(success),
+                'seconds': elapsed,
+                'items': items,
+                'unit': unit,
+                'per_second': items / elapsed if elapsed > 0 else 0.0
+            })
+
+    total = sum(r['seconds'] for r in results)
+    return {
+        'parameters': {
+            'bioi_count': bioi_count, 'orders_per_bioi': orders_per_bioi,
+            'samples_per_order': samples_per_order, 'pcr_count': pcr_count,
+            'reinject_count': reinject_count, 'ab1_size': ab1_size, 'latency': latency,
+            'per_file_latency': per_file_latency, 'startup_latency': startup_latency,
+            'failure_rate': failure_rate, 'seed': seed
+        },
+        'generated': {'seconds': gen_elapsed, 'ab1_files': day['total_ab1'],
+                      'orders': len(day['orders']), 'counts': day['counts']},
+        'stages': results,
+        'total_seconds': total,
+        'files_per_second': day['total_ab1'] / total if total > 0 else 0.0,
+        'simulator': dict(simulator.stats)
+    }
+
+
+def format_report(report):
+    """Format a benchmark report as a plain-text table"""
+    gen = report['generated']
+    lines = [
+        f"Generated {gen['ab1_files']} ab1 files in {gen['orders']} orders ({gen['seconds']:.2f}s)",
+        f"{'Stage':<8}{'OK':<5}{'Seconds':>10}{'Items':>8}  {'Throughput':<16}",
+    ]
+    for r in report['stages']:
+        lines.append(f"{r['stage']:<8}{'yes' if r['success'] else 'no':<5}{r['seconds']:>10.3f}"
+                     f"{r['items']:>8}  {r['per_second']:.1f} {r['unit']}/s")
+    lines.append(f"{'total':<8}{'':<5}{report['total_seconds']:>10.3f}{gen['ab1_files']:>8}  "
+                 f"{report['files_per_second']:.1f} files/s")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the IND pipeline on synthetic data")
+    parser.add_argument('--bioi', type=int, default=2, help="BioI folders to generate")
+    parser.add_argument('--orders', type=int, default=4, help="Orders per BioI folder")
+    parser.add_argument('--samples', type=int, default=8, help="Samples per order")
+    parser.add_argument('--pcr', type=int, default=1, help="FB-PCR groups per BioI folder")
+    parser.add_argument('--reinjects', type=int, default=2, help="Reinjects per BioI folder")
+    parser.add_argument('--ab1-size', type=int, default=4096, help="Bytes per fake .ab1 file")
+    parser.add_argument('--latency', type=float, default=0.0, help="Simulated mSeq seconds per folder")
+    parser.add_argument('--per-file-latency', type=float, default=0.0, help="Simulated mSeq seconds per file")
+    parser.add_argument('--startup-latency', type=float, default=0.0, help="Simulated mSeq launch time")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Simulated mSeq failure probability")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--work-dir', help="Generate data here instead of a temp folder (kept afterwards)")
+    parser.add_argument('--json', help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="mseqauto_bench_")
+    try:
+        report = run_benchmark(work_dir, bioi_count=args.bioi, orders_per_bioi=args.orders,
+                               samples_per_order=args.samples, pcr_count=args.pcr,
+                               reinject_count=args.reinjects, ab1_size=args.ab1_size,
+                               latency=args.latency, per_file_latency=args.per_file_latency,
+                               startup_latency=args.startup_latency, failure_rate=args.failure_rate,
+                               seed=args.seed)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -41,14 +41,23 @@ def has_plasmid_files(folder_path):
         pass
     return False
 
-def has_standard_zip(folder_path, config):
-    """Check if a folder contains a standard zip file (not a raw data zip)"""
+def has_standard_zip(folder_path, config, processor=None):
+    """
+    Check if a folder contains a standard zip file (not a raw data zip)
+
+    With a processor, the order's own zip only counts while its member
+    manifest still matches the folder.
+    """
     try:
         for item in os.listdir(folder_path):
             if item.endswith('.zip'):
                 # Skip raw data zips (ending with rd#.zip)
                 if config.REGEX_PATTERNS['raw_data_zip'].search(item):
                     continue
+                if processor is not None and item == f"{os.path.basename(folder_path)}.zip" and \
+                        not processor.file_dao.zip_is_current(folder_path, os.path.join(folder_path, item),
+                                                              processor.PLASMID_EXTENSIONS):
+                    return False
                 # Found a non-raw-data zip file
                 return True
     except (OSError, PermissionError):
@@ -69,7 +78,7 @@ def process_plasmid_folder(folder_path, file_dao, processor, order_key, zip_dump
         return False
 
     # Check if order already has a standard zip file (ignore raw data zips)
-    if has_standard_zip(folder_path, config):
+    if has_standard_zip(folder_path, config, processor):
         logger.info(f"Skipping {folder_name} - already has standard zip file")
         return False
 
@@ -86,13 +95,12 @@ def process_plasmid_folder(folder_path, file_dao, processor, order_key, zip_dump
         order_key=order_key,
         order_number=order_number,
         use_7zip=USE_7ZIP,
-        compression_level=COMPRESSION_LEVEL
+        compression_level=COMPRESSION_LEVEL,
+        dump_folder=zip_dump_folder
     )
 
     if zip_path:
-        # Copy zip to dump folder
-        logger.info(f"Copying zip to dump folder: {os.path.basename(zip_path)}")
-        file_dao.copy_zip_to_dump(zip_path, zip_dump_folder)
+        logger.info(f"Delivered zip to dump folder: {os.path.basename(zip_path)}")
         logger.info(f"Successfully processed {folder_name}")
         return True
     else:
@@ -52,7 +52,10 @@ def main(provided_folder=None):
     # The GUI is already launching us with 32-bit Python
     if not GUI_MODE:
         # Only do the 32-bit check in standalone mode
-        if not is_relaunched and provided_folder is None and sys.maxsize > 2 ** 32:
+        from mseqauto.config import MseqConfig  # type: ignore
+        # With the automation server, mSeq is driven from its 32-bit process instead
+        if (not is_relaunched and provided_folder is None and sys.maxsize > 2 ** 32
+                and not MseqConfig.USE_AUTOMATION_SERVER):
             print("Detected 64-bit Python, need to relaunch in 32-bit for mSeq automation...")
 
             # Set environment variable before relaunching
@@ -76,6 +79,8 @@ def main(provided_folder=None):
 
     if is_relaunched:
         print("Running in relaunched 32-bit Python process")
+    elif provided_folder is None and sys.maxsize > 2 ** 32:
+        print("Using the 32-bit automation server for mSeq")
     elif provided_folder is None:
         print("Already running in 32-bit Python")
 
@@ -92,8 +97,8 @@ def main(provided_folder=None):
 
     # NOW import package modules (after folder selection and 32-bit check)
     from mseqauto.utils import setup_logger  # type: ignore
-    from mseqauto.config import MseqConfig  # type: ignore
-    from mseqauto.core import OSCompatibilityManager, FileSystemDAO, MseqAutomation, FolderProcessor  # type: ignore
+    from mseqauto.core import OSCompatibilityManager, PipelineContext  # type: ignore
+    from mseqauto.core.automation_server import create_ui_automation  # type: ignore
 
     # Get the script directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -109,10 +114,13 @@ def main(provided_folder=None):
     OSCompatibilityManager.log_environment_info(logger)
 
     # Initialize components
-    config = MseqConfig()
-    file_dao = FileSystemDAO(config)
-    ui_automation = MseqAutomation(config)
-    processor = FolderProcessor(file_dao, ui_automation, config, logger=logger.info)
+    # The context loads the order key once for every order's expected file count
+    context = PipelineContext(data_folder=data_folder, logger=logger)
+    config = context.config
+    file_dao = context.file_dao
+    ui_automation = create_ui_automation(config)
+    use_pool = config.MSEQ_WORKER_COUNT > 1
+    processor = context.processor(ui_automation, logger=logger.info)
 
     try:
         # Get folders to process
@@ -156,6 +164,13 @@ def main(provided_folder=None):
             print("No folders found to process, exiting")
             return
 
+        # With MSEQ_WORKER_COUNT > 1 the ready orders are mSeqed in parallel first, each worker
+        # on its own mSeq; the passes below then move them and retry any the pool could not finish
+        if use_pool:
+            order_folders = [order for bio_folder in bio_folders
+                             for order in processor.get_order_folders(bio_folder)] + immediate_orders
+            processor.mseq_orders_in_pool(order_folders, config.MSEQ_WORKER_COUNT)
+
         # Process BioI folders
         for i, folder in enumerate(bio_folders):
             logger.info(f"Processing BioI folder {i+1}/{len(bio_folders)}: {os.path.basename(folder)}")
@@ -191,6 +206,13 @@ def main(provided_folder=None):
                 ui_automation.close()
         except Exception as e:
             logger.error(f"Error closing mSeq: {e}")
+        context.close()
+
+def run():
+    """Run main() as an instrumented run; the console entry point"""
+    from mseqauto.utils.instrumentation import run_instrumented  # type: ignore
+    return run_instrumented("ind_auto_mseq", main)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run()
@@ -37,11 +37,17 @@ def show_error_and_exit(step_name, error_msg):
     root.destroy()
     sys.exit(1)
 
-def run_sort_files(data_folder):
-    """Run the file sorting step"""
+def run_sort_files(data_folder, config=None, context=None):
+    """Run the file sorting step
+
+    Args:
+        data_folder: Today's data folder
+        config: Optional config, defaults to MseqConfig()
+        context: Optional PipelineContext shared with the other steps
+    """
+    own_context = None
     try:
-        from mseqauto.config import MseqConfig # type: ignore
-        from mseqauto.core import FileSystemDAO, FolderProcessor # type: ignore
+        from mseqauto.core import PipelineContext # type: ignore
         from mseqauto.utils import setup_logger # type: ignore
         from datetime import datetime
         import subprocess
@@ -55,22 +61,24 @@ def run_sort_files(data_folder):
         logger.info("Starting IND sort files...")
 
         # Initialize components
-        config = MseqConfig()
-        logger.info("Config loaded")
-        file_dao = FileSystemDAO(config)
-        logger.info("FileSystemDAO initialized")
-        processor = FolderProcessor(file_dao, None, config, logger=logger.info)
+        if context is None:
+            context = own_context = PipelineContext(config, data_folder, logger)
+        context.begin_stage("sort")
+        config = context.config
+        file_dao = context.file_dao
+        processor = context.processor(logger=logger.info)
         logger.info("Folder processor initialized")
         logger.info(f"Using folder: {data_folder}")
 
-        # Run batch file to generate order key
-        try:
-            logger.info(f"Running batch file: {config.BATCH_FILE_PATH}")
-            subprocess.run(config.BATCH_FILE_PATH, shell=True, check=True)
-            logger.info("Batch file completed successfully")
-        except subprocess.CalledProcessError:
-            logger.error(f"Batch file {config.BATCH_FILE_PATH} failed to run")
-            raise Exception(f"Batch file {config.BATCH_FILE_PATH} failed to run")
+        # Run batch file to generate order key (skipped when the key is provided directly)
+        if config.BATCH_FILE_PATH:
+            try:
+                logger.info(f"Running batch file: {config.BATCH_FILE_PATH}")
+                subprocess.run(config.BATCH_FILE_PATH, shell=True, check=True)
+                logger.info("Batch file completed successfully")
+            except subprocess.CalledProcessError:
+                logger.error(f"Batch file {config.BATCH_FILE_PATH} failed to run")
+                raise Exception(f"Batch file {config.BATCH_FILE_PATH} failed to run")
 
         # Store the selected folder in the processor for later reference
         processor.current_data_folder = data_folder
@@ -80,28 +88,23 @@ def run_sort_files(data_folder):
         logger.info(f"Found {len(i_numbers)} I numbers and {len(bio_folders)} BioI folders")
 
         # Get recent I numbers for order key filtering
-        recent_inumbers = file_dao.collect_active_inumbers(
-            paths=['G:\\Lab\\Spreadsheets\\Individual Uploaded to ABI', 'G:\\Lab\\Spreadsheets'],
-            min_inum=file_dao.get_most_recent_inumber('P:\\Data\\Individuals')
-        )
+        recent_inumbers = context.active_inumbers()
 
         # Load order key and adjust characters
-        order_key = file_dao.load_order_key(config.KEY_FILE_PATH)
+        order_key = context.order_key()
         logger.info("Order key loaded")
 
         # Get complete list of reinjects
-        reinject_path = f"P:\\Data\\Reinjects\\Reinject List_{datetime.now().strftime('%m-%d-%Y')}.xlsx"
+        reinject_path = os.path.join(str(config.REINJECT_FOLDER), f"Reinject List_{datetime.now().strftime('%m-%d-%Y')}.xlsx")
         try:
-            reinject_list = processor.get_reinject_list(recent_inumbers, reinject_path)
+            reinject_list = context.reinject_list(processor, recent_inumbers, reinject_path)
             logger.info(f"Found {len(reinject_list)} reinjects")
         except Exception as e:
             logger.error(f"Error loading reinject list: {e}")
             reinject_list = []
 
-        # Process each BioI folder
-        for i, folder in enumerate(bio_folders):
-            logger.info(f"Processing folder {i+1}/{len(bio_folders)}: {os.path.basename(folder)}")
-            processor.sort_ind_folder(folder, reinject_list, order_key)
+        # Process the BioI folders (concurrently with SORT_WORKER_COUNT > 1)
+        processor.sort_ind_folders(bio_folders, reinject_list, order_key)
 
         # Final cleanup pass for the entire data folder
         processor.final_cleanup(data_folder)
@@ -111,13 +114,24 @@ def run_sort_files(data_folder):
 
     except Exception as e:
         raise Exception(f"File sorting failed: {str(e)}")
-
-def run_mseq_processing(data_folder):
-    """Run the mSeq processing step"""
+    finally:
+        if own_context is not None:
+            own_context.close()
+
+def run_mseq_processing(data_folder, config=None, ui_automation=None, context=None):
+    """Run the mSeq processing step
+
+    Args:
+        data_folder: Today's data folder
+        config: Optional config, defaults to MseqConfig()
+        ui_automation: Optional automation object (e.g. MseqSimulator), defaults to create_ui_automation()
+        context: Optional PipelineContext shared with the other steps
+    """
+    own_context = None
     try:
         from mseqauto.utils import setup_logger # type: ignore
-        from mseqauto.config import MseqConfig # type: ignore
-        from mseqauto.core import OSCompatibilityManager, FileSystemDAO, MseqAutomation, FolderProcessor # type: ignore
+        from mseqauto.core import OSCompatibilityManager, PipelineContext # type: ignore
+        from mseqauto.core.automation_server import create_ui_automation  # type: ignore
 
         # Get the script directory
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -137,10 +151,14 @@ def run_mseq_processing(data_folder):
         OSCompatibilityManager.log_environment_info(logger)
 
         # Initialize components
-        config = MseqConfig()
-        file_dao = FileSystemDAO(config)
-        ui_automation = MseqAutomation(config, logger)
-        processor = FolderProcessor(file_dao, ui_automation, config, logger=logger.info)
+        if context is None:
+            context = own_context = PipelineContext(config, data_folder, logger)
+        context.begin_stage("mseq")
+        config = context.config
+        file_dao = context.file_dao
+        use_pool = ui_automation is None and config.MSEQ_WORKER_COUNT > 1
+        ui_automation = ui_automation or create_ui_automation(config, logger)
+        processor = context.processor(ui_automation, logger=logger.info)
 
         try:
             # Get folders to process
@@ -158,6 +176,13 @@ def run_mseq_processing(data_folder):
                 logger.info("No folders found to process")
                 return True
 
+            # With MSEQ_WORKER_COUNT > 1 the ready orders are mSeqed in parallel first, each worker
+            # on its own mSeq; the passes below then move them and retry any the pool could not finish
+            if use_pool:
+                order_folders = [order for bio_folder in bio_folders
+                                 for order in processor.get_order_folders(bio_folder)] + immediate_orders
+                processor.mseq_orders_in_pool(order_folders, config.MSEQ_WORKER_COUNT)
+
             # Process BioI folders
             for i, folder in enumerate(bio_folders):
                 logger.info(f"Processing BioI folder {i+1}/{len(bio_folders)}: {os.path.basename(folder)}")
@@ -191,12 +216,21 @@ def run_mseq_processing(data_folder):
 
     except Exception as e:
         raise Exception(f"mSeq processing failed: {str(e)}")
-
-def run_zip_files(data_folder):
-    """Run the file zipping step"""
+    finally:
+        if own_context is not None:
+            own_context.close()
+
+def run_zip_files(data_folder, config=None, context=None):
+    """Run the file zipping step
+
+    Args:
+        data_folder: Today's data folder
+        config: Optional config, defaults to MseqConfig()
+        context: Optional PipelineContext shared with the other steps
+    """
+    own_context = None
     try:
-        from mseqauto.config import MseqConfig # type: ignore
-        from mseqauto.core import FileSystemDAO, FolderProcessor # type: ignore
+        from mseqauto.core import PipelineContext # type: ignore
         from mseqauto.utils import setup_logger # type: ignore
 
         # Get the script directory
@@ -208,12 +242,13 @@ def run_zip_files(data_folder):
         logger.info("Starting IND zip files...")
 
         # Initialize components
-        config = MseqConfig()
-        logger.info("Config loaded")
+        if context is None:
+            context = own_context = PipelineContext(config, data_folder, logger)
+        context.begin_stage("zip")
+        config = context.config
         REGEX = config.REGEX_PATTERNS
-        file_dao = FileSystemDAO(config, logger=logger)
-        logger.info("FileSystemDAO initialized")
-        processor = FolderProcessor(file_dao, None, config, logger=logger.info)
+        file_dao = context.file_dao
+        processor = context.processor(logger=logger.info)
         logger.info("Folder processor initialized")
         logger.info(f"Using folder: {data_folder}")
 
@@ -254,18 +289,16 @@ def run_zip_files(data_folder):
 
             for order_folder in order_folders:
                 # Check if order already has a zip file
-                if file_dao.check_for_zip(order_folder):
+                if processor.check_for_zip(order_folder):
                     logger.info(f"Skipping {os.path.basename(order_folder)} - already has zip file")
                     continue
 
                 # Zip the order folder
                 logger.info(f"Zipping {os.path.basename(order_folder)}")
-                zip_path = processor.zip_order_folder(order_folder, include_txt=True)
+                zip_path = processor.zip_order_folder(order_folder, include_txt=True, dump_folder=zip_dump_folder)
 
                 if zip_path:
-                    # Copy zip to dump folder
-                    logger.info(f"Copying zip to dump folder: {os.path.basename(zip_path)}")
-                    file_dao.copy_zip_to_dump(zip_path, zip_dump_folder)
+                    logger.info(f"Delivered zip to dump folder: {os.path.basename(zip_path)}")
 
                     order_count += 1
                     logger.info(f"Successfully processed {os.path.basename(order_folder)}")
@@ -275,18 +308,16 @@ def run_zip_files(data_folder):
         # Process PCR folders
         for pcr_folder in pcr_folders:
             # Check if PCR folder already has a zip file
-            if file_dao.check_for_zip(pcr_folder):
+            if processor.check_for_zip(pcr_folder):
                 logger.info(f"Skipping {os.path.basename(pcr_folder)} - already has zip file")
                 continue
 
             # Zip the PCR folder
             logger.info(f"Zipping {os.path.basename(pcr_folder)}")
-            zip_path = processor.zip_order_folder(pcr_folder, include_txt=True)
+            zip_path = processor.zip_order_folder(pcr_folder, include_txt=True, dump_folder=zip_dump_folder)
 
             if zip_path:
-                # Copy zip to dump folder
-                logger.info(f"Copying zip to dump folder: {os.path.basename(zip_path)}")
-                file_dao.copy_zip_to_dump(zip_path, zip_dump_folder)
+                logger.info(f"Delivered zip to dump folder: {os.path.basename(zip_path)}")
 
                 order_count += 1
                 logger.info(f"Successfully processed {os.path.basename(pcr_folder)}")
@@ -308,6 +339,9 @@ def run_zip_files(data_folder):
 
     except Exception as e:
         raise Exception(f"File zipping failed: {str(e)}")
+    finally:
+        if own_context is not None:
+            own_context.close()
 
 def check_relaunch_status():
     """Check if we're after a relaunch"""
@@ -322,7 +356,10 @@ def main():
     import sys
 
     # Check if we're in 32-bit Python FIRST, before folder selection
-    if not is_relaunched and sys.maxsize > 2 ** 32:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from mseqauto.config import MseqConfig  # type: ignore
+    # With the automation server, mSeq is driven from its 32-bit process instead
+    if not is_relaunched and sys.maxsize > 2 ** 32 and not MseqConfig.USE_AUTOMATION_SERVER:
         print("Detected 64-bit Python, need to relaunch in 32-bit for mSeq automation...")
 
         # Set environment variable before relaunching
@@ -345,6 +382,8 @@ def main():
 
     if is_relaunched:
         print("Running in relaunched 32-bit Python process")
+    elif sys.maxsize > 2 ** 32:
+        print("Using the 32-bit automation server for mSeq")
     else:
         print("Already running in 32-bit Python")
 
@@ -379,21 +418,24 @@ def main():
         ("File Zipping", run_zip_files)
     ]
 
-    # Run each step in sequence
-    for i, (step_name, step_func) in enumerate(steps, 1):
-        print(f"\n{'='*50}")
-        print(f"STEP {i}/3: {step_name.upper()}")
-        print(f"{'='*50}")
+    # One context carries the DAO, order key, reinject list and state store across the steps
+    from mseqauto.core import PipelineContext  # type: ignore
+    with PipelineContext(data_folder=data_folder, logger=logger) as context:
+        # Run each step in sequence
+        for i, (step_name, step_func) in enumerate(steps, 1):
+            print(f"\n{'='*50}")
+            print(f"STEP {i}/3: {step_name.upper()}")
+            print(f"{'='*50}")
 
-        try:
-            success = step_func(data_folder)
-            if success:
-                print(f"✓ {step_name} completed successfully")
-            else:
-                show_error_and_exit(step_name, "Step returned failure status")
+            try:
+                success = step_func(data_folder, context=context)
+                if success:
+                    print(f"✓ {step_name} completed successfully")
+                else:
+                    show_error_and_exit(step_name, "Step returned failure status")
 
-        except Exception as e:
-            show_error_and_exit(step_name, str(e))
+            except Exception as e:
+                show_error_and_exit(step_name, str(e))
 
     # All steps completed successfully
     print(f"\n{'='*60}")
@@ -407,5 +449,11 @@ def main():
     messagebox.showinfo("Processing Complete", "All IND processing steps completed successfully!")
     root.destroy()
 
+def run():
+    """Run main() as an instrumented run; the console entry point"""
+    from mseqauto.utils.instrumentation import run_instrumented  # type: ignore
+    return run_instrumented("ind_process_all", main)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run()
@@ -55,8 +55,7 @@ def main():
         return
 
     # ONLY NOW import package modules
-    from mseqauto.config import MseqConfig # type: ignore
-    from mseqauto.core import FileSystemDAO, FolderProcessor # type: ignore
+    from mseqauto.core import PipelineContext # type: ignore
     from mseqauto.utils import setup_logger # type: ignore
 
     # Get the script directory
@@ -69,61 +68,64 @@ def main():
     logger.info("Starting IND sort files...")
 
     # Initialize components
-    config = MseqConfig()
-    logger.info("Config loaded")
-    file_dao = FileSystemDAO(config)
-    logger.info("FileSystemDAO initialized")
-    processor = FolderProcessor(file_dao, None, config, logger=logger.info)
-    logger.info("Folder processor initialized")
-    logger.info(f"Using folder: {data_folder}")
-
-    # Run batch file to generate order key
+    context = PipelineContext(data_folder=data_folder, logger=logger)
     try:
-        logger.info(f"Running batch file: {config.BATCH_FILE_PATH}")
-        batch_file_path = str(config.BATCH_FILE_PATH)  # Convert Path to string
-        subprocess.run(batch_file_path, shell=True, check=True)
-        logger.info("Batch file completed successfully")
-    except subprocess.CalledProcessError:
-        logger.error(f"Batch file {config.BATCH_FILE_PATH} failed to run")
-        print(f"Error: Batch file {config.BATCH_FILE_PATH} failed to run")
-        return
-
-    # Store the selected folder in the processor for later reference
-    processor.current_data_folder = data_folder #type: ignore
-
-    # Get today's I numbers and BioI folders
-    i_numbers, bio_folders = file_dao.get_folders_with_inumbers(data_folder)
-    logger.info(f"Found {len(i_numbers)} I numbers and {len(bio_folders)} BioI folders")
-
-    # Get recent I numbers for order key filtering
-    recent_inumbers = file_dao.collect_active_inumbers(
-        paths=['G:\\Lab\\Spreadsheets\\Individual Uploaded to ABI', 'G:\\Lab\\Spreadsheets'],
-        min_inum=file_dao.get_most_recent_inumber('P:\\Data\\Individuals')
-    )
-
-    # Load order key and adjust characters
-    order_key = file_dao.load_order_key(str(config.KEY_FILE_PATH))
-    logger.info("Order key loaded")
-
-    # Get complete list of reinjects
-    reinject_path = f"P:\\Data\\Reinjects\\Reinject List_{datetime.now().strftime('%m-%d-%Y')}.xlsx"
-    try:
-        reinject_list = processor.get_reinject_list(recent_inumbers, reinject_path)
-        logger.info(f"Found {len(reinject_list)} reinjects")
-    except Exception as e:
-        logger.error(f"Error loading reinject list: {e}")
-        reinject_list = []
-
-    # Process each BioI folder
-    for i, folder in enumerate(bio_folders):
-        logger.info(f"Processing folder {i+1}/{len(bio_folders)}: {Path(folder).name}")
-        processor.sort_ind_folder(folder, reinject_list, order_key)
+        config = context.config
+        file_dao = context.file_dao
+        processor = context.processor(logger=logger.info)
+        logger.info("Folder processor initialized")
+        logger.info(f"Using folder: {data_folder}")
+
+        # Run batch file to generate order key
+        try:
+            logger.info(f"Running batch file: {config.BATCH_FILE_PATH}")
+            batch_file_path = str(config.BATCH_FILE_PATH)  # Convert Path to string
+            subprocess.run(batch_file_path, shell=True, check=True)
+            logger.info("Batch file completed successfully")
+        except subprocess.CalledProcessError:
+            logger.error(f"Batch file {config.BATCH_FILE_PATH} failed to run")
+            print(f"Error: Batch file {config.BATCH_FILE_PATH} failed to run")
+            return
+
+        # Store the selected folder in the processor for later reference
+        processor.current_data_folder = data_folder #type: ignore
+
+        # Get today's I numbers and BioI folders
+        i_numbers, bio_folders = file_dao.get_folders_with_inumbers(data_folder)
+        logger.info(f"Found {len(i_numbers)} I numbers and {len(bio_folders)} BioI folders")
+
+        # Get recent I numbers for order key filtering
+        recent_inumbers = context.active_inumbers()
+
+        # Load order key and adjust characters
+        order_key = context.order_key()
+        logger.info("Order key loaded")
+
+        # Get complete list of reinjects
+        reinject_path = str(Path(config.REINJECT_FOLDER) / f"Reinject List_{datetime.now().strftime('%m-%d-%Y')}.xlsx")
+        try:
+            reinject_list = context.reinject_list(processor, recent_inumbers, reinject_path)
+            logger.info(f"Found {len(reinject_list)} reinjects")
+        except Exception as e:
+            logger.error(f"Error loading reinject list: {e}")
+            reinject_list = []
+
+        # Process the BioI folders (concurrently with SORT_WORKER_COUNT > 1)
+        processor.sort_ind_folders(bio_folders, reinject_list, order_key)
+
+        # Final cleanup pass for the entire data folder
+        processor.final_cleanup(data_folder)
+
+        logger.info("All folders processed")
+        print("All done!")
+    finally:
+        context.close()
 
-    # Final cleanup pass for the entire data folder
-    processor.final_cleanup(data_folder)
+def run():
+    """Run main() as an instrumented run; the console entry point"""
+    from mseqauto.utils.instrumentation import run_instrumented  # type: ignore
+    return run_instrumented("ind_sort_files", main)
 
-    logger.info("All folders processed")
-    print("All done!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run()
@@ -56,7 +56,7 @@ def main():
 
     # ONLY NOW import package modules
     from mseqauto.config import MseqConfig # type: ignore
-    from mseqauto.core import FileSystemDAO, FolderProcessor # type: ignore
+    from mseqauto.core import FileSystemDAO, FolderProcessor, open_order_state_store # type: ignore
     from mseqauto.utils import setup_logger # type: ignore
 
     # Get the script directory
@@ -74,7 +74,8 @@ def main():
     REGEX = config.REGEX_PATTERNS
     file_dao = FileSystemDAO(config, logger=logger)
     logger.info("FileSystemDAO initialized")
-    processor = FolderProcessor(file_dao, None, config, logger=logger.info)
+    processor = FolderProcessor(file_dao, None, config, logger=logger.info,
+                                state_store=open_order_state_store(config, logger))
     logger.info("Folder processor initialized")
     logger.info(f"Using folder: {data_folder}")
 
@@ -120,18 +121,16 @@ def main():
 
         for order_folder in order_folders:
             # Check if order already has a zip file
-            if file_dao.check_for_zip(order_folder):
+            if processor.check_for_zip(order_folder):
                 logger.info(f"Skipping {order_folder.name} - already has zip file")
                 continue
 
             # Add code to zip the order folder here
             logger.info(f"Zipping {order_folder.name}")
-            zip_path = processor.zip_order_folder(order_folder, include_txt=True)
+            zip_path = processor.zip_order_folder(order_folder, include_txt=True, dump_folder=zip_dump_folder)
 
             if zip_path:
-                # Copy zip to dump folder
-                logger.info(f"Copying zip to dump folder: {Path(zip_path).name}")
-                file_dao.copy_zip_to_dump(zip_path, zip_dump_folder)
+                logger.info(f"Delivered zip to dump folder: {Path(zip_path).name}")
 
                 order_count += 1
                 logger.info(f"Successfully processed {order_folder.name}")
@@ -141,18 +140,16 @@ def main():
     # Process PCR folders
     for pcr_folder in pcr_folders:
         # Check if PCR folder already has a zip file
-        if file_dao.check_for_zip(pcr_folder):
+        if processor.check_for_zip(pcr_folder):
             logger.info(f"Skipping {pcr_folder.name} - already has zip file")
             continue
 
         # Zip the PCR folder
         logger.info(f"Zipping {pcr_folder.name}")
-        zip_path = processor.zip_order_folder(pcr_folder, include_txt=True)
+        zip_path = processor.zip_order_folder(pcr_folder, include_txt=True, dump_folder=zip_dump_folder)
 
         if zip_path:
-            # Copy zip to dump folder
-            logger.info(f"Copying zip to dump folder: {Path(zip_path).name}")
-            file_dao.copy_zip_to_dump(zip_path, zip_dump_folder)
+            logger.info(f"Delivered zip to dump folder: {Path(zip_path).name}")
 
             order_count += 1  # Use the same count as order folders
             logger.info(f"Successfully processed {pcr_folder.name}")
@@ -180,5 +177,11 @@ def main():
     else:
         print(f"All done! {order_count} orders zipped.")
 
+def run():
+    """Run main() as an instrumented run; the console entry point"""
+    from mseqauto.utils.instrumentation import run_instrumented  # type: ignore
+    return run_instrumented("ind_zip_files", main)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run()
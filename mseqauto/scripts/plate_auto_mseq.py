@@ -63,7 +63,10 @@ def main(provided_folder=None):
     # The GUI is already launching us with 32-bit Python
     if not GUI_MODE:
         # Only do the 32-bit check in standalone mode
-        if not is_relaunched and provided_folder is None and sys.maxsize > 2 ** 32:
+        from mseqauto.config import MseqConfig  # type: ignore
+        # With the automation server, mSeq is driven from its 32-bit process instead
+        if (not is_relaunched and provided_folder is None and sys.maxsize > 2 ** 32
+                and not MseqConfig.USE_AUTOMATION_SERVER):
             print("Detected 64-bit Python, need to relaunch in 32-bit for mSeq automation...")
 
             # Set environment variable before relaunching
@@ -87,6 +90,8 @@ def main(provided_folder=None):
 
     if is_relaunched:
         print("Running in relaunched 32-bit Python process")
+    elif provided_folder is None and sys.maxsize > 2 ** 32:
+        print("Using the 32-bit automation server for mSeq")
     elif provided_folder is None:
         print("Already running in 32-bit Python")
 
@@ -104,7 +109,8 @@ def main(provided_folder=None):
     # NOW import package modules (after folder selection and 32-bit check)
     from mseqauto.utils import setup_logger  # type: ignore
     from mseqauto.config import MseqConfig  # type: ignore
-    from mseqauto.core import OSCompatibilityManager, FileSystemDAO, MseqAutomation, FolderProcessor  # type: ignore
+    from mseqauto.core import OSCompatibilityManager, FileSystemDAO, FolderProcessor  # type: ignore
+    from mseqauto.core.automation_server import create_ui_automation  # type: ignore
 
     # Get the script directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -122,7 +128,7 @@ def main(provided_folder=None):
     # Initialize components
     config = MseqConfig()
     file_dao = FileSystemDAO(config)
-    ui_automation = MseqAutomation(config)
+    ui_automation = create_ui_automation(config)
     processor = FolderProcessor(file_dao, ui_automation, config, logger=logger.info)
 
 
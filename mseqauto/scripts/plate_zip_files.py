@@ -81,18 +81,16 @@ def main():
     plate_count = 0
     for plate_folder in plate_folders:
         # Check if plate folder already has a zip file
-        if file_dao.check_for_zip(plate_folder):
+        if processor.check_for_zip(plate_folder):
             logger.info(f"Skipping {os.path.basename(plate_folder)} - already has zip file")
             continue
 
         # The zip_order_folder method will automatically detect and handle FSA files
         logger.info(f"Zipping {os.path.basename(plate_folder)}")
-        zip_path = processor.zip_order_folder(plate_folder, include_txt=True)
+        zip_path = processor.zip_order_folder(plate_folder, include_txt=True, dump_folder=zip_dump_folder)
 
         if zip_path:
-            # Copy zip to dump folder
-            logger.info(f"Copying zip to dump folder: {os.path.basename(zip_path)}")
-            file_dao.copy_zip_to_dump(zip_path, zip_dump_folder)
+            logger.info(f"Delivered zip to dump folder: {os.path.basename(zip_path)}")
             plate_count += 1
 
             logger.info(f"Successfully processed {os.path.basename(plate_folder)}")
@@ -0,0 +1,68 @@
+# summary_newest_first.py
+import sys
+import tkinter as tk
+from pathlib import Path
+from tkinter import filedialog
+
+# Add parent directory to PYTHONPATH for imports
+sys.path.append(str(Path(__file__).parents[2]))
+
+
+def get_summary_from_user():
+    """Get summary workbook selection from user"""
+    print("Opening file selection dialog...")
+    root = tk.Tk()
+    root.withdraw()
+    root.update()
+
+    file_path = filedialog.askopenfilename(
+        title="Select zip order summary",
+        filetypes=[("Excel workbooks", "*.xlsx")]
+    )
+    root.destroy()
+
+    if file_path:
+        print(f"Selected summary: {file_path}")
+        return file_path
+    else:
+        print("No summary selected")
+        return None
+
+
+def write_view(summary_path, view_path=None):
+    """
+    Render an appended zip order summary newest session first
+
+    The view is written next to the summary as '<summary> - newest first.xlsx'
+    unless view_path is given. Returns the view path, or None on failure.
+    """
+    from mseqauto.config import MseqConfig # type: ignore
+    from mseqauto.utils import ExcelDAO # type: ignore
+
+    summary_path = Path(summary_path)
+    if view_path is None:
+        view_path = summary_path.with_name(f"{summary_path.stem} - newest first.xlsx")
+
+    excel_dao = ExcelDAO(MseqConfig())
+    workbook = excel_dao.load_workbook(summary_path)
+    if workbook is None:
+        print(f"Error: Could not load {summary_path.name}")
+        return None
+
+    if not excel_dao.write_newest_first_view(workbook.active, view_path):
+        return None
+    return Path(view_path)
+
+
+def main():
+    summary_path = sys.argv[1] if len(sys.argv) > 1 else get_summary_from_user()
+    if not summary_path:
+        return
+
+    view_path = write_view(summary_path)
+    if view_path:
+        print(f"Newest-first view written to {view_path}")
+
+
+if __name__ == "__main__":
+    main()
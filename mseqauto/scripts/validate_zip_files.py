@@ -3,6 +3,7 @@ import os
 import subprocess
 import sys
 import tkinter as tk
+from contextlib import nullcontext
 from datetime import datetime
 from tkinter import filedialog
 import warnings
@@ -44,8 +45,8 @@ def main():
 
     # Import package modules
     from mseqauto.config import MseqConfig # type: ignore
-    from mseqauto.core import FileSystemDAO, FolderProcessor # type: ignore
-    from mseqauto.utils import setup_logger, ExcelDAO # type: ignore
+    from mseqauto.core import FileSystemDAO, FolderProcessor, open_order_state_store # type: ignore
+    from mseqauto.utils import setup_logger, ExcelDAO, ValidationTable # type: ignore
 
     # Setup logging
     script_dir = Path(__file__).parent.resolve()
@@ -57,7 +58,8 @@ def main():
     config = MseqConfig()
     file_dao = FileSystemDAO(config, logger=logger)
     excel_dao = ExcelDAO(config)
-    processor = FolderProcessor(file_dao, None, config, logger=logger.info)
+    processor = FolderProcessor(file_dao, None, config, logger=logger.info,
+                                state_store=open_order_state_store(config, logger))
     logger.info(f"Using folder: {data_folder}")
 
     # Run batch file to generate order key
@@ -84,16 +86,20 @@ def main():
     summary_exists = excel_path.exists()
     logger.info(f"Summary exists: {summary_exists}")
 
-    # Load existing workbook if it exists
+    # Skip checks read the sidecar when it matches the workbook; the workbook
+    # itself is only loaded if the sidecar is stale or there are rows to add
     existing_workbook = None
     existing_worksheet = None
-    if summary_exists:
+    sidecar = excel_dao.load_summary_sidecar(excel_path) if summary_exists else None
+    if summary_exists and sidecar is None:
         existing_workbook = excel_dao.load_workbook(excel_path)
         if not existing_workbook:
             print("Error: Could not load existing summary. Make sure the file is not open in Excel.")
             return
         existing_worksheet = existing_workbook.active
         logger.info("Existing workbook loaded successfully")
+    elif sidecar is not None:
+        logger.info(f"Using summary sidecar with {len(sidecar)} orders")
 
     # Create new workbook for this session's data
     new_workbook = excel_dao.create_workbook()
@@ -111,13 +117,16 @@ def main():
     plate_zips = file_dao.find_plate_folder_zips(data_folder)
     logger.info(f"Found {len(plate_zips)} plate folder zip files to process")
 
+    deep_verify = config.ZIP_DEEP_VERIFY
+    zip_dump_folder = Path(data_folder) / config.ZIP_DUMP_FOLDER
+
     # Set headers based on what data types we have
     if len(order_folders) > 0 and (len(fb_pcr_zips) > 0 or len(plate_zips) > 0):
         # Mixed data - use validation headers as primary, other data will use available columns
-        excel_dao.set_validation_headers(new_worksheet)
+        excel_dao.set_validation_headers(new_worksheet, integrity=deep_verify)
     elif len(fb_pcr_zips) > 0 and len(plate_zips) > 0:
         # Both FB-PCR and plate data - use validation headers to accommodate both
-        excel_dao.set_validation_headers(new_worksheet)
+        excel_dao.set_validation_headers(new_worksheet, integrity=deep_verify)
     elif len(fb_pcr_zips) > 0:
         # Only FB-PCR data
         excel_dao.set_fb_pcr_headers(new_worksheet)
@@ -126,57 +135,87 @@ def main():
         excel_dao.set_plate_headers(new_worksheet)
     else:
         # Only validation data
-        excel_dao.set_validation_headers(new_worksheet)
+        excel_dao.set_validation_headers(new_worksheet, integrity=deep_verify)
+
+    # Results are collected column-wise and written to the worksheet in one pass
+    session_table = ValidationTable(headers=[cell.value for cell in new_worksheet[1]])
 
     # Process each order folder
     order_count = 0
-    new_row_count = 2  # Start after headers
-
-    for order_folder, i_number in order_folders:
-        # Find zip file using existing FolderProcessor method
-        zip_path = processor.find_zip_file(order_folder)  # Use existing method
-        if not zip_path:
-            logger.info(f"Skipping {Path(order_folder).name} - no zip file")
-            continue
-
-        # Get order number
-        order_number = processor.get_order_number_from_folder_name(order_folder)
-        if not order_number:
-            logger.warning(f"Could not extract order number from {Path(order_folder).name}")
-            continue
-
-        logger.info(f"Processing order: I-{i_number}, Order: {order_number}")
-
-        # Check if order already validated with current or newer zip
-        if summary_exists:
-            _, _, existing_mod_time = excel_dao.find_order_in_summary(existing_worksheet, order_number)
-            current_mod_time = Path(zip_path).stat().st_mtime
-
-            if existing_mod_time and float(existing_mod_time) >= current_mod_time:
-                logger.info(f"Skipping {Path(order_folder).name} - already validated with current or newer zip")
+    validated_orders = []  # recorded in the state store once the summary is saved
+    orders_to_resolve = []  # previous entries marked resolved when the workbook is updated
+    validated_results = []  # added to the session table once their deep verification is done
+
+    # Optional deep verification runs on its own threads alongside the name checks
+    verifier = None
+    if deep_verify:
+        from mseqauto.core.zip_verifier import ZipVerifier  # type: ignore
+        verifier = ZipVerifier(max_workers=config.ZIP_VERIFY_WORKERS, compare_sources=config.ZIP_VERIFY_SOURCES,
+                               logger=logger)
+        logger.info(f"Deep zip verification on {config.ZIP_VERIFY_WORKERS} threads")
+    with verifier or nullcontext():
+        for order_folder, i_number in order_folders:
+            # Find zip file using existing FolderProcessor method
+            zip_path = processor.find_zip_file(order_folder)  # Use existing method
+            if not zip_path:
+                logger.info(f"Skipping {Path(order_folder).name} - no zip file")
                 continue
 
-        # Validate zip contents using FolderProcessor method
-        logger.info(f"Validating zip contents for order {order_number}")
-        validation_result = processor.validate_zip_contents(zip_path, i_number, order_number, order_key)
-
-        if validation_result:
-            order_count += 1
-
-            # Check if this is an Andreev order
-            is_andreev = config.ANDREEV_NAME.lower() in Path(order_folder).name.lower()
+            # Get order number
+            order_number = processor.get_order_number_from_folder_name(order_folder)
+            if not order_number:
+                logger.warning(f"Could not extract order number from {Path(order_folder).name}")
+                continue
 
-            # Add validation results to new worksheet
-            new_row_count = excel_dao.add_validation_result(
-                new_worksheet, new_row_count, validation_result, zip_path,
-                i_number, order_number, is_andreev
+            logger.info(f"Processing order: I-{i_number}, Order: {order_number}")
+
+            # Check if order already validated with current or newer zip
+            if summary_exists:
+                # The state store answers without scanning the summary sheet
+                if processor.is_order_validated(order_folder, zip_path, excel_path):
+                    logger.info(f"Skipping {Path(order_folder).name} - already validated with current zip")
+                    continue
+
+                if sidecar is not None:
+                    existing_mod_time = sidecar.zip_timestamp(order_number)
+                else:
+                    _, _, existing_mod_time = excel_dao.find_order_in_summary(existing_worksheet, order_number)
+                current_mod_time = Path(zip_path).stat().st_mtime
+
+                if existing_mod_time and float(existing_mod_time) >= current_mod_time:
+                    logger.info(f"Skipping {Path(order_folder).name} - already validated with current or newer zip")
+                    continue
+
+            integrity = None
+            if verifier is not None:
+                integrity = verifier.submit(zip_path, source_folder=order_folder,
+                                            copies=[zip_dump_folder / Path(zip_path).name])
+
+            # Validate zip contents using FolderProcessor method
+            logger.info(f"Validating zip contents for order {order_number}")
+            validation_result = processor.validate_zip_contents(zip_path, i_number, order_number, order_key)
+
+            if validation_result:
+                order_count += 1
+
+                # Check if this is an Andreev order
+                is_andreev = config.ANDREEV_NAME.lower() in Path(order_folder).name.lower()
+                validated_results.append((validation_result, zip_path, i_number, order_number, is_andreev, integrity))
+
+                # If updating existing order, mark old one as resolved
+                if summary_exists and existing_mod_time:
+                    orders_to_resolve.append(order_number)
+
+                validated_orders.append((order_folder, zip_path))
+
+        # Add validation results to the session table, in order, as their verification finishes
+        for validation_result, zip_path, i_number, order_number, is_andreev, integrity in validated_results:
+            excel_dao.collect_validation_result(
+                session_table, validation_result, zip_path,
+                i_number, order_number, is_andreev,
+                integrity=integrity.result() if integrity is not None else None
             )
 
-            # If updating existing order, mark old one as resolved
-            if summary_exists and existing_mod_time:
-                logger.info(f"Marking previous version of order {order_number} as resolved")
-                excel_dao.resolve_order_status(existing_worksheet, order_number)
-
     # Process FB-PCR zip files
     fb_pcr_count = 0
     for zip_path, pcr_number, order_number, version in fb_pcr_zips:
@@ -191,10 +230,8 @@ def main():
             # Determine if we're using mixed headers
             mixed_headers = len(order_folders) > 0 or len(plate_zips) > 0
 
-            # Add FB-PCR results to new worksheet
-            new_row_count = excel_dao.add_fb_pcr_result(
-                new_worksheet, new_row_count, fb_pcr_result, zip_path, mixed_headers
-            )
+            # Add FB-PCR results to the session table
+            excel_dao.collect_fb_pcr_result(session_table, fb_pcr_result, zip_path, mixed_headers)
 
     # Process plate folder zip files
     plate_count = 0
@@ -210,20 +247,32 @@ def main():
             # Determine if we're using mixed headers
             mixed_headers = len(order_folders) > 0 or len(fb_pcr_zips) > 0
 
-            # Add plate results to new worksheet
-            new_row_count = excel_dao.add_plate_result(
-                new_worksheet, new_row_count, plate_result, zip_path, mixed_headers
-            )
+            # Add plate results to the session table
+            excel_dao.collect_plate_result(session_table, plate_result, zip_path, mixed_headers)
 
     # Update order count to include FB-PCR and plate zips
     total_processed = order_count + fb_pcr_count + plate_count
 
     # Finalize and save results
     if total_processed > 0:
-        excel_dao.finalize_workbook(new_worksheet, add_break_at_end=summary_exists)
+        excel_dao.render_table(new_worksheet, session_table, start_row=2)
+        # Appended sessions get their break row above them instead
+        excel_dao.finalize_workbook(new_worksheet, add_break_at_end=summary_exists and not excel_dao.append_mode,
+                                    table=session_table)
         logger.info(f"Processed {order_count} orders, {fb_pcr_count} FB-PCR zips, and {plate_count} plate zips")
 
         if summary_exists:
+            if existing_workbook is None:
+                existing_workbook = excel_dao.load_workbook(excel_path)
+                if not existing_workbook:
+                    print("Error: Could not load existing summary. Make sure the file is not open in Excel.")
+                    return
+                existing_worksheet = existing_workbook.active
+
+            for order_number in orders_to_resolve:
+                logger.info(f"Marking previous version of order {order_number} as resolved")
+                excel_dao.resolve_order_status(existing_worksheet, order_number)
+
             # Update existing summary
             logger.info("Updating existing summary with new data")
             success = excel_dao.update_existing_summary(existing_workbook, new_workbook, excel_path)
@@ -237,6 +286,22 @@ def main():
             print("Error: Could not save summary. Make sure the file is not open in Excel.")
             return
 
+        for order_folder, zip_path in validated_orders:
+            processor.record_order_stage(order_folder, 'validated', zip_path=zip_path,
+                                         validation_summary=excel_path)
+
+        summary_sheet = existing_worksheet if summary_exists else new_worksheet
+        excel_dao.write_summary_sidecar(excel_path, worksheet=summary_sheet, table=session_table, sidecar=sidecar)
+
+        if config.SUMMARY_TSV_EXPORT:
+            tsv_path = excel_path.with_suffix('.tsv')
+            session_table.to_tsv(tsv_path, append=tsv_path.exists())
+            logger.info(f"Session rows written to {tsv_path.name}")
+
+    elif summary_exists and sidecar is None:
+        # Nothing new, but the next run can skip loading the workbook
+        excel_dao.write_summary_sidecar(excel_path, worksheet=existing_worksheet)
+
     logger.info(f"Validation complete. Total orders processed: {order_count}, FB-PCR zips processed: {fb_pcr_count}, Plate zips processed: {plate_count}")
     if total_processed > 0:
         # Build output message based on what was processed
@@ -254,5 +319,11 @@ def main():
         print("All done! No new orders, FB-PCR zips, or plate zips found to validate.")
 
 
+def run():
+    """Run main() as an instrumented run; the console entry point"""
+    from mseqauto.utils.instrumentation import run_instrumented  # type: ignore
+    return run_instrumented("validate_zip_files", main)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run()
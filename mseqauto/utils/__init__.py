@@ -2,10 +2,40 @@
 Utility functions and classes for the MseqAuto package.
 
 This module contains utility functions and classes that are used
-by the core functionality and scripts.
+by the core functionality and scripts. They are imported on first use
+(PEP 562), so openpyxl is only loaded once ExcelDAO is needed.
 """
+import importlib
+from typing import TYPE_CHECKING
 
-from .logger import setup_logger
-from .excel_dao import ExcelDAO
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    'setup_logger': '.logger',
+    'ExcelDAO': '.excel_dao',
+    'Instrumentation': '.instrumentation',
+    'SummarySidecar': '.summary_sidecar',
+    'ValidationTable': '.validation_table',
+}
 
-__all__ = ['setup_logger', 'ExcelDAO']
\ No newline at end of file
+__all__ = ['setup_logger', 'ExcelDAO', 'Instrumentation', 'SummarySidecar', 'ValidationTable']
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .logger import setup_logger
+    from .excel_dao import ExcelDAO
+    from .instrumentation import Instrumentation
+    from .summary_sidecar import SummarySidecar
+    from .validation_table import ValidationTable
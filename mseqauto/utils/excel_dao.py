@@ -1,10 +1,67 @@
 # excel_dao.py - Simplified version
 import os
+from bisect import bisect_right
+from copy import copy
 from pathlib import Path
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill, Font, Alignment
 from openpyxl.utils import get_column_letter
 
+from mseqauto.utils.instrumentation import timed
+from mseqauto.utils.summary_sidecar import SummarySidecar
+from mseqauto.utils.validation_table import ValidationTable
+
+
+class SummaryIndex:
+    """
+    Order number -> (row, zip timestamp) lookup for a summary worksheet
+
+    Built with one pass over the sheet. Rows are stored relative to the sheet
+    as it was read; rows inserted at the top only bump an offset, so lookups
+    stay constant time however often the summary has been extended.
+    """
+
+    def __init__(self, worksheet, newest_last=False):
+        self.offset = 0
+        self.newest_last = newest_last  # appended summaries keep the newest entry furthest down
+        self._orders = {}       # str(order number) -> (row, zip timestamp) of the newest entry
+        self._order_rows = []   # rows with anything in column B, ascending
+        self.extend(worksheet, 2)
+
+    def extend(self, worksheet, start_row):
+        """Index rows from start_row to the end of the sheet (rows appended below the index)"""
+        for row_num, row in enumerate(worksheet.iter_rows(min_row=start_row, values_only=True), start=start_row):
+            order_value = row[1] if len(row) > 1 else None
+            if order_value is None or not str(order_value).strip():
+                continue
+            base_row = row_num - self.offset
+            self._order_rows.append(base_row)
+            key = str(order_value)
+            if self.newest_last or key not in self._orders:
+                self._orders[key] = (base_row, row[7] if len(row) > 7 else None)
+
+    def __len__(self):
+        return len(self._orders)
+
+    def find(self, order_number):
+        """(row, zip timestamp) of the newest entry for an order, or None"""
+        entry = self._orders.get(str(order_number))
+        if entry is None:
+            return None
+        return entry[0] + self.offset, entry[1]
+
+    def next_order_row(self, row):
+        """First row after row that starts another entry, or None"""
+        pos = bisect_right(self._order_rows, row - self.offset)
+        if pos == len(self._order_rows):
+            return None
+        return self._order_rows[pos] + self.offset
+
+    def shift(self, num_rows):
+        """Account for rows inserted above every indexed row"""
+        self.offset += num_rows
+
 
 class ExcelDAO:
     def __init__(self, config):
@@ -14,25 +71,41 @@ class ExcelDAO:
         self.attention_style = PatternFill(start_color='FF4747', end_color='FF4747', fill_type='solid')
         self.resolved_style = PatternFill(start_color='FFA500', end_color='FFA500', fill_type='solid')
         self.break_style = PatternFill(start_color='DDD9C4', end_color='DDD9C4', fill_type='solid')
+        self._style_map = {
+            'success': self.success_style,
+            'attention': self.attention_style,
+            'break': self.break_style,
+            'resolved': self.resolved_style
+        }
 
         # Store hidden row states for preservation during updates
         self._stored_hidden_states = {}
 
+        # Order lookup indexes for loaded summary worksheets
+        self._summary_indexes = {}
+
+        # Append new sessions below the existing summary instead of inserting them at the top
+        self.append_mode = getattr(config, 'SUMMARY_APPEND_MODE', False)
+
     # Core workbook operations
     def create_workbook(self):
         """Create a new workbook"""
         return Workbook()
 
+    @timed()
     def load_workbook(self, file_path):
         """Load an existing workbook with error handling"""
         if not Path(file_path).exists():
             return None
         try:
-            return load_workbook(file_path)
+            workbook = load_workbook(file_path)
         except Exception as e:
             print(f"Error loading Excel file: {e}")
             return None
+        self.build_summary_index(workbook.active)
+        return workbook
 
+    @timed()
     def save_with_error_handling(self, workbook, file_path):
         """Save workbook with specific error handling for permission issues"""
         try:
@@ -49,6 +122,9 @@ class ExcelDAO:
     def set_cell_value(self, worksheet, row, col, value):
         """Set cell value"""
         worksheet.cell(row=row, column=col, value=value)
+        if col == 2 and worksheet in self._summary_indexes:
+            # Order column edited directly; rebuild the index on next lookup
+            del self._summary_indexes[worksheet]
 
     def get_cell_value(self, worksheet, row, col):
         """Get cell value"""
@@ -56,20 +132,16 @@ class ExcelDAO:
 
     def apply_style(self, worksheet, cell_ref, style_type):
         """Apply style to cell"""
-        style_map = {
-            'success': self.success_style,
-            'attention': self.attention_style,
-            'break': self.break_style,
-            'resolved': self.resolved_style
-        }
-        if style_type in style_map:
-            worksheet[cell_ref].fill = style_map[style_type]
+        if style_type in self._style_map:
+            worksheet[cell_ref].fill = self._style_map[style_type]
 
     # Formatting operations
-    def set_validation_headers(self, worksheet):
-        """Set headers for validation summary"""
+    def set_validation_headers(self, worksheet, integrity=False):
+        """Set headers for validation summary (with an Integrity column for deep-verified runs)"""
         headers = ['I Number', 'Order Number', 'Status', 'Zip Filename',
                    'Order Items', 'File Names', 'Match Status', 'Zip Timestamp']
+        if integrity:
+            headers.append('Integrity')
         for i, header in enumerate(headers, 1):
             cell = worksheet.cell(row=1, column=i, value=header)
             cell.font = Font(bold=True)
@@ -131,39 +203,96 @@ class ExcelDAO:
             return
         self.preserve_hidden_row_states(worksheet)
         worksheet.insert_rows(2, num_rows)
+        index = self._summary_indexes.get(worksheet)
+        if index is not None:
+            index.shift(num_rows)
 
     # Order management
+    def build_summary_index(self, worksheet):
+        """Index the orders in a summary worksheet (column B order, column H zip timestamp)"""
+        index = SummaryIndex(worksheet, newest_last=self.append_mode)
+        self._summary_indexes[worksheet] = index
+        return index
+
+    def get_summary_index(self, worksheet):
+        """Return the worksheet's order index, building it on first use"""
+        index = self._summary_indexes.get(worksheet)
+        if index is None:
+            index = self.build_summary_index(worksheet)
+        return index
+
     def find_order_in_summary(self, worksheet, order_number):
         """Find if an order already exists in the summary"""
-        for row_num, row in enumerate(worksheet.iter_rows(min_row=2, values_only=True), start=2):
-            if str(row[1]) == str(order_number):  # Column B is order number
-                zip_timestamp = row[7] if len(row) > 7 else None  # Column H is zip timestamp
-                return True, row_num, zip_timestamp
-        return False, None, None
+        entry = self.get_summary_index(worksheet).find(order_number)
+        if entry is None:
+            return False, None, None
+        row_num, zip_timestamp = entry
+        return True, row_num, zip_timestamp
 
     def resolve_order_status(self, worksheet, order_number):
         """Mark an order as resolved and hide associated rows"""
-        found, order_row, _ = self.find_order_in_summary(worksheet, order_number)
+        index = self.get_summary_index(worksheet)
+        entry = index.find(order_number)
 
-        if not found:
+        if entry is None:
             return False
+        order_row = entry[0]
 
         # Set status to "Resolved"
         self.set_cell_value(worksheet, order_row, 3, "Resolved")  # Column C
         self.apply_style(worksheet, f'C{order_row}', 'resolved')
 
         # Hide rows until we hit another order or end of data
-        current_row = order_row + 1 #type: ignore
-        while current_row <= worksheet.max_row:
-            order_cell_value = self.get_cell_value(worksheet, current_row, 2)
-            if order_cell_value is not None and str(order_cell_value).strip():
-                break  # Hit another order, stop hiding
-            else:
-                worksheet.row_dimensions[current_row].hidden = True
-                current_row += 1
+        next_order_row = index.next_order_row(order_row)
+        last_row = worksheet.max_row if next_order_row is None else next_order_row - 1
+        for current_row in range(order_row + 1, last_row + 1):
+            worksheet.row_dimensions[current_row].hidden = True
 
         return True
 
+    # Summary sidecar
+    def summary_entries(self, rows):
+        """
+        (order, status, zip, zip timestamp) for each entry row, oldest first
+
+        rows are value tuples in sheet order (worksheet rows from row 2, or
+        ValidationTable.rows()); column B is the order and column H the zip
+        timestamp, as in find_order_in_summary.
+        """
+        entries = []
+        for row in rows:
+            order_value = row[1] if len(row) > 1 else None
+            if order_value is None or not str(order_value).strip():
+                continue
+            entries.append((str(order_value),
+                            row[2] if len(row) > 2 else None,
+                            row[3] if len(row) > 3 else None,
+                            row[7] if len(row) > 7 else None))
+        if not self.append_mode:
+            entries.reverse()  # newest entries are at the top of the sheet
+        return entries
+
+    def load_summary_sidecar(self, summary_path):
+        """Return the summary's sidecar if it matches the workbook on disk, else None"""
+        return SummarySidecar.load(summary_path)
+
+    def write_summary_sidecar(self, summary_path, worksheet=None, table=None, sidecar=None):
+        """
+        Bring the sidecar up to date after the summary was saved
+
+        With a current sidecar and the session table only the new entries are
+        appended; otherwise the sidecar is rebuilt from the whole worksheet.
+        """
+        try:
+            if sidecar is not None and table is not None:
+                sidecar.append(summary_path, self.summary_entries(table.rows()))
+                return sidecar
+            rows = worksheet.iter_rows(min_row=2, values_only=True)
+            return SummarySidecar.rebuild(summary_path, self.summary_entries(rows))
+        except OSError as e:
+            print(f"Error writing summary sidecar: {e}")
+            return None
+
     def add_break_row(self, worksheet, row_num):
         """Add a break row with styling"""
         self.set_cell_value(worksheet, row_num, 1, "Break")
@@ -171,17 +300,42 @@ class ExcelDAO:
         worksheet.row_dimensions[row_num].hidden = False
 
     # Main validation result processing
-    def add_validation_result(self, worksheet, row_count, validation_result, zip_path, i_number, order_number,
-                              is_andreev=False):
-        """Add validation result to worksheet"""
+    def render_table(self, worksheet, table, start_row=2):
+        """
+        Write a ValidationTable to the worksheet in one pass
+
+        Fills are the shared style objects; pass the table to finalize_workbook
+        for column widths. Returns the next free row.
+        """
+        style_map = self._style_map
+        for offset, row_values in enumerate(table.rows()):
+            row_num = start_row + offset
+            for col_num, value in enumerate(row_values, start=1):
+                style_type = table.styles[col_num - 1][offset]
+                if value is None and style_type is None:
+                    continue
+                cell = worksheet.cell(row=row_num, column=col_num, value=value)
+                if style_type in style_map:
+                    cell.fill = style_map[style_type]
+            if table.hidden[offset]:
+                worksheet.row_dimensions[row_num].hidden = True
+
+        return start_row + len(table)
+
+    def collect_validation_result(self, table, validation_result, zip_path, i_number, order_number,
+                                  is_andreev=False, integrity=None):
+        """
+        Add validation result rows to a ValidationTable
+
+        integrity is an optional deep-verification result (ok, summary()); it
+        goes in column 9 and a failed check makes the order need attention.
+        """
         # Set basic information
-        self.set_cell_value(worksheet, row_count, 1, i_number)
-        self.set_cell_value(worksheet, row_count, 2, order_number)
-        self.set_cell_value(worksheet, row_count, 4, Path(zip_path).name)
-        self.set_cell_value(worksheet, row_count, 8, str(int(Path(zip_path).stat().st_mtime)))
-
-        order_row = row_count
-        row_count += 1
+        order_row = table.add_row()
+        table.set(order_row, 1, i_number)
+        table.set(order_row, 2, order_number)
+        table.set(order_row, 4, Path(zip_path).name)
+        table.set(order_row, 8, str(int(Path(zip_path).stat().st_mtime)))
 
         # Determine status
         match_count = validation_result.get('match_count', 0)
@@ -192,175 +346,163 @@ class ExcelDAO:
         # Status logic: completed if all expected files match, no extra files, and (for non-Andreev) all txt files present
         is_completed = (match_count == expected_count and match_count != 0 and extra_ab1_count == 0 and
                        (is_andreev or txt_count == 5))
+        if integrity is not None:
+            table.set(order_row, 9, integrity.summary())
+            table.set_style(order_row, 9, 'success' if integrity.ok else 'attention')
+            is_completed = is_completed and integrity.ok
 
         status = 'Completed' if is_completed else 'ATTENTION'
         style = 'success' if is_completed else 'attention'
 
-        self.set_cell_value(worksheet, order_row, 3, status)
-        self.apply_style(worksheet, f'C{order_row}', style)
+        table.set(order_row, 3, status)
+        table.set_style(order_row, 3, style)
 
         # Add file details
         for match in validation_result.get('matches', []):
-            self.set_cell_value(worksheet, row_count, 5, match['raw_name'])
-            self.set_cell_value(worksheet, row_count, 6, match['file_name'])
-            self.set_cell_value(worksheet, row_count, 7, 'match')
-            self.apply_style(worksheet, f'G{row_count}', 'success')
-            row_count += 1
+            row = table.add_row()
+            table.set(row, 5, match['raw_name'])
+            table.set(row, 6, match['file_name'])
+            table.set(row, 7, 'match')
+            table.set_style(row, 7, 'success')
 
         for mismatch in validation_result.get('mismatches_in_zip', []):
-            self.set_cell_value(worksheet, row_count, 6, mismatch)
-            self.set_cell_value(worksheet, row_count, 7, 'no match')
-            self.apply_style(worksheet, f'G{row_count}', 'attention')
-            row_count += 1
+            row = table.add_row()
+            table.set(row, 6, mismatch)
+            table.set(row, 7, 'no match')
+            table.set_style(row, 7, 'attention')
 
         for mismatch in validation_result.get('mismatches_in_order', []):
-            self.set_cell_value(worksheet, row_count, 5, mismatch['raw_name'])
-            self.set_cell_value(worksheet, row_count, 7, 'no match')
-            self.apply_style(worksheet, f'G{row_count}', 'attention')
-            row_count += 1
+            row = table.add_row()
+            table.set(row, 5, mismatch['raw_name'])
+            table.set(row, 7, 'no match')
+            table.set_style(row, 7, 'attention')
 
         # Add txt file status
+        txt_files = set(validation_result.get('txt_files', []))
         for txt_ext in self.config.TEXT_FILES:
-            self.set_cell_value(worksheet, row_count, 5, txt_ext)
-            if txt_ext in validation_result.get('txt_files', []):
-                self.set_cell_value(worksheet, row_count, 6, f"*{txt_ext}")
-                self.set_cell_value(worksheet, row_count, 7, 'txt file')
-                self.apply_style(worksheet, f'G{row_count}', 'success')
+            row = table.add_row()
+            table.set(row, 5, txt_ext)
+            if txt_ext in txt_files:
+                table.set(row, 6, f"*{txt_ext}")
+                table.set(row, 7, 'txt file')
+                table.set_style(row, 7, 'success')
             else:
-                self.set_cell_value(worksheet, row_count, 7, 'MISSING txt file')
-                self.apply_style(worksheet, f'G{row_count}', 'attention')
-            row_count += 1
+                table.set(row, 7, 'MISSING txt file')
+                table.set_style(row, 7, 'attention')
 
         # Hide rows for completed orders
         if is_completed:
-            for i in range(order_row + 1, row_count):
-                worksheet.row_dimensions[i].hidden = True
+            table.hide_rows(order_row + 1, len(table))
 
-        return row_count
+        return table
 
-    def add_fb_pcr_result(self, worksheet, row_count, fb_pcr_result, zip_path, mixed_headers=False):
-        """Add FB-PCR result to worksheet with individual file listing"""
-        order_row = row_count  # Store the main row for hiding purposes
+    def add_validation_result(self, worksheet, row_count, validation_result, zip_path, i_number, order_number,
+                              is_andreev=False, integrity=None):
+        """Add validation result to worksheet"""
+        table = self.collect_validation_result(ValidationTable(num_columns=8 if integrity is None else 9),
+                                               validation_result, zip_path, i_number, order_number,
+                                               is_andreev, integrity)
+        return self.render_table(worksheet, table, start_row=row_count)
+
+    def collect_fb_pcr_result(self, table, fb_pcr_result, zip_path, mixed_headers=False):
+        """Add FB-PCR result rows to a ValidationTable with individual file listing"""
+        order_row = table.add_row()  # Store the main row for hiding purposes
+
+        ab1_count = fb_pcr_result.get('ab1_count', 0)
+        txt_count = fb_pcr_result.get('txt_count', 0)
+        total_files = fb_pcr_result.get('total_files', 0)
+        file_types_str = ", ".join([f"{ext}: {count}" for ext, count in fb_pcr_result['file_types'].items()])
+        zip_timestamp = str(int(Path(zip_path).stat().st_mtime))
 
         if mixed_headers:
             # Use validation headers format for mixed data
             # I Number, Order Number, Status, Zip Filename, Order Items, File Names, Match Status, Zip Timestamp
-            self.set_cell_value(worksheet, row_count, 1, f"PCR-{fb_pcr_result['pcr_number']}")  # I Number -> PCR Number
-            self.set_cell_value(worksheet, row_count, 2, fb_pcr_result['order_number'])        # Order Number
-            self.set_cell_value(worksheet, row_count, 3, "FB-PCR")                            # Status -> FB-PCR
-            self.set_cell_value(worksheet, row_count, 4, Path(zip_path).name)                 # Zip Filename
-
+            table.set(order_row, 1, f"PCR-{fb_pcr_result['pcr_number']}")  # I Number -> PCR Number
+            table.set(order_row, 2, fb_pcr_result['order_number'])        # Order Number
+            table.set(order_row, 3, "FB-PCR")                            # Status -> FB-PCR
+            table.set(order_row, 4, Path(zip_path).name)                 # Zip Filename
             # Show .ab1 file count prominently, with text file count as additional info
-            ab1_count = fb_pcr_result.get('ab1_count', 0)
-            txt_count = fb_pcr_result.get('txt_count', 0)
-            total_files = fb_pcr_result.get('total_files', 0)
-            self.set_cell_value(worksheet, row_count, 5, f".ab1 Files: {ab1_count}, Text Files: {txt_count}, Total: {total_files}")  # Order Items -> File counts
-
-            # Format file types as a readable string for File Names column
-            file_types_str = ", ".join([f"{ext}: {count}" for ext, count in fb_pcr_result['file_types'].items()])
-            self.set_cell_value(worksheet, row_count, 6, file_types_str)                      # File Names -> File types
-
-            self.set_cell_value(worksheet, row_count, 7, f"Version {fb_pcr_result['version']}")  # Match Status -> Version
-            self.set_cell_value(worksheet, row_count, 8, str(int(Path(zip_path).stat().st_mtime)))  # Zip Timestamp
+            table.set(order_row, 5, f".ab1 Files: {ab1_count}, Text Files: {txt_count}, Total: {total_files}")  # Order Items -> File counts
+            table.set(order_row, 6, file_types_str)                      # File Names -> File types
+            table.set(order_row, 7, f"Version {fb_pcr_result['version']}")  # Match Status -> Version
+            table.set(order_row, 8, zip_timestamp)                       # Zip Timestamp
 
             # Apply styling for FB-PCR entries
-            self.apply_style(worksheet, f'C{row_count}', 'success')
+            table.set_style(order_row, 3, 'success')
         else:
             # Use FB-PCR specific headers format
             # PCR Number, Order Number, Version, Zip Filename, Total Files, File Types, Zip Timestamp
-            self.set_cell_value(worksheet, row_count, 1, fb_pcr_result['pcr_number'])
-            self.set_cell_value(worksheet, row_count, 2, fb_pcr_result['order_number'])
-            self.set_cell_value(worksheet, row_count, 3, fb_pcr_result['version'])
-            self.set_cell_value(worksheet, row_count, 4, Path(zip_path).name)
-
+            table.set(order_row, 1, fb_pcr_result['pcr_number'])
+            table.set(order_row, 2, fb_pcr_result['order_number'])
+            table.set(order_row, 3, fb_pcr_result['version'])
+            table.set(order_row, 4, Path(zip_path).name)
             # Show .ab1 file count prominently in the Total Files column
-            ab1_count = fb_pcr_result.get('ab1_count', 0)
-            txt_count = fb_pcr_result.get('txt_count', 0)
-            total_files = fb_pcr_result.get('total_files', 0)
-            self.set_cell_value(worksheet, row_count, 5, f".ab1: {ab1_count}, Text: {txt_count}, Total: {total_files}")
-
-            # Format file types as a readable string
-            file_types_str = ", ".join([f"{ext}: {count}" for ext, count in fb_pcr_result['file_types'].items()])
-            self.set_cell_value(worksheet, row_count, 6, file_types_str)
-
-            self.set_cell_value(worksheet, row_count, 7, str(int(Path(zip_path).stat().st_mtime)))
-
-        row_count += 1
+            table.set(order_row, 5, f".ab1: {ab1_count}, Text: {txt_count}, Total: {total_files}")
+            table.set(order_row, 6, file_types_str)
+            table.set(order_row, 7, zip_timestamp)
 
         # Add individual file names for verification (similar to validation results)
         # Sort files so .ab1 files appear first, then text files
         file_names = fb_pcr_result.get('file_names', [])
         ab1_files = [f for f in file_names if f.lower().endswith('.ab1')]
         text_files = [f for f in file_names if not f.lower().endswith('.ab1')]
-        sorted_files = ab1_files + text_files
 
-        for file_name in sorted_files:
+        for file_name in ab1_files + text_files:
+            row = table.add_row()
             if mixed_headers:
                 # Use columns 5 and 6 for file details in mixed format
-                self.set_cell_value(worksheet, row_count, 5, "")  # Empty order items column
-                self.set_cell_value(worksheet, row_count, 6, file_name)  # File name in file names column
-            else:
-                # Use available columns for FB-PCR format - put in file types column for now
-                self.set_cell_value(worksheet, row_count, 6, file_name)
-            row_count += 1
+                table.set(row, 5, "")  # Empty order items column
+            # File name goes in the file names / file types column either way
+            table.set(row, 6, file_name)
 
         # Hide the individual file name rows (keeping only the summary row visible)
-        for i in range(order_row + 1, row_count):
-            worksheet.row_dimensions[i].hidden = True
+        table.hide_rows(order_row + 1, len(table))
 
-        return row_count
+        return table
 
-    def add_plate_result(self, worksheet, row_count, plate_result, zip_path, mixed_headers=False):
-        """Add plate folder result to worksheet with individual file listing"""
-        order_row = row_count  # Store the main row for hiding purposes
+    def add_fb_pcr_result(self, worksheet, row_count, fb_pcr_result, zip_path, mixed_headers=False):
+        """Add FB-PCR result to worksheet with individual file listing"""
+        table = self.collect_fb_pcr_result(ValidationTable(), fb_pcr_result, zip_path, mixed_headers)
+        return self.render_table(worksheet, table, start_row=row_count)
+
+    def collect_plate_result(self, table, plate_result, zip_path, mixed_headers=False):
+        """Add plate folder result rows to a ValidationTable with individual file listing"""
+        order_row = table.add_row()  # Store the main row for hiding purposes
+
+        ab1_count = plate_result.get('ab1_count', 0)
+        fsa_count = plate_result.get('fsa_count', 0)
+        txt_count = plate_result.get('txt_count', 0)
+        total_files = plate_result.get('total_files', 0)
+        file_types_str = ", ".join([f"{ext}: {count}" for ext, count in plate_result['file_types'].items()])
+        zip_timestamp = str(int(Path(zip_path).stat().st_mtime))
 
         if mixed_headers:
             # Use validation headers format for mixed data
             # I Number, Order Number, Status, Zip Filename, Order Items, File Names, Match Status, Zip Timestamp
-            self.set_cell_value(worksheet, row_count, 1, f"P{plate_result['plate_number']}")  # I Number -> Plate Number
-            self.set_cell_value(worksheet, row_count, 2, plate_result['description'])         # Order Number -> Description
-            self.set_cell_value(worksheet, row_count, 3, "PLATE")                            # Status -> PLATE
-            self.set_cell_value(worksheet, row_count, 4, Path(zip_path).name)                # Zip Filename
-
+            table.set(order_row, 1, f"P{plate_result['plate_number']}")  # I Number -> Plate Number
+            table.set(order_row, 2, plate_result['description'])         # Order Number -> Description
+            table.set(order_row, 3, "PLATE")                            # Status -> PLATE
+            table.set(order_row, 4, Path(zip_path).name)                # Zip Filename
             # Show file counts prominently
-            ab1_count = plate_result.get('ab1_count', 0)
-            fsa_count = plate_result.get('fsa_count', 0)
-            txt_count = plate_result.get('txt_count', 0)
-            total_files = plate_result.get('total_files', 0)
-            self.set_cell_value(worksheet, row_count, 5, f".ab1: {ab1_count}, .fsa: {fsa_count}, Text: {txt_count}, Total: {total_files}")  # Order Items -> File counts
-
-            # Format file types as a readable string for File Names column
-            file_types_str = ", ".join([f"{ext}: {count}" for ext, count in plate_result['file_types'].items()])
-            self.set_cell_value(worksheet, row_count, 6, file_types_str)                      # File Names -> File types
-
-            self.set_cell_value(worksheet, row_count, 7, "PLATE")                             # Match Status -> PLATE
-            self.set_cell_value(worksheet, row_count, 8, str(int(Path(zip_path).stat().st_mtime)))  # Zip Timestamp
+            table.set(order_row, 5, f".ab1: {ab1_count}, .fsa: {fsa_count}, Text: {txt_count}, Total: {total_files}")  # Order Items -> File counts
+            table.set(order_row, 6, file_types_str)                     # File Names -> File types
+            table.set(order_row, 7, "PLATE")                            # Match Status -> PLATE
+            table.set(order_row, 8, zip_timestamp)                      # Zip Timestamp
 
             # Apply styling for plate entries
-            self.apply_style(worksheet, f'C{row_count}', 'success')
+            table.set_style(order_row, 3, 'success')
         else:
             # Use plate specific headers format
             # Plate Number, Description, Zip Filename, Total Files, AB1 Files, FSA Files, File Types, Zip Timestamp
-            self.set_cell_value(worksheet, row_count, 1, plate_result['plate_number'])
-            self.set_cell_value(worksheet, row_count, 2, plate_result['description'])
-            self.set_cell_value(worksheet, row_count, 3, Path(zip_path).name)
-
+            table.set(order_row, 1, plate_result['plate_number'])
+            table.set(order_row, 2, plate_result['description'])
+            table.set(order_row, 3, Path(zip_path).name)
             # Show file counts in Total Files column
-            ab1_count = plate_result.get('ab1_count', 0)
-            fsa_count = plate_result.get('fsa_count', 0)
-            txt_count = plate_result.get('txt_count', 0)
-            total_files = plate_result.get('total_files', 0)
-            self.set_cell_value(worksheet, row_count, 4, f"Total: {total_files}")
-            self.set_cell_value(worksheet, row_count, 5, f".ab1: {ab1_count}")
-            self.set_cell_value(worksheet, row_count, 6, f".fsa: {fsa_count}")
-
-            # Format file types as a readable string
-            file_types_str = ", ".join([f"{ext}: {count}" for ext, count in plate_result['file_types'].items()])
-            self.set_cell_value(worksheet, row_count, 7, file_types_str)
-
-            self.set_cell_value(worksheet, row_count, 8, str(int(Path(zip_path).stat().st_mtime)))
-
-        row_count += 1
+            table.set(order_row, 4, f"Total: {total_files}")
+            table.set(order_row, 5, f".ab1: {ab1_count}")
+            table.set(order_row, 6, f".fsa: {fsa_count}")
+            table.set(order_row, 7, file_types_str)
+            table.set(order_row, 8, zip_timestamp)
 
         # Add individual file names for verification (similar to validation results)
         # Sort files so .ab1 files appear first, then .fsa files, then text files
@@ -370,23 +512,25 @@ class ExcelDAO:
         text_files = [f for f in file_names if f.lower().endswith('.txt')]
         other_files = [f for f in file_names if not any(f.lower().endswith(ext) for ext in ['.ab1', '.fsa', '.txt'])]
 
-        sorted_files = ab1_files + fsa_files + text_files + other_files
-
-        for file_name in sorted_files:
+        for file_name in ab1_files + fsa_files + text_files + other_files:
+            row = table.add_row()
             if mixed_headers:
                 # Use columns 5 and 6 for file details in mixed format
-                self.set_cell_value(worksheet, row_count, 5, "")  # Empty order items column
-                self.set_cell_value(worksheet, row_count, 6, file_name)  # File name in file names column
+                table.set(row, 5, "")  # Empty order items column
+                table.set(row, 6, file_name)  # File name in file names column
             else:
                 # Use available columns for plate format - put in file types column for now
-                self.set_cell_value(worksheet, row_count, 7, file_name)
-            row_count += 1
+                table.set(row, 7, file_name)
 
         # Hide the individual file name rows (keeping only the summary row visible)
-        for i in range(order_row + 1, row_count):
-            worksheet.row_dimensions[i].hidden = True
+        table.hide_rows(order_row + 1, len(table))
+
+        return table
 
-        return row_count
+    def add_plate_result(self, worksheet, row_count, plate_result, zip_path, mixed_headers=False):
+        """Add plate folder result to worksheet with individual file listing"""
+        table = self.collect_plate_result(ValidationTable(), plate_result, zip_path, mixed_headers)
+        return self.render_table(worksheet, table, start_row=row_count)
 
     # Complex update operations
     def copy_data_with_formatting(self, source_worksheet, start_row=2):
@@ -426,8 +570,25 @@ class ExcelDAO:
                     fill_type=cell_data['fill']['fill_type']
                 )
 
+    def extend_header(self, existing_sheet, new_sheet):
+        """
+        Add header labels the existing summary lacks, e.g. Integrity the first
+        time a deep-verified run is pasted into an 8-column summary
+        """
+        for new_cell in next(new_sheet.iter_rows(min_row=1, max_row=1), ()):
+            if new_cell.value is None:
+                continue
+            cell = existing_sheet.cell(row=1, column=new_cell.column)
+            if cell.value is None:
+                cell.value = new_cell.value
+                cell.font = Font(bold=True)
+                cell.alignment = Alignment(horizontal='center')
+
     def update_existing_summary(self, existing_workbook, new_data_workbook, save_path):
         """Update existing summary with new data"""
+        if self.append_mode:
+            return self.append_to_summary(existing_workbook, new_data_workbook, save_path)
+
         existing_sheet = existing_workbook.active
         new_sheet = new_data_workbook.active
 
@@ -439,8 +600,11 @@ class ExcelDAO:
             return True
 
         # Insert rows and handle data transfer
+        self.extend_header(existing_sheet, new_sheet)
         self.insert_rows_at_top(existing_sheet, num_new_rows)
         self.paste_data_with_formatting(existing_sheet, new_data_rows, start_row=2)
+        # The pasted orders are not in the index yet
+        self._summary_indexes.pop(existing_sheet, None)
 
         # Copy column widths
         for col_letter, col_dimension in new_sheet.column_dimensions.items():
@@ -451,13 +615,99 @@ class ExcelDAO:
 
         return self.save_with_error_handling(existing_workbook, save_path)
 
-    def finalize_workbook(self, worksheet, add_break_at_end=False):
-        """Finalize workbook with column adjustments and optional break row"""
-        self.auto_adjust_columns(worksheet)
+    def append_to_summary(self, existing_workbook, new_data_workbook, save_path):
+        """
+        Append new data below the existing summary, after a break row
+
+        Existing rows are never moved, so their hidden states stay put and the
+        cost is proportional to the new rows only.
+        """
+        existing_sheet = existing_workbook.active
+        new_sheet = new_data_workbook.active
+
+        new_data_rows = self.copy_data_with_formatting(new_sheet)
+        if not new_data_rows:
+            return True
+
+        self.extend_header(existing_sheet, new_sheet)
+        break_row = existing_sheet.max_row + 1
+        self.add_break_row(existing_sheet, break_row)
+        self.paste_data_with_formatting(existing_sheet, new_data_rows, start_row=break_row + 1)
+
+        # Widen columns to fit the new data, never narrow them
+        for col_letter, col_dimension in new_sheet.column_dimensions.items():
+            existing_width = existing_sheet.column_dimensions[col_letter].width or 0
+            if col_dimension.width and col_dimension.width > existing_width:
+                existing_sheet.column_dimensions[col_letter].width = col_dimension.width
+
+        index = self._summary_indexes.get(existing_sheet)
+        if index is not None:
+            index.extend(existing_sheet, break_row + 1)
+
+        return self.save_with_error_handling(existing_workbook, save_path)
+
+    def write_newest_first_view(self, worksheet, view_path):
+        """
+        Write a copy of an appended summary with the newest session on top
+
+        Sessions are the blocks between break rows. The copy is streamed with a
+        write-only workbook, keeping values, fills and hidden rows.
+        """
+        header = list(worksheet.iter_rows(min_row=1, max_row=1))
+        sessions = [[]]
+        for row in worksheet.iter_rows(min_row=2):
+            if row and row[0].value == "Break":
+                sessions.append([])
+            else:
+                sessions[-1].append((row, worksheet.row_dimensions[row[0].row].hidden))
+        sessions = [session for session in sessions if session]
+
+        view_workbook = Workbook(write_only=True)
+        view_sheet = view_workbook.create_sheet(worksheet.title)
+        for col_letter, col_dimension in worksheet.column_dimensions.items():
+            view_sheet.column_dimensions[col_letter].width = col_dimension.width
+
+        def copy_cell(cell):
+            view_cell = WriteOnlyCell(view_sheet, value=cell.value)
+            if cell.has_style:
+                view_cell.fill = copy(cell.fill)
+                view_cell.font = copy(cell.font)
+                view_cell.alignment = copy(cell.alignment)
+            return view_cell
+
+        if header:
+            view_sheet.append([copy_cell(cell) for cell in header[0]])
+
+        row_num = 2
+        for session_num, session in enumerate(reversed(sessions)):
+            if session_num:
+                break_cell = WriteOnlyCell(view_sheet, value="Break")
+                break_cell.fill = self.break_style
+                view_sheet.append([break_cell])
+                row_num += 1
+            for row, hidden in session:
+                if hidden:
+                    view_sheet.row_dimensions[row_num].hidden = True
+                view_sheet.append([copy_cell(cell) for cell in row])
+                row_num += 1
+
+        return self.save_with_error_handling(view_workbook, view_path)
+
+    def finalize_workbook(self, worksheet, add_break_at_end=False, table=None):
+        """
+        Finalize workbook with column adjustments and optional break row
+
+        When the rows came from a ValidationTable, its tracked widths are used
+        instead of measuring every cell.
+        """
+        if table is None:
+            self.auto_adjust_columns(worksheet)
+        else:
+            for col_num, width in enumerate(table.column_widths(), start=1):
+                worksheet.column_dimensions[get_column_letter(col_num)].width = width
         if add_break_at_end:
             self.add_break_row(worksheet, worksheet.max_row + 1)
 
-
 if __name__ == "__main__":
     # Simplified test
     class TestConfig:
@@ -0,0 +1,187 @@
+# instrumentation.py
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# Comma-separated extras for a run: 'cprofile', 'tracemalloc' (or 'all')
+PROFILE_ENV = 'MSEQAUTO_PROFILE'
+
+
+class Instrumentation:
+    """
+    Span timers and counters for one script run
+
+    Spans aggregate by name (calls, total, max seconds) so wrapping a hot
+    method costs two perf_counter calls and a dict update. A run writes a JSON
+    report to the logs directory; with MSEQAUTO_PROFILE set it also runs
+    cProfile and/or tracemalloc for the whole run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans = {}      # name -> [calls, total seconds, max seconds]
+        self.counters = {}   # name -> value
+        self.run_name = None
+        self._run_started = None
+        self._run_wall_start = None
+        self._profiler = None
+        self._tracing = False
+
+    def reset(self):
+        with self._lock:
+            self.spans = {}
+            self.counters = {}
+
+    def record(self, name, elapsed):
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                self.spans[name] = [1, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed > stats[2]:
+                    stats[2] = elapsed
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed(self, name=None):
+        """Decorator recording every call as a span (default name: Class.method)"""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """Spans (sorted by total time) and counters as plain dicts"""
+        with self._lock:
+            spans = {name: {'calls': calls, 'total': round(total, 6), 'max': round(longest, 6),
+                            'mean': round(total / calls, 6)}
+                     for name, (calls, total, longest) in self.spans.items()}
+            counters = dict(self.counters)
+        ordered = dict(sorted(spans.items(), key=lambda item: item[1]['total'], reverse=True))
+        return {'spans': ordered, 'counters': counters}
+
+    # Runs
+    def start_run(self, run_name):
+        """Reset and start timing a run; starts profilers requested by MSEQAUTO_PROFILE"""
+        self.reset()
+        self.run_name = run_name
+        self._run_started = time.perf_counter()
+        self._run_wall_start = datetime.now()
+
+        modes = profile_modes()
+        if 'tracemalloc' in modes:
+            import tracemalloc
+            tracemalloc.start()
+            self._tracing = True
+        if 'cprofile' in modes:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def finish_run(self, log_dir, top=5):
+        """
+        Write the run report to log_dir and forward a summary to the GUI
+
+        Returns the report path, or None if no run was started.
+        """
+        if self._run_started is None:
+            return None
+
+        duration = time.perf_counter() - self._run_started
+        log_dir = Path(log_dir)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.run_name}_{self._run_wall_start.strftime('%Y%m%d_%H%M%S')}_timing"
+
+        report = {
+            'run': self.run_name,
+            'started': self._run_wall_start.isoformat(timespec='seconds'),
+            'duration': round(duration, 3),
+            'pid': os.getpid(),
+        }
+        report.update(self.snapshot())
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            profile_path = log_dir / f"{stem}.prof"
+            self._profiler.dump_stats(str(profile_path))
+            report['cprofile'] = str(profile_path)
+            self._profiler = None
+
+        if self._tracing:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._tracing = False
+            report['tracemalloc'] = {
+                'current': current,
+                'peak': peak,
+                'top': [str(stat) for stat in snapshot.statistics('lineno')[:10]]
+            }
+
+        report_path = log_dir / f"{stem}.json"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        from mseqauto.core.process_communication import send_gui_message  # type: ignore
+        send_gui_message("timing", {
+            'run': self.run_name,
+            'duration': report['duration'],
+            'spans': dict(list(report['spans'].items())[:top]),
+            'report': str(report_path)
+        })
+
+        self._run_started = None
+        return report_path
+
+
+def profile_modes():
+    """Set of extra profilers requested through MSEQAUTO_PROFILE"""
+    value = os.environ.get(PROFILE_ENV, '').lower()
+    modes = {mode.strip() for mode in value.split(',') if mode.strip()}
+    if 'all' in modes or '1' in modes:
+        modes |= {'cprofile', 'tracemalloc'}
+    return modes
+
+
+# Process-wide instance used by the DAOs, processor and scripts
+instrumentation = Instrumentation()
+span = instrumentation.span
+timed = instrumentation.timed
+count = instrumentation.count
+
+
+def run_instrumented(run_name, func, log_dir=None):
+    """Run a script's main() as an instrumented run and always write its report"""
+    if log_dir is None:
+        log_dir = Path(__file__).resolve().parents[1] / "scripts" / "logs"
+    instrumentation.start_run(run_name)
+    try:
+        return func()
+    finally:
+        instrumentation.finish_run(log_dir)
@@ -1,12 +1,60 @@
 # logger.py
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+from collections.abc import Mapping
 from pathlib import Path
 from datetime import datetime
 
-def setup_logger(name, log_dir=None):
+# Lowest level written to the log file; INFO skips building debug messages at all
+LOG_LEVEL_ENV = 'MSEQAUTO_LOG_LEVEL'
+
+# Below DEBUG, for per-comparison detail that is only wanted when chasing a bug
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+# Listeners writing queued records, by logger name
+_listeners = {}
+
+
+# Arguments the caller cannot change between the log call and the listener formatting it
+_IMMUTABLE_ARGS = (str, bytes, int, float, complex, bool, type(None), Path)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    Records whose arguments are all immutable go as they are; any other
+    record (a list, a dict, an object...) is formatted here, so the file
+    shows the arguments as they were when the message was logged.
+    """
+
+    def prepare(self, record):
+        args = record.args
+        if args and (isinstance(args, Mapping) or not all(isinstance(arg, _IMMUTABLE_ARGS) for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def setup_logger(name, log_dir=None, queued=True, level=None):
+    """
+    Set up a file (DEBUG) and console (WARNING) logger
+
+    With queued=True the calling thread only puts records on a queue and a
+    QueueListener thread formats and writes them. Setting up the same name
+    twice returns the existing logger instead of adding duplicate handlers.
+    """
     # Configure logger
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV, 'DEBUG').upper()
+    logger.setLevel(level)
+    if logger.handlers:
+        return logger
 
     # Create logs directory if it doesn't exist
     if log_dir is None:
@@ -21,7 +69,7 @@ def setup_logger(name, log_dir=None):
     # File handler - logs to file
     log_file = log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
     file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.DEBUG)  # Make sure this is DEBUG, not INFO
+    file_handler.setLevel(min(logging.DEBUG, logger.level))  # Make sure this is DEBUG (or TRACE), not INFO
 
     # Console handler - logs to console
     console_handler = logging.StreamHandler()
@@ -33,7 +81,82 @@ def setup_logger(name, log_dir=None):
     console_handler.setFormatter(formatter)
 
     # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    if queued:
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                                  respect_handler_level=True)
+        listener.start()
+        _listeners[name] = listener
+        logger.addHandler(_DeferredQueueHandler(log_queue))
+    else:
+        logger.addHandler(file_handler)
+        logger.addHandler(console_handler)
+
+    return logger
+
+
+def flush_logger(name):
+    """Wait until every queued record of a logger has been written"""
+    listener = _listeners.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        listener.start()
+        _listeners[name] = listener
+
+
+@atexit.register
+def stop_listeners():
+    """Write out the remaining queued records"""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
+
+class LevelLogger:
+    """
+    debug/info/warning/error callables for whatever a class was given as logger
+
+    Accepts a logging.Logger, a bound Logger method such as logger.info (how
+    the scripts pass their logger) or any plain callable. Messages use lazy
+    %-style arguments: with a Logger they are only formatted if the level is
+    enabled, with a plain callable they are formatted before the call.
+    """
+
+    def __init__(self, logger=None, name=None):
+        target = getattr(logger, '__self__', None)
+        if isinstance(target, logging.Logger):
+            logger = target
+        elif logger is None:
+            logger = logging.getLogger(name)
+
+        if isinstance(logger, logging.Logger):
+            self.logger = logger
+            self.debug = logger.debug
+            self.info = logger.info
+            self.warning = logger.warning
+            self.error = logger.error
+        else:
+            # A plain callable has no levels
+            self.logger = None
+            self.debug = self.info = self.warning = self.error = self._formatting(logger)
+
+    def trace(self, msg, *args):
+        if self.logger is None:
+            self.debug(msg, *args)
+        elif self.logger.isEnabledFor(TRACE):
+            self.logger.log(TRACE, msg, *args)
+
+    @staticmethod
+    def _formatting(func):
+        def log(msg, *args):
+            func(msg % args if args else msg)
+        return log
+
+    @property
+    def debug_enabled(self):
+        """False when debug messages would be dropped, so callers can skip building them"""
+        return self.logger is None or self.logger.isEnabledFor(logging.DEBUG)
 
-    return logger
\ No newline at end of file
+    @property
+    def trace_enabled(self):
+        return self.logger is None or self.logger.isEnabledFor(TRACE)
@@ -4,15 +4,11 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-print(sys.path)
-
-from mseqauto.config import MseqConfig
-from mseqauto.utils import setup_logger
 from mseqauto.config import MseqConfig
-from mseqauto.core import OSCompatibilityManager, FileSystemDAO, MseqAutomation, FolderProcessor
 config = MseqConfig()
-file_dao = FileSystemDAO(config)
-processor = FolderProcessor(file_dao, None, config)
+
+# Same pattern as FileSystemDAO.regex_patterns['inumber']
+INUMBER_RE = re.compile(r'bioi-(\d+)', re.IGNORECASE)
 
 #remove braces from string
 #adjust abi chars
@@ -129,7 +125,7 @@ def get_inumber_from_name(name):
      #Move to path_utilities.py
      """Extract I number from a name using precompiled regex"""
 
-     match = file_dao.regex_patterns['inumber'].search(str(name).lower())
+     match = INUMBER_RE.search(str(name).lower())
      if match:
           return match.group(1)  # Return just the number
      return None
\ No newline at end of file
@@ -0,0 +1,86 @@
+# summary_sidecar.py
+import json
+import os
+from pathlib import Path
+
+
+class SummarySidecar:
+    """
+    JSON lines companion to a zip order summary workbook
+
+    Holds the order number, status, zip name and zip timestamp of every
+    summary entry so skip checks do not need openpyxl to load the workbook.
+    Entry lines are written oldest to newest, so the last line for an order
+    wins. Each write ends with a stamp line recording the workbook's mtime and
+    size; if the workbook no longer matches (edited in Excel, or a save that
+    never reached the sidecar) the sidecar is ignored and rebuilt.
+    """
+
+    SUFFIX = '.orders.jsonl'
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}  # str(order number) -> entry dict
+        self.stamp = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def path_for(cls, summary_path):
+        summary_path = Path(summary_path)
+        return summary_path.with_name(summary_path.stem + cls.SUFFIX)
+
+    @staticmethod
+    def _stamp(summary_path):
+        stat = os.stat(summary_path)
+        return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+    @classmethod
+    def load(cls, summary_path):
+        """Read the sidecar for a summary; None if missing, unreadable or out of date"""
+        sidecar = cls(cls.path_for(summary_path))
+        try:
+            with open(sidecar.path, encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    if 'stamp' in record:
+                        sidecar.stamp = record['stamp']
+                    else:
+                        sidecar.entries[str(record['order'])] = record
+            current = cls._stamp(summary_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        if sidecar.stamp != current:
+            return None
+        return sidecar
+
+    def get(self, order_number):
+        return self.entries.get(str(order_number))
+
+    def zip_timestamp(self, order_number):
+        """Zip timestamp recorded for an order's newest entry, or None"""
+        entry = self.get(order_number)
+        return entry['zip_timestamp'] if entry else None
+
+    def _write(self, summary_path, entries, mode):
+        lines = []
+        for order, status, zip_name, zip_timestamp in entries:
+            record = {'order': str(order), 'status': status, 'zip': zip_name, 'zip_timestamp': zip_timestamp}
+            self.entries[record['order']] = record
+            lines.append(json.dumps(record))
+        self.stamp = self._stamp(summary_path)
+        lines.append(json.dumps({'stamp': self.stamp}))
+        with open(self.path, mode, encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def append(self, summary_path, entries):
+        """Append (order, status, zip, zip timestamp) entries, newest last, and re-stamp"""
+        self._write(summary_path, entries, 'a')
+
+    @classmethod
+    def rebuild(cls, summary_path, entries):
+        """Replace the sidecar with the given entries, newest last"""
+        sidecar = cls(cls.path_for(summary_path))
+        sidecar._write(summary_path, entries, 'w')
+        return sidecar
@@ -0,0 +1,204 @@
+# synthetic_data.py
+import random
+from datetime import datetime
+from pathlib import Path
+
+ACCOUNT_NAMES = ['Mehle', 'Smith', 'Garcia', 'Nguyen', 'Okafor', 'Larsen', 'Kowalski', 'Tanaka']
+PRIMERS = ['T7', 'SP6', 'M13F', 'M13R', 'BGHR', 'CMVF']
+WELL_ROWS = 'ABCDEFGH'
+
+IND_CONTROLS = ['_pGEM_T7Promoter', '_Water_T7Promoter']
+PLATE_CONTROLS = ['pGEM_M13F-20', 'Water_M13F-20']
+
+
+def _wells():
+    """Yield 96-well plate positions column-wise (01A, 01B, ... 12H)"""
+    for col in range(1, 13):
+        for row in WELL_ROWS:
+            yield f"{col:02d}{row}"
+
+
+def _write_ab1(path, rng, size):
+    """Write a fake chromatogram of the given size"""
+    path.write_bytes(rng.randbytes(size))
+
+
+def _write_sheet(path, names):
+    """Write an ABI upload sheet: 5 header rows then well<TAB>sample rows"""
+    lines = ['Container Name\tPlate ID', 'Synthetic\tSynthetic', 'AppServer\tAppInstance',
+             'Unified Data Collection\tSynthetic', 'Well\tSample Name']
+    for well, name in zip(_wells(), names):
+        lines.append(f"{well}\t{name}")
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def generate_day_folder(root, date=None, bioi_count=2, orders_per_bioi=4, samples_per_order=8,
+                        pcr_count=1, pcr_samples=4, plate_count=1, plate_samples=88,
+                        reinject_count=2, ab1_size=4096, first_inumber=22000, seed=None):
+    """
+    Build a synthetic day of sequencing data for tests and benchmarks
+
+    Layout under root:
+        <MM.DD.YY>/                      day data folder
+            <YYYY-MM-DD>_BioI-<n>_1/     raw individual run folders (customer,
+                                         PCR, control, blank and reinject files)
+            FB-PCR<n>_<order>/           empty PCR order folders
+            <YYYY-MM-DD>_P<n>_1/         raw plate run folders
+        order_key.txt                    tab-separated order key
+        Spreadsheets/                    I-number and reinject upload sheets
+            Individual Uploaded to ABI/
+        Individuals/                     previous I-number folders
+        Reinjects/
+
+    Args:
+        root (str or Path): Directory to build the data in
+        date (datetime): Day to generate, defaults to today
+        seed (int): Seed so the same arguments always produce the same tree
+
+    Returns:
+        dict: Paths and counts describing what was generated
+    """
+    rng = random.Random(seed)
+    date = date or datetime.now()
+    root = Path(root)
+
+    day_folder = root / date.strftime('%m.%d.%y')
+    spreadsheets_path = root / 'Spreadsheets'
+    abi_upload_path = spreadsheets_path / 'Individual Uploaded to ABI'
+    individuals_path = root / 'Individuals'
+    reinject_folder = root / 'Reinjects'
+    for folder in (day_folder, abi_upload_path, individuals_path, reinject_folder):
+        folder.mkdir(parents=True, exist_ok=True)
+
+    # Yesterday's I number, so only today's sheets count as active
+    (individuals_path / f"BioI-{first_inumber - 1}").mkdir(exist_ok=True)
+
+    date_prefix = date.strftime('%Y-%m-%d')
+    order_key_rows = []
+    orders = []
+    i_numbers = []
+    counts = {'customer': 0, 'pcr': 0, 'control': 0, 'blank': 0, 'reinject': 0, 'plate': 0}
+    next_order = 150000
+    next_pcr = 3000
+
+    for b in range(bioi_count):
+        i_num = str(first_inumber + b)
+        i_numbers.append(i_num)
+        raw_folder = day_folder / f"{date_prefix}_BioI-{i_num}_1"
+        raw_folder.mkdir(exist_ok=True)
+        wells = _wells()
+        sheet_names = []
+
+        for _ in range(orders_per_bioi):
+            acct_name = rng.choice(ACCOUNT_NAMES)
+            order_num = str(next_order)
+            next_order += 1
+            orders.append((i_num, acct_name, order_num, samples_per_order))
+
+            for s in range(samples_per_order):
+                sample_name = f"{acct_name[:3]}{order_num[-3:]}-S{s + 1:02d}_{rng.choice(PRIMERS)}"
+                order_key_rows.append((i_num, acct_name, order_num, sample_name))
+                well = next(wells, None) or f"{rng.randint(1, 12):02d}{rng.choice(WELL_ROWS)}"
+                _write_ab1(raw_folder / f"{{{well}}}{sample_name}.ab1", rng, ab1_size)
+                sheet_names.append(f"{{{well}}}{sample_name}")
+                counts['customer'] += 1
+
+        for p in range(pcr_count):
+            pcr_num = next_pcr + b * pcr_count + p
+            pcr_order = str(next_order)
+            next_order += 1
+            (day_folder / f"FB-PCR{pcr_num}_{pcr_order}").mkdir(exist_ok=True)
+            for s in range(pcr_samples):
+                well = next(wells, None) or '12H'
+                name = f"{{{well}}}{{PCR{pcr_num}exp1}}Amplicon{s + 1:02d}_{rng.choice(PRIMERS)}.ab1"
+                _write_ab1(raw_folder / name, rng, ab1_size)
+                counts['pcr'] += 1
+
+        for control in IND_CONTROLS:
+            well = next(wells, None) or '12G'
+            _write_ab1(raw_folder / f"{{{well}}}{control}.ab1", rng, ab1_size)
+            counts['control'] += 1
+
+        blank_well = next(wells, None) or '12H'
+        _write_ab1(raw_folder / f"{{{blank_well}}}.ab1", rng, ab1_size)
+        counts['blank'] += 1
+
+        _write_sheet(spreadsheets_path / f"BioI-{i_num}_{date.strftime('%m%d%y')}.txt", sheet_names)
+
+        # Reinjects: a second injection of a few samples, listed in a reinject sheet
+        bioi_rows = [row for row in order_key_rows if row[0] == i_num]
+        reinjects = rng.sample(bioi_rows, min(reinject_count, len(bioi_rows)))
+        reinject_names = []
+        for _, _, _, sample_name in reinjects:
+            well = f"{rng.randint(1, 12):02d}{rng.choice(WELL_ROWS)}"
+            _write_ab1(raw_folder / f"{{{well}}}{sample_name}.ab1", rng, ab1_size)
+            reinject_names.append(f"{{{well}}}{sample_name}")
+            counts['reinject'] += 1
+        if reinject_names:
+            _write_sheet(abi_upload_path / f"Reinject BioI-{i_num}.txt", reinject_names)
+
+    plate_numbers = []
+    for p in range(plate_count):
+        plate = f"P{40000 + p}"
+        plate_numbers.append(plate)
+        raw_folder = day_folder / f"{date_prefix}_{plate}_1"
+        raw_folder.mkdir(exist_ok=True)
+        wells = list(_wells())
+        for s in range(min(plate_samples, len(wells) - len(PLATE_CONTROLS) - 1)):
+            _write_ab1(raw_folder / f"{plate}_{wells[s]}_Clone{s + 1:02d}_{rng.choice(PRIMERS)}.ab1", rng, ab1_size)
+            counts['plate'] += 1
+        for c, control in enumerate(PLATE_CONTROLS):
+            _write_ab1(raw_folder / f"{plate}_{wells[-3 + c]}_{control}.ab1", rng, ab1_size)
+            counts['control'] += 1
+        _write_ab1(raw_folder / f"{plate}_{wells[-1]}__.ab1", rng, ab1_size)
+        counts['blank'] += 1
+
+    order_key_path = root / 'order_key.txt'
+    order_key_path.write_text('\n'.join('\t'.join(row) for row in order_key_rows) + '\n')
+
+    return {
+        'root': root,
+        'day_folder': day_folder,
+        'order_key_path': order_key_path,
+        'spreadsheets_path': spreadsheets_path,
+        'abi_upload_path': abi_upload_path,
+        'individuals_path': individuals_path,
+        'reinject_folder': reinject_folder,
+        'i_numbers': i_numbers,
+        'orders': orders,
+        'plates': plate_numbers,
+        'counts': counts,
+        'total_ab1': sum(counts.values())
+    }
+
+
+def generate_order_key(path, rows, samples_per_order=12, orders_per_inumber=8, first_inumber=22000, seed=None):
+    """
+    Write a large tab-separated order key (I number, account, order, sample) without the data files
+
+    Returns:
+        list: The rows written, in file order
+    """
+    rng = random.Random(seed)
+    order_key_rows = []
+    for r in range(rows):
+        order_index = r // samples_per_order
+        i_num = str(first_inumber + order_index // orders_per_inumber)
+        acct_name = ACCOUNT_NAMES[order_index % len(ACCOUNT_NAMES)]
+        order_num = str(150000 + order_index)
+        sample_name = f"{acct_name[:3]}{order_num[-3:]}-S{r % samples_per_order + 1:02d}_{rng.choice(PRIMERS)}"
+        order_key_rows.append((i_num, acct_name, order_num, sample_name))
+    Path(path).write_text('\n'.join('\t'.join(row) for row in order_key_rows) + '\n')
+    return order_key_rows
+
+
+def apply_to_config(config, day):
+    """Point a config instance at a generated day instead of the lab drives"""
+    config.KEY_FILE_PATH = day['order_key_path']
+    config.BATCH_FILE_PATH = None
+    config.REINJECT_FOLDER = day['reinject_folder']
+    config.SPREADSHEETS_PATH = day['spreadsheets_path']
+    config.ABI_UPLOAD_PATH = day['abi_upload_path']
+    config.INDIVIDUALS_DATA_PATH = day['individuals_path']
+    config.ORDER_STATE_DB = day['root'] / 'order_state.db'
+    return config
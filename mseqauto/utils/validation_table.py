@@ -0,0 +1,76 @@
+# validation_table.py
+import csv
+
+
+class ValidationTable:
+    """
+    Column-oriented buffer of summary rows
+
+    Validation, FB-PCR and plate results are collected here first and written
+    to a worksheet in one pass by ExcelDAO.render_table. Values and style names
+    are stored per column, so column widths are tracked as rows are added
+    instead of re-walking every cell afterwards.
+    """
+
+    def __init__(self, headers=None, num_columns=8):
+        self.headers = list(headers or [])
+        self.num_columns = max(num_columns, len(self.headers))
+        self.values = [[] for _ in range(self.num_columns)]   # column -> row values
+        self.styles = [[] for _ in range(self.num_columns)]   # column -> row style names
+        self.hidden = []                                       # row -> hidden flag
+        self._widths = [len(str(header)) if header else 0 for header in self.headers]
+        self._widths += [0] * (self.num_columns - len(self._widths))
+
+    def __len__(self):
+        return len(self.hidden)
+
+    def add_row(self):
+        """Append an empty row and return its index"""
+        for column in self.values:
+            column.append(None)
+        for column in self.styles:
+            column.append(None)
+        self.hidden.append(False)
+        return len(self.hidden) - 1
+
+    def set(self, row, col, value):
+        """Set the value at a row index and 1-based column"""
+        self.values[col - 1][row] = value
+        if value:
+            length = len(str(value))
+            if length > self._widths[col - 1]:
+                self._widths[col - 1] = length
+
+    def get(self, row, col):
+        return self.values[col - 1][row]
+
+    def set_style(self, row, col, style_type):
+        """Record a named style ('success', 'attention', 'resolved', 'break') for a cell"""
+        self.styles[col - 1][row] = style_type
+
+    def hide_rows(self, start, end):
+        """Hide rows start..end-1"""
+        for row in range(start, end):
+            self.hidden[row] = True
+
+    def rows(self):
+        """Yield each row's values as a tuple"""
+        return zip(*self.values)
+
+    def column_widths(self, padding=2):
+        """Width for each column: longest value or header plus padding"""
+        return [width + padding for width in self._widths]
+
+    def to_tsv(self, path, append=False):
+        """
+        Write the table as tab-separated text (header line unless appending)
+
+        Empty cells are written as empty fields and the hidden flag is dropped.
+        """
+        mode = 'a' if append else 'w'
+        with open(path, mode, newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+            if self.headers and not append:
+                writer.writerow(self.headers)
+            for row in self.rows():
+                writer.writerow('' if value is None else value for value in row)
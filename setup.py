@@ -6,13 +6,13 @@ setup(
     packages=find_packages(),
     entry_points={
         'console_scripts': [
-            'ind-sort=mseqauto.scripts.ind_sort_files:main',
-            'ind-mseq=mseqauto.scripts.ind_auto_mseq:main',
-            'ind-zip=mseqauto.scripts.ind_zip_files:main',
+            'ind-sort=mseqauto.scripts.ind_sort_files:run',
+            'ind-mseq=mseqauto.scripts.ind_auto_mseq:run',
+            'ind-zip=mseqauto.scripts.ind_zip_files:run',
             'plate-sort=mseqauto.scripts.plate_sort_files:main',
             'plate-mseq=mseqauto.scripts.plate_auto_mseq:main',
             'plate-zip=mseqauto.scripts.plate_zip_files:main',
-            'validate-zip=mseqauto.scripts.validate_zip_files:main',
+            'validate-zip=mseqauto.scripts.validate_zip_files:run',
         ],
     },
     install_requires=[
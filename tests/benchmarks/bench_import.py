@@ -0,0 +1,19 @@
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+
+@pytest.mark.parametrize('statement', [
+    'import mseqauto.core',
+    'from mseqauto.core import FileSystemDAO, FolderProcessor',
+    'from mseqauto.utils import ExcelDAO',
+], ids=['core', 'sort-zip', 'excel'])
+def test_import_time(benchmark, statement):
+    """Wall time of a fresh interpreter importing the package, as a script launch pays it"""
+    result = benchmark.pedantic(subprocess.run, args=([sys.executable, '-c', statement],),
+                                kwargs={'check': True}, rounds=5)
+
+    assert result.returncode == 0
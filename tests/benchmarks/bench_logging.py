@@ -0,0 +1,40 @@
+import pytest
+
+from mseqauto.utils.logger import flush_logger, setup_logger
+
+from .conftest import make_processor
+
+pytest.importorskip('pytest_benchmark')
+
+# (queued, file level): every comparison traced, synchronous and queued writers at DEBUG, queued at INFO
+LOGGING_MODES = {
+    'queued-trace': (True, 'TRACE'),
+    'sync-debug': (False, 'DEBUG'),
+    'queued-debug': (True, 'DEBUG'),
+    'queued-info': (True, 'INFO'),
+}
+
+
+@pytest.fixture(params=list(LOGGING_MODES))
+def script_logger(request, tmp_path):
+    """A logger set up the way the scripts do it, passed on as logger.info"""
+    queued, level = LOGGING_MODES[request.param]
+    name = f"bench_{request.param}"
+    logger = setup_logger(name, log_dir=tmp_path, queued=queued, level=level)
+    yield logger
+    flush_logger(name)
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def test_validate_zip_contents_logging(benchmark, mseqed_order, script_logger):
+    processor = make_processor(mseqed_order['config'])
+    zip_path = processor.zip_order_folder(str(mseqed_order['order_folder']))
+    processor = make_processor(mseqed_order['config'], logger=script_logger.info)
+
+    result = benchmark(processor.validate_zip_contents, zip_path, mseqed_order['i_number'],
+                       mseqed_order['order_number'], mseqed_order['order_key'])
+
+    assert result['match_count'] == 96
+    assert processor._logger is script_logger
@@ -0,0 +1,47 @@
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO
+from mseqauto.core.shared_order_key import SharedOrderKey
+
+from .conftest import make_processor
+
+pytest.importorskip('pytest_benchmark')
+
+
+def test_load_order_key(benchmark, order_key_file):
+    file_dao = FileSystemDAO(MseqConfig())
+
+    order_key = benchmark(file_dao.load_order_key, order_key_file)
+
+    assert len(order_key) > 0
+
+
+def test_build_order_key_index(benchmark, order_key_file):
+    config = MseqConfig()
+    processor = make_processor(config)
+    order_key = processor.file_dao.load_order_key(order_key_file)
+
+    def reset():
+        processor.order_key_index = None
+
+    benchmark.pedantic(processor.build_order_key_index, args=(order_key,), setup=reset, rounds=3)
+
+    assert processor.order_key_index
+
+
+def test_attach_shared_order_key(benchmark, order_key_file):
+    """What a worker process pays instead of loading and indexing the key itself"""
+    file_dao = FileSystemDAO(MseqConfig())
+    shared = SharedOrderKey.create_shared(file_dao.load_order_key(order_key_file), file_dao)
+    sample = next(iter(shared.index))
+
+    def attach_and_look_up():
+        with SharedOrderKey.attach(shared.name) as order_key:
+            return order_key.index[sample]
+
+    try:
+        assert benchmark(attach_and_look_up)
+    finally:
+        shared.close()
+        shared.unlink()
@@ -0,0 +1,44 @@
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.utils.synthetic_data import apply_to_config
+
+from .conftest import make_processor
+
+pytest.importorskip('pytest_benchmark')
+
+
+def prepare_day(day):
+    config = apply_to_config(MseqConfig(), day)
+    processor = make_processor(config, day['day_folder'])
+    file_dao = processor.file_dao
+    order_key = file_dao.load_order_key(config.KEY_FILE_PATH)
+    i_numbers, bio_folders = file_dao.get_folders_with_inumbers(str(day['day_folder']))
+    reinject_list = processor.get_reinject_list(i_numbers)
+    return processor, bio_folders, reinject_list, order_key
+
+
+def sort_day(processor, bio_folders, reinject_list, order_key):
+    for bio_folder in bio_folders:
+        processor.sort_ind_folder(bio_folder, reinject_list, order_key)
+
+
+def test_sort_ind_folder(benchmark, pristine_day, day_copy):
+    days = []
+
+    def setup():
+        days.append(day_copy())
+        return prepare_day(days[-1]), {}
+
+    benchmark.pedantic(sort_day, setup=setup, rounds=3)
+
+    assert pristine_day['total_ab1'] >= 2000
+    assert not list(days[-1]['day_folder'].glob('*_BioI-*_1/*.ab1'))
+
+
+def test_get_reinject_list(benchmark, pristine_day):
+    processor, _, _, _ = prepare_day(pristine_day)
+
+    reinject_list = benchmark(processor.get_reinject_list, pristine_day['i_numbers'])
+
+    assert len(reinject_list) == pristine_day['counts']['reinject']
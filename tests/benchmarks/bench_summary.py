@@ -0,0 +1,39 @@
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.utils import ExcelDAO
+
+pytest.importorskip('pytest_benchmark')
+
+EXISTING_ORDERS = 300
+NEW_ORDERS = 40
+SAMPLES_PER_ORDER = 8
+
+
+def summary_workbook(excel_dao, first_order, orders):
+    workbook = excel_dao.create_workbook()
+    worksheet = workbook.active
+    excel_dao.set_validation_headers(worksheet)
+    for order in range(first_order, first_order + orders):
+        worksheet.append(("22000", str(order), "Completed", f"BioI-22000_Smith_{order}.zip",
+                          None, None, None, "1000"))
+        for sample in range(SAMPLES_PER_ORDER):
+            worksheet.append((None, None, None, None, f"S{sample}", f"S{sample}.ab1", "match", None))
+        worksheet.row_dimensions[worksheet.max_row].hidden = True
+    return workbook
+
+
+@pytest.mark.parametrize('append_mode', [False, True], ids=['insert', 'append'])
+def test_update_existing_summary(benchmark, tmp_path, append_mode):
+    excel_dao = ExcelDAO(MseqConfig())
+    excel_dao.append_mode = append_mode
+    path = tmp_path / "summary.xlsx"
+    summary_workbook(excel_dao, 100000, EXISTING_ORDERS).save(path)
+
+    def setup():
+        return (excel_dao.load_workbook(path), summary_workbook(excel_dao, 200000, NEW_ORDERS),
+                tmp_path / "updated.xlsx"), {}
+
+    result = benchmark.pedantic(excel_dao.update_existing_summary, setup=setup, rounds=3)
+
+    assert result
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO
+
+from .conftest import make_processor, slow_share
+
+pytest.importorskip('pytest_benchmark')
+
+
+def test_zip_order_folder(benchmark, mseqed_order):
+    processor = make_processor(mseqed_order['config'])
+
+    zip_path = benchmark(processor.zip_order_folder, str(mseqed_order['order_folder']))
+
+    assert zip_path
+
+
+def test_validate_zip_contents(benchmark, mseqed_order):
+    processor = make_processor(mseqed_order['config'])
+    zip_path = processor.zip_order_folder(str(mseqed_order['order_folder']))
+
+    result = benchmark(processor.validate_zip_contents, zip_path, mseqed_order['i_number'],
+                       mseqed_order['order_number'], mseqed_order['order_key'])
+
+    assert result['match_count'] == 96
+
+
+@pytest.mark.parametrize('staging', [False, True], ids=['direct', 'staged'])
+def test_zip_files_over_slow_share(benchmark, mseqed_order, tmp_path, staging):
+    config = MseqConfig()
+    config.ZIP_LOCAL_STAGING = staging
+    config.ZIP_STAGING_DIR = str(tmp_path)
+    file_dao = FileSystemDAO(config)
+    share = mseqed_order['order_folder'].parent
+    zip_path = share / "share_latency.zip"
+
+    def remove_zip():
+        if zip_path.exists():
+            zip_path.unlink()
+
+    with slow_share(share):
+        benchmark.pedantic(file_dao.zip_files, args=(str(mseqed_order['order_folder']), str(zip_path), ['.ab1']),
+                           setup=remove_zip, rounds=3)
+
+    assert len(file_dao.get_zip_contents(zip_path)) == 96
+    assert os.listdir(tmp_path) == []
+    zip_path.unlink()
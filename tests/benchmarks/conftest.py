@@ -0,0 +1,143 @@
+"""
+Benchmarks for the FileSystemDAO, FolderProcessor and ExcelDAO hot paths
+
+The bench_*.py files are not picked up by a plain `pytest` run; they need
+pytest-benchmark and are run explicitly. Baselines live in
+tests/benchmarks/baselines, one folder per machine/interpreter:
+
+    # save a baseline
+    python -m pytest tests/benchmarks/bench_*.py --benchmark-storage=tests/benchmarks/baselines --benchmark-autosave
+
+    # compare against the latest baseline, failing on a >20% slower mean
+    python -m pytest tests/benchmarks/bench_*.py --benchmark-storage=tests/benchmarks/baselines \
+        --benchmark-compare --benchmark-compare-fail=mean:20%
+
+MSEQAUTO_BENCH_ORDER_KEY_ROWS sets the order key sizes (default
+10000,100000; add 500000 for the full range) and MSEQAUTO_BENCH_SCALE
+multiplies the number of BioI folders in the synthetic day.
+"""
+import builtins
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor
+from mseqauto.core.mseq_simulator import MseqSimulator
+from mseqauto.utils.synthetic_data import apply_to_config, generate_day_folder, generate_order_key
+
+ORDER_KEY_ROWS = [int(rows) for rows in os.environ.get('MSEQAUTO_BENCH_ORDER_KEY_ROWS', '10000,100000').split(',')]
+SCALE = int(os.environ.get('MSEQAUTO_BENCH_SCALE', '1'))
+
+
+def quiet(*args, **kwargs):
+    pass
+
+
+def make_processor(config, data_folder=None, logger=quiet):
+    processor = FolderProcessor(FileSystemDAO(config), None, config, logger=logger)
+    # Without a data folder the processor falls back to P:\Data\<today>
+    processor.current_data_folder = str(data_folder) if data_folder else None
+    return processor
+
+
+class _SlowFile:
+    """File object whose reads and writes each pay the share's round trip"""
+
+    def __init__(self, f, latency):
+        self._f = f
+        self._latency = latency
+
+    def read(self, *args):
+        time.sleep(self._latency)
+        return self._f.read(*args)
+
+    def write(self, data):
+        time.sleep(self._latency)
+        return self._f.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._f.close()
+
+
+@contextmanager
+def slow_share(root, open_latency=0.004, io_latency=0.0005):
+    """
+    Stand-in for an SMB share: files under root pay open_latency per open and
+    io_latency per read/write call (os.sendfile copies only pay the open)
+    """
+    real_open = builtins.open
+    root = os.path.abspath(root)
+
+    def open_(file, *args, **kwargs):
+        f = real_open(file, *args, **kwargs)
+        if isinstance(file, (str, os.PathLike)) and os.path.abspath(file).startswith(root):
+            time.sleep(open_latency)
+            return _SlowFile(f, io_latency)
+        return f
+
+    builtins.open = open_
+    try:
+        yield
+    finally:
+        builtins.open = real_open
+
+
+@pytest.fixture(scope='session', params=ORDER_KEY_ROWS, ids=lambda rows: f"{rows}rows")
+def order_key_file(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp('order_key') / 'order_key.txt'
+    generate_order_key(path, request.param, seed=0)
+    return path
+
+
+@pytest.fixture(scope='session')
+def pristine_day(tmp_path_factory):
+    """A synthetic day with ~2000 .ab1 files across 20 BioI folders, never modified"""
+    root = tmp_path_factory.mktemp('pristine')
+    day = generate_day_folder(root, bioi_count=20 * SCALE, orders_per_bioi=8, samples_per_order=11,
+                              pcr_count=1, plate_count=0, reinject_count=6, ab1_size=512, seed=0)
+    return day
+
+
+@pytest.fixture
+def day_copy(pristine_day, tmp_path):
+    """Fresh copy of the pristine day for benchmarks that move files"""
+    def copy():
+        root = tmp_path / f"run{len(os.listdir(tmp_path))}"
+        shutil.copytree(pristine_day['root'], root)
+        day = dict(pristine_day, root=root)
+        for key in ('day_folder', 'order_key_path', 'spreadsheets_path', 'abi_upload_path',
+                    'individuals_path', 'reinject_folder'):
+            day[key] = root / pristine_day[key].relative_to(pristine_day['root'])
+        return day
+    return copy
+
+
+@pytest.fixture(scope='session')
+def mseqed_order(tmp_path_factory):
+    """A sorted, mSeq'd 96-sample order folder and the order key it came from"""
+    root = tmp_path_factory.mktemp('order')
+    day = generate_day_folder(root, bioi_count=1, orders_per_bioi=1, samples_per_order=96, pcr_count=0,
+                              plate_count=0, reinject_count=0, ab1_size=4096, seed=0)
+    config = apply_to_config(MseqConfig(), day)
+    processor = make_processor(config, day['day_folder'])
+    file_dao = processor.file_dao
+    order_key = file_dao.load_order_key(config.KEY_FILE_PATH)
+    _, bio_folders = file_dao.get_folders_with_inumbers(str(day['day_folder']))
+    for bio_folder in bio_folders:
+        processor.sort_ind_folder(bio_folder, [], order_key)
+
+    i_num, acct_name, order_num, _ = day['orders'][0]
+    order_folder = day['day_folder'] / f"BioI-{i_num}" / f"BioI-{i_num}_{acct_name}_{order_num}"
+    MseqSimulator(config).process_folder(str(order_folder))
+    return {'config': config, 'order_folder': order_folder, 'order_key': order_key,
+            'i_number': i_num, 'order_number': order_num}
@@ -0,0 +1,15 @@
+"""Stand-in for the mSeq executable: writes the five TEXT_FILES outputs for a folder"""
+import sys
+from pathlib import Path
+
+TEXT_FILES = ['.raw.qual.txt', '.raw.seq.txt', '.seq.info.txt', '.seq.qual.txt', '.seq.txt']
+
+
+def run(folder):
+    folder = Path(folder)
+    for ext in TEXT_FILES:
+        (folder / f"{folder.name}{ext}").write_text("")
+
+
+if __name__ == "__main__":
+    run(sys.argv[1])
@@ -0,0 +1,95 @@
+import sys
+import types
+
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core.automation_server import (
+    AutomationClient, AutomationServerBusy, AutomationServerError, connect_automation_server,
+    create_ui_automation, read_session_file
+)
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = MseqConfig()
+    config.AUTOMATION_SERVER_FILE = tmp_path / "session" / "automation_server.json"
+    config.AUTOMATION_SERVER_IDLE_TIMEOUT = 60
+    return config
+
+
+def test_server_processes_folders_and_is_reused(tmp_path, config):
+    folder = tmp_path / "BioI-20000_Customer_100000"
+    folder.mkdir()
+    for i in range(3):
+        (folder / f"Sample{i}_T7.ab1").write_bytes(b"abif")
+
+    client = connect_automation_server(config, simulator=True)
+    try:
+        client.connect_or_start_mseq()
+        assert client.process_folder(folder) is True
+        status = client.status()
+        assert status['automation'] == 'MseqSimulator'
+        assert status['folders_processed'] == 1
+        client.close()
+        for ext in config.TEXT_FILES:
+            assert any(f.name.endswith(ext) for f in folder.iterdir())
+
+        # A second script finds the running server instead of starting another
+        session = read_session_file(config.AUTOMATION_SERVER_FILE)
+        client = connect_automation_server(config, start=False)
+        assert client.status()['pid'] == session['pid']
+        client.disconnect()
+
+        # Clients are served one at a time, so the bad one is only answered once the last has gone
+        with pytest.raises(AutomationServerError):
+            AutomationClient(session['host'], session['port'], 'wrong token', timeout=10).ping()
+        client = connect_automation_server(config, start=False)
+    finally:
+        client.shutdown()
+
+
+def test_close_between_folders_keeps_client_usable(tmp_path, config):
+    # FolderProcessor closes mSeq after every folder it processes
+    folders = []
+    for order in range(3):
+        folder = tmp_path / f"BioI-20000_Customer_10000{order}"
+        folder.mkdir()
+        (folder / "Sample_T7.ab1").write_bytes(b"abif")
+        folders.append(folder)
+
+    client = connect_automation_server(config, simulator=True)
+    try:
+        for folder in folders:
+            assert client.process_folder(folder) is True
+            client.close()
+        assert client.status()['folders_processed'] == 3
+    finally:
+        client.shutdown()
+
+
+def test_connect_without_server_fails_when_not_starting(config):
+    with pytest.raises(AutomationServerError):
+        connect_automation_server(config, start=False)
+
+
+def test_second_script_is_told_the_server_is_busy(config, monkeypatch):
+    config.AUTOMATION_SERVER_BUSY_TIMEOUT = 0.5
+    first = connect_automation_server(config, simulator=True)
+    try:
+        with pytest.raises(AutomationServerBusy):
+            connect_automation_server(config, start=False)
+
+        # create_ui_automation falls back to driving mSeq in-process
+        local = types.ModuleType("ui_automation")
+        local.MseqAutomation = lambda config, logger=None: ("local", config)
+        monkeypatch.setattr(sys, "maxsize", 2 ** 63 - 1)
+        monkeypatch.setitem(sys.modules, "mseqauto.core.ui_automation", local)
+        assert create_ui_automation(config) == ("local", config)
+
+        first.disconnect()
+        second = connect_automation_server(config, start=False)
+        assert second.ping() is True
+        first = second
+    finally:
+        first.shutdown()
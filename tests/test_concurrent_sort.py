@@ -0,0 +1,99 @@
+import hashlib
+import random
+import shutil
+from datetime import datetime
+
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor, open_order_state_store
+from mseqauto.utils.synthetic_data import apply_to_config, generate_day_folder
+
+DATE = datetime(2025, 4, 18)
+
+
+def make_day(root):
+    """A synthetic day where every I number has a second raw folder sharing its destinations"""
+    day = generate_day_folder(root, date=DATE, bioi_count=6, orders_per_bioi=4, samples_per_order=6,
+                              pcr_count=1, plate_count=0, reinject_count=2, ab1_size=256, seed=11)
+    rng = random.Random(5)
+    for raw_folder in sorted(day['day_folder'].glob('*_BioI-*_1')):
+        second = raw_folder.with_name(raw_folder.name[:-2] + '_2')
+        second.mkdir()
+        files = sorted(raw_folder.iterdir())
+        for source in rng.sample(files, len(files) // 3):
+            # Same sample in another well, so the two copies clean to the same name
+            name = source.name
+            if name.startswith('{') and rng.random() < 0.5:
+                name = '{12A}' + name[5:]
+            shutil.copy(source, second / name)
+    return day
+
+
+def make_cross_day(root):
+    """A synthetic day where every raw folder also holds samples of the next I number's orders"""
+    day = generate_day_folder(root, date=DATE, bioi_count=6, orders_per_bioi=4, samples_per_order=6,
+                              pcr_count=0, plate_count=0, reinject_count=2, ab1_size=256, seed=13)
+    rng = random.Random(7)
+    raw_folders = sorted(day['day_folder'].glob('*_BioI-*_1'))
+    for raw_folder, other in zip(raw_folders, raw_folders[1:] + raw_folders[:1]):
+        files = sorted(path for path in other.iterdir() if path.suffix == '.ab1')
+        for source in rng.sample(files, len(files) // 3):
+            shutil.copy(source, raw_folder / source.name)
+    return day
+
+
+def layout(folder):
+    return {str(path.relative_to(folder)).replace('\\', '/'): hashlib.md5(path.read_bytes()).hexdigest()
+            for path in folder.rglob('*') if path.is_file()}
+
+
+def sort_day(root, max_workers, make=make_day):
+    day = make(root)
+    config = apply_to_config(MseqConfig(), day)
+    file_dao = FileSystemDAO(config)
+    with open_order_state_store(config) as state_store:
+        processor = FolderProcessor(file_dao, None, config, logger=lambda *args: None, state_store=state_store)
+        processor.current_data_folder = str(day['day_folder'])
+        order_key = file_dao.load_order_key(config.KEY_FILE_PATH)
+        _, bio_folders = file_dao.get_folders_with_inumbers(day['day_folder'])
+        reinject_list = processor.get_reinject_list(day['i_numbers'])
+        assert len(bio_folders) == (12 if make is make_day else 6)
+
+        processor.sort_ind_folders(bio_folders, reinject_list, order_key, max_workers=max_workers)
+        sorted_orders = [folder for folder in day['day_folder'].glob('BioI-*/BioI-*_*_*')
+                         if (state_store.get(folder) or {}).get('sorted_at')]
+    return layout(day['day_folder']), len(sorted_orders)
+
+
+@pytest.mark.parametrize('run', range(3))
+def test_concurrent_sort_matches_serial_layout(tmp_path, run):
+    serial, serial_orders = sort_day(tmp_path / 'serial', max_workers=1)
+    concurrent, concurrent_orders = sort_day(tmp_path / 'concurrent', max_workers=8)
+
+    assert any('/Alternate Injections/' in path for path in serial)
+    assert concurrent == serial
+    assert concurrent_orders == serial_orders == 24
+
+
+@pytest.mark.parametrize('run', range(3))
+def test_concurrent_sort_routing_across_i_numbers_matches_serial_layout(tmp_path, run):
+    serial, _ = sort_day(tmp_path / 'serial', max_workers=1, make=make_cross_day)
+    concurrent, _ = sort_day(tmp_path / 'concurrent', max_workers=8, make=make_cross_day)
+
+    assert any('/Alternate Injections/' in path for path in serial)
+    assert concurrent == serial
+
+
+def test_folders_routing_into_each_other_share_a_group(tmp_path):
+    day = make_cross_day(tmp_path)
+    config = apply_to_config(MseqConfig(), day)
+    file_dao = FileSystemDAO(config)
+    processor = FolderProcessor(file_dao, None, config, logger=lambda *args: None)
+    processor.build_order_key_index(file_dao.load_order_key(config.KEY_FILE_PATH))
+    _, bio_folders = file_dao.get_folders_with_inumbers(day['day_folder'])
+    bio_folders = sorted(bio_folders)
+
+    own = [file_dao.get_inumber_from_name(folder) for folder in bio_folders]
+    for folder, next_i_number in zip(bio_folders, own[1:] + own[:1]):
+        assert next_i_number in processor._sort_destinations(folder)
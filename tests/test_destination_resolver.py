@@ -0,0 +1,70 @@
+import os
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO
+from mseqauto.core.destination_resolver import DestinationResolver
+
+
+def test_pcr_folders_are_indexed_once_and_prefer_order_numbers(tmp_path, monkeypatch):
+    for name in ("FB-PCR3000", "FB-PCR3000_150001", "FB-PCR3001", "notes"):
+        (tmp_path / name).mkdir()
+    resolver = DestinationResolver(FileSystemDAO(MseqConfig()))
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+
+    assert resolver.pcr_folder("3000", tmp_path) == str(tmp_path / "FB-PCR3000_150001")
+    assert resolver.pcr_folder("3001", tmp_path) == str(tmp_path / "FB-PCR3001")
+    created = resolver.pcr_folder("3002", tmp_path)
+    assert created == str(tmp_path / "FB-PCR3002") and os.path.isdir(created)
+    for _ in range(3):
+        assert resolver.pcr_folder("3000", tmp_path) == str(tmp_path / "FB-PCR3000_150001")
+        assert resolver.pcr_folder("3002", tmp_path) == created
+    assert len(scans) == 1
+
+
+def test_bioi_and_order_folders_are_created_once(tmp_path, monkeypatch):
+    resolver = DestinationResolver(FileSystemDAO(MseqConfig()))
+    bioi = resolver.bioi_folder("22000", tmp_path / "day")
+    order = resolver.order_folder("22000", "Smith", "150000", bioi)
+    assert os.path.isdir(order)
+    assert order == str(tmp_path / "day" / "BioI-22000" / "BioI-22000_Smith_150000")
+
+    # Remembered folders are not looked at again until invalidate()
+    os.rmdir(order)
+    assert resolver.order_folder("22000", "Smith", "150000", bioi) == order
+    assert not os.path.exists(order)
+    resolver.invalidate()
+    resolver.order_folder("22000", "Smith", "150000", bioi)
+    assert os.path.isdir(order)
+
+
+def test_folders_removed_by_cleanup_are_resolved_again(tmp_path):
+    from mseqauto.core import FolderProcessor
+    config = MseqConfig()
+    processor = FolderProcessor(FileSystemDAO(config), None, config, logger=lambda msg: None)
+    day = tmp_path / "day"
+    bioi = processor.destinations.bioi_folder("22000", day)
+    order = processor.destinations.order_folder("22000", "Smith", "150000", bioi)
+
+    # Nothing was sorted into them, so final cleanup deletes both
+    removed = processor.final_cleanup(str(day))
+    assert order in removed and not os.path.exists(bioi)
+
+    assert processor.destinations.bioi_folder("22000", day) == bioi
+    assert processor.destinations.order_folder("22000", "Smith", "150000", bioi) == order
+    assert os.path.isdir(order)
+
+
+def test_forget_drops_only_the_moved_folder(tmp_path):
+    resolver = DestinationResolver(FileSystemDAO(MseqConfig()))
+    kept = resolver.order_folder("22000", "Smith", "150000", resolver.bioi_folder("22000", tmp_path))
+    moved = resolver.order_folder("22001", "Jones", "150001", resolver.bioi_folder("22001", tmp_path))
+    os.rename(moved, tmp_path / "elsewhere")
+
+    resolver.forget(moved)
+    os.rmdir(kept)
+    assert resolver.order_folder("22000", "Smith", "150000", os.path.dirname(kept)) == kept
+    assert not os.path.exists(kept)
+    resolver.order_folder("22001", "Jones", "150001", os.path.dirname(moved))
+    assert os.path.isdir(moved)
@@ -0,0 +1,82 @@
+from mseqauto.config import MseqConfig
+from mseqauto.utils import ExcelDAO
+
+
+def write_summary(excel_dao, path):
+    """Two sessions: order 100002 re-validated on top of an older entry"""
+    workbook = excel_dao.create_workbook()
+    worksheet = workbook.active
+    excel_dao.set_validation_headers(worksheet)
+    rows = [
+        ("22001", "100002", "Completed", "new.zip", None, None, None, "2000"),
+        (None, None, None, None, "S1", "S1.ab1", "match", None),
+        (None, None, None, None, ".seq.txt", "*.seq.txt", "txt file", None),
+        ("Break",),
+        ("22000", "100001", "Completed", "a.zip", None, None, None, "1000"),
+        (None, None, None, None, "S1", "S1.ab1", "match", None),
+        ("22000", "100002", "ATTENTION", "old.zip", None, None, None, "900"),
+        (None, None, None, None, "S2", None, "no match", None),
+        (None, None, None, None, ".seq.txt", None, "MISSING txt file", None),
+    ]
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def test_index_matches_newest_entry(tmp_path):
+    excel_dao = ExcelDAO(MseqConfig())
+    path = tmp_path / "summary.xlsx"
+    write_summary(excel_dao, path)
+
+    worksheet = excel_dao.load_workbook(path).active
+    assert excel_dao.find_order_in_summary(worksheet, "100002") == (True, 2, "2000")
+    assert excel_dao.find_order_in_summary(worksheet, 100001) == (True, 6, "1000")
+    assert excel_dao.find_order_in_summary(worksheet, "999999") == (False, None, None)
+
+
+def test_index_follows_inserted_rows_and_resolves_block(tmp_path):
+    excel_dao = ExcelDAO(MseqConfig())
+    path = tmp_path / "summary.xlsx"
+    write_summary(excel_dao, path)
+    worksheet = excel_dao.load_workbook(path).active
+
+    excel_dao.insert_rows_at_top(worksheet, 3)
+    assert excel_dao.find_order_in_summary(worksheet, "100001") == (True, 9, "1000")
+
+    assert excel_dao.resolve_order_status(worksheet, "100002")
+    assert worksheet.cell(row=5, column=3).value == "Resolved"
+    # Detail rows and the break row up to the next order are hidden
+    assert [worksheet.row_dimensions[r].hidden for r in range(6, 10)] == [True, True, True, False]
+    assert not excel_dao.resolve_order_status(worksheet, "999999")
+
+
+def test_update_existing_summary_reindexes_pasted_orders(tmp_path):
+    excel_dao = ExcelDAO(MseqConfig())
+    path = tmp_path / "summary.xlsx"
+    write_summary(excel_dao, path)
+    existing = excel_dao.load_workbook(path)
+
+    new_workbook = excel_dao.create_workbook()
+    excel_dao.set_validation_headers(new_workbook.active)
+    new_workbook.active.append(("22002", "100003", "Completed", "c.zip", None, None, None, "3000"))
+
+    assert excel_dao.update_existing_summary(existing, new_workbook, path)
+    assert excel_dao.find_order_in_summary(existing.active, "100003") == (True, 2, "3000")
+    assert excel_dao.find_order_in_summary(existing.active, "100002") == (True, 3, "2000")
+
+
+def test_pasting_a_deep_verified_run_labels_the_integrity_column(tmp_path):
+    for append_mode in (False, True):
+        excel_dao = ExcelDAO(MseqConfig())
+        excel_dao.append_mode = append_mode
+        path = tmp_path / f"summary_{append_mode}.xlsx"
+        write_summary(excel_dao, path)
+        existing = excel_dao.load_workbook(path)
+
+        new_workbook = excel_dao.create_workbook()
+        excel_dao.set_validation_headers(new_workbook.active, integrity=True)
+        new_workbook.active.append(("22002", "100003", "Completed", "c.zip", None, None, None, "3000", "OK (1 CRC)"))
+
+        assert excel_dao.update_existing_summary(existing, new_workbook, path)
+        header = [cell.value for cell in next(existing.active.iter_rows(min_row=1, max_row=1))]
+        assert header[:2] == ["I Number", "Order Number"] and header[8] == "Integrity"
@@ -0,0 +1,48 @@
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO
+from mseqauto.core.filename_classifier import (
+    KIND_BLANK, KIND_BRACES, KIND_CONTROL, KIND_CROSS_PLATE, KIND_OTHER, KIND_PCR, FilenameClassifier
+)
+
+IND_NAMES = [
+    "{01A}{PCR3000exp1}Amplicon01_T7.ab1",
+    "{07H}.ab1",
+    "01A__.ab1",
+    "{12G}_pGEM_T7Promoter.ab1",
+    "{12H}_Water_M13F-20_Premixed.ab1",
+    "{02B}Smi150-S01_T7.ab1",
+    "{03C}Sample 1+2.ab1",
+]
+
+
+def test_individual_rules_match_file_dao():
+    config = MseqConfig()
+    file_dao = FileSystemDAO(config)
+    classified = FilenameClassifier(config.CONTROLS).classify(IND_NAMES)
+
+    assert list(classified.kinds) == [KIND_PCR, KIND_BLANK, KIND_BLANK, KIND_CONTROL, KIND_CONTROL,
+                                      KIND_OTHER, KIND_OTHER]
+    assert classified.details[0] == file_dao.get_pcr_number(IND_NAMES[0]) == "3000"
+    for name, kind, detail in classified:
+        assert (kind == KIND_BLANK) == file_dao.is_blank_file(name)
+        if kind == KIND_OTHER:
+            assert detail == file_dao.normalize_filename(name)
+
+
+def test_plate_rules_and_precedence():
+    classifier = FilenameClassifier()
+    names = [
+        "12G_pGEM_M13F-20.ab1",
+        "12H__.ab1",
+        "02A_S3.F{P37955}.ab1",
+        "02B_S4{note}.ab1",
+        "01A_S1_T7.ab1",
+        "12G_Water_T7Promoter{P2}.ab1",
+    ]
+    classified = classifier.classify_plate(names)
+
+    assert list(classified.kinds) == [KIND_CONTROL, KIND_BLANK, KIND_CROSS_PLATE, KIND_BRACES, KIND_OTHER,
+                                      KIND_CONTROL]
+    assert classified.details[2] == "P37955"
+    assert classified.details[3] == "02B_S4.ab1"
+    assert classified.count(KIND_CONTROL) == 2
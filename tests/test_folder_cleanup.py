@@ -0,0 +1,73 @@
+import os
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor
+from mseqauto.core.folder_cleanup import FolderCleanup, FolderTree, is_nn_folder, is_protected_folder
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+
+
+def test_empty_chains_are_removed_bottom_up_with_one_listing_per_folder(tmp_path, monkeypatch):
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    (tmp_path / "a" / "d").mkdir()
+    _touch(tmp_path / "keep" / "e" / "file.txt")
+    (tmp_path / "keep" / "f").mkdir()
+    (tmp_path / "FB-PCR3000" / "empty").mkdir(parents=True)
+    (tmp_path / "ind_run").mkdir()
+
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or scandir(path))
+    tree = FolderTree(tmp_path, skip=is_protected_folder)
+    cleanup = FolderCleanup()
+    removed = cleanup.remove_empty(tree)
+
+    assert len(scans) == len(set(scans))
+    assert sorted(os.path.relpath(path, tmp_path) for path in removed) == sorted(
+        ["a", os.path.join("a", "b"), os.path.join("a", "b", "c"), os.path.join("a", "d"),
+         os.path.join("keep", "f")])
+    # Children are reported before their parents
+    assert removed.index(str(tmp_path / "a" / "b" / "c")) < removed.index(str(tmp_path / "a"))
+    assert sorted(os.listdir(tmp_path)) == ["FB-PCR3000", "ind_run", "keep"]
+    assert (tmp_path / "FB-PCR3000" / "empty").is_dir()
+    assert cleanup.failed == []
+
+
+def test_name_rules():
+    for name in ("NN", "nn", "NN-Preemptives", "NN_2", "nn-preemptives_b"):
+        assert is_nn_folder(name)
+    for name in ("NNX", "Controls", "bioi-22000"):
+        assert not is_nn_folder(name)
+    assert is_protected_folder("Ind_Run") and is_protected_folder("FB-PCR3000_150001")
+    assert not is_protected_folder("BioI-22000")
+
+
+def test_original_folder_cleanup_moves_leftovers_and_removes_it(tmp_path):
+    processor = FolderProcessor(FileSystemDAO(MseqConfig()), None, MseqConfig(), logger=lambda msg: None)
+    original = tmp_path / "raw_run"
+    new_folder = tmp_path / "BioI-22000"
+    new_folder.mkdir()
+    _touch(original / "Controls" / "pGEM_T7.ab1")
+    (original / "Blank").mkdir()
+    (original / "NN" / "NN_2").mkdir(parents=True)
+
+    removed = processor._cleanup_original_folder(str(original), str(new_folder))
+
+    assert not original.exists()
+    assert (new_folder / "Controls" / "pGEM_T7.ab1").is_file()
+    assert str(original) in removed and str(original / "NN" / "NN_2") in removed
+
+
+def test_original_folder_with_unknown_folder_is_kept(tmp_path):
+    processor = FolderProcessor(FileSystemDAO(MseqConfig()), None, MseqConfig(), logger=lambda msg: None)
+    original = tmp_path / "raw_run"
+    (original / "NN").mkdir(parents=True)
+    (original / "notes").mkdir()
+
+    removed = processor._cleanup_original_folder(str(original), str(tmp_path / "BioI-22000"))
+
+    assert removed == [str(original / "NN")]
+    assert sorted(os.listdir(original)) == ["notes"]
@@ -0,0 +1,71 @@
+import os
+import time
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor
+from mseqauto.core.folder_status import OutputSuffixTable, scan_folder_status
+
+
+def test_suffix_table_prefers_longest_suffix():
+    table = OutputSuffixTable(MseqConfig.TEXT_FILES)
+
+    assert table.match("BioI-1_A_100000.raw.seq.txt") == '.raw.seq.txt'
+    assert table.match("BioI-1_A_100000.seq.txt") == '.seq.txt'
+    assert table.match("BioI-1_A_100000.seq.info.txt") == '.seq.info.txt'
+    assert table.match("notes.txt") is None
+    assert table.match(".seq.txt") is None
+
+
+def test_scan_folder_status_classifies_entries(tmp_path):
+    config = MseqConfig()
+    (tmp_path / "chromat_dir").mkdir()
+    (tmp_path / "{01A}Sample.ab1").write_bytes(b"abif")
+    (tmp_path / "Sample2.ab1").write_bytes(b"abif")
+    (tmp_path / "order.zip").write_bytes(b"PK")
+    for ext in config.TEXT_FILES:
+        (tmp_path / f"order{ext}").write_text("x")
+
+    status = scan_folder_status(tmp_path, config)
+
+    assert status.exists
+    assert status.ab1_count == 2
+    assert status.has_braces
+    assert status.zip_files == ["order.zip"]
+    assert status.output_count == 5
+    assert set(status.outputs) == set(config.TEXT_FILES)
+    assert status.project_items == {"chromat_dir"}
+    assert status.order_status(len(config.TEXT_FILES)) == (True, True, True)
+
+
+def test_scan_missing_folder(tmp_path):
+    status = scan_folder_status(tmp_path / "missing", MseqConfig())
+    assert not status.exists
+    assert status.order_status(5) == (False, False, False)
+
+
+def test_dao_status_cache_follows_folder_mtime(tmp_path):
+    config = MseqConfig()
+    file_dao = FileSystemDAO(config)
+    (tmp_path / "Sample.ab1").write_bytes(b"abif")
+    old = time.time() - 60
+    os.utime(tmp_path, (old, old))
+
+    first = file_dao.get_folder_status(tmp_path)
+    assert file_dao.get_folder_status(tmp_path) is first
+
+    # Adding a file bumps the folder mtime, so the snapshot is rebuilt
+    (tmp_path / "order.zip").write_bytes(b"PK")
+    assert file_dao.check_for_zip(tmp_path)
+    assert file_dao.get_folder_status(tmp_path) is not first
+
+
+def test_check_order_status_matches_folder_contents(tmp_path):
+    config = MseqConfig()
+    processor = FolderProcessor(FileSystemDAO(config), None, config)
+    (tmp_path / "Sample.ab1").write_bytes(b"abif")
+
+    assert processor.check_order_status(str(tmp_path)) == (False, False, True)
+
+    for ext in config.TEXT_FILES:
+        (tmp_path / f"{tmp_path.name}{ext}").write_text("x")
+    assert processor.check_order_status(str(tmp_path)) == (True, False, True)
@@ -0,0 +1,70 @@
+import importlib
+import json
+import re
+from pathlib import Path
+
+from mseqauto.core import FileSystemDAO
+from mseqauto.config import MseqConfig
+from mseqauto.utils.instrumentation import Instrumentation, instrumentation
+
+
+def test_spans_and_counters_aggregate_by_name():
+    inst = Instrumentation()
+
+    @inst.timed()
+    def work(n):
+        inst.count("items", n)
+        return n * 2
+
+    assert work(2) == 4 and work(3) == 6
+    with inst.span("block"):
+        pass
+
+    snap = inst.snapshot()
+    stats = snap['spans']['test_spans_and_counters_aggregate_by_name.<locals>.work']
+    assert stats['calls'] == 2 and stats['max'] <= stats['total']
+    assert snap['spans']['block']['calls'] == 1
+    assert snap['counters'] == {'items': 5}
+
+
+def test_run_writes_report_with_profiles(tmp_path, monkeypatch):
+    monkeypatch.setenv("MSEQAUTO_PROFILE", "all")
+    inst = Instrumentation()
+    inst.start_run("unit")
+    with inst.span("step"):
+        sum(range(1000))
+    report_path = inst.finish_run(tmp_path)
+
+    report = json.loads(report_path.read_text())
+    assert report['run'] == "unit"
+    assert report['spans']['step']['calls'] == 1
+    assert report['tracemalloc']['peak'] > 0
+    assert (tmp_path / report_path.name.replace('.json', '.prof')).exists()
+    assert inst.finish_run(tmp_path) is None
+
+
+def test_file_dao_moves_are_counted(tmp_path):
+    source = tmp_path / "a.ab1"
+    source.write_text("x")
+    instrumentation.reset()
+
+    FileSystemDAO(MseqConfig()).move_file(str(source), str(tmp_path / "b.ab1"))
+
+    snap = instrumentation.snapshot()
+    assert snap['counters']['fs.files_moved'] == 1
+    assert snap['spans']['FileSystemDAO.move_file']['calls'] == 1
+
+
+def test_console_entry_points_run_instrumented(monkeypatch):
+    setup_text = (Path(__file__).parents[1] / "setup.py").read_text()
+    runs = []
+    monkeypatch.setattr(instrumentation, "finish_run", lambda log_dir: runs.append(instrumentation.run_name))
+
+    for module_name, func_name in re.findall(r"'[\w-]+=([\w.]+):(\w+)'", setup_text):
+        module = importlib.import_module(module_name)
+        if not hasattr(module, "run"):
+            continue   # not an instrumented script
+        assert func_name == "run"
+        monkeypatch.setattr(module, "main", lambda: "done")
+        assert getattr(module, func_name)() == "done"
+    assert runs == ["ind_sort_files", "ind_auto_mseq", "ind_zip_files", "validate_zip_files"]
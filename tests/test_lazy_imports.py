@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+import pytest
+
+import mseqauto.core
+import mseqauto.utils
+
+HEAVY_MODULES = ('numpy', 'openpyxl', 'pywinauto', 'win32api')
+
+
+def loaded_after(code):
+    """Heavy modules in sys.modules after running code in a fresh interpreter"""
+    probe = f"{code}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+    return set(filter(None, output.strip().split(',')))
+
+
+def test_sorting_and_zipping_imports_stay_light():
+    assert loaded_after(
+        "from mseqauto.config import MseqConfig\n"
+        "from mseqauto.core import FileSystemDAO, FolderProcessor, PlateSortEngine\n"
+        "from mseqauto.utils import setup_logger\n"
+        "FolderProcessor(FileSystemDAO(MseqConfig()), None, MseqConfig())"
+    ) == set()
+
+
+def test_heavy_modules_load_on_first_use():
+    assert 'openpyxl' in loaded_after("from mseqauto.utils import ExcelDAO")
+
+
+def test_lazy_names_resolve_and_unknown_names_fail():
+    from mseqauto.core.file_system_dao import FileSystemDAO
+
+    assert mseqauto.core.FileSystemDAO is FileSystemDAO
+    assert set(mseqauto.core.__all__) <= set(dir(mseqauto.core))
+    assert mseqauto.utils.ValidationTable.__name__ == 'ValidationTable'
+    with pytest.raises(AttributeError):
+        mseqauto.core.NotAClass
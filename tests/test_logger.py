@@ -0,0 +1,54 @@
+import logging
+
+from mseqauto.utils.logger import LevelLogger, flush_logger, setup_logger
+
+
+def test_bound_logger_method_keeps_levels(caplog):
+    logger = logging.getLogger("test_levels")
+    levels = LevelLogger(logger.info)
+
+    with caplog.at_level(logging.DEBUG, logger="test_levels"):
+        levels.debug("moved %s", "a.ab1")
+        levels.warning("failed %d times", 3)
+
+    assert [(r.levelname, r.getMessage()) for r in caplog.records] == [
+        ("DEBUG", "moved a.ab1"), ("WARNING", "failed 3 times")]
+
+
+def test_plain_callable_gets_formatted_messages():
+    lines = []
+    levels = LevelLogger(lines.append)
+
+    levels.debug("moved %s", "a.ab1")
+    levels.error("100% done")
+
+    assert lines == ["moved a.ab1", "100% done"]
+    assert levels.debug_enabled
+
+
+def test_queued_logger_writes_file_once(tmp_path):
+    logger = setup_logger("test_queued", log_dir=tmp_path, level="INFO")
+    assert setup_logger("test_queued", log_dir=tmp_path, level="INFO") is logger
+    assert len(logger.handlers) == 1
+
+    logger.debug("skipped %s", "debug")
+    logger.info("kept %s", "info")
+    flush_logger("test_queued")
+
+    text = next(tmp_path.glob("test_queued_*.log")).read_text()
+    assert "kept info" in text and "skipped" not in text
+    assert not LevelLogger(logger).debug_enabled
+
+
+def test_queued_logger_formats_mutable_args_when_logged(tmp_path):
+    logger = setup_logger("test_queued_mutable", log_dir=tmp_path, level="INFO")
+    pending = ["a.ab1"]
+    logger.info("pending: %s", pending)
+    counts = {"done": 1, "total": 2}
+    logger.info("counts: %(done)d of %(total)d", counts)
+    pending.append("b.ab1")
+    counts["done"] = 2
+    flush_logger("test_queued_mutable")
+
+    text = next(tmp_path.glob("test_queued_mutable_*.log")).read_text()
+    assert "pending: ['a.ab1']\n" in text and "counts: 1 of 2" in text
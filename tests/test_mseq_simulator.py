@@ -0,0 +1,49 @@
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor
+from mseqauto.core.mseq_simulator import MseqSimulator
+from mseqauto.scripts.benchmark_pipeline import run_benchmark
+
+
+def make_order_folder(tmp_path, samples=3):
+    folder = tmp_path / "BioI-20000_Customer_100000"
+    folder.mkdir()
+    for i in range(samples):
+        (folder / f"Sample{i}_T7.ab1").write_bytes(b"abif")
+    return folder
+
+
+def test_simulator_writes_mseq_project(tmp_path):
+    config = MseqConfig()
+    folder = make_order_folder(tmp_path)
+    simulator = MseqSimulator(config)
+
+    assert simulator.process_folder(str(folder))
+    simulator.close()
+
+    processor = FolderProcessor(FileSystemDAO(config), simulator, config)
+    was_mseqed, has_braces, has_ab1_files = processor.check_order_status(str(folder))
+    assert (was_mseqed, has_braces, has_ab1_files) == (True, False, True)
+    assert simulator.stats['folders_processed'] == 1
+    assert simulator.stats['files_processed'] == 3
+
+
+def test_simulator_failure_leaves_outputs_incomplete(tmp_path):
+    config = MseqConfig()
+    folder = make_order_folder(tmp_path)
+    simulator = MseqSimulator(config, failure_rate=1.0, seed=1)
+
+    assert not simulator.process_folder(str(folder))
+    assert len([f for f in folder.iterdir() if f.name.endswith('.txt')]) == len(config.TEXT_FILES) - 1
+    assert simulator.stats['folders_failed'] == 1
+
+
+def test_pipeline_benchmark_end_to_end(tmp_path):
+    report = run_benchmark(tmp_path, bioi_count=1, orders_per_bioi=2, samples_per_order=3,
+                           pcr_count=1, reinject_count=0, seed=0)
+
+    stages = {r['stage']: r for r in report['stages']}
+    assert all(r['success'] for r in report['stages'])
+    # Two orders plus one FB-PCR folder go through mSeq and get zipped
+    assert stages['mseq']['items'] == 3
+    assert stages['zip']['items'] == 3
+    assert report['simulator']['folders_failed'] == 0
@@ -0,0 +1,135 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor, mseq_worker_pool
+from mseqauto.core.mseq_worker_pool import MseqWorkerPool
+
+FAKE_MSEQ = str(Path(__file__).with_name("fake_mseq.py"))
+
+
+class FakeMseqAutomation:
+    """Headless stand-in for MseqAutomation that shells out to the fake mSeq executable"""
+
+    def __init__(self, config, worker_id, input_lock=None):
+        self.config = config
+        self.worker_id = worker_id
+        self.input_lock = input_lock
+
+    def process_folder(self, folder_path):
+        crash_marker = Path(folder_path) / "crash_once"
+        if crash_marker.exists():
+            crash_marker.unlink()
+            os._exit(3)
+        input_marker = Path(folder_path) / "crash_holding_input"
+        if input_marker.exists():
+            input_marker.unlink()
+            with self.input_lock:
+                # Dies mid-dialog, before releasing the desktop to the other workers
+                os._exit(3)
+        with self.input_lock:
+            pass
+        subprocess.run([sys.executable, FAKE_MSEQ, str(folder_path)], check=True)
+        return True
+
+    def close(self):
+        pass
+
+
+def make_folders(tmp_path, count):
+    folders = []
+    for i in range(count):
+        folder = tmp_path / f"BioI-2000{i}_Customer_10000{i}"
+        folder.mkdir()
+        (folder / "sample.ab1").write_bytes(b"abif")
+        folders.append(folder)
+    return folders
+
+
+def test_pool_processes_every_folder(tmp_path):
+    folders = make_folders(tmp_path, 6)
+
+    with MseqWorkerPool(MseqConfig(), worker_count=2, automation_factory=FakeMseqAutomation,
+                        poll_interval=0.1) as pool:
+        results = pool.process_folders(folders)
+
+    assert set(results) == {str(f) for f in folders}
+    for folder in folders:
+        result = results[str(folder)]
+        assert result['success'] and result['outputs_complete']
+        outputs = [p.name for p in folder.iterdir() if p.name.endswith('.txt')]
+        assert len(outputs) == len(MseqConfig.TEXT_FILES)
+
+
+def test_pool_replaces_crashed_worker_and_retries(tmp_path):
+    folders = make_folders(tmp_path, 3)
+    (folders[1] / "crash_once").write_text("")
+
+    with MseqWorkerPool(MseqConfig(), worker_count=1, automation_factory=FakeMseqAutomation,
+                        poll_interval=0.1) as pool:
+        results = pool.process_folders(folders)
+
+    crashed = results[str(folders[1])]
+    assert crashed['success'] and crashed['attempts'] == 2
+    assert all(r['outputs_complete'] for r in results.values())
+
+
+class KillOnFirstDispatchPool(MseqWorkerPool):
+    """Kills a worker as soon as it is handed its first folder, before it can report on it"""
+
+    killed = False
+
+    def _dispatch(self):
+        super()._dispatch()
+        if self._assigned and not self.killed:
+            worker_id = next(iter(self._assigned))
+            self._workers[worker_id][0].kill()
+            self.killed = True
+
+
+def test_folder_of_worker_killed_before_starting_is_retried(tmp_path):
+    folders = make_folders(tmp_path, 2)
+
+    with KillOnFirstDispatchPool(MseqConfig(), worker_count=1, automation_factory=FakeMseqAutomation,
+                                 poll_interval=0.1) as pool:
+        results = pool.process_folders(folders)
+
+    assert pool.killed
+    assert [results[str(f)]['attempts'] for f in folders] == [2, 1]
+    assert all(r['success'] and r['outputs_complete'] for r in results.values())
+
+
+def test_worker_dying_while_holding_input_lock_does_not_block_others(tmp_path):
+    folders = make_folders(tmp_path, 4)
+    (folders[0] / "crash_holding_input").write_text("")
+
+    with MseqWorkerPool(MseqConfig(), worker_count=2, automation_factory=FakeMseqAutomation,
+                        poll_interval=0.1) as pool:
+        results = pool.process_folders(folders)
+
+    assert results[str(folders[0])]['attempts'] == 2
+    assert all(r['success'] and r['outputs_complete'] for r in results.values())
+
+
+def test_processor_mseqs_only_ready_orders_in_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(mseq_worker_pool, "create_mseq_automation", FakeMseqAutomation)
+    config = MseqConfig()
+    processor = FolderProcessor(FileSystemDAO(config), None, config, logger=lambda msg: None)
+    # Re-sequenced requests (_N) only need some .ab1 files to count as complete
+    ready = []
+    for i in range(3):
+        folder = tmp_path / f"BioI-2000{i}_Customer_10000{i}_2"
+        folder.mkdir()
+        (folder / "sample.ab1").write_bytes(b"abif")
+        ready.append(folder)
+    braces = tmp_path / "BioI-20009_Customer_100009_2"
+    braces.mkdir()
+    (braces / "{01A}sample.ab1").write_bytes(b"abif")
+
+    results = processor.mseq_orders_in_pool(ready + [braces], worker_count=2)
+
+    assert set(results) == {str(folder) for folder in ready}
+    assert all(r['success'] and r['outputs_complete'] for r in results.values())
+    assert not any(processor.order_ready_for_mseq(folder) for folder in ready)
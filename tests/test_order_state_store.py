@@ -0,0 +1,80 @@
+import os
+import time
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor
+from mseqauto.core.folder_status import scan_folder_status
+from mseqauto.core.order_state_store import OrderStateStore
+
+
+def make_order_folder(tmp_path, age=60):
+    folder = tmp_path / "BioI-20000_Customer_100000"
+    folder.mkdir()
+    (folder / "Sample_T7.ab1").write_bytes(b"abif")
+    old = time.time() - age
+    os.utime(folder, (old, old))
+    return folder
+
+
+def test_status_is_trusted_only_while_folder_unchanged(tmp_path):
+    config = MseqConfig()
+    folder = make_order_folder(tmp_path)
+    store = OrderStateStore(tmp_path / "state.db")
+
+    status = scan_folder_status(folder, config)
+    store.record_status(folder, status, status.order_status(5))
+    assert store.get_order_status(folder) == (False, False, True)
+
+    (folder / "Sample_SP6.ab1").write_bytes(b"abif")
+    assert store.get_order_status(folder) is None
+    store.close()
+
+
+def test_status_taken_right_after_a_change_is_not_trusted(tmp_path):
+    config = MseqConfig()
+    folder = make_order_folder(tmp_path, age=0)
+    store = OrderStateStore(tmp_path / "state.db")
+
+    status = scan_folder_status(folder, config)
+    store.record_status(folder, status, status.order_status(5))
+    assert store.get_order_status(folder) is None
+    store.close()
+
+
+def test_processor_uses_store_before_filesystem(tmp_path):
+    config = MseqConfig()
+    folder = make_order_folder(tmp_path)
+    (folder / "BioI-20000_Customer_100000.zip").write_bytes(b"PK")
+    old = time.time() - 60
+    os.utime(folder, (old, old))
+
+    store = OrderStateStore(tmp_path / "state.db")
+    processor = FolderProcessor(FileSystemDAO(config), None, config, state_store=store)
+    assert processor.check_order_status(str(folder)) == (False, False, True)
+
+    # A fresh processor (next run) answers from the store without scanning
+    rerun = FolderProcessor(FileSystemDAO(config), None, config, state_store=store)
+    rerun.file_dao.get_folder_status = None
+    assert rerun.check_order_status(str(folder)) == (False, False, True)
+    assert rerun.check_for_zip(str(folder))
+    assert rerun.find_zip_file(str(folder)).endswith(".zip")
+    store.close()
+
+
+def test_validated_orders_are_tied_to_zip_and_summary(tmp_path):
+    folder = make_order_folder(tmp_path)
+    zip_path = folder / "order.zip"
+    zip_path.write_bytes(b"PK")
+    summary = tmp_path / "summary.xlsx"
+    store = OrderStateStore(tmp_path / "state.db")
+
+    assert not store.is_validated(folder, zip_path, summary)
+    store.record_stage(folder, 'validated', zip_path=str(zip_path), validation_summary=summary)
+    assert store.is_validated(folder, str(zip_path), summary)
+    assert not store.is_validated(folder, str(zip_path), tmp_path / "other.xlsx")
+
+    # A rebuilt zip needs validating again
+    newer = time.time() + 10
+    os.utime(zip_path, (newer, newer))
+    assert not store.is_validated(folder, str(zip_path), summary)
+    store.close()
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import PipelineContext
+from mseqauto.core.shared_order_key import SharedOrderKey
+from mseqauto.utils.synthetic_data import generate_order_key
+
+
+def make_context(tmp_path, rows=24):
+    config = MseqConfig()
+    config.KEY_FILE_PATH = tmp_path / "order_key.txt"
+    config.ORDER_STATE_DB = None
+    generate_order_key(config.KEY_FILE_PATH, rows, seed=1)
+    return PipelineContext(config, data_folder=str(tmp_path))
+
+
+def test_order_key_and_index_are_shared_until_the_key_changes(tmp_path):
+    context = make_context(tmp_path)
+    order_key = context.order_key()
+    first, second = context.processor(), context.processor()
+
+    first.build_order_key_index(order_key)
+    second.build_order_key_index(context.order_key())
+    assert context.order_key() is order_key
+    assert first.order_key_index is second.order_key_index
+    assert second.context is context and second.state_store is None
+    assert second._get_expected_file_count(order_key[0][2]) == 12
+
+    # Rewriting the key file invalidates the key and its index
+    generate_order_key(context.config.KEY_FILE_PATH, 36, seed=2)
+    stat = os.stat(context.config.KEY_FILE_PATH)
+    os.utime(context.config.KEY_FILE_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    reloaded = context.order_key()
+    assert reloaded is not order_key and len(reloaded) == 36
+    assert context.order_key_index() is not first.order_key_index
+
+
+def test_shared_order_key_follows_the_context(tmp_path):
+    context = make_context(tmp_path)
+    shared = context.shared_order_key()
+    assert context.shared_order_key() is shared
+
+    with SharedOrderKey.attach(shared.name) as attached:
+        assert len(attached) == len(context.order_key())
+        assert set(attached.index) == set(context.order_key_index())
+    context.close()
+
+
+def test_leaving_the_context_frees_the_shared_order_key(tmp_path):
+    with make_context(tmp_path) as context:
+        name = context.shared_order_key().name
+    with pytest.raises(FileNotFoundError):
+        SharedOrderKey.attach(name)
+
+
+def test_begin_stage_drops_directory_listings(tmp_path):
+    context = make_context(tmp_path)
+    context.file_dao.get_directory_contents(tmp_path)
+    assert context.file_dao.directory_cache
+
+    context.begin_stage("zip")
+    assert context.stage == "zip"
+    assert not context.file_dao.directory_cache
+
+
+def test_reinject_list_is_cached_per_input(tmp_path, monkeypatch):
+    context = make_context(tmp_path)
+    context.config.SPREADSHEETS_PATH = tmp_path / "spreadsheets"
+    context.config.ABI_UPLOAD_PATH = tmp_path / "abi"
+    processor = context.processor()
+    calls = []
+
+    def get_reinject_list(i_numbers, reinject_path=None):
+        calls.append(tuple(i_numbers))
+        processor.raw_reinject_list = ["{01A}Sample"]
+        return ["sample"]
+    monkeypatch.setattr(processor, "get_reinject_list", get_reinject_list)
+
+    assert context.reinject_list(processor, ["22000"]) == ["sample"]
+    assert context.reinject_list(processor, ["22000"]) == ["sample"]
+    assert context.reinject_list(processor, ["22001"]) == ["sample"]
+    assert calls == [("22000",), ("22001",)]
+
+
+def test_order_key_tables_are_built_once_per_key(tmp_path, monkeypatch):
+    context = make_context(tmp_path, rows=48)
+    order_key = context.order_key()
+    processor = context.processor()
+    tables = context.order_key_tables()
+    assert processor.order_key_tables() is tables and processor.order_key_tables(order_key) is tables
+
+    for i_num, _, order_num, _ in order_key[:5]:
+        expected = [row[3] for row in order_key if row[0] == i_num and row[2] == order_num]
+        assert tables.samples[(str(i_num), str(order_num))] == expected
+        assert processor._get_expected_file_count(order_num) == sum(row[2] == order_num for row in order_key)
+
+    # Without a context the key file is loaded once, not on every count
+    standalone = type(processor)(context.file_dao, None, context.config)
+    loads = []
+    load_order_key = context.file_dao.load_order_key
+    monkeypatch.setattr(context.file_dao, "load_order_key", lambda path: loads.append(path) or load_order_key(path))
+    for _, _, order_num, _ in order_key[:10]:
+        assert standalone._get_expected_file_count(order_num) == tables.expected_counts[str(order_num)]
+    assert len(loads) == 1
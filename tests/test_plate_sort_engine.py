@@ -0,0 +1,50 @@
+from mseqauto.core.plate_sort_engine import PlateSortEngine
+
+
+def make_raw_folder(root, name, files):
+    folder = root / name
+    folder.mkdir()
+    for file_name in files:
+        (folder / file_name).write_text(file_name)
+    return folder
+
+
+def tree(root):
+    return sorted(str(p.relative_to(root)).replace('\\', '/') for p in root.rglob('*') if p.is_file())
+
+
+def test_files_go_straight_to_final_folders(tmp_path):
+    multi = make_raw_folder(tmp_path, "2025-04-18_P1-P2_1", [
+        "P1_01A_S1_T7.ab1", "P1_01B_S2{x}_T7.ab1", "P1_12G_pGEM_M13F-20.ab1", "P1_12H__.ab1",
+        "P1_02A_S3.F{P2}.ab1", "P2_01A_S1.ab1", "P2_notes.txt",
+    ])
+    single = make_raw_folder(tmp_path, "2025-04-18_P40000_1", ["P40000_01A_a.ab1", "P40000_12H__.ab1"])
+    (tmp_path / "P2").mkdir()
+    (tmp_path / "P2" / "old{b}.ab1").write_text("old")
+
+    result = PlateSortEngine(tmp_path, max_workers=2).sort([str(multi), str(single)])
+
+    assert tree(tmp_path) == [
+        "2025-04-18_P1-P2_1/P2_notes.txt",
+        "P1/01A_S1_T7.ab1",
+        "P1/01B_S2_T7.ab1",
+        "P1/Blank/12H__.ab1",
+        "P1/Controls/12G_pGEM_M13F-20.ab1",
+        "P2/01A_S1.ab1",
+        "P2/02A_S3.F.ab1",
+        "P2/old.ab1",
+        "P40000/Blank/P40000_12H__.ab1",
+        "P40000/P40000_01A_a.ab1",
+    ]
+    assert result['moved'] == 9
+    assert result['counts']['P1']['cross'] == 1
+
+
+def test_conflicting_destinations_do_not_overwrite(tmp_path):
+    raw = make_raw_folder(tmp_path, "2025-04-18_P1-P2_1", ["P1_A{x}.ab1", "P1_A{y}.ab1"])
+
+    result = PlateSortEngine(tmp_path).sort([str(raw)])
+
+    assert result['moved'] == 1 and result['skipped'] == 1
+    assert len(list((tmp_path / "P1").iterdir())) == 1
+    assert len(list(raw.iterdir())) == 1
@@ -0,0 +1,65 @@
+import multiprocessing as mp
+
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor
+from mseqauto.core.shared_order_key import SharedOrderKey, SharedOrderKeyError
+from mseqauto.utils.synthetic_data import generate_order_key
+
+
+@pytest.fixture
+def loaded_key(tmp_path):
+    path = tmp_path / "order_key.txt"
+    generate_order_key(path, 300, seed=3)
+    file_dao = FileSystemDAO(MseqConfig())
+    return file_dao.load_order_key(path), file_dao
+
+
+def _lookup_in_worker(name, sample):
+    with SharedOrderKey.attach(name) as order_key:
+        return len(order_key), order_key.index.get(sample)
+
+
+def test_packed_index_matches_folder_processor(loaded_key):
+    order_key, file_dao = loaded_key
+    expected = FolderProcessor.index_order_key(order_key, file_dao)
+    packed = SharedOrderKey.from_order_key(order_key, file_dao)
+
+    assert len(packed) == len(order_key)
+    assert packed[5] == tuple(str(value) for value in order_key[5][:4])
+    assert len(packed.index) == len(expected)
+    assert set(packed.index) == set(expected)
+    for name, matches in expected.items():
+        assert packed.index[name] == [tuple(str(value) for value in match) for match in matches]
+    assert "not an order key sample" not in packed.index
+
+    processor = FolderProcessor(file_dao, None, MseqConfig())
+    processor.build_order_key_index(packed)
+    assert processor.order_key_index is packed.index
+
+
+def test_memory_mapped_file(tmp_path, loaded_key):
+    order_key, file_dao = loaded_key
+    path = SharedOrderKey.write_file(tmp_path / "order_key.bin", order_key, file_dao)
+
+    with SharedOrderKey.open_file(path) as mapped:
+        assert list(mapped) == list(SharedOrderKey.from_order_key(order_key, file_dao))
+
+    (tmp_path / "bad.bin").write_bytes(b"not a packed key" * 4)
+    with pytest.raises(SharedOrderKeyError):
+        SharedOrderKey.open_file(tmp_path / "bad.bin")
+
+
+def test_worker_process_attaches_to_shared_memory(loaded_key):
+    order_key, file_dao = loaded_key
+    shared = SharedOrderKey.create_shared(order_key, file_dao)
+    sample = next(iter(shared.index))
+    try:
+        with mp.get_context('spawn').Pool(1) as pool:
+            rows, matches = pool.apply(_lookup_in_worker, (shared.name, sample))
+        assert rows == len(order_key)
+        assert matches == shared.index[sample]
+    finally:
+        shared.close()
+        shared.unlink()
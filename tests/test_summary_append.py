@@ -0,0 +1,60 @@
+from mseqauto.config import MseqConfig
+from mseqauto.utils import ExcelDAO
+
+
+class AppendConfig(MseqConfig):
+    SUMMARY_APPEND_MODE = True
+
+
+def session_workbook(excel_dao, rows, hidden_rows=()):
+    workbook = excel_dao.create_workbook()
+    worksheet = workbook.active
+    excel_dao.set_validation_headers(worksheet)
+    for row in rows:
+        worksheet.append(row)
+    for row_num in hidden_rows:
+        worksheet.row_dimensions[row_num].hidden = True
+    return workbook
+
+
+def test_sessions_are_appended_and_newest_entry_wins(tmp_path):
+    excel_dao = ExcelDAO(AppendConfig())
+    path = tmp_path / "summary.xlsx"
+    first = session_workbook(excel_dao, [
+        ("22000", "100001", "ATTENTION", "a.zip", None, None, None, "1000"),
+        (None, None, None, None, "S1", None, "no match", None),
+    ], hidden_rows=[3])
+    first.save(path)
+
+    existing = excel_dao.load_workbook(path)
+    second = session_workbook(excel_dao, [
+        ("22000", "100001", "Completed", "a.zip", None, None, None, "2000"),
+        (None, None, None, None, "S1", "S1.ab1", "match", None),
+    ])
+    assert excel_dao.update_existing_summary(existing, second, path)
+
+    sheet = excel_dao.load_workbook(path).active
+    assert [sheet.cell(row=r, column=1).value for r in range(2, 6)] == ["22000", None, "Break", "22000"]
+    assert sheet.row_dimensions[3].hidden
+    # Lookups made after the append see the new entry without rescanning
+    assert excel_dao.find_order_in_summary(existing.active, "100001") == (True, 5, "2000")
+    assert excel_dao.find_order_in_summary(sheet, "100001") == (True, 5, "2000")
+
+
+def test_newest_first_view_reverses_sessions(tmp_path):
+    excel_dao = ExcelDAO(AppendConfig())
+    path = tmp_path / "summary.xlsx"
+    session_workbook(excel_dao, [("22000", "100001")]).save(path)
+    for order in ("100002", "100003"):
+        existing = excel_dao.load_workbook(path)
+        excel_dao.update_existing_summary(existing, session_workbook(
+            excel_dao, [("22001", order), (None, None, None, None, "S1")], hidden_rows=[3]), path)
+
+    view_path = tmp_path / "view.xlsx"
+    assert excel_dao.write_newest_first_view(excel_dao.load_workbook(path).active, view_path)
+
+    view = excel_dao.load_workbook(view_path).active
+    assert [view.cell(row=r, column=2).value for r in range(1, 9)] == [
+        "Order Number", "100003", None, None, "100002", None, None, "100001"]
+    assert view.cell(row=4, column=1).value == "Break"
+    assert view.row_dimensions[3].hidden and not view.row_dimensions[2].hidden
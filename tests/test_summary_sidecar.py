@@ -0,0 +1,61 @@
+from mseqauto.config import MseqConfig
+from mseqauto.utils import ExcelDAO, SummarySidecar, ValidationTable
+
+
+def save_summary(excel_dao, path, rows):
+    workbook = excel_dao.create_workbook()
+    worksheet = workbook.active
+    excel_dao.set_validation_headers(worksheet)
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+    return workbook
+
+
+def test_sidecar_keeps_newest_entry_and_tracks_workbook(tmp_path):
+    excel_dao = ExcelDAO(MseqConfig())
+    path = tmp_path / "zip order summary.xlsx"
+    workbook = save_summary(excel_dao, path, [
+        ("22001", "100002", "Completed", "new.zip", None, None, None, "2000"),
+        ("Break",),
+        ("22000", "100002", "ATTENTION", "old.zip", None, None, None, "900"),
+    ])
+
+    assert excel_dao.load_summary_sidecar(path) is None
+    excel_dao.write_summary_sidecar(path, worksheet=workbook.active)
+
+    sidecar = excel_dao.load_summary_sidecar(path)
+    assert sidecar.path == tmp_path / "zip order summary.orders.jsonl"
+    assert sidecar.zip_timestamp("100002") == "2000"
+    assert sidecar.get(100002)['zip'] == "new.zip"
+    assert sidecar.zip_timestamp("999999") is None
+
+    # Saving the workbook without the sidecar (e.g. from Excel) makes it stale
+    workbook.active.append(("22002", "100003"))
+    workbook.save(path)
+    assert excel_dao.load_summary_sidecar(path) is None
+
+
+def test_session_entries_are_appended(tmp_path):
+    excel_dao = ExcelDAO(MseqConfig())
+    path = tmp_path / "summary.xlsx"
+    workbook = save_summary(excel_dao, path, [("22000", "100001", "ATTENTION", "a.zip", None, None, None, "1000")])
+    sidecar = excel_dao.write_summary_sidecar(path, worksheet=workbook.active)
+
+    table = ValidationTable()
+    for order, timestamp in (("100001", "3000"), ("100004", "3100")):
+        row = table.add_row()
+        table.set(row, 2, order)
+        table.set(row, 8, timestamp)
+    detail = table.add_row()
+    table.set(detail, 5, "S1")
+
+    for order, timestamp in (("100001", "3000"), ("100004", "3100")):
+        workbook.active.append(("22000", order, None, None, None, None, None, timestamp))
+    workbook.save(path)
+    excel_dao.write_summary_sidecar(path, worksheet=workbook.active, table=table, sidecar=sidecar)
+
+    reloaded = SummarySidecar.load(path)
+    assert len(reloaded) == 2
+    assert reloaded.zip_timestamp("100001") == "3000"
+    assert reloaded.zip_timestamp("100004") == "3100"
@@ -0,0 +1,76 @@
+from mseqauto.config import MseqConfig
+from mseqauto.utils import ExcelDAO, ValidationTable
+
+
+def validation_result(config, complete=True):
+    return {
+        'match_count': 2,
+        'expected_count': 2,
+        'txt_count': 5 if complete else 4,
+        'extra_ab1_count': 0,
+        'matches': [{'raw_name': 'S1_T7', 'file_name': 'S1_T7.ab1'},
+                    {'raw_name': 'S2_T7', 'file_name': 'S2_T7.ab1'}],
+        'mismatches_in_zip': [],
+        'mismatches_in_order': [],
+        'txt_files': config.TEXT_FILES if complete else config.TEXT_FILES[:4],
+    }
+
+
+def test_table_renders_rows_styles_and_hidden_state(tmp_path):
+    config = MseqConfig()
+    excel_dao = ExcelDAO(config)
+    zip_path = tmp_path / "order.zip"
+    zip_path.write_bytes(b"PK")
+
+    workbook = excel_dao.create_workbook()
+    worksheet = workbook.active
+    excel_dao.set_validation_headers(worksheet)
+    table = ValidationTable(headers=[cell.value for cell in worksheet[1]])
+    excel_dao.collect_validation_result(table, validation_result(config), zip_path, "22000", "100001")
+    excel_dao.collect_validation_result(table, validation_result(config, complete=False), zip_path,
+                                        "22000", "100002")
+
+    assert len(table) == 16
+    assert excel_dao.render_table(worksheet, table) == 18
+    excel_dao.finalize_workbook(worksheet, table=table)
+
+    assert worksheet['C2'].value == "Completed"
+    assert worksheet['C2'].fill.start_color.rgb.endswith('00CC00')
+    assert all(worksheet.row_dimensions[r].hidden for r in range(3, 10))
+    assert worksheet['C10'].value == "ATTENTION"
+    assert not worksheet.row_dimensions[11].hidden
+    assert worksheet['G17'].value == 'MISSING txt file'
+    assert worksheet.column_dimensions['G'].width == len('MISSING txt file') + 2
+
+
+def test_widths_match_cell_walk(tmp_path):
+    config = MseqConfig()
+    excel_dao = ExcelDAO(config)
+    zip_path = tmp_path / "order.zip"
+    zip_path.write_bytes(b"PK")
+
+    workbook = excel_dao.create_workbook()
+    worksheet = workbook.active
+    excel_dao.set_validation_headers(worksheet)
+    table = ValidationTable(headers=[cell.value for cell in worksheet[1]])
+    excel_dao.collect_validation_result(table, validation_result(config), zip_path, "22000", "100001")
+    excel_dao.render_table(worksheet, table)
+
+    excel_dao.auto_adjust_columns(worksheet)
+    walked = [worksheet.column_dimensions[letter].width for letter in "ABCDEFGH"]
+    assert walked == table.column_widths()
+
+
+def test_table_exports_tsv(tmp_path):
+    table = ValidationTable(headers=['I Number', 'Order Number'], num_columns=2)
+    row = table.add_row()
+    table.set(row, 1, "22000")
+    table.set(row, 2, "100001")
+    table.add_row()
+
+    path = tmp_path / "summary.tsv"
+    table.to_tsv(path)
+    table.to_tsv(path, append=True)
+
+    assert path.read_text().splitlines() == [
+        "I Number\tOrder Number", "22000\t100001", "\t", "22000\t100001", "\t"]
@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO
+from mseqauto.core import file_system_dao
+from mseqauto.utils.instrumentation import instrumentation
+
+
+def make_order(tmp_path):
+    order = tmp_path / "BioI-22000_Smith_150000"
+    order.mkdir()
+    for i in range(5):
+        (order / f"sample{i}.ab1").write_bytes(os.urandom(2048))
+    return order
+
+
+def zip_and_deliver(tmp_path, mode="auto"):
+    config = MseqConfig()
+    config.ZIP_DUMP_DELIVERY = mode
+    order = make_order(tmp_path)
+    dump = tmp_path / "zip dump"
+    zip_path = order / f"{order.name}.zip"
+    instrumentation.reset()
+    FileSystemDAO(config).zip_files(str(order), str(zip_path), [".ab1"], dump_folder=str(dump))
+    return zip_path, dump / zip_path.name, dict(instrumentation.counters)
+
+
+def test_same_volume_dump_entry_is_a_hardlink(tmp_path):
+    zip_path, dump_path, counters = zip_and_deliver(tmp_path)
+    assert os.path.samefile(zip_path, dump_path)
+    assert counters["fs.dump_hardlinks"] == 1
+    assert "fs.dump_bytes_written" not in counters
+    assert counters["fs.zip_bytes_written"] == zip_path.stat().st_size
+
+
+def test_other_volume_dump_copy_is_written_in_the_same_pass(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_system_dao, "same_volume", lambda a, b: False)
+    copies = []
+    monkeypatch.setattr(file_system_dao, "copyfile", lambda *args: copies.append(args))
+
+    zip_path, dump_path, counters = zip_and_deliver(tmp_path)
+    assert not os.path.samefile(zip_path, dump_path)
+    assert dump_path.read_bytes() == zip_path.read_bytes()
+    assert counters["fs.dump_bytes_written"] == zip_path.stat().st_size
+    assert copies == []
+
+
+def test_failed_tee_falls_back_to_copy(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_system_dao, "same_volume", lambda a, b: False)
+
+    def failing(self, method, *args):
+        self.secondary_error = OSError("share went away")
+    monkeypatch.setattr(file_system_dao._TeeWriter, "_secondary", failing)
+
+    zip_path, dump_path, counters = zip_and_deliver(tmp_path)
+    assert dump_path.read_bytes() == zip_path.read_bytes()
+    assert counters["fs.dump_bytes_written"] == zip_path.stat().st_size
+
+
+def test_copy_mode_copies(tmp_path):
+    zip_path, dump_path, counters = zip_and_deliver(tmp_path, mode="copy")
+    assert not os.path.samefile(zip_path, dump_path)
+    assert dump_path.read_bytes() == zip_path.read_bytes()
+    assert "fs.dump_hardlinks" not in counters
+
+
+def test_staged_zip_matches_direct_zip_and_cleans_up(tmp_path):
+    import zipfile
+    order = make_order(tmp_path)
+    staging = tmp_path / "staging"
+    staging.mkdir()
+    config = MseqConfig()
+    direct = tmp_path / "direct.zip"
+    FileSystemDAO(config).zip_files(str(order), str(direct), [".ab1"])
+
+    config.ZIP_LOCAL_STAGING = True
+    config.ZIP_STAGING_DIR = str(staging)
+    staged = tmp_path / "staged.zip"
+    FileSystemDAO(config).zip_files(str(order), str(staged), [".ab1"], dump_folder=str(tmp_path / "zip dump"))
+
+    with zipfile.ZipFile(direct) as a, zipfile.ZipFile(staged) as b:
+        assert [(i.filename, i.date_time, i.CRC) for i in a.infolist()] == \
+               [(i.filename, i.date_time, i.CRC) for i in b.infolist()]
+    assert (tmp_path / "zip dump" / "staged.zip").read_bytes() == staged.read_bytes()
+    assert os.listdir(staging) == []
+
+
+def test_failed_staged_upload_leaves_nothing_behind(tmp_path, monkeypatch):
+    order = make_order(tmp_path)
+    staging = tmp_path / "staging"
+    staging.mkdir()
+    config = MseqConfig()
+    config.ZIP_LOCAL_STAGING = True
+    config.ZIP_STAGING_DIR = str(staging)
+
+    def broken_upload(source, output, length=0):
+        output.write(source.read(100))
+        raise OSError("share went away")
+    monkeypatch.setattr(file_system_dao, "copyfileobj", broken_upload)
+
+    zip_path = order / "staged.zip"
+    with pytest.raises(OSError):
+        FileSystemDAO(config).zip_files(str(order), str(zip_path), [".ab1"])
+    assert not zip_path.exists()
+    assert os.listdir(staging) == []
+
+
+def test_failed_rewrite_keeps_the_old_zip_and_dump_entry(tmp_path, monkeypatch):
+    zip_path, dump_path, _ = zip_and_deliver(tmp_path)
+    old_zip = zip_path.read_bytes()
+    (zip_path.parent / "sample0.ab1").write_bytes(os.urandom(4096))
+    config = MseqConfig()
+    config.ZIP_DUMP_DELIVERY = "auto"
+    config.ZIP_LOCAL_STAGING = True
+    config.ZIP_STAGING_DIR = str(tmp_path)
+
+    def broken_upload(source, output, length=0):
+        output.write(source.read(100))
+        raise OSError("share went away")
+    monkeypatch.setattr(file_system_dao, "copyfileobj", broken_upload)
+
+    with pytest.raises(OSError):
+        FileSystemDAO(config).zip_files(str(zip_path.parent), str(zip_path), [".ab1"],
+                                        dump_folder=str(dump_path.parent))
+    assert zip_path.read_bytes() == old_zip
+    assert dump_path.read_bytes() == old_zip
+    assert not [name for name in os.listdir(zip_path.parent) if name.startswith(".write_")]
@@ -0,0 +1,152 @@
+import os
+import zipfile
+
+import pytest
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import FileSystemDAO, FolderProcessor
+from mseqauto.core import file_system_dao
+from mseqauto.core import zip_manifest
+from mseqauto.core.zip_manifest import ManifestUnavailable, read_manifest
+from mseqauto.utils.instrumentation import instrumentation
+
+
+def make_processor():
+    config = MseqConfig()
+    config.ORDER_STATE_DB = None
+    return FolderProcessor(FileSystemDAO(config), None, config, logger=lambda msg: None)
+
+
+def make_order(tmp_path, samples=4):
+    order = tmp_path / "BioI-22000_Smith_150000"
+    order.mkdir()
+    for i in range(samples):
+        (order / f"sample{i}.ab1").write_bytes(os.urandom(1024))
+    return order
+
+
+def rezip(processor, order):
+    # A new run: nothing cached from the previous one
+    processor.file_dao.directory_cache.clear()
+    processor.file_dao.folder_status_cache.clear()
+    if processor.check_for_zip(order):
+        return None
+    return processor.zip_order_folder(order)
+
+
+def test_new_files_are_appended_to_a_stale_zip(tmp_path):
+    processor = make_processor()
+    order = make_order(tmp_path)
+    zip_path = processor.zip_order_folder(order)
+    assert sorted(read_manifest(zip_path)) == [f"sample{i}.ab1" for i in range(4)]
+    assert rezip(processor, order) is None
+
+    # A reinject lands after the order was zipped
+    (order / "sample4.ab1").write_bytes(os.urandom(1024))
+    instrumentation.reset()
+    assert rezip(processor, order) == zip_path
+    assert instrumentation.counters.get("fs.files_appended") == 1
+    assert "fs.files_zipped" not in instrumentation.counters
+    with zipfile.ZipFile(zip_path) as zip_file:
+        assert sorted(zip_file.namelist()) == [f"sample{i}.ab1" for i in range(5)]
+        assert zip_file.read("sample4.ab1") == (order / "sample4.ab1").read_bytes()
+    assert rezip(processor, order) is None
+
+
+def test_replaced_or_removed_files_rebuild_the_zip(tmp_path):
+    processor = make_processor()
+    order = make_order(tmp_path)
+    zip_path = processor.zip_order_folder(order)
+
+    (order / "sample1.ab1").write_bytes(os.urandom(2048))
+    (order / "sample3.ab1").unlink()
+    assert rezip(processor, order) == zip_path
+    with zipfile.ZipFile(zip_path) as zip_file:
+        assert sorted(zip_file.namelist()) == ["sample0.ab1", "sample1.ab1", "sample2.ab1"]
+        assert zip_file.read("sample1.ab1") == (order / "sample1.ab1").read_bytes()
+    assert read_manifest(zip_path)["sample1.ab1"].size == 2048
+    assert rezip(processor, order) is None
+
+
+def test_zips_without_a_manifest_are_left_alone(tmp_path):
+    processor = make_processor()
+    order = make_order(tmp_path)
+    with zipfile.ZipFile(order / f"{order.name}.zip", "w") as zip_file:
+        zip_file.write(order / "sample0.ab1", arcname="sample0.ab1")
+    assert rezip(processor, order) is None
+
+
+def test_append_never_touches_a_hardlinked_dump_entry_in_place(tmp_path, monkeypatch):
+    file_dao = FileSystemDAO(MseqConfig())
+    order = make_order(tmp_path)
+    dump = tmp_path / "zip dump"
+    zip_path = order / f"{order.name}.zip"
+    file_dao.zip_files(str(order), str(zip_path), [".ab1"], dump_folder=str(dump))
+    dump_path = dump / zip_path.name
+    assert os.path.samefile(zip_path, dump_path)
+    before = zip_path.read_bytes()
+
+    # A failed append leaves the zip and its dump entry as they were
+    (order / "sample4.ab1").write_bytes(os.urandom(1024))
+    file_dao.directory_cache.clear()
+
+    def fail(zip_file, sources):
+        raise OSError("share went away")
+
+    monkeypatch.setattr(file_system_dao, "manifest_comment", fail)
+    with pytest.raises(OSError):
+        file_dao.zip_files(str(order), str(zip_path), [".ab1"], dump_folder=str(dump))
+    assert zip_path.read_bytes() == before and dump_path.read_bytes() == before
+    assert sorted(p.name for p in order.iterdir() if p.suffix == ".zip") == [zip_path.name]
+
+    monkeypatch.undo()
+    file_dao.zip_files(str(order), str(zip_path), [".ab1"], dump_folder=str(dump))
+    assert os.path.samefile(zip_path, dump_path)
+    with zipfile.ZipFile(dump_path) as zip_file:
+        assert "sample4.ab1" in zip_file.namelist()
+
+
+def test_unreadable_or_mismatched_zips_are_stale(tmp_path, monkeypatch):
+    processor = make_processor()
+    order = make_order(tmp_path)
+    zip_path = processor.zip_order_folder(order)
+    file_dao = processor.file_dao
+
+    # Truncated mid-write
+    data = open(zip_path, 'rb').read()
+    with open(zip_path, 'wb') as f:
+        f.write(data[:len(data) // 2])
+    with pytest.raises(ManifestUnavailable):
+        read_manifest(zip_path)
+    assert not file_dao.zip_is_current(str(order), zip_path, [".ab1"])
+    assert rezip(processor, order) == zip_path
+    assert sorted(read_manifest(zip_path)) == [f"sample{i}.ab1" for i in range(4)]
+
+    # Members no longer match the CRCs the manifest recorded
+    with zipfile.ZipFile(zip_path) as zip_file:
+        comment = zip_file.comment
+    with zipfile.ZipFile(zip_path, 'w') as zip_file:
+        for i in range(4):
+            zip_file.writestr(f"sample{i}.ab1", b"other")
+        zip_file.comment = comment
+    assert not file_dao.zip_is_current(str(order), zip_path, [".ab1"])
+
+    # A manifest too large for the comment marks the zip stale instead of unmanaged
+    monkeypatch.setattr(zip_manifest, "MAX_COMMENT_BYTES", 10)
+    assert rezip(processor, order) == zip_path
+    with pytest.raises(ManifestUnavailable):
+        read_manifest(zip_path)
+    assert not file_dao.zip_is_current(str(order), zip_path, [".ab1"])
+
+
+def test_zip_files_sees_files_added_after_the_folder_was_listed(tmp_path):
+    file_dao = FileSystemDAO(MseqConfig())
+    order = make_order(tmp_path)
+    zip_path = order / f"{order.name}.zip"
+    file_dao.zip_files(str(order), str(zip_path), [".ab1"])
+
+    # Cached listing predates the new file
+    (order / "sample4.ab1").write_bytes(os.urandom(1024))
+    file_dao.zip_files(str(order), str(zip_path), [".ab1"])
+
+    assert "sample4.ab1" in read_manifest(zip_path)
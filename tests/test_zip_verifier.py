@@ -0,0 +1,134 @@
+import os
+import shutil
+import zipfile
+
+from mseqauto.config import MseqConfig
+from mseqauto.core import zip_verifier
+from mseqauto.core.zip_verifier import ZipIntegrity, ZipVerifier, file_crc32, verify_zip
+from mseqauto.utils import ExcelDAO
+from mseqauto.utils.validation_table import ValidationTable
+
+
+def make_zip(tmp_path, compression=zipfile.ZIP_DEFLATED):
+    order = tmp_path / "BioI-22000_Smith_150000"
+    order.mkdir()
+    zip_path = order / f"{order.name}.zip"
+    with zipfile.ZipFile(zip_path, 'w', compression) as zip_file:
+        for i in range(4):
+            sample = order / f"sample{i}.ab1"
+            sample.write_bytes(os.urandom(4096))
+            zip_file.write(sample, sample.name)
+    return order, zip_path
+
+
+def flip_member_byte(zip_path, name):
+    with zipfile.ZipFile(zip_path) as zip_file:
+        info = zip_file.getinfo(name)
+    with open(zip_path, 'r+b') as f:
+        # Local header: 30 bytes plus name and extra field lengths
+        f.seek(info.header_offset + 26)
+        name_len = int.from_bytes(f.read(2), 'little')
+        extra_len = int.from_bytes(f.read(2), 'little')
+        data_offset = info.header_offset + 30 + name_len + extra_len + 100
+        f.seek(data_offset)
+        byte = f.read(1)
+        f.seek(data_offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+
+def test_sound_zip_and_sources_verify(tmp_path):
+    order, zip_path = make_zip(tmp_path)
+
+    result = verify_zip(zip_path, order, compare_sources=True)
+
+    assert result.ok
+    assert (result.members, result.sources) == (4, 4)
+    assert result.summary() == "OK (4 CRC, 4 source)"
+    assert file_crc32(order / "sample0.ab1") == zipfile.ZipFile(zip_path).getinfo("sample0.ab1").CRC
+
+
+def test_corrupted_member_is_reported(tmp_path):
+    _, zip_path = make_zip(tmp_path, zipfile.ZIP_STORED)
+    flip_member_byte(zip_path, "sample2.ab1")
+
+    result = verify_zip(zip_path)
+
+    assert result.members == 3
+    assert len(result.problems) == 1 and result.problems[0].startswith("sample2.ab1")
+
+
+def test_truncated_zip_is_unreadable(tmp_path):
+    _, zip_path = make_zip(tmp_path)
+    with open(zip_path, 'r+b') as f:
+        f.truncate(zip_path.stat().st_size // 2)
+
+    result = verify_zip(zip_path)
+
+    assert not result.ok
+    assert result.problems[0].startswith("Unreadable zip")
+
+
+def test_source_changed_since_zipping(tmp_path):
+    order, zip_path = make_zip(tmp_path)
+    (order / "sample1.ab1").write_bytes(os.urandom(4096))
+
+    assert verify_zip(zip_path, order).ok
+    result = verify_zip(zip_path, order, compare_sources=True)
+    assert result.problems == ["sample1.ab1: differs from source file"]
+
+
+def test_verifier_checks_dump_copy(tmp_path):
+    order, zip_path = make_zip(tmp_path, zipfile.ZIP_STORED)
+    dump = tmp_path / "zip dump"
+    dump.mkdir()
+    good_copy = dump / zip_path.name
+    shutil.copy2(zip_path, good_copy)
+    bad_copy = dump / "bad.zip"
+    shutil.copy2(zip_path, bad_copy)
+    flip_member_byte(bad_copy, "sample0.ab1")
+    hardlink = dump / "linked.zip"
+    os.link(zip_path, hardlink)
+
+    with ZipVerifier(max_workers=2, logger=lambda msg: None) as verifier:
+        good = verifier.submit(zip_path, order, copies=[good_copy, hardlink, dump / "missing.zip"])
+        bad = verifier.submit(zip_path, order, copies=[bad_copy])
+        assert good.result().ok
+        assert bad.result().problems[0].startswith("dump copy: sample0.ab1")
+
+
+def test_dump_copy_removed_mid_check_is_a_problem_not_an_error(tmp_path, monkeypatch):
+    order, zip_path = make_zip(tmp_path)
+    dump = tmp_path / "zip dump"
+    dump.mkdir()
+    copy_path = dump / zip_path.name
+    shutil.copy2(zip_path, copy_path)
+    getsize = os.path.getsize
+
+    def vanished(path):
+        if str(path) == str(copy_path):
+            raise FileNotFoundError(2, "No such file or directory", str(path))
+        return getsize(path)
+
+    monkeypatch.setattr(zip_verifier.os.path, "getsize", vanished)
+    with ZipVerifier(logger=lambda msg: None) as verifier:
+        result = verifier.submit(zip_path, order, copies=[copy_path]).result()
+
+    assert result.members == 4
+    assert len(result.problems) == 1 and result.problems[0].startswith("dump copy: ")
+
+
+def test_integrity_column_in_summary(tmp_path):
+    _, zip_path = make_zip(tmp_path)
+    excel_dao = ExcelDAO(MseqConfig())
+    validation_result = {'match_count': 1, 'expected_count': 1, 'txt_count': 5, 'extra_ab1_count': 0,
+                         'matches': [{'raw_name': 'a', 'file_name': 'a.ab1'}], 'txt_files': []}
+
+    table = ValidationTable(num_columns=9)
+    excel_dao.collect_validation_result(table, validation_result, zip_path, "22000", "150000",
+                                        integrity=ZipIntegrity(1, 0, []))
+    excel_dao.collect_validation_result(table, validation_result, zip_path, "22000", "150001",
+                                        integrity=ZipIntegrity(0, 0, ["a.ab1: Bad CRC-32"]))
+
+    order_rows = [row for row in range(len(table)) if table.get(row, 2) in ("150000", "150001")]
+    assert [table.get(row, 3) for row in order_rows] == ["Completed", "ATTENTION"]
+    assert [table.get(row, 9) for row in order_rows] == ["OK (1 CRC)", "a.ab1: Bad CRC-32"]